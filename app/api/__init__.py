@@ -1,4 +1,13 @@
 from .health import router as health_router
+from .metrics import MetricsMiddleware
+from .metrics import router as metrics_router
+from .profiling import router as profiling_router
 from .sentiment import router as sentiment_router
 
-__all__ = ["sentiment_router", "health_router"]
+__all__ = [
+    "sentiment_router",
+    "health_router",
+    "metrics_router",
+    "profiling_router",
+    "MetricsMiddleware",
+]
@@ -0,0 +1,38 @@
+"""
+Dépendances FastAPI partagées par les routers
+"""
+
+from typing import Optional
+
+from app.services import profiling
+from app.services.admission import AdmissionController
+from app.services.batcher import MicroBatcher
+from app.services.executor import InferenceExecutor
+from app.services.profiling import Profiler
+from app.services.registry import get_registry
+from app.services.sentiment_service import SentimentService
+
+
+def get_sentiment_service() -> SentimentService:
+    """Service de sentiment partagé"""
+    return get_registry().sentiment_service
+
+
+def get_executor() -> InferenceExecutor:
+    """Pool de threads d'inférence partagé"""
+    return get_registry().executor
+
+
+def get_batcher() -> Optional[MicroBatcher]:
+    """Micro-batcher partagé (None si désactivé)"""
+    return get_registry().batcher
+
+
+def get_admission() -> Optional[AdmissionController]:
+    """Contrôle d'admission partagé (None si désactivé)"""
+    return get_registry().admission
+
+
+def get_profiler() -> Profiler:
+    """Profileur du chemin d'inférence partagé"""
+    return profiling.get_profiler()
@@ -0,0 +1,142 @@
+"""
+Chemin rapide Lambda pour les prédictions, sans passer par la pile ASGI
+
+Les événements API Gateway (REST v1 ou HTTP v2) ``POST /predict-sentiment``
+et ``POST /predict-sentiment/batch`` dont le corps est valide sont traités
+directement : décodage du corps, appel du service, réponse API Gateway
+construite à la main. Le contenu des réponses est identique à celui des
+endpoints FastAPI.
+
+Tout autre événement, ou un corps invalide, retourne None : l'appelant le
+transmet à Mangum, qui produit la réponse (et les erreurs 422) de FastAPI.
+"""
+
+import base64
+import json
+from typing import Optional
+
+from app.api.dependencies import get_sentiment_service
+from app.api.sentiment import _use_cache
+from app.schemas.sentiment import MAX_BATCH_SIZE
+
+FAST_ROUTES = {
+    ("POST", "/predict-sentiment"): "single",
+    ("POST", "/predict-sentiment/batch"): "batch",
+}
+
+
+def _request_line(event: dict):
+    """Méthode et chemin d'un événement API Gateway v1 ou v2"""
+    http = event.get("requestContext", {}).get("http")
+    if http:
+        return http.get("method"), event.get("rawPath")
+    return event.get("httpMethod"), event.get("path")
+
+
+def route(event: dict) -> Optional[str]:
+    """Type de prédiction (``single`` / ``batch``) ou None"""
+    method, path = _request_line(event)
+    if not method or not path:
+        return None
+    return FAST_ROUTES.get((method.upper(), path.rstrip("/") or "/"))
+
+
+def _headers(event: dict) -> dict:
+    return {k.lower(): v for k, v in (event.get("headers") or {}).items()}
+
+
+def _body(event: dict):
+    body = event.get("body")
+    if body is None:
+        return None
+    if event.get("isBase64Encoded"):
+        body = base64.b64decode(body)
+    try:
+        return json.loads(body)
+    except ValueError:
+        return None
+
+
+def _response(status_code: int, content: dict, headers: dict) -> dict:
+    # Même sérialisation que JSONResponse
+    body = json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    )
+    headers = {
+        "content-type": "application/json",
+        "content-length": str(len(body.encode("utf-8"))),
+        **headers,
+    }
+    return {
+        "statusCode": status_code,
+        "headers": headers,
+        "body": body,
+        "isBase64Encoded": False,
+    }
+
+
+def _cors_headers(request_headers: dict) -> dict:
+    """En-têtes CORS d'une requête simple (``allow_origins=["*"]``)"""
+    if "origin" not in request_headers:
+        return {}
+    return {
+        "access-control-allow-origin": "*",
+        "access-control-allow-credentials": "true",
+    }
+
+
+def handle(event: dict, service=None) -> Optional[dict]:
+    """
+    Traite l'événement s'il relève du chemin rapide
+
+    Returns:
+        La réponse API Gateway, ou None si l'événement doit passer par
+        Mangum (autre route, corps invalide, requête avec cookies)
+    """
+    kind = route(event)
+    if kind is None:
+        return None
+
+    headers = _headers(event)
+    # Avec des cookies, CORSMiddleware renvoie l'origine explicite : laisser
+    # FastAPI répondre
+    if "origin" in headers and "cookie" in headers:
+        return None
+
+    payload = _body(event)
+    if not isinstance(payload, dict):
+        return None
+    if kind == "single":
+        text = payload.get("text")
+        if not isinstance(text, str):
+            return None
+    else:
+        texts = payload.get("texts")
+        if (
+            not isinstance(texts, list)
+            or not 1 <= len(texts) <= MAX_BATCH_SIZE
+            or not all(isinstance(text, str) for text in texts)
+        ):
+            return None
+
+    service = service or get_sentiment_service()
+    use_cache = _use_cache(headers.get("cache-control"))
+    cors = _cors_headers(headers)
+
+    try:
+        if kind == "single":
+            label, confidence = service.predict_sentiment(text, use_cache)
+            content = {"text": text, "sentiment": label, "confidence": confidence}
+        else:
+            predictions = service.predict_batch(texts, use_cache)
+            content = {
+                "results": [
+                    {"text": text, "sentiment": label, "confidence": confidence}
+                    for text, (label, confidence) in zip(texts, predictions)
+                ]
+            }
+    except Exception as e:
+        return _response(
+            500, {"detail": f"Erreur lors de la prédiction: {str(e)}"}, cors
+        )
+    return _response(200, content, cors)
@@ -1,19 +1,10 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
+from app.api.dependencies import get_sentiment_service
 from app.services.sentiment_service import SentimentService
 
 router = APIRouter(tags=["health"])
 
-# Instance singleton du service de sentiment
-_sentiment_service = None
-
-
-def get_sentiment_service():
-    global _sentiment_service
-    if _sentiment_service is None:
-        _sentiment_service = SentimentService()
-    return _sentiment_service
-
 
 @router.get("/")
 async def root():
@@ -22,9 +13,10 @@ async def root():
 
 
 @router.get("/health")
-async def health_check():
+async def health_check(
+    sentiment_service: SentimentService = Depends(get_sentiment_service),
+):
     """Vérification de santé de l'API"""
-    sentiment_service = get_sentiment_service()
     model_status = "healthy" if sentiment_service.is_model_loaded() else "unhealthy"
 
     return {
@@ -52,5 +44,9 @@ async def get_info():
             "GET /users - Liste des utilisateurs",
             "POST /users - Créer un utilisateur",
             "POST /predict-sentiment - Prédiction de sentiment (0=négatif, 4=positif)",
+            "POST /predict-sentiment/batch - Prédiction de sentiment par lot",
+            "POST /predict-sentiment/stream - Scoring en flux NDJSON",
+            "GET /metrics - Métriques Prometheus",
+            "POST /admin/profiling/start - Profilage à la demande (admin)",
         ],
     }
@@ -0,0 +1,77 @@
+"""
+Endpoint ``/metrics`` (format Prometheus) et middleware des requêtes HTTP
+"""
+
+import time
+
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from app.services.metrics import (
+    CONTENT_TYPE,
+    HTTP_IN_FLIGHT,
+    HTTP_REQUEST_SECONDS,
+    HTTP_REQUESTS,
+    REGISTRY,
+)
+
+router = APIRouter(tags=["metrics"])
+
+# Étiquette des requêtes sans route (404) : cardinalité bornée
+UNMATCHED_PATH = "unmatched"
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Métriques au format d'exposition texte Prometheus"""
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
+class MetricsMiddleware:
+    """
+    Compte les requêtes par méthode, route et statut, mesure leur durée
+    (jusqu'au dernier octet de la réponse) et les requêtes en cours
+
+    L'étiquette ``path`` est le gabarit de la route (``/items/{id}``), pas
+    le chemin brut.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._paths = None
+
+    def _route_path(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return UNMATCHED_PATH
+        if self._paths is None:
+            self._paths = {
+                getattr(route, "endpoint", None): route.path
+                for route in scope["app"].routes
+            }
+        return self._paths.get(endpoint, UNMATCHED_PATH)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            method, path = scope["method"], self._route_path(scope)
+            HTTP_REQUEST_SECONDS.labels(method=method, path=path).observe(
+                time.perf_counter() - started_at
+            )
+            HTTP_REQUESTS.labels(method=method, path=path, status=status).inc()
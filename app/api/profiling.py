@@ -0,0 +1,100 @@
+"""
+Endpoints d'administration du profilage à la demande
+
+Absents (404) tant que ``PROFILING_ENABLED`` n'est pas activé ; chaque
+requête doit présenter ``PROFILING_TOKEN`` dans l'en-tête
+``X-Profiling-Token``.
+"""
+
+import hmac
+import io
+import zipfile
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import Response
+
+from app.api.dependencies import get_profiler
+from app.config import Settings, get_settings
+from app.schemas import ProfilingRequest
+from app.services.profiling import Profiler, ProfilingBusyError
+
+# Session par défaut : les 100 prochaines prédictions
+DEFAULT_PREDICTIONS = 100
+
+
+def require_profiling_access(
+    x_profiling_token: Optional[str] = Header(None),
+    settings: Settings = Depends(get_settings),
+):
+    """Profilage activé et jeton d'administration valide"""
+    if not settings.profiling_enabled:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not settings.profiling_token or not hmac.compare_digest(
+        (x_profiling_token or "").encode(), settings.profiling_token.encode()
+    ):
+        raise HTTPException(status_code=403, detail="Jeton de profilage invalide")
+
+
+router = APIRouter(
+    prefix="/admin/profiling",
+    tags=["admin"],
+    include_in_schema=False,
+    dependencies=[Depends(require_profiling_access)],
+)
+
+
+@router.get("")
+async def profiling_status(profiler: Profiler = Depends(get_profiler)):
+    """Session en cours (ou dernière session) et sessions téléchargeables"""
+    return profiler.status()
+
+
+@router.post("/start")
+async def start_profiling(
+    request: ProfilingRequest, profiler: Profiler = Depends(get_profiler)
+):
+    """
+    Profile les ``predictions`` prochaines prédictions et/ou pendant
+    ``duration_s`` secondes (100 prédictions par défaut)
+    """
+    predictions = request.predictions
+    if predictions is None and request.duration_s is None:
+        predictions = DEFAULT_PREDICTIONS
+    try:
+        session = profiler.start(request.mode, predictions, request.duration_s)
+    except ProfilingBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ImportError as e:
+        raise HTTPException(status_code=501, detail=f"Profileur indisponible: {e}")
+    return session.to_dict()
+
+
+@router.post("/stop")
+async def stop_profiling(profiler: Profiler = Depends(get_profiler)):
+    """Termine la session en cours et écrit le profil"""
+    session = profiler.stop()
+    if session is None:
+        raise HTTPException(status_code=409, detail="Aucune session en cours")
+    return session.to_dict()
+
+
+@router.get("/sessions/{session_id}")
+async def download_profile(session_id: str, profiler: Profiler = Depends(get_profiler)):
+    """Archive zip des fichiers d'une session terminée"""
+    directory = profiler.session_directory(session_id)
+    if directory is None:
+        raise HTTPException(status_code=404, detail="Session inconnue ou en cours")
+
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zf:
+        for path in sorted(directory.rglob("*")):
+            if path.is_file():
+                zf.write(path, path.relative_to(directory.parent))
+    return Response(
+        archive.getvalue(),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f'attachment; filename="profile-{session_id}.zip"'
+        },
+    )
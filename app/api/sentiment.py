@@ -1,35 +1,299 @@
-from fastapi import APIRouter, HTTPException
+import asyncio
+import math
+from typing import Awaitable, Callable, Optional, Set, TypeVar
 
-from app.schemas import SentimentRequest, SentimentResponse
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+from app.api.dependencies import (
+    get_admission,
+    get_batcher,
+    get_executor,
+    get_sentiment_service,
+)
+from app.config import Settings, get_settings
+from app.schemas import (
+    BatchSentimentRequest,
+    BatchSentimentResponse,
+    SentimentRequest,
+    SentimentResponse,
+)
+from app.services.admission import (
+    AdmissionController,
+    AdmissionError,
+    ClientDisconnectedError,
+)
+from app.services.batcher import MicroBatcher
+from app.services.executor import InferenceExecutor
+from app.services.metrics import ADMISSION_REJECTED
 from app.services.sentiment_service import SentimentService
+from app.services.streaming import score_ndjson
 
 router = APIRouter(prefix="/predict-sentiment", tags=["sentiment"])
 
-# Instance singleton du service de sentiment
-_sentiment_service = None
+T = TypeVar("T")
+
+# Prédictions déjà lancées dont le client est parti, gardées jusqu'à leur fin
+_orphans: Set[asyncio.Future] = set()
+
+
+def _use_cache(cache_control: Optional[str]) -> bool:
+    """Le cache est ignoré si la requête envoie ``Cache-Control: no-cache``"""
+    if not cache_control:
+        return True
+    directives = {d.strip().lower() for d in cache_control.split(",")}
+    return not directives & {"no-cache", "no-store"}
+
+
+async def _wait_for_disconnect(request: Request):
+    """Retourne quand le client se déconnecte (corps de la requête déjà lu)"""
+    while (await request.receive())["type"] != "http.disconnect":
+        pass
+
+
+def _forget(work: asyncio.Future):
+    """Oublie une prédiction orpheline terminée (résultat sans destinataire)"""
+    _orphans.discard(work)
+    if not work.cancelled():
+        work.exception()
+
+
+def _abandon(work: asyncio.Future, started: bool):
+    """
+    Abandonne ``work`` : annulé s'il attend encore son tour ; s'il s'exécute
+    déjà, le thread d'inférence ne peut pas être interrompu et ``work`` garde
+    son emplacement d'admission jusqu'à la fin du calcul
+    """
+    if not started:
+        work.cancel()
+        return
+    _orphans.add(work)
+    work.add_done_callback(_forget)
+
+
+async def _admitted(
+    request: Request,
+    admission: Optional[AdmissionController],
+    timeout_ms: Optional[float],
+    call: Callable[[], Awaitable[T]],
+) -> T:
+    """
+    Exécute ``call()`` via le contrôle d'admission ; le travail est abandonné
+    si le client se déconnecte avant la réponse (voir ``_abandon``)
+    """
+    if admission is None:
+        return await call()
+
+    started = False
+
+    async def start():
+        nonlocal started
+        started = True
+        return await call()
+
+    deadline_s = timeout_ms / 1000 if timeout_ms is not None else None
+    work = asyncio.ensure_future(admission.run(start, deadline_s))
+    disconnect = asyncio.ensure_future(_wait_for_disconnect(request))
+    try:
+        await asyncio.wait({work, disconnect}, return_when=asyncio.FIRST_COMPLETED)
+    except asyncio.CancelledError:
+        _abandon(work, started)
+        raise
+    finally:
+        disconnect.cancel()
+    if not work.done():
+        _abandon(work, started)
+        if not started:
+            await asyncio.wait((work,))
+        raise ClientDisconnectedError("Client déconnecté avant la réponse", 0.0)
+    return work.result()
 
 
-def get_sentiment_service():
-    global _sentiment_service
-    if _sentiment_service is None:
-        _sentiment_service = SentimentService()
-    return _sentiment_service
+def _rejected(error: AdmissionError) -> HTTPException:
+    """Réponse 429/503 (avec ``Retry-After``) d'une requête non admise"""
+    ADMISSION_REJECTED.labels(reason=error.reason).inc()
+    return HTTPException(
+        status_code=error.status_code,
+        detail=str(error),
+        headers={"Retry-After": str(math.ceil(error.retry_after_s))},
+    )
 
 
 @router.post("/", response_model=SentimentResponse)
-async def predict_sentiment(request: SentimentRequest):
+async def predict_sentiment(
+    request: SentimentRequest,
+    http_request: Request,
+    cache_control: Optional[str] = Header(None),
+    x_request_timeout_ms: Optional[float] = Header(None, gt=0),
+    sentiment_service: SentimentService = Depends(get_sentiment_service),
+    executor: InferenceExecutor = Depends(get_executor),
+    batcher: Optional[MicroBatcher] = Depends(get_batcher),
+    admission: Optional[AdmissionController] = Depends(get_admission),
+):
     """
     Prédit le sentiment d'un texte (0 = négatif, 4 = positif)
+
+    L'en-tête ``Cache-Control: no-cache`` force le passage par le modèle.
+    ``X-Request-Timeout-Ms`` fixe l'échéance de la requête : si elle ne peut
+    pas être tenue, la réponse est immédiatement 503 (429 si la file est
+    pleine).
     """
+    use_cache = _use_cache(cache_control)
+
+    async def predict():
+        if batcher is not None:
+            return await batcher.predict(request.text, use_cache)
+        return await executor.run(
+            sentiment_service.predict_sentiment, request.text, use_cache
+        )
+
     try:
-        sentiment_service = get_sentiment_service()
-        label, confidence = sentiment_service.predict_sentiment(request.text)
+        label, confidence = await _admitted(
+            http_request, admission, x_request_timeout_ms, predict
+        )
 
         return SentimentResponse(
             text=request.text, sentiment=label, confidence=confidence
         )
 
+    except AdmissionError as e:
+        raise _rejected(e)
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Erreur lors de la prédiction: {str(e)}"
         )
+
+
+@router.post("/batch", response_model=BatchSentimentResponse)
+async def predict_sentiment_batch(
+    request: BatchSentimentRequest,
+    http_request: Request,
+    cache_control: Optional[str] = Header(None),
+    x_request_timeout_ms: Optional[float] = Header(None, gt=0),
+    sentiment_service: SentimentService = Depends(get_sentiment_service),
+    executor: InferenceExecutor = Depends(get_executor),
+    admission: Optional[AdmissionController] = Depends(get_admission),
+):
+    """
+    Prédit le sentiment d'une liste de textes en un seul passage du modèle
+
+    L'en-tête ``Cache-Control: no-cache`` force le passage par le modèle.
+    ``X-Request-Timeout-Ms`` fixe l'échéance de la requête (voir ``/``).
+    """
+    use_cache = _use_cache(cache_control)
+
+    async def predict():
+        return await executor.run(
+            sentiment_service.predict_batch, request.texts, use_cache
+        )
+
+    try:
+        predictions = await _admitted(
+            http_request, admission, x_request_timeout_ms, predict
+        )
+
+        return BatchSentimentResponse(
+            results=[
+                SentimentResponse(text=text, sentiment=label, confidence=confidence)
+                for text, (label, confidence) in zip(request.texts, predictions)
+            ]
+        )
+
+    except AdmissionError as e:
+        raise _rejected(e)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Erreur lors de la prédiction: {str(e)}"
+        )
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """
+    Réponse en flux qui laisse le générateur lire le corps de la requête
+
+    ``StreamingResponse`` consomme ``receive()`` pour détecter la
+    déconnexion du client, ce qui volerait des morceaux du corps encore en
+    cours de lecture ; ici la déconnexion est signalée par ``request.stream()``.
+    """
+
+    media_type = "application/x-ndjson"
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+@router.post("/stream", response_class=NDJSONStreamingResponse)
+async def predict_sentiment_stream(
+    request: Request,
+    cache_control: Optional[str] = Header(None),
+    x_request_timeout_ms: Optional[float] = Header(None, gt=0),
+    sentiment_service: SentimentService = Depends(get_sentiment_service),
+    executor: InferenceExecutor = Depends(get_executor),
+    settings: Settings = Depends(get_settings),
+    admission: Optional[AdmissionController] = Depends(get_admission),
+):
+    """
+    Score en flux un corps NDJSON (``{"text": "...", "id": ...}`` par ligne)
+
+    Les textes sont prédits par lots au fil de la lecture du corps et les
+    résultats renvoyés en NDJSON dans l'ordre d'entrée, sans jamais garder
+    l'entrée ou la sortie complète en mémoire. Une ligne invalide produit
+    une ligne ``{"line": n, "error": "..."}`` sans interrompre le flux.
+
+    Chaque lot passe par le contrôle d'admission, ``X-Request-Timeout-Ms``
+    bornant son attente. Un flux qui serait refusé dès son premier lot
+    reçoit 429/503 avant toute réponse ; un lot refusé en cours de flux
+    produit une ligne d'erreur pour chacun de ses textes.
+    """
+    use_cache = _use_cache(cache_control)
+    deadline_s = x_request_timeout_ms / 1000 if x_request_timeout_ms else None
+    if admission is not None:
+        try:
+            admission.check(deadline_s)
+        except AdmissionError as e:
+            raise _rejected(e)
+
+    async def predict(texts):
+        def call():
+            return executor.run(sentiment_service.predict_batch, texts, use_cache)
+
+        if admission is None:
+            return await call()
+        try:
+            return await admission.run(call, deadline_s)
+        except AdmissionError as e:
+            ADMISSION_REJECTED.labels(reason=e.reason).inc()
+            raise
+
+    return NDJSONStreamingResponse(
+        score_ndjson(
+            request.stream(),
+            predict,
+            batch_size=settings.stream_batch_size,
+            max_line_bytes=settings.stream_max_line_bytes,
+        )
+    )
+
+
+@router.get("/stats")
+async def prediction_stats(
+    sentiment_service: SentimentService = Depends(get_sentiment_service),
+    executor: InferenceExecutor = Depends(get_executor),
+    batcher: Optional[MicroBatcher] = Depends(get_batcher),
+    admission: Optional[AdmissionController] = Depends(get_admission),
+):
+    """
+    Statistiques d'exécution du chemin de prédiction
+    """
+    return {
+        "executor": executor.snapshot(),
+        "admission": admission.snapshot() if admission is not None else None,
+        "cache": sentiment_service.cache_snapshot(),
+        "persistent_cache": sentiment_service.persistent_cache_snapshot(),
+        "model_loading": sentiment_service.load_snapshot(),
+        "cascade": sentiment_service.cascade_snapshot(),
+        "coalescing": sentiment_service.coalescing_snapshot(),
+        "micro_batching": batcher.snapshot() if batcher is not None else None,
+    }
@@ -0,0 +1,302 @@
+"""
+Scoring hors ligne d'un gros fichier avec un pool de processus
+
+Usage :
+    python -m app.batch training.1600000.processed.noemoticon.csv scores.jsonl
+    python -m app.batch tweets.jsonl scores.csv --workers 8 --chunk-size 1024
+    python -m app.batch tweets.parquet scores.jsonl --resume
+
+Le fichier d'entrée (CSV Sentiment140, JSONL ou Parquet) est lu en flux par
+lots de ``--chunk-size`` lignes, répartis sur ``--workers`` processus qui
+chargent chacun le modèle une seule fois. Les résultats sont écrits au fur
+et à mesure, dans l'ordre d'entrée (JSONL ou CSV selon l'extension de
+sortie), chaque ligne d'entrée complétée des colonnes ``sentiment`` et
+``confidence``.
+
+Après chaque lot écrit, un checkpoint ``<sortie>.checkpoint`` enregistre le
+nombre de lignes traitées et la taille de la sortie : ``--resume`` reprend
+à partir de ce point après une interruption.
+
+Les lignes mal formées (CSV dont le nombre de colonnes diffère de six,
+JSON invalide) ne sont pas scorées : leur nombre figure dans le résumé
+final et dans le checkpoint (``malformed_rows``).
+
+Le débit (lignes/s) est mesuré à partir du premier lot rendu ; le temps de
+démarrage des workers (chargement du modèle) est rapporté à part
+(``startup_s``).
+"""
+
+import argparse
+import csv
+import io
+import itertools
+import json
+import multiprocessing
+import os
+import pathlib
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from typing import Iterator, List, Optional, Tuple
+
+from app.config import Settings, get_settings
+from app.datasets import DATASET_FORMATS, iter_records
+from app.serving import threads_per_worker, worker_environment
+
+OUTPUT_FORMATS = ("jsonl", "csv")
+
+# Service chargé une fois par processus du pool
+_service = None
+
+
+def _init_worker(model_path: Optional[str], threads: int):
+    """Initialisation d'un processus : threads bornés et modèle chargé"""
+    global _service
+
+    os.environ.update(worker_environment(threads))
+    get_settings.cache_clear()
+    from app.services.sentiment_service import SentimentService
+
+    # Chaque texte n'est vu qu'une fois : le cache serait inutile
+    _service = SentimentService(
+        replace(Settings.from_env(), prediction_cache_enabled=False)
+    )
+    if model_path:
+        _service.model_path = pathlib.Path(model_path)
+    _service.load()
+
+
+def _score_chunk(texts: List[str]) -> List[Tuple[str, float]]:
+    return _service.predict_batch(texts, use_cache=False)
+
+
+def checkpoint_path(output: pathlib.Path) -> pathlib.Path:
+    return output.with_name(output.name + ".checkpoint")
+
+
+def read_checkpoint(output: pathlib.Path) -> Optional[dict]:
+    path = checkpoint_path(output)
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def write_checkpoint(output: pathlib.Path, state: dict):
+    """Écriture atomique du checkpoint (fichier temporaire puis rename)"""
+    path = checkpoint_path(output)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(state))
+    os.replace(tmp, path)
+
+
+def iter_chunks(records: Iterator[dict], size: int) -> Iterator[List[dict]]:
+    while True:
+        chunk = list(itertools.islice(records, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class ResultWriter:
+    """Écriture incrémentale des résultats en JSONL ou en CSV"""
+
+    def __init__(self, f, fmt: str):
+        self.f = f
+        self.fmt = fmt
+        self.columns: Optional[List[str]] = None
+
+    def write(self, rows: List[dict]) -> int:
+        buffer = io.StringIO()
+        if self.fmt == "jsonl":
+            for row in rows:
+                buffer.write(json.dumps(row, ensure_ascii=False, default=str))
+                buffer.write("\n")
+        else:
+            # Colonnes fixées par la première ligne écrite
+            if self.columns is None:
+                self.columns = list(rows[0])
+                if self.f.tell() == 0:
+                    csv.writer(buffer).writerow(self.columns)
+            writer = csv.DictWriter(buffer, self.columns, extrasaction="ignore")
+            writer.writerows(rows)
+        self.f.write(buffer.getvalue().encode("utf-8"))
+        self.f.flush()
+        return self.f.tell()
+
+
+def score_file(
+    input_path: pathlib.Path,
+    output_path: pathlib.Path,
+    input_format: Optional[str] = None,
+    text_column: str = "text",
+    workers: int = 1,
+    chunk_size: int = 512,
+    model_path: Optional[pathlib.Path] = None,
+    resume: bool = False,
+    overwrite: bool = False,
+    progress_every_s: float = 10.0,
+) -> dict:
+    """
+    Score ``input_path`` vers ``output_path`` ; retourne les statistiques
+
+    Au plus ``2 × workers`` lots sont en cours à un instant donné : la
+    mémoire utilisée ne dépend pas de la taille du fichier.
+    """
+    input_path, output_path = pathlib.Path(input_path), pathlib.Path(output_path)
+    output_format = output_path.suffix.lower().lstrip(".")
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Format de sortie non supporté: {output_path}")
+
+    checkpoint = read_checkpoint(output_path) if resume else None
+    if checkpoint is not None:
+        if checkpoint["input"] != str(input_path.resolve()):
+            raise ValueError(
+                f"Le checkpoint concerne un autre fichier: {checkpoint['input']}"
+            )
+        skip_rows = checkpoint["rows"]
+        f = open(output_path, "r+b")
+        # Écarter ce qui a été écrit après le dernier checkpoint
+        f.truncate(checkpoint["output_bytes"])
+        f.seek(0, os.SEEK_END)
+        print(f"⏩ Reprise après {skip_rows} lignes")
+    else:
+        if output_path.exists() and not overwrite:
+            raise FileExistsError(
+                f"{output_path} existe déjà (utiliser --resume ou --overwrite)"
+            )
+        skip_rows = 0
+        f = open(output_path, "wb")
+
+    # Numéros des lignes ignorées, relus depuis le début en cas de reprise
+    malformed: List[int] = []
+    records = iter_records(input_path, input_format, malformed)
+    records = itertools.islice(records, skip_rows, None)
+    threads = threads_per_worker(workers)
+    state = {"input": str(input_path.resolve()), "rows": skip_rows}
+
+    started_at = time.perf_counter()
+    last_report = started_at
+    scored = 0
+    # Le débit est mesuré à partir du premier lot rendu : le démarrage des
+    # workers (spawn + chargement du modèle) est compté à part
+    first_result_at = None
+    first_rows = 0
+
+    def rate(now: float) -> float:
+        if first_result_at is None or now <= first_result_at or scored == first_rows:
+            return scored / (now - started_at) if now > started_at else 0.0
+        return (scored - first_rows) / (now - first_result_at)
+
+    writer = ResultWriter(f, output_format)
+    # spawn : aucun état TensorFlow hérité du parent
+    with (
+        ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(str(model_path) if model_path else None, threads),
+        ) as pool,
+        f,
+    ):
+        pending = deque()
+        chunks = iter_chunks(records, chunk_size)
+
+        def submit_next() -> bool:
+            chunk = next(chunks, None)
+            if chunk is None:
+                return False
+            texts = [str(row.get(text_column) or "") for row in chunk]
+            pending.append((chunk, pool.submit(_score_chunk, texts)))
+            return True
+
+        while len(pending) < 2 * workers and submit_next():
+            pass
+
+        while pending:
+            chunk, future = pending.popleft()
+            predictions = future.result()
+            submit_next()
+            rows = [
+                {**row, "sentiment": label, "confidence": confidence}
+                for row, (label, confidence) in zip(chunk, predictions)
+            ]
+            state["output_bytes"] = writer.write(rows)
+            state["rows"] += len(rows)
+            # Lignes ignorées lues jusqu'ici (lecture en avance de 2 × workers lots)
+            state["malformed_rows"] = len(malformed)
+            write_checkpoint(output_path, state)
+            scored += len(rows)
+
+            now = time.perf_counter()
+            if first_result_at is None:
+                first_result_at = now
+                first_rows = scored
+            if now - last_report >= progress_every_s:
+                print(
+                    f"📈 {state['rows']} lignes traitées " f"({rate(now):.0f} lignes/s)"
+                )
+                last_report = now
+
+    finished_at = time.perf_counter()
+    duration_s = finished_at - started_at
+    startup_s = (first_result_at or finished_at) - started_at
+    stats = {
+        "rows": scored,
+        "total_rows": state["rows"],
+        "duration_s": round(duration_s, 3),
+        "startup_s": round(startup_s, 3),
+        "rows_per_s": round(rate(finished_at), 1),
+        "workers": workers,
+        "malformed_rows": len(malformed),
+    }
+    print(
+        f"✅ {scored} lignes scorées en {duration_s:.1f}s dont {startup_s:.1f}s "
+        f"de démarrage ({stats['rows_per_s']} lignes/s, {workers} workers)"
+    )
+    if malformed:
+        print(
+            f"⚠️ {len(malformed)} lignes mal formées ignorées "
+            f"(lignes {', '.join(map(str, malformed[:10]))}"
+            f"{', ...' if len(malformed) > 10 else ''})"
+        )
+    return stats
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Scoring hors ligne d'un fichier")
+    parser.add_argument("input", type=pathlib.Path)
+    parser.add_argument("output", type=pathlib.Path, help="Fichier .jsonl ou .csv")
+    parser.add_argument(
+        "--format",
+        choices=DATASET_FORMATS,
+        default=None,
+        help="Format d'entrée (par défaut : d'après l'extension)",
+    )
+    parser.add_argument("--text-column", default="text")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=512)
+    parser.add_argument("--model-path", type=pathlib.Path, default=None)
+    parser.add_argument("--resume", action="store_true")
+    parser.add_argument("--overwrite", action="store_true")
+    parser.add_argument("--progress-every", type=float, default=10.0)
+    args = parser.parse_args(argv)
+
+    score_file(
+        args.input,
+        args.output,
+        input_format=args.format,
+        text_column=args.text_column,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        model_path=args.model_path,
+        resume=args.resume,
+        overwrite=args.overwrite,
+        progress_every_s=args.progress_every,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+"""
+Configuration de l'application lue depuis les variables d'environnement
+"""
+
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Tuple
+
+_TRUE_VALUES = {"1", "true", "yes", "on"}
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in _TRUE_VALUES
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+
+def _env_int_tuple(name: str, default: Tuple[int, ...]) -> Tuple[int, ...]:
+    value = os.environ.get(name)
+    if not value:
+        return default
+    return tuple(sorted(int(part) for part in value.split(",") if part.strip()))
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Paramètres d'exécution de l'API"""
+
+    # Chargement du modèle : "eager" (au démarrage) ou "lazy" (1re prédiction)
+    model_loading: str = "eager"
+    # Délai avant une nouvelle tentative après un échec de chargement
+    # (doublé à chaque échec consécutif, borné)
+    model_load_backoff_s: float = 1.0
+    model_load_backoff_max_s: float = 60.0
+
+    # Tokenizer : "auto" (embarqué s'il existe, sinon Hub), "bundled" ou "hub"
+    tokenizer_source: str = "auto"
+
+    # Micro-batching des requêtes unitaires concurrentes
+    micro_batching_enabled: bool = False
+    batch_max_size: int = 32
+    batch_max_wait_ms: float = 5.0
+
+    # Pool de threads dédié à l'inférence
+    inference_workers: int = 2
+
+    # Contrôle d'admission : file bornée et échéance par requête (en-tête
+    # X-Request-Timeout-Ms, sinon request_deadline_ms)
+    admission_enabled: bool = True
+    admission_max_queue: int = 256
+    request_deadline_ms: float = 10000.0
+
+    # Padding des séquences : "max_length" (128 fixe) ou "dynamic" (buckets)
+    padding_strategy: str = "max_length"
+    sequence_buckets: Tuple[int, ...] = (16, 32, 64, 128)
+    max_tokens_per_batch: int = 8192
+
+    # Moteur d'inférence : "tensorflow", "tflite" ou "onnx"
+    inference_backend: str = "tensorflow"
+    # Précision des poids : "fp32" ou "int8" (quantifié, TFLite/ONNX)
+    model_precision: str = "fp32"
+    # Threads intra-op du moteur d'inférence (0 = valeur par défaut)
+    inference_threads: int = 0
+
+    # Fonction d'inférence compilée (tf.function) et compilation XLA
+    compiled_inference: bool = True
+    xla_jit_compile: bool = False
+
+    # Endpoint de scoring en flux (NDJSON)
+    stream_batch_size: int = 64
+    stream_max_line_bytes: int = 65536
+
+    # Scoring des événements SQS / S3 (Lambda) : destination et taille des
+    # paquets
+    result_sink: str = "file:///tmp/sentiment-results"
+    event_chunk_size: int = 256
+
+    # Profilage à la demande (endpoints /admin/profiling, jeton requis)
+    profiling_enabled: bool = False
+    profiling_token: str = ""
+    profiling_dir: str = "/tmp/sentiment-profiles"
+
+    # Cascade : classifieur linéaire TF-IDF d'abord, DistilBERT seulement
+    # si sa probabilité positive tombe dans [cascade_low, cascade_high]
+    cascade_enabled: bool = False
+    cascade_low: float = 0.2
+    cascade_high: float = 0.8
+
+    # Coalescence : les copies d'un texte en cours de calcul attendent son
+    # résultat au lieu de relancer une inférence
+    coalescing_enabled: bool = True
+
+    # Cache mémoire des prédictions
+    model_version: str = "distilbert_HF_100000k"
+    prediction_cache_enabled: bool = True
+    prediction_cache_max_entries: int = 10000
+    prediction_cache_ttl_s: float = 3600.0
+
+    # Cache persistant (SQLite) partagé par les processus de l'hôte,
+    # consulté après le cache mémoire
+    persistent_cache_enabled: bool = False
+    persistent_cache_path: str = "/tmp/sentiment-cache/predictions.sqlite3"
+    persistent_cache_max_entries: int = 1_000_000
+    persistent_cache_ttl_s: float = 86400.0
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """Construit la configuration à partir des variables d'environnement"""
+        return cls(
+            model_loading=os.environ.get("MODEL_LOADING", cls.model_loading),
+            model_load_backoff_s=_env_float(
+                "MODEL_LOAD_BACKOFF_S", cls.model_load_backoff_s
+            ),
+            model_load_backoff_max_s=_env_float(
+                "MODEL_LOAD_BACKOFF_MAX_S", cls.model_load_backoff_max_s
+            ),
+            tokenizer_source=os.environ.get("TOKENIZER_SOURCE", cls.tokenizer_source),
+            micro_batching_enabled=_env_bool(
+                "MICRO_BATCHING_ENABLED", cls.micro_batching_enabled
+            ),
+            batch_max_size=_env_int("BATCH_MAX_SIZE", cls.batch_max_size),
+            batch_max_wait_ms=_env_float("BATCH_MAX_WAIT_MS", cls.batch_max_wait_ms),
+            inference_workers=_env_int("INFERENCE_WORKERS", cls.inference_workers),
+            admission_enabled=_env_bool("ADMISSION_ENABLED", cls.admission_enabled),
+            admission_max_queue=_env_int(
+                "ADMISSION_MAX_QUEUE", cls.admission_max_queue
+            ),
+            request_deadline_ms=_env_float(
+                "REQUEST_DEADLINE_MS", cls.request_deadline_ms
+            ),
+            padding_strategy=os.environ.get("PADDING_STRATEGY", cls.padding_strategy),
+            sequence_buckets=_env_int_tuple("SEQUENCE_BUCKETS", cls.sequence_buckets),
+            max_tokens_per_batch=_env_int(
+                "MAX_TOKENS_PER_BATCH", cls.max_tokens_per_batch
+            ),
+            inference_backend=os.environ.get(
+                "INFERENCE_BACKEND", cls.inference_backend
+            ),
+            model_precision=os.environ.get("MODEL_PRECISION", cls.model_precision),
+            inference_threads=_env_int("INFERENCE_THREADS", cls.inference_threads),
+            compiled_inference=_env_bool("COMPILED_INFERENCE", cls.compiled_inference),
+            xla_jit_compile=_env_bool("XLA_JIT_COMPILE", cls.xla_jit_compile),
+            stream_batch_size=_env_int("STREAM_BATCH_SIZE", cls.stream_batch_size),
+            stream_max_line_bytes=_env_int(
+                "STREAM_MAX_LINE_BYTES", cls.stream_max_line_bytes
+            ),
+            result_sink=os.environ.get("RESULT_SINK", cls.result_sink),
+            event_chunk_size=_env_int("EVENT_CHUNK_SIZE", cls.event_chunk_size),
+            profiling_enabled=_env_bool("PROFILING_ENABLED", cls.profiling_enabled),
+            profiling_token=os.environ.get("PROFILING_TOKEN", cls.profiling_token),
+            profiling_dir=os.environ.get("PROFILING_DIR", cls.profiling_dir),
+            cascade_enabled=_env_bool("CASCADE_ENABLED", cls.cascade_enabled),
+            cascade_low=_env_float("CASCADE_LOW", cls.cascade_low),
+            cascade_high=_env_float("CASCADE_HIGH", cls.cascade_high),
+            coalescing_enabled=_env_bool("COALESCING_ENABLED", cls.coalescing_enabled),
+            model_version=os.environ.get("MODEL_VERSION", cls.model_version),
+            prediction_cache_enabled=_env_bool(
+                "PREDICTION_CACHE_ENABLED", cls.prediction_cache_enabled
+            ),
+            prediction_cache_max_entries=_env_int(
+                "PREDICTION_CACHE_MAX_ENTRIES", cls.prediction_cache_max_entries
+            ),
+            prediction_cache_ttl_s=_env_float(
+                "PREDICTION_CACHE_TTL_S", cls.prediction_cache_ttl_s
+            ),
+            persistent_cache_enabled=_env_bool(
+                "PERSISTENT_CACHE_ENABLED", cls.persistent_cache_enabled
+            ),
+            persistent_cache_path=os.environ.get(
+                "PERSISTENT_CACHE_PATH", cls.persistent_cache_path
+            ),
+            persistent_cache_max_entries=_env_int(
+                "PERSISTENT_CACHE_MAX_ENTRIES", cls.persistent_cache_max_entries
+            ),
+            persistent_cache_ttl_s=_env_float(
+                "PERSISTENT_CACHE_TTL_S", cls.persistent_cache_ttl_s
+            ),
+        )
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Retourne la configuration (lue une seule fois)"""
+    return Settings.from_env()
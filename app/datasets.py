@@ -0,0 +1,158 @@
+"""
+Lecture des jeux de données à scorer
+
+Format Sentiment140 du jeu d'entraînement (voir ``script_models``) : CSV
+sans en-tête, encodé en ISO-8859-1, colonnes ``target, id, date, flag,
+user, text`` avec ``target`` = "0" (négatif) ou "4" (positif).
+
+Les fichiers JSONL (un objet ou une chaîne JSON par ligne) et Parquet
+(``pyarrow`` requis) sont aussi lus en flux, ligne par ligne.
+
+Les échantillons d'entraînement et d'évaluation sont tirés de deux parties
+disjointes du fichier, choisies par le hash du texte : la partition ne
+dépend ni de la graine ni de la taille des échantillons, et les tweets
+en double restent du même côté.
+"""
+
+import csv
+import hashlib
+import json
+import pathlib
+import random
+from typing import Iterator, List, Optional, Union
+
+DATASET_FORMATS = ("csv", "jsonl", "parquet")
+
+SENTIMENT140_COLUMNS = ("target", "id", "date", "flag", "user", "text")
+SENTIMENT140_ENCODING = "ISO-8859-1"
+
+# Parties d'un fichier : entraînement et évaluation (textes réservés)
+SPLITS = ("train", "holdout")
+# Part des textes réservés à l'évaluation (en %)
+HOLDOUT_PERCENT = 10
+
+
+def iter_sentiment140(
+    path: Union[str, pathlib.Path], malformed: Optional[List[int]] = None
+) -> Iterator[dict]:
+    """
+    Parcourt les lignes du fichier sous forme de dictionnaires
+
+    Les lignes qui n'ont pas six colonnes sont ignorées ; leur numéro (à
+    partir de 1) est ajouté à ``malformed`` si la liste est fournie.
+    """
+    with open(path, newline="", encoding=SENTIMENT140_ENCODING) as f:
+        reader = csv.reader(f)
+        for row in reader:
+            if len(row) != len(SENTIMENT140_COLUMNS):
+                if malformed is not None:
+                    malformed.append(reader.line_num)
+                continue
+            yield dict(zip(SENTIMENT140_COLUMNS, row))
+
+
+def in_holdout(text: str, holdout_percent: int = HOLDOUT_PERCENT) -> bool:
+    """Indique si le texte appartient à la partie réservée à l'évaluation"""
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % 100 < holdout_percent
+
+
+def sample_sentiment140(
+    path: Union[str, pathlib.Path],
+    size: int,
+    seed: int = 0,
+    split: Optional[str] = None,
+    holdout_percent: int = HOLDOUT_PERCENT,
+) -> List[dict]:
+    """
+    Échantillon aléatoire reproductible de ``size`` lignes
+
+    Échantillonnage par réservoir : le fichier (1,6 M de lignes) est lu en
+    flux sans être chargé en mémoire. ``split`` restreint l'échantillon à
+    la partie ``train`` ou ``holdout`` du fichier (voir ``in_holdout``).
+    """
+    if split is not None and split not in SPLITS:
+        raise ValueError(f"Partie inconnue: {split} (attendu: {SPLITS})")
+    rows = iter_sentiment140(path)
+    if split is not None:
+        holdout = split == "holdout"
+        rows = (
+            row for row in rows if in_holdout(row["text"], holdout_percent) == holdout
+        )
+
+    rng = random.Random(seed)
+    sample: List[dict] = []
+    for index, row in enumerate(rows):
+        if index < size:
+            sample.append(row)
+        else:
+            slot = rng.randint(0, index)
+            if slot < size:
+                sample[slot] = row
+    return sample
+
+
+def iter_jsonl(
+    path: Union[str, pathlib.Path], malformed: Optional[List[int]] = None
+) -> Iterator[dict]:
+    """
+    Parcourt un fichier JSONL ; une chaîne JSON devient ``{"text": ...}``
+
+    Une ligne JSON invalide lève ``ValueError``, sauf si la liste
+    ``malformed`` est fournie : la ligne est alors ignorée et son numéro
+    ajouté à la liste.
+    """
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                value = json.loads(line)
+            except ValueError as e:
+                if malformed is None:
+                    raise ValueError(f"JSON invalide ligne {number}: {e}") from e
+                malformed.append(number)
+                continue
+            yield value if isinstance(value, dict) else {"text": value}
+
+
+def iter_parquet(
+    path: Union[str, pathlib.Path], batch_size: int = 10000
+) -> Iterator[dict]:
+    """Parcourt un fichier Parquet par lots de ``batch_size`` lignes"""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError(
+            "pyarrow est requis pour lire les fichiers Parquet (pip install pyarrow)"
+        ) from e
+
+    for batch in pq.ParquetFile(str(path)).iter_batches(batch_size=batch_size):
+        yield from batch.to_pylist()
+
+
+def detect_format(path: Union[str, pathlib.Path]) -> str:
+    """Format d'un fichier d'après son extension"""
+    suffix = pathlib.Path(path).suffix.lower().lstrip(".")
+    fmt = {"ndjson": "jsonl", "json": "jsonl", "pq": "parquet"}.get(suffix, suffix)
+    if fmt not in DATASET_FORMATS:
+        raise ValueError(f"Format de fichier non reconnu: {path}")
+    return fmt
+
+
+def iter_records(
+    path: Union[str, pathlib.Path],
+    fmt: Optional[str] = None,
+    malformed: Optional[List[int]] = None,
+) -> Iterator[dict]:
+    """
+    Parcourt un fichier CSV Sentiment140, JSONL ou Parquet
+
+    ``malformed`` reçoit les numéros des lignes CSV ou JSONL mal formées,
+    qui sont alors ignorées.
+    """
+    fmt = fmt or detect_format(path)
+    if fmt == "parquet":
+        return iter_parquet(path)
+    readers = {"csv": iter_sentiment140, "jsonl": iter_jsonl}
+    return readers[fmt](path, malformed)
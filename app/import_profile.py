@@ -0,0 +1,108 @@
+"""
+Profil du temps d'import d'un module (budget de la phase init Lambda)
+
+Usage :
+    python -m app.import_profile main_lambda --output import_profile.json
+    python -m app.import_profile main_lambda --budget-ms 1500
+
+Le module est importé dans un processus neuf avec ``python -X importtime`` ;
+le rapport liste les modules par temps cumulé. Avec ``--budget-ms``, le
+code de sortie est 1 si l'import total dépasse le budget.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from dataclasses import asdict, dataclass
+from typing import List
+
+_HEADER = "import time: self [us] | cumulative | imported package"
+
+
+@dataclass
+class ModuleTiming:
+    """Temps d'import d'un module en millisecondes"""
+
+    module: str
+    self_ms: float
+    cumulative_ms: float
+    depth: int
+
+
+def parse_importtime(output: str) -> List[ModuleTiming]:
+    """Analyse la sortie stderr de ``python -X importtime``"""
+    timings = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or line.strip() == _HEADER:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:") :].split("|")
+            self_value, cumulative_value = int(self_us), int(cumulative_us)
+        except ValueError:
+            continue
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        timings.append(
+            ModuleTiming(
+                module=name.strip(),
+                self_ms=self_value / 1000,
+                cumulative_ms=cumulative_value / 1000,
+                depth=max(depth, 0),
+            )
+        )
+    return timings
+
+
+def profile_import(module: str) -> List[ModuleTiming]:
+    """Importe ``module`` dans un processus neuf et retourne les temps"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Échec de l'import de {module}:\n{result.stderr}")
+    return parse_importtime(result.stderr)
+
+
+def build_report(module: str, timings: List[ModuleTiming], top: int = 30) -> dict:
+    """Construit le rapport : temps total et modules les plus coûteux"""
+    total_ms = sum(t.self_ms for t in timings)
+    by_cumulative = sorted(timings, key=lambda t: t.cumulative_ms, reverse=True)
+    by_self = sorted(timings, key=lambda t: t.self_ms, reverse=True)
+    return {
+        "module": module,
+        "total_ms": round(total_ms, 3),
+        "modules_imported": len(timings),
+        "top_cumulative": [asdict(t) for t in by_cumulative[:top]],
+        "top_self": [asdict(t) for t in by_self[:top]],
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Profil du temps d'import")
+    parser.add_argument("module", help="Module à importer (ex: main_lambda)")
+    parser.add_argument("--output", help="Fichier JSON du rapport")
+    parser.add_argument("--top", type=int, default=30)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    args = parser.parse_args(argv)
+
+    report = build_report(args.module, profile_import(args.module), args.top)
+
+    print(f"⏱️ Import de {args.module}: {report['total_ms']:.1f} ms")
+    for timing in report["top_cumulative"][:10]:
+        print(f"  {timing['cumulative_ms']:>10.1f} ms  {timing['module']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"📄 Rapport écrit dans {args.output}")
+
+    if args.budget_ms is not None and report["total_ms"] > args.budget_ms:
+        print(f"❌ Budget dépassé ({args.budget_ms:.0f} ms)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+"""
+Scoring en masse des événements SQS et S3 sur Lambda
+
+SQS : chaque message contient un texte (``{"text": "...", "id": ...}`` ou
+une chaîne JSON). Les textes du lot sont prédits par paquets de
+``EVENT_CHUNK_SIZE`` (un appel vectorisé du modèle par paquet) et les
+résultats écrits dans ``RESULT_SINK``. Un message invalide produit un
+enregistrement d'erreur ``{"line": n, "error": ...}`` : le présenter à
+nouveau ne changerait rien. Si un paquet échoue (modèle ou écriture), ses
+messages sont repris un par un : seuls ceux qui échouent encore sont
+renvoyés dans ``batchItemFailures`` (activer ``ReportBatchItemFailures``
+sur le déclencheur).
+
+S3 : chaque objet JSONL créé est lu en flux et scoré par paquets de
+``EVENT_CHUNK_SIZE`` lignes, écrits chacun dans un objet de résultats
+``s3/<bucket>/<clé>/part-00000``. Une ligne invalide produit un
+enregistrement d'erreur sans interrompre l'objet. Un objet situé sous la
+destination des résultats est ignoré : le scorer déclencherait un nouvel
+événement à chaque écriture.
+"""
+
+from typing import Callable, Iterator, List, Optional, Tuple
+from urllib.parse import unquote_plus
+
+from app.api.dependencies import get_sentiment_service
+from app.config import get_settings
+from app.lambda_runtime import log
+from app.services.sinks import ResultSink, sink_from_url
+from app.services.streaming import StreamItem, parse_line
+
+EVENT_SOURCES = {"aws:sqs": "sqs", "aws:s3": "s3"}
+
+OpenObject = Callable[[str, str], Iterator[bytes]]
+
+
+def event_source(event) -> Optional[str]:
+    """``sqs``, ``s3`` ou None pour un autre type d'événement"""
+    if not isinstance(event, dict):
+        return None
+    records = event.get("Records")
+    if not isinstance(records, list) or not records:
+        return None
+    return EVENT_SOURCES.get(records[0].get("eventSource"))
+
+
+def s3_object_lines(client=None) -> OpenObject:
+    """Lecteur de lignes d'objets S3 (boto3, import différé)"""
+
+    def open_object(bucket: str, key: str) -> Iterator[bytes]:
+        nonlocal client
+        if client is None:
+            import boto3
+
+            client = boto3.client("s3")
+        body = client.get_object(Bucket=bucket, Key=key)["Body"]
+        return body.iter_lines()
+
+    return open_object
+
+
+class BulkScorer:
+    """Scoring des lots SQS et des objets S3 vers un sink de résultats"""
+
+    def __init__(
+        self,
+        service,
+        sink: ResultSink,
+        open_object: Optional[OpenObject] = None,
+        chunk_size: int = 256,
+    ):
+        self.service = service
+        self.sink = sink
+        self.open_object = open_object or s3_object_lines()
+        self.chunk_size = chunk_size
+
+    def handle(self, event: dict) -> dict:
+        if event_source(event) == "sqs":
+            return self.handle_sqs(event)
+        return self.handle_s3(event)
+
+    def _predict(self, items: List[StreamItem]) -> List[dict]:
+        """Un appel vectorisé pour les textes valides du paquet"""
+        texts = [item.text for item in items if item.error is None]
+        predictions = iter(self.service.predict_batch(texts) if texts else [])
+        records = []
+        for item in items:
+            if item.error is not None:
+                records.append({"line": item.line, "error": item.error})
+                continue
+            label, confidence = next(predictions)
+            record = {"text": item.text, "sentiment": label, "confidence": confidence}
+            if item.id is not None:
+                record = {"id": item.id, **record}
+            records.append(record)
+        return records
+
+    def handle_sqs(self, event: dict) -> dict:
+        failures: List[str] = []
+        messages: List[Tuple[str, StreamItem]] = []
+        for number, record in enumerate(event["Records"], start=1):
+            item = parse_line((record.get("body") or "").encode("utf-8"), number)
+            if item is None:
+                item = StreamItem(line=number, error="Message vide")
+            messages.append((record["messageId"], item))
+
+        written = errors = 0
+
+        def score(chunk: List[Tuple[str, StreamItem]]):
+            nonlocal written, errors
+            records = self._predict([item for _, item in chunk])
+            for (message_id, _), result in zip(chunk, records):
+                result["message_id"] = message_id
+            self.sink.write(f"sqs/{chunk[0][0]}", records)
+            written += len(records)
+            errors += sum("error" in record for record in records)
+
+        for start in range(0, len(messages), self.chunk_size):
+            chunk = messages[start : start + self.chunk_size]
+            try:
+                score(chunk)
+                continue
+            except Exception as e:
+                log("sqs_chunk_failed", messages=len(chunk), error=str(e))
+            # Paquet en échec : chaque message est repris seul, pour ne
+            # renvoyer que ceux qui échouent encore
+            for message in chunk:
+                try:
+                    score([message])
+                except Exception as e:
+                    log("sqs_message_failed", message_id=message[0], error=str(e))
+                    failures.append(message[0])
+
+        log(
+            "sqs_batch",
+            messages=len(event["Records"]),
+            scored=written - errors,
+            errors=errors,
+            failures=len(failures),
+        )
+        return {"batchItemFailures": [{"itemIdentifier": m} for m in failures]}
+
+    def _score_object(self, bucket: str, key: str) -> dict:
+        summary = {"bucket": bucket, "key": key, "rows": 0, "errors": 0, "parts": 0}
+        items: List[StreamItem] = []
+
+        def flush():
+            records = self._predict(items)
+            self.sink.write(f"s3/{bucket}/{key}/part-{summary['parts']:05d}", records)
+            summary["parts"] += 1
+            summary["rows"] += len(records)
+            summary["errors"] += sum("error" in record for record in records)
+            items.clear()
+
+        for number, line in enumerate(self.open_object(bucket, key), start=1):
+            item = parse_line(line, number)
+            if item is None:
+                continue
+            items.append(item)
+            if len(items) >= self.chunk_size:
+                flush()
+        if items:
+            flush()
+        return summary
+
+    def handle_s3(self, event: dict) -> dict:
+        """
+        Score chaque objet de l'événement ; lève une exception si un objet
+        a échoué (nouvelle tentative de l'invocation asynchrone, les parts
+        déjà écrites sont réécrites à l'identique)
+        """
+        summaries, failed = [], []
+        for record in event["Records"]:
+            if not record.get("eventName", "").startswith("ObjectCreated"):
+                continue
+            bucket = record["s3"]["bucket"]["name"]
+            key = unquote_plus(record["s3"]["object"]["key"])
+            if self.sink.contains(bucket, key):
+                log("s3_object_skipped", bucket=bucket, key=key, reason="result_sink")
+                continue
+            try:
+                summary = self._score_object(bucket, key)
+            except Exception as e:
+                log("s3_object_failed", bucket=bucket, key=key, error=str(e))
+                failed.append(key)
+                continue
+            log("s3_object", **summary)
+            summaries.append(summary)
+
+        if failed:
+            raise RuntimeError(f"Échec du scoring de {len(failed)} objet(s): {failed}")
+        return {"objects": summaries}
+
+
+# Instance unique du conteneur Lambda
+_scorer: Optional[BulkScorer] = None
+
+
+def get_bulk_scorer() -> BulkScorer:
+    global _scorer
+    if _scorer is None:
+        settings = get_settings()
+        _scorer = BulkScorer(
+            get_sentiment_service(),
+            sink_from_url(settings.result_sink),
+            chunk_size=settings.event_chunk_size,
+        )
+    return _scorer
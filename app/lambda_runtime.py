@@ -0,0 +1,120 @@
+"""
+Cycle de vie Lambda : chargement du modèle en phase init, événements de
+préchauffage et logs structurés
+
+La phase init (import du handler) bénéficie d'un CPU boosté et n'est pas
+facturée : en mode ``MODEL_LOADING=eager``, le modèle, le tokenizer et le
+label encoder y sont chargés et les graphes tracés (``warmup``), au lieu de
+l'être pendant la première invocation.
+
+Les événements de préchauffage (règle EventBridge planifiée,
+serverless-plugin-warmup, ``{"warmer": true}``) reçoivent une réponse
+immédiate, sans passer par FastAPI ni exécuter d'inférence.
+
+Les mesures sont écrites sur stdout en JSON, une ligne par événement
+(``lambda_init``, ``first_invocation``, ``warmer``), exploitables par
+CloudWatch Logs Insights.
+"""
+
+import json
+import os
+import time
+from typing import Optional
+
+WARMER_SOURCES = ("aws.events", "serverless-plugin-warmup")
+WARMER_KEYS = ("warmer", "keep_alive")
+
+
+def log(event: str, **fields):
+    """Écrit une ligne de log JSON"""
+    print(json.dumps({"event": event, **fields}, default=str), flush=True)
+
+
+def is_lambda() -> bool:
+    """Exécution dans l'environnement Lambda"""
+    return "AWS_LAMBDA_FUNCTION_NAME" in os.environ
+
+
+def is_warmer_event(event) -> bool:
+    """Événement de préchauffage (planifié ou explicite)"""
+    if not isinstance(event, dict):
+        return False
+    if event.get("source") in WARMER_SOURCES:
+        return True
+    return any(event.get(key) is True for key in WARMER_KEYS)
+
+
+class LambdaRuntime:
+    """État du conteneur Lambda (démarrage à froid, première invocation)"""
+
+    def __init__(self, get_service):
+        self._get_service = get_service
+        self.init_duration_ms: Optional[float] = None
+        self.init_error: Optional[str] = None
+        self._first_invocation = True
+
+    def initialize(self, model_loading: str = "eager") -> dict:
+        """
+        Charge et préchauffe le modèle pendant la phase init
+
+        Un échec n'empêche pas le démarrage : le chargement est retenté à la
+        première prédiction.
+        """
+        if model_loading != "eager":
+            log("lambda_init", model_loading=model_loading, model_loaded=False)
+            return {}
+
+        service = self._get_service()
+        started_at = time.perf_counter()
+        try:
+            service.warmup()
+        except Exception as e:
+            self.init_error = str(e)
+        self.init_duration_ms = round((time.perf_counter() - started_at) * 1000, 1)
+
+        fields = {
+            "init_duration_ms": self.init_duration_ms,
+            "model_loaded": service.is_model_loaded(),
+            "warmup_ms": (
+                round(service.warmup_duration_s * 1000, 1)
+                if service.warmup_duration_s is not None
+                else None
+            ),
+        }
+        for key, value in service.load_timings.items():
+            # Durées en secondes (``model_s``) converties en millisecondes
+            if key.endswith("_s") and isinstance(value, float):
+                fields[f"{key[:-2]}_ms"] = round(value * 1000, 1)
+            else:
+                fields[key] = value
+        if self.init_error:
+            fields["error"] = self.init_error
+        log("lambda_init", **fields)
+        return fields
+
+    def warm(self) -> dict:
+        """Réponse à un événement de préchauffage, sans inférence"""
+        service = self._get_service()
+        fields = {}
+        if not service.is_model_loaded():
+            # Conteneur dont le chargement a échoué en phase init
+            try:
+                service.load()
+            except Exception as e:
+                fields["error"] = str(e)
+        log("warmer", model_loaded=service.is_model_loaded(), **fields)
+        return {"statusCode": 200, "body": json.dumps({"warm": True})}
+
+    def record_invocation(self, started_at: float, route: Optional[str]):
+        """Journalise la latence de la première invocation du conteneur"""
+        if not self._first_invocation:
+            return
+        self._first_invocation = False
+        log(
+            "first_invocation",
+            latency_ms=round((time.perf_counter() - started_at) * 1000, 1),
+            route=route,
+            init_duration_ms=self.init_duration_ms,
+            model_loaded_at_init=self.init_duration_ms is not None
+            and self.init_error is None,
+        )
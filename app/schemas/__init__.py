@@ -1,3 +1,15 @@
-from .sentiment import SentimentRequest, SentimentResponse
+from .sentiment import (
+    BatchSentimentRequest,
+    BatchSentimentResponse,
+    ProfilingRequest,
+    SentimentRequest,
+    SentimentResponse,
+)
 
-__all__ = ["SentimentRequest", "SentimentResponse"]
+__all__ = [
+    "SentimentRequest",
+    "SentimentResponse",
+    "BatchSentimentRequest",
+    "BatchSentimentResponse",
+    "ProfilingRequest",
+]
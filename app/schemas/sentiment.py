@@ -1,4 +1,9 @@
-from pydantic import BaseModel
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+# Nombre maximal de textes acceptés par une requête batch
+MAX_BATCH_SIZE = 256
 
 
 class SentimentRequest(BaseModel):
@@ -13,3 +18,23 @@ class SentimentResponse(BaseModel):
     text: str
     sentiment: str  # "0" pour négatif, "4" pour positif
     confidence: float
+
+
+class BatchSentimentRequest(BaseModel):
+    """Schéma pour la requête de prédiction de sentiment par lot"""
+
+    texts: List[str] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class BatchSentimentResponse(BaseModel):
+    """Schéma pour la réponse de prédiction de sentiment par lot"""
+
+    results: List[SentimentResponse]
+
+
+class ProfilingRequest(BaseModel):
+    """Schéma pour le démarrage d'une session de profilage"""
+
+    mode: Literal["cprofile", "tensorflow"] = "cprofile"
+    predictions: Optional[int] = Field(None, ge=1, le=10000)
+    duration_s: Optional[float] = Field(None, gt=0, le=600)
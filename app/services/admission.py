@@ -0,0 +1,244 @@
+"""
+Contrôle d'admission du chemin de prédiction : file bornée et échéances
+
+Chaque requête dispose d'une échéance (en-tête ``X-Request-Timeout-Ms`` ou
+``REQUEST_DEADLINE_MS``). Quand tous les emplacements d'exécution sont
+occupés, la requête attend dans une file bornée ; elle est refusée
+immédiatement si la file est pleine (429) ou si le temps de service estimé
+(moyenne mobile exponentielle des exécutions récentes) ne permet pas de
+tenir son échéance (503). Une requête dont l'échéance expire dans la file,
+ou dont le client se déconnecte, est retirée sans être exécutée.
+
+Le travail déjà commencé n'est pas interrompu : l'échéance borne l'attente,
+pas l'inférence.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class AdmissionError(RuntimeError):
+    """Requête refusée par le contrôle d'admission"""
+
+    status_code = 503
+    reason = ""
+
+    def __init__(self, message: str, retry_after_s: float):
+        super().__init__(message)
+        self.retry_after_s = retry_after_s
+
+
+class QueueFullError(AdmissionError):
+    """File d'attente pleine"""
+
+    status_code = 429
+    reason = "queue_full"
+
+
+class DeadlineExceededError(AdmissionError):
+    """Échéance impossible à tenir (estimée ou expirée dans la file)"""
+
+    reason = "deadline"
+
+
+class ClientDisconnectedError(AdmissionError):
+    """Client déconnecté avant la réponse : le travail en attente est abandonné"""
+
+    status_code = 499
+    reason = "disconnected"
+
+
+class AdmissionController:
+    """
+    Borne le nombre de requêtes en cours (``max_concurrency``) et en attente
+    (``max_queue``) devant le service de sentiment
+
+    Les emplacements sont attribués dans l'ordre d'arrivée. L'état est lié
+    à la boucle asyncio qui l'utilise, comme pour ``MicroBatcher``.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_queue: int = 256,
+        default_deadline_s: float = 10.0,
+        ewma_alpha: float = 0.2,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency doit être supérieur ou égal à 1")
+        if max_queue < 0:
+            raise ValueError("max_queue doit être positif ou nul")
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.default_deadline_s = default_deadline_s
+        self.ewma_alpha = ewma_alpha
+        self._clock = clock
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._running = 0
+        self.service_time_s: Optional[float] = None
+        self.admitted_total = 0
+        self.completed_total = 0
+        self.rejected_queue_full = 0
+        self.rejected_deadline = 0
+        self.expired_in_queue = 0
+        self.cancelled_in_queue = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Nombre de requêtes en attente d'un emplacement"""
+        return len(self._waiters)
+
+    def estimated_wait_s(self) -> Optional[float]:
+        """
+        Temps estimé avant la réponse d'une nouvelle requête (None tant
+        qu'aucune exécution n'a été mesurée ou si un emplacement est libre)
+        """
+        if self.service_time_s is None or self._running < self.max_concurrency:
+            return None
+        rounds = self.queue_depth // self.max_concurrency + 1
+        return self.service_time_s * (rounds + 1)
+
+    async def run(
+        self, call: Callable[[], Awaitable[T]], deadline_s: Optional[float] = None
+    ) -> T:
+        """
+        Exécute ``call()`` dès qu'un emplacement est libre
+
+        Raises:
+            QueueFullError: la file d'attente est pleine
+            DeadlineExceededError: l'échéance ne peut pas être tenue ou a
+                expiré dans la file
+        """
+        deadline_s = self.default_deadline_s if deadline_s is None else deadline_s
+        await self._acquire(deadline_s)
+        self.admitted_total += 1
+        started_at = self._clock()
+        cancelled = False
+        try:
+            return await call()
+        except asyncio.CancelledError:
+            # Une exécution interrompue ne mesure pas le temps de service
+            cancelled = True
+            raise
+        finally:
+            if not cancelled:
+                self._record(self._clock() - started_at)
+            self._release()
+
+    def check(self, deadline_s: Optional[float] = None):
+        """
+        Lève l'erreur qu'une nouvelle requête recevrait maintenant, sans
+        l'ajouter à la file (refus d'un flux avant sa première réponse)
+
+        Raises:
+            QueueFullError, DeadlineExceededError: comme ``run``
+        """
+        self._bind(asyncio.get_running_loop())
+        deadline_s = self.default_deadline_s if deadline_s is None else deadline_s
+        if self._running < self.max_concurrency and not self._waiters:
+            return
+        self._check_capacity(deadline_s)
+
+    async def _acquire(self, deadline_s: float):
+        self._bind(asyncio.get_running_loop())
+        if self._running < self.max_concurrency and not self._waiters:
+            self._running += 1
+            return
+
+        self._check_capacity(deadline_s)
+        waiter = self._loop.create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait((waiter,), timeout=deadline_s)
+        except asyncio.CancelledError:
+            # Client déconnecté : la requête quitte la file sans être exécutée
+            if self._abandon(waiter):
+                self.cancelled_in_queue += 1
+            else:
+                self._release()
+            raise
+        if self._abandon(waiter):
+            self.expired_in_queue += 1
+            raise DeadlineExceededError(
+                f"Échéance de {deadline_s * 1000:.0f}ms expirée dans la file",
+                self._retry_after_s(),
+            )
+
+    def _check_capacity(self, deadline_s: float):
+        """Refus d'une requête qui devrait attendre (file pleine, échéance)"""
+        if len(self._waiters) >= self.max_queue:
+            self.rejected_queue_full += 1
+            raise QueueFullError(
+                f"File d'attente pleine ({self.max_queue} requêtes)",
+                self._retry_after_s(),
+            )
+        estimate = self.estimated_wait_s()
+        if estimate is not None and estimate > deadline_s:
+            self.rejected_deadline += 1
+            raise DeadlineExceededError(
+                f"Échéance de {deadline_s * 1000:.0f}ms impossible à tenir "
+                f"(attente estimée {estimate * 1000:.0f}ms)",
+                self._retry_after_s(),
+            )
+
+    def _abandon(self, waiter: asyncio.Future) -> bool:
+        """Retire une attente de la file ; False si l'emplacement était cédé"""
+        if waiter.done():
+            return False
+        waiter.cancel()
+        self._waiters.remove(waiter)
+        return True
+
+    def _release(self):
+        # L'emplacement est cédé à la première requête en attente
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        # Une requête de la boucle précédente peut terminer après ``_bind``
+        self._running = max(self._running - 1, 0)
+
+    def _record(self, duration_s: float):
+        self.completed_total += 1
+        if self.service_time_s is None:
+            self.service_time_s = duration_s
+        else:
+            self.service_time_s += self.ewma_alpha * (duration_s - self.service_time_s)
+
+    def _retry_after_s(self) -> float:
+        return max(self.estimated_wait_s() or self.service_time_s or 1.0, 1.0)
+
+    def _bind(self, loop: asyncio.AbstractEventLoop):
+        # Les futures d'attente sont liées à la boucle qui les a créées
+        if self._loop is not loop:
+            self._loop = loop
+            self._waiters = deque()
+            self._running = 0
+
+    def snapshot(self) -> dict:
+        """Retourne l'état courant du contrôle d'admission"""
+        estimate = self.estimated_wait_s()
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "default_deadline_ms": self.default_deadline_s * 1000,
+            "running": self._running,
+            "queue_depth": self.queue_depth,
+            "service_time_ms": (
+                self.service_time_s * 1000 if self.service_time_s is not None else None
+            ),
+            "estimated_wait_ms": estimate * 1000 if estimate is not None else None,
+            "admitted_total": self.admitted_total,
+            "completed_total": self.completed_total,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_deadline": self.rejected_deadline,
+            "expired_in_queue": self.expired_in_queue,
+            "cancelled_in_queue": self.cancelled_in_queue,
+        }
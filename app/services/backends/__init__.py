@@ -0,0 +1,56 @@
+"""
+Moteurs d'inférence interchangeables : TensorFlow, TFLite et ONNX Runtime
+"""
+
+import pathlib
+from typing import Iterable, Type
+
+from .base import PRECISIONS, InferenceBackend
+from .onnx_backend import OnnxBackend
+from .tensorflow_backend import TensorFlowBackend
+from .tflite_backend import TFLiteBackend
+
+BACKENDS = {
+    TensorFlowBackend.name: TensorFlowBackend,
+    TFLiteBackend.name: TFLiteBackend,
+    OnnxBackend.name: OnnxBackend,
+}
+
+
+def get_backend_class(name: str) -> Type[InferenceBackend]:
+    try:
+        return BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Moteur d'inférence inconnu: {name}") from None
+
+
+def load_backend(
+    name: str,
+    model_dir: pathlib.Path,
+    sequence_lengths: Iterable[int] = (),
+    compiled: bool = True,
+    jit_compile: bool = False,
+    num_threads: int = 0,
+    precision: str = "fp32",
+) -> InferenceBackend:
+    """Charge le moteur ``name`` depuis l'artefact associé à ``model_dir``"""
+    return get_backend_class(name).load(
+        model_dir,
+        sequence_lengths=sequence_lengths,
+        compiled=compiled,
+        jit_compile=jit_compile,
+        num_threads=num_threads,
+        precision=precision,
+    )
+
+
+__all__ = [
+    "BACKENDS",
+    "InferenceBackend",
+    "PRECISIONS",
+    "OnnxBackend",
+    "TensorFlowBackend",
+    "TFLiteBackend",
+    "get_backend_class",
+    "load_backend",
+]
@@ -0,0 +1,87 @@
+"""
+Interface commune des moteurs d'inférence
+"""
+
+import pathlib
+from abc import ABC, abstractmethod
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+
+PRECISIONS = ("fp32", "int8")
+
+
+def input_names(names: Iterable[str]) -> Tuple[str, str]:
+    """Identifie (ids, mask) parmi les noms d'entrées d'un modèle exporté"""
+    names = list(names)
+    if len(names) != 2:
+        raise ValueError(f"Deux entrées attendues (ids, mask): {names}")
+    mask_name = next((name for name in names if "mask" in name), None)
+    if mask_name is None:
+        raise ValueError(f"Entrée de masque introuvable: {names}")
+    ids_name = next(name for name in names if name != mask_name)
+    return ids_name, mask_name
+
+
+class InferenceBackend(ABC):
+    """
+    Moteur d'inférence du classifieur DistilBERT
+
+    Reçoit les ``input_ids`` et ``attention_mask`` (tableaux numpy int32 de
+    forme ``[lot, longueur]``) et retourne la probabilité positive de chaque
+    ligne.
+    """
+
+    name: str = ""
+    # Suffixe de l'artefact à côté du dossier SavedModel ("" = le dossier)
+    file_suffix: str = ""
+    supported_precisions: Tuple[str, ...] = ("fp32",)
+
+    def __init__(self):
+        self.model = None
+        self.precision = "fp32"
+        # Longueur de séquence imposée par le graphe exporté (None = libre)
+        self.fixed_length: Optional[int] = None
+
+    @classmethod
+    def check_precision(cls, precision: str):
+        if precision not in cls.supported_precisions:
+            raise ValueError(
+                f"Précision {precision} non supportée par le moteur {cls.name} "
+                f"(supportées: {', '.join(cls.supported_precisions)})"
+            )
+
+    @classmethod
+    def artifact_path(
+        cls, model_dir: pathlib.Path, precision: str = "fp32"
+    ) -> pathlib.Path:
+        """
+        Chemin de l'artefact du moteur pour le dossier SavedModel donné
+        (``distilbert_HF_100000k.onnx``, ``distilbert_HF_100000k.int8.onnx``)
+        """
+        cls.check_precision(precision)
+        model_dir = pathlib.Path(model_dir)
+        if not cls.file_suffix:
+            return model_dir
+        qualifier = "" if precision == "fp32" else f".{precision}"
+        return model_dir.with_name(model_dir.name + qualifier + cls.file_suffix)
+
+    @classmethod
+    @abstractmethod
+    def load(cls, model_dir: pathlib.Path, **kwargs) -> "InferenceBackend":
+        """Charge le moteur depuis l'artefact associé à ``model_dir``"""
+
+    @abstractmethod
+    def predict(self, input_ids, attention_mask) -> np.ndarray:
+        """Retourne la probabilité positive de chaque ligne"""
+
+    def warmup(self) -> float:
+        """Prépare le moteur (traçage, allocation) ; retourne la durée"""
+        return 0.0
+
+    def snapshot(self) -> dict:
+        return {
+            "name": self.name,
+            "precision": self.precision,
+            "fixed_length": self.fixed_length,
+        }
@@ -0,0 +1,188 @@
+"""
+Export du SavedModel vers TFLite / ONNX avec contrôle de parité numérique
+
+Usage :
+    python -m app.services.backends.export                  # tflite + onnx
+    python -m app.services.backends.export --formats onnx --atol 1e-4
+
+Les artefacts sont écrits à côté du SavedModel
+(``distilbert_HF_100000k.tflite``, ``distilbert_HF_100000k.onnx``). Chaque
+export est rechargé par son moteur et comparé au SavedModel ; le code de
+sortie est 1 si l'écart dépasse la tolérance.
+"""
+
+import argparse
+import json
+import pathlib
+import subprocess
+import sys
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.services.backends import get_backend_class
+from app.services.backends.base import InferenceBackend
+from app.services.backends.tensorflow_backend import TensorFlowBackend
+from app.services.engine import SERVING_SIGNATURE
+from app.services.tokenizer import DEFAULT_MODEL_PATH, TOKENIZER_FILENAME
+
+DEFAULT_MODEL_DIR = DEFAULT_MODEL_PATH / "distilbert_HF_100000k"
+EXPORT_FORMATS = ("tflite", "onnx")
+ONNX_OPSET = 17
+
+PARITY_TEXTS = (
+    "I love this movie!",
+    "This was the worst day ever, everything went wrong",
+    "meh",
+    "Just got back from the beach, sun was great but the traffic was awful",
+    "@friend thanks so much for the birthday wishes :)",
+    "I can't believe they cancelled the show, so disappointed",
+    "not bad at all",
+    "Work work work... I need a vacation",
+)
+
+
+def export_tflite(model_dir: pathlib.Path, output: pathlib.Path) -> pathlib.Path:
+    """Convertit la signature de service du SavedModel en ``.tflite``"""
+    import tensorflow as tf
+
+    converter = tf.lite.TFLiteConverter.from_saved_model(
+        str(model_dir), signature_keys=[SERVING_SIGNATURE]
+    )
+    # Opérations TF (flex) uniquement si une opération n'a pas d'équivalent
+    # natif ; elles nécessitent tf.lite plutôt que tflite_runtime
+    converter.target_spec.supported_ops = [
+        tf.lite.OpsSet.TFLITE_BUILTINS,
+        tf.lite.OpsSet.SELECT_TF_OPS,
+    ]
+    output.write_bytes(converter.convert())
+    return output
+
+
+def export_onnx(
+    model_dir: pathlib.Path, output: pathlib.Path, opset: int = ONNX_OPSET
+) -> pathlib.Path:
+    """Convertit le SavedModel en ``.onnx`` avec ``tf2onnx``"""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "tf2onnx.convert",
+            "--saved-model",
+            str(model_dir),
+            "--signature_def",
+            SERVING_SIGNATURE,
+            "--opset",
+            str(opset),
+            "--output",
+            str(output),
+        ],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Échec de la conversion ONNX:\n{result.stderr}")
+    return output
+
+
+EXPORTERS = {"tflite": export_tflite, "onnx": export_onnx}
+
+
+def sample_inputs(
+    length: int,
+    tokenizer_file: Optional[pathlib.Path] = None,
+    texts: Sequence[str] = PARITY_TEXTS,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Entrées de contrôle : textes tokenisés si ``tokenizer.json`` existe,
+    sinon identifiants aléatoires déterministes
+    """
+    if tokenizer_file is not None and pathlib.Path(tokenizer_file).exists():
+        from app.services.tokenizer import FastTokenizer
+
+        tokenizer = FastTokenizer.from_file(tokenizer_file, max_length=length)
+        encoded = tokenizer(list(texts), padding="max_length", return_tensors="np")
+        return encoded["input_ids"], encoded["attention_mask"]
+
+    rng = np.random.default_rng(0)
+    input_ids = np.zeros((len(texts), length), dtype=np.int32)
+    attention_mask = np.zeros((len(texts), length), dtype=np.int32)
+    for row in range(len(texts)):
+        size = int(rng.integers(4, length + 1))
+        input_ids[row, :size] = rng.integers(1000, 2000, size)
+        attention_mask[row, :size] = 1
+    return input_ids, attention_mask
+
+
+def check_parity(
+    reference: InferenceBackend,
+    candidate: InferenceBackend,
+    input_ids: np.ndarray,
+    attention_mask: np.ndarray,
+    atol: float,
+) -> dict:
+    """Compare les probabilités et les labels de deux moteurs"""
+    expected = reference.predict(input_ids, attention_mask)
+    actual = candidate.predict(input_ids, attention_mask)
+    max_abs_diff = float(np.max(np.abs(expected - actual)))
+    agreement = float(np.mean((expected >= 0.5) == (actual >= 0.5)))
+    return {
+        "samples": int(len(expected)),
+        "max_abs_diff": max_abs_diff,
+        "label_agreement": agreement,
+        "atol": atol,
+        "passed": max_abs_diff <= atol,
+    }
+
+
+def export_and_check(
+    model_dir: pathlib.Path = DEFAULT_MODEL_DIR,
+    formats: Sequence[str] = EXPORT_FORMATS,
+    atol: float = 1e-4,
+    tokenizer_file: Optional[pathlib.Path] = None,
+) -> dict:
+    """Exporte chaque format puis vérifie sa parité avec le SavedModel"""
+    model_dir = pathlib.Path(model_dir)
+    reference = TensorFlowBackend.load(model_dir, compiled=False)
+    tokenizer_file = tokenizer_file or model_dir.parent / TOKENIZER_FILENAME
+
+    report = {}
+    for fmt in formats:
+        backend_class = get_backend_class(fmt)
+        output = EXPORTERS[fmt](model_dir, backend_class.artifact_path(model_dir))
+        candidate = backend_class.load(model_dir)
+        length = candidate.fixed_length or 128
+        input_ids, attention_mask = sample_inputs(length, tokenizer_file)
+        report[fmt] = {
+            "path": str(output),
+            "size_mb": round(output.stat().st_size / 1e6, 2),
+            **check_parity(reference, candidate, input_ids, attention_mask, atol),
+        }
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Export TFLite / ONNX")
+    parser.add_argument("--model-dir", type=pathlib.Path, default=DEFAULT_MODEL_DIR)
+    parser.add_argument(
+        "--formats", nargs="+", choices=EXPORT_FORMATS, default=list(EXPORT_FORMATS)
+    )
+    parser.add_argument("--atol", type=float, default=1e-4)
+    parser.add_argument("--tokenizer-file", type=pathlib.Path, default=None)
+    args = parser.parse_args(argv)
+
+    report = export_and_check(
+        args.model_dir, args.formats, args.atol, args.tokenizer_file
+    )
+    print(json.dumps(report, indent=2))
+
+    failed = [fmt for fmt, result in report.items() if not result["passed"]]
+    if failed:
+        print(f"❌ Parité non respectée: {', '.join(failed)}")
+        return 1
+    print("✅ Parité numérique vérifiée")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
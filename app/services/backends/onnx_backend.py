@@ -0,0 +1,69 @@
+"""
+Moteur ONNX Runtime (CPU)
+"""
+
+import numpy as np
+
+from app.services.backends.base import InferenceBackend, input_names
+from app.services.engine import OUTPUT_KEY
+from app.services.metrics import stage_timer
+
+_ONNX_DTYPES = {"tensor(int32)": np.int32, "tensor(int64)": np.int64}
+
+
+class OnnxBackend(InferenceBackend):
+    """
+    Modèle ``.onnx`` exécuté par ONNX Runtime (``CPUExecutionProvider``)
+
+    ``InferenceSession.run`` est thread-safe : aucun verrou n'est pris.
+    """
+
+    name = "onnx"
+    supported_precisions = ("fp32", "int8")
+    file_suffix = ".onnx"
+
+    def __init__(self, model_file, num_threads: int = 0, precision: str = "fp32"):
+        super().__init__()
+        self.precision = precision
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.model = ort.InferenceSession(
+            str(model_file), options, providers=["CPUExecutionProvider"]
+        )
+
+        inputs = {node.name: node for node in self.model.get_inputs()}
+        self._ids_name, self._mask_name = input_names(inputs)
+        self._dtypes = {
+            name: _ONNX_DTYPES.get(node.type, np.int32) for name, node in inputs.items()
+        }
+        outputs = [node.name for node in self.model.get_outputs()]
+        self._output_name = next(
+            (name for name in outputs if name.split(":")[0] == OUTPUT_KEY), outputs[0]
+        )
+
+        length = inputs[self._ids_name].shape[-1]
+        self.fixed_length = length if isinstance(length, int) else None
+
+    @classmethod
+    def load(
+        cls, model_dir, num_threads: int = 0, precision: str = "fp32", **kwargs
+    ) -> "OnnxBackend":
+        return cls(
+            cls.artifact_path(model_dir, precision),
+            num_threads=num_threads,
+            precision=precision,
+        )
+
+    def predict(self, input_ids, attention_mask) -> np.ndarray:
+        feeds = {
+            self._ids_name: np.asarray(input_ids, self._dtypes[self._ids_name]),
+            self._mask_name: np.asarray(attention_mask, self._dtypes[self._mask_name]),
+        }
+        with stage_timer("model"):
+            (proba,) = self.model.run([self._output_name], feeds)
+        with stage_timer("transfer"):
+            return np.asarray(proba, dtype=np.float32)[:, 0]
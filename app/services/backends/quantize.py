@@ -0,0 +1,304 @@
+"""
+Quantification INT8 (dynamic range) du classifieur et rapport de comparaison
+
+Usage :
+    python -m app.services.backends.quantize run --data training.1600000.csv
+    python -m app.services.backends.quantize run --formats onnx --samples 2000
+
+Les poids sont quantifiés en INT8, les activations restent en flottant
+(TFLite ``Optimize.DEFAULT``, ONNX Runtime ``quantize_dynamic``). Les
+artefacts ``distilbert_HF_100000k.int8.tflite`` / ``.int8.onnx`` sont servis
+avec ``MODEL_PRECISION=int8``.
+
+Le rapport compare chaque variante INT8 au SavedModel FP32 sur un
+échantillon au format Sentiment140 : latence (lot unitaire et lot de
+``--batch-size``), RSS maximal, accord des labels et précision. Chaque
+variante est mesurée dans un processus neuf.
+"""
+
+import argparse
+import json
+import pathlib
+import resource
+import subprocess
+import sys
+import time
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from app.datasets import sample_sentiment140
+from app.services.backends import get_backend_class, load_backend
+from app.services.backends.export import DEFAULT_MODEL_DIR, export_onnx
+from app.services.engine import SERVING_SIGNATURE
+from app.services.tokenizer import TOKENIZER_FILENAME
+
+QUANTIZED_FORMATS = ("tflite", "onnx")
+REFERENCE = ("tensorflow", "fp32")
+MAX_LENGTH = 128
+
+
+def quantize_tflite(model_dir: pathlib.Path, output: pathlib.Path) -> pathlib.Path:
+    """Conversion TFLite avec quantification des poids en INT8"""
+    import tensorflow as tf
+
+    converter = tf.lite.TFLiteConverter.from_saved_model(
+        str(model_dir), signature_keys=[SERVING_SIGNATURE]
+    )
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.target_spec.supported_ops = [
+        tf.lite.OpsSet.TFLITE_BUILTINS,
+        tf.lite.OpsSet.SELECT_TF_OPS,
+    ]
+    output.write_bytes(converter.convert())
+    return output
+
+
+def quantize_onnx(model_dir: pathlib.Path, output: pathlib.Path) -> pathlib.Path:
+    """Quantification dynamique du modèle ONNX (exporté si nécessaire)"""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    fp32_model = get_backend_class("onnx").artifact_path(model_dir)
+    if not fp32_model.exists():
+        export_onnx(model_dir, fp32_model)
+    quantize_dynamic(str(fp32_model), str(output), weight_type=QuantType.QInt8)
+    return output
+
+
+QUANTIZERS = {"tflite": quantize_tflite, "onnx": quantize_onnx}
+
+
+def quantize(
+    model_dir: pathlib.Path = DEFAULT_MODEL_DIR,
+    formats: Sequence[str] = QUANTIZED_FORMATS,
+) -> dict:
+    """Produit les artefacts INT8 ; retourne leur chemin par format"""
+    model_dir = pathlib.Path(model_dir)
+    outputs = {}
+    for fmt in formats:
+        output = get_backend_class(fmt).artifact_path(model_dir, "int8")
+        outputs[fmt] = QUANTIZERS[fmt](model_dir, output)
+        print(f"✅ {fmt} INT8: {output} ({output.stat().st_size / 1e6:.1f} Mo)")
+    return outputs
+
+
+def _load_tokenizer(tokenizer_file: pathlib.Path, max_length: int):
+    if tokenizer_file.exists():
+        from app.services.tokenizer import FastTokenizer
+
+        return FastTokenizer.from_file(tokenizer_file, max_length=max_length)
+
+    from transformers import AutoTokenizer
+
+    return AutoTokenizer.from_pretrained(
+        "distilbert-base-uncased", cache_dir="/tmp/transformers_cache"
+    )
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss est exprimé en kilo-octets sous Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _percentiles_ms(durations: List[float]) -> dict:
+    values = np.asarray(durations) * 1000
+    return {
+        "p50_ms": round(float(np.percentile(values, 50)), 3),
+        "p95_ms": round(float(np.percentile(values, 95)), 3),
+        "mean_ms": round(float(values.mean()), 3),
+    }
+
+
+def measure(
+    backend: str,
+    precision: str,
+    model_dir: pathlib.Path,
+    texts: List[str],
+    batch_size: int = 32,
+    tokenizer_file: Optional[pathlib.Path] = None,
+    single_runs: int = 50,
+) -> dict:
+    """
+    Charge une variante et mesure chargement, latences, RSS et probabilités
+
+    À exécuter dans un processus dédié pour que le RSS soit significatif.
+    """
+    rss_before_mb = _peak_rss_mb()
+    started_at = time.perf_counter()
+    engine = load_backend(
+        backend, model_dir, sequence_lengths=(MAX_LENGTH,), precision=precision
+    )
+    load_s = time.perf_counter() - started_at
+
+    length = engine.fixed_length or MAX_LENGTH
+    tokenizer_file = tokenizer_file or model_dir.parent / TOKENIZER_FILENAME
+    tokenizer = _load_tokenizer(pathlib.Path(tokenizer_file), length)
+    encoded = tokenizer(texts, truncation=True, padding="max_length", max_length=length)
+    input_ids = np.asarray(encoded["input_ids"], dtype=np.int32)
+    attention_mask = np.asarray(encoded["attention_mask"], dtype=np.int32)
+
+    # Warm-up hors mesure (traçage, allocation des tenseurs)
+    engine.predict(input_ids[:batch_size], attention_mask[:batch_size])
+    engine.predict(input_ids[:1], attention_mask[:1])
+
+    single = []
+    for row in range(min(single_runs, len(texts))):
+        started_at = time.perf_counter()
+        engine.predict(input_ids[row : row + 1], attention_mask[row : row + 1])
+        single.append(time.perf_counter() - started_at)
+
+    batched, probas = [], []
+    for start in range(0, len(texts), batch_size):
+        stop = start + batch_size
+        started_at = time.perf_counter()
+        probas.append(engine.predict(input_ids[start:stop], attention_mask[start:stop]))
+        batched.append(time.perf_counter() - started_at)
+
+    return {
+        "backend": backend,
+        "precision": precision,
+        "load_s": round(load_s, 3),
+        "single": _percentiles_ms(single),
+        "batch": {"size": batch_size, **_percentiles_ms(batched)},
+        "throughput_per_s": round(len(texts) / sum(batched), 1),
+        "rss_before_load_mb": round(rss_before_mb, 1),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "probabilities": np.concatenate(probas).astype(float).tolist(),
+    }
+
+
+def _measure_in_subprocess(
+    backend: str, precision: str, args: argparse.Namespace
+) -> dict:
+    command = [
+        sys.executable,
+        "-m",
+        "app.services.backends.quantize",
+        "measure",
+        "--backend",
+        backend,
+        "--precision",
+        precision,
+        "--model-dir",
+        str(args.model_dir),
+        "--data",
+        str(args.data),
+        "--samples",
+        str(args.samples),
+        "--batch-size",
+        str(args.batch_size),
+        "--seed",
+        str(args.seed),
+    ]
+    if args.tokenizer_file:
+        command += ["--tokenizer-file", str(args.tokenizer_file)]
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(
+            f"Échec de la mesure {backend}/{precision}:\n{result.stderr}"
+        )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def compare(reference: dict, variant: dict, labels: List[str]) -> dict:
+    """Accord et écart d'une variante avec la référence FP32"""
+    expected = np.asarray(reference["probabilities"])
+    actual = np.asarray(variant["probabilities"])
+    truth = np.asarray([label == "4" for label in labels])
+    return {
+        "label_agreement": round(
+            float(np.mean((expected >= 0.5) == (actual >= 0.5))), 4
+        ),
+        "max_abs_diff": round(float(np.max(np.abs(expected - actual))), 6),
+        "accuracy": round(float(np.mean((actual >= 0.5) == truth)), 4),
+        "reference_accuracy": round(float(np.mean((expected >= 0.5) == truth)), 4),
+        "single_speedup": round(
+            reference["single"]["p50_ms"] / variant["single"]["p50_ms"], 2
+        ),
+        "batch_speedup": round(
+            reference["batch"]["p50_ms"] / variant["batch"]["p50_ms"], 2
+        ),
+        "peak_rss_ratio": round(variant["peak_rss_mb"] / reference["peak_rss_mb"], 2),
+    }
+
+
+def build_report(args: argparse.Namespace) -> dict:
+    rows = sample_sentiment140(args.data, args.samples, args.seed)
+    labels = [row["target"] for row in rows]
+
+    reference = _measure_in_subprocess(*REFERENCE, args)
+    report = {
+        "samples": len(rows),
+        "data": str(args.data),
+        "reference": {k: v for k, v in reference.items() if k != "probabilities"},
+        "variants": {},
+    }
+    for fmt in args.formats:
+        variant = _measure_in_subprocess(fmt, "int8", args)
+        report["variants"][f"{fmt}-int8"] = {
+            **{k: v for k, v in variant.items() if k != "probabilities"},
+            **compare(reference, variant, labels),
+        }
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Quantification INT8")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add_common(subparser):
+        subparser.add_argument(
+            "--model-dir", type=pathlib.Path, default=DEFAULT_MODEL_DIR
+        )
+        subparser.add_argument("--data", type=pathlib.Path, required=True)
+        subparser.add_argument("--samples", type=int, default=1000)
+        subparser.add_argument("--batch-size", type=int, default=32)
+        subparser.add_argument("--seed", type=int, default=0)
+        subparser.add_argument("--tokenizer-file", type=pathlib.Path, default=None)
+
+    run_parser = subparsers.add_parser("run", help="Quantifier puis comparer")
+    add_common(run_parser)
+    run_parser.add_argument(
+        "--formats",
+        nargs="+",
+        choices=QUANTIZED_FORMATS,
+        default=list(QUANTIZED_FORMATS),
+    )
+    run_parser.add_argument("--output", type=pathlib.Path, default=None)
+    run_parser.add_argument(
+        "--skip-quantize", action="store_true", help="Réutiliser les artefacts INT8"
+    )
+
+    measure_parser = subparsers.add_parser("measure", help=argparse.SUPPRESS)
+    add_common(measure_parser)
+    measure_parser.add_argument("--backend", required=True)
+    measure_parser.add_argument("--precision", default="fp32")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "measure":
+        rows = sample_sentiment140(args.data, args.samples, args.seed)
+        result = measure(
+            args.backend,
+            args.precision,
+            args.model_dir,
+            [row["text"] for row in rows],
+            batch_size=args.batch_size,
+            tokenizer_file=args.tokenizer_file,
+        )
+        print(json.dumps(result))
+        return 0
+
+    if not args.skip_quantize:
+        quantize(args.model_dir, args.formats)
+    report = build_report(args)
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"📄 Rapport écrit dans {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""
+Moteur TensorFlow (SavedModel)
+"""
+
+from collections.abc import Mapping
+from typing import Iterable, Optional
+
+import numpy as np
+
+from app.services.backends.base import InferenceBackend
+from app.services.engine import OUTPUT_KEY, InferenceEngine
+from app.services.metrics import stage_timer
+
+
+class TensorFlowBackend(InferenceBackend):
+    """
+    SavedModel chargé par ``tf.saved_model.load``
+
+    Avec ``compiled=True``, les prédictions passent par un
+    ``InferenceEngine`` (une ``tf.function`` par longueur de séquence) ;
+    sinon, ou si l'objet chargé n'expose pas de signatures, le modèle est
+    appelé directement avec ``[ids, mask]``.
+    """
+
+    name = "tensorflow"
+
+    def __init__(
+        self,
+        model,
+        sequence_lengths: Iterable[int] = (),
+        compiled: bool = True,
+        jit_compile: bool = False,
+    ):
+        super().__init__()
+        self.model = model
+        self.engine: Optional[InferenceEngine] = None
+        if compiled and InferenceEngine.supports(model):
+            self.engine = InferenceEngine(
+                model, sequence_lengths, jit_compile=jit_compile
+            )
+            self.fixed_length = self.engine.fixed_length
+
+    @classmethod
+    def load(
+        cls,
+        model_dir,
+        sequence_lengths: Iterable[int] = (),
+        compiled: bool = True,
+        jit_compile: bool = False,
+        precision: str = "fp32",
+        num_threads: int = 0,
+        **kwargs,
+    ) -> "TensorFlowBackend":
+        cls.check_precision(precision)
+        import tensorflow as tf
+
+        if num_threads:
+            try:
+                tf.config.threading.set_intra_op_parallelism_threads(num_threads)
+                tf.config.threading.set_inter_op_parallelism_threads(1)
+            except RuntimeError as e:
+                # Runtime TensorFlow déjà initialisé dans ce processus
+                print(f"⚠️ Threads TensorFlow non modifiés: {e}")
+
+        # Charger le modèle avec tf.saved_model.load (plus compatible)
+        return cls(
+            tf.saved_model.load(str(model_dir)),
+            sequence_lengths=sequence_lengths,
+            compiled=compiled,
+            jit_compile=jit_compile,
+        )
+
+    def predict(self, input_ids, attention_mask) -> np.ndarray:
+        if self.engine is not None:
+            return self.engine(input_ids, attention_mask)
+
+        # Le modèle attend une liste [ids, mask]
+        with stage_timer("model"):
+            prediction = self.model([input_ids, attention_mask], training=False)
+        if isinstance(prediction, Mapping):
+            prediction = prediction.get(OUTPUT_KEY)
+        if prediction is None:
+            raise ValueError("Impossible d'extraire la prédiction du modèle")
+        with stage_timer("transfer"):
+            return np.asarray(prediction)[:, 0]
+
+    def warmup(self) -> float:
+        return self.engine.warmup() if self.engine is not None else 0.0
+
+    def snapshot(self) -> dict:
+        snapshot = super().snapshot()
+        snapshot["engine"] = self.engine.snapshot() if self.engine else None
+        return snapshot
@@ -0,0 +1,75 @@
+"""
+Moteur TensorFlow Lite
+"""
+
+import threading
+
+import numpy as np
+
+from app.services.backends.base import InferenceBackend, input_names
+from app.services.engine import OUTPUT_KEY, SERVING_SIGNATURE
+from app.services.metrics import stage_timer
+
+
+def _interpreter_class():
+    """``tflite_runtime`` (léger) s'il est installé, sinon ``tf.lite``"""
+    try:
+        from tflite_runtime.interpreter import Interpreter
+    except ImportError:
+        import tensorflow as tf
+
+        Interpreter = tf.lite.Interpreter
+    return Interpreter
+
+
+class TFLiteBackend(InferenceBackend):
+    """
+    Modèle ``.tflite`` exécuté par l'interpréteur TFLite
+
+    L'interpréteur n'est pas thread-safe : les appels sont sérialisés. Les
+    tenseurs d'entrée sont redimensionnés à la taille du lot par le
+    ``SignatureRunner``.
+    """
+
+    name = "tflite"
+    supported_precisions = ("fp32", "int8")
+    file_suffix = ".tflite"
+
+    def __init__(self, model_file, num_threads: int = 0, precision: str = "fp32"):
+        super().__init__()
+        self.precision = precision
+        Interpreter = _interpreter_class()
+        self.model = Interpreter(
+            model_path=str(model_file), num_threads=num_threads or None
+        )
+        self._runner = self.model.get_signature_runner(SERVING_SIGNATURE)
+        details = self._runner.get_input_details()
+        self._ids_name, self._mask_name = input_names(details)
+        self._dtypes = {name: spec["dtype"] for name, spec in details.items()}
+
+        outputs = list(self._runner.get_output_details())
+        self._output_key = OUTPUT_KEY if OUTPUT_KEY in outputs else outputs[0]
+
+        length = details[self._ids_name]["shape_signature"][-1]
+        self.fixed_length = int(length) if length > 0 else None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(
+        cls, model_dir, num_threads: int = 0, precision: str = "fp32", **kwargs
+    ) -> "TFLiteBackend":
+        return cls(
+            cls.artifact_path(model_dir, precision),
+            num_threads=num_threads,
+            precision=precision,
+        )
+
+    def predict(self, input_ids, attention_mask) -> np.ndarray:
+        inputs = {
+            self._ids_name: np.asarray(input_ids, self._dtypes[self._ids_name]),
+            self._mask_name: np.asarray(attention_mask, self._dtypes[self._mask_name]),
+        }
+        with self._lock, stage_timer("model"):
+            outputs = self._runner(**inputs)
+        with stage_timer("transfer"):
+            return np.array(outputs[self._output_key][:, 0], dtype=np.float32)
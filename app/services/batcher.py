@@ -0,0 +1,196 @@
+"""
+Micro-batching des requêtes de prédiction concurrentes
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from app.services.executor import InferenceExecutor
+
+PredictBatchFn = Callable[[List[str], bool], List[Tuple[str, float]]]
+
+
+@dataclass
+class _PendingItem:
+    text: str
+    use_cache: bool
+    future: asyncio.Future
+    enqueued_at: float
+
+
+@dataclass
+class BatcherStats:
+    """Compteurs observables du micro-batcher"""
+
+    batches_total: int = 0
+    items_total: int = 0
+    errors_total: int = 0
+    last_batch_size: int = 0
+    wait_ms_total: float = 0.0
+    max_wait_ms: float = 0.0
+    batch_size_counts: Dict[int, int] = field(default_factory=dict)
+
+    def record_batch(self, size: int, wait_times_ms: List[float]):
+        self.batches_total += 1
+        self.items_total += size
+        self.last_batch_size = size
+        self.batch_size_counts[size] = self.batch_size_counts.get(size, 0) + 1
+        self.wait_ms_total += sum(wait_times_ms)
+        self.max_wait_ms = max([self.max_wait_ms, *wait_times_ms])
+
+
+class MicroBatcher:
+    """
+    Regroupe les appels unitaires concurrents en un seul appel au modèle
+
+    Les requêtes sont collectées pendant au plus ``max_wait_ms`` ou jusqu'à
+    ``max_batch_size`` textes, puis envoyées ensemble à ``predict_batch``
+    (un appel par valeur de ``use_cache`` présente dans le lot). Chaque
+    appelant reçoit le résultat correspondant à son texte.
+
+    Avec un ``executor``, les lots sont exécutés dans son pool de threads et
+    jusqu'à ``executor.max_workers`` lots peuvent être en cours simultanément ;
+    le lot suivant se remplit pendant ce temps.
+    """
+
+    def __init__(
+        self,
+        predict_batch: PredictBatchFn,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        executor: Optional[InferenceExecutor] = None,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size doit être supérieur ou égal à 1")
+        self._predict_batch = predict_batch
+        self._executor = executor
+        self._concurrency = executor.max_workers if executor is not None else 1
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.stats = BatcherStats()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._flushes: Set[asyncio.Task] = set()
+
+    @property
+    def queue_depth(self) -> int:
+        """Nombre de requêtes en attente d'un lot"""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def predict(self, text: str, use_cache: bool = True) -> Tuple[str, float]:
+        """Soumet un texte et attend sa prédiction"""
+        self._ensure_worker()
+        future = self._loop.create_future()
+        self._queue.put_nowait(
+            _PendingItem(text, use_cache, future, time.perf_counter())
+        )
+        return await future
+
+    async def close(self):
+        """Arrête la tâche de collecte"""
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+        self._worker = None
+
+    def snapshot(self) -> dict:
+        """Retourne l'état courant du batcher"""
+        stats = self.stats
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "queue_depth": self.queue_depth,
+            "batches_total": stats.batches_total,
+            "items_total": stats.items_total,
+            "errors_total": stats.errors_total,
+            "last_batch_size": stats.last_batch_size,
+            "avg_batch_size": (
+                stats.items_total / stats.batches_total if stats.batches_total else 0.0
+            ),
+            "avg_wait_ms": (
+                stats.wait_ms_total / stats.items_total if stats.items_total else 0.0
+            ),
+            "max_wait_ms_observed": stats.max_wait_ms,
+            "batch_size_counts": dict(sorted(stats.batch_size_counts.items())),
+        }
+
+    def _ensure_worker(self):
+        loop = asyncio.get_running_loop()
+        # La file et la tâche sont liées à la boucle qui les a créées
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self._concurrency)
+            self._flushes = set()
+            self._worker = loop.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            # Attendre un emplacement libre avant de former le lot suivant
+            await self._slots.acquire()
+            batch = await self._collect()
+            task = self._loop.create_task(self._flush(batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._on_flush_done)
+
+    def _on_flush_done(self, task: asyncio.Task):
+        self._flushes.discard(task)
+        self._slots.release()
+
+    async def _collect(self) -> List[_PendingItem]:
+        batch = [await self._queue.get()]
+        deadline = self._loop.time() + self.max_wait_ms / 1000
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - self._loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _flush(self, batch: List[_PendingItem]):
+        # Les appelants ayant abandonné ne sont pas envoyés au modèle
+        batch = [item for item in batch if not item.future.done()]
+        if not batch:
+            return
+
+        started_at = time.perf_counter()
+        self.stats.record_batch(
+            len(batch), [(started_at - item.enqueued_at) * 1000 for item in batch]
+        )
+
+        for use_cache in (True, False):
+            group = [item for item in batch if item.use_cache is use_cache]
+            if group:
+                await self._run_group(group, use_cache)
+
+    async def _run_group(self, group: List[_PendingItem], use_cache: bool):
+        texts = [item.text for item in group]
+        try:
+            if self._executor is not None:
+                results = await self._executor.run(
+                    self._predict_batch, texts, use_cache
+                )
+            else:
+                results = self._predict_batch(texts, use_cache)
+        except Exception as e:
+            self.stats.errors_total += 1
+            for item in group:
+                if not item.future.done():
+                    item.future.set_exception(e)
+            return
+
+        for item, result in zip(group, results):
+            if not item.future.done():
+                item.future.set_result(result)
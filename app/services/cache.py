@@ -0,0 +1,105 @@
+"""
+Cache mémoire des prédictions (LRU + TTL)
+"""
+
+import hashlib
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+Prediction = Tuple[str, float]
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalise un texte pour la clé de cache
+
+    La normalisation (Unicode NFC, minuscules, espaces fusionnés) ne change
+    pas la sortie du tokenizer ``distilbert-base-uncased``.
+    """
+    return " ".join(unicodedata.normalize("NFC", text).lower().split())
+
+
+def cache_key(text: str, model_version: str) -> str:
+    """Clé de cache : hash du texte normalisé et de la version du modèle"""
+    payload = f"{model_version}\x00{normalize_text(text)}".encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+class PredictionCache:
+    """
+    Cache borné des prédictions avec éviction LRU et expiration TTL
+
+    Thread-safe : il est partagé par les threads du pool d'inférence.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl_seconds: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries doit être supérieur ou égal à 1")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, Prediction]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Prediction]:
+        """Retourne la prédiction en cache ou None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: Prediction):
+        """Ajoute ou remplace une prédiction"""
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Vide le cache"""
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self) -> dict:
+        """Retourne les compteurs du cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
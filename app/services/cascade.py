@@ -0,0 +1,235 @@
+"""
+Cascade de modèles : classifieur linéaire TF-IDF d'abord, DistilBERT
+seulement pour les textes incertains
+
+Le classifieur linéaire (TF-IDF 1-2-grammes + régression logistique, comme
+les modèles de référence du notebook ``script_models``) score chaque texte
+en quelques microsecondes. Les textes dont la probabilité positive tombe
+dans la bande d'incertitude ``[CASCADE_LOW, CASCADE_HIGH]`` sont transmis à
+DistilBERT ; les autres reçoivent la réponse du classifieur linéaire.
+
+Usage :
+    python -m app.services.cascade train --data training.1600000.csv
+    python -m app.services.cascade evaluate --data training.1600000.csv
+
+``train`` et ``evaluate`` échantillonnent deux parties disjointes du
+fichier (``--holdout-percent`` % des textes, choisis par leur hash, sont
+réservés à l'évaluation) : ``evaluate`` mesure, sur des textes jamais vus à
+l'entraînement, le taux d'escalade et la précision des réponses du
+classifieur linéaire pour plusieurs bandes.
+"""
+
+import argparse
+import json
+import pathlib
+import pickle
+import sys
+import threading
+import time
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from app.datasets import HOLDOUT_PERCENT, sample_sentiment140
+
+LINEAR_MODEL_FILENAME = "linear_model.pkl"
+DEFAULT_MODEL_PATH = pathlib.Path("models/bert_curriculum_HF_last_version")
+POSITIVE_LABEL = "4"
+
+# Étage qui a produit la prédiction
+TIER_CACHE = "cache"
+TIER_LINEAR = "linear"
+TIER_TRANSFORMER = "transformer"
+
+# Bandes comparées par ``evaluate``
+EVALUATED_BANDS = ((0.5, 0.5), (0.4, 0.6), (0.3, 0.7), (0.2, 0.8), (0.1, 0.9))
+
+
+def train_linear_model(
+    texts: Sequence[str],
+    labels: Sequence[str],
+    max_features: int = 200_000,
+    c: float = 1.0,
+):
+    """Pipeline TF-IDF (1-2-grammes) + régression logistique"""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import Pipeline
+
+    pipeline = Pipeline(
+        [
+            (
+                "tfidf",
+                TfidfVectorizer(
+                    ngram_range=(1, 2),
+                    min_df=2,
+                    max_features=max_features,
+                    sublinear_tf=True,
+                ),
+            ),
+            ("classifier", LogisticRegression(C=c, max_iter=1000)),
+        ]
+    )
+    pipeline.fit(list(texts), [str(label) for label in labels])
+    return pipeline
+
+
+class LinearTier:
+    """Classifieur linéaire rapide, premier étage de la cascade"""
+
+    def __init__(self, pipeline):
+        classes = [str(label) for label in pipeline.classes_]
+        if POSITIVE_LABEL not in classes or len(classes) != 2:
+            raise ValueError(f"Classes inattendues pour la cascade: {classes}")
+        self.pipeline = pipeline
+        self._positive = classes.index(POSITIVE_LABEL)
+        self.negative_label = classes[1 - self._positive]
+
+    @classmethod
+    def load(cls, path) -> "LinearTier":
+        with open(path, "rb") as f:
+            return cls(pickle.load(f))
+
+    def save(self, path) -> pathlib.Path:
+        path = pathlib.Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            pickle.dump(self.pipeline, f)
+        return path
+
+    def predict_proba(self, texts: Sequence[str]) -> np.ndarray:
+        """Probabilité positive de chaque texte"""
+        return self.pipeline.predict_proba(list(texts))[:, self._positive]
+
+    def label(self, proba_value: float) -> str:
+        return POSITIVE_LABEL if proba_value >= 0.5 else self.negative_label
+
+
+def uncertain(proba_values: np.ndarray, low: float, high: float) -> np.ndarray:
+    """Masque des textes à transmettre à DistilBERT"""
+    return (proba_values >= low) & (proba_values <= high)
+
+
+class CascadeStats:
+    """Compteurs des réponses par étage (thread-safe)"""
+
+    def __init__(self, low: float, high: float):
+        self.low = low
+        self.high = high
+        self._lock = threading.Lock()
+        self.texts_total = 0
+        self.linear_total = 0
+        self.escalated_total = 0
+
+    def record(self, texts: int, escalated: int):
+        with self._lock:
+            self.texts_total += texts
+            self.escalated_total += escalated
+            self.linear_total += texts - escalated
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            total = self.texts_total
+            return {
+                "band": [self.low, self.high],
+                "texts_total": total,
+                "linear_total": self.linear_total,
+                "escalated_total": self.escalated_total,
+                "escalation_rate": (
+                    round(self.escalated_total / total, 4) if total else None
+                ),
+            }
+
+
+def evaluate_bands(
+    tier: LinearTier,
+    texts: Sequence[str],
+    labels: Sequence[str],
+    bands: Sequence[Tuple[float, float]] = EVALUATED_BANDS,
+) -> List[dict]:
+    """Taux d'escalade et précision des réponses linéaires par bande"""
+    started_at = time.perf_counter()
+    proba_values = tier.predict_proba(texts)
+    per_text_us = (time.perf_counter() - started_at) / len(texts) * 1e6
+    predicted = np.array([tier.label(p) for p in proba_values])
+    expected = np.array([str(label) for label in labels])
+
+    report = []
+    for low, high in bands:
+        escalate = uncertain(proba_values, low, high)
+        answered = ~escalate
+        report.append(
+            {
+                "band": [low, high],
+                "escalation_rate": round(float(escalate.mean()), 4),
+                "linear_accuracy": (
+                    round(float((predicted[answered] == expected[answered]).mean()), 4)
+                    if answered.any()
+                    else None
+                ),
+                "linear_us_per_text": round(per_text_us, 2),
+            }
+        )
+    return report
+
+
+def _split(rows: List[dict]) -> Tuple[List[str], List[str]]:
+    return [row["text"] for row in rows], [row["target"] for row in rows]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Cascade linéaire / DistilBERT")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    train_parser = subparsers.add_parser("train", help="Entraîner le classifieur")
+    train_parser.add_argument("--data", type=pathlib.Path, required=True)
+    train_parser.add_argument("--samples", type=int, default=400_000)
+    train_parser.add_argument("--max-features", type=int, default=200_000)
+    train_parser.add_argument("--seed", type=int, default=0)
+    train_parser.add_argument(
+        "--output",
+        type=pathlib.Path,
+        default=DEFAULT_MODEL_PATH / LINEAR_MODEL_FILENAME,
+    )
+
+    eval_parser = subparsers.add_parser("evaluate", help="Comparer les bandes")
+    eval_parser.add_argument("--data", type=pathlib.Path, required=True)
+    eval_parser.add_argument("--samples", type=int, default=20_000)
+    eval_parser.add_argument("--seed", type=int, default=1)
+    eval_parser.add_argument(
+        "--model",
+        type=pathlib.Path,
+        default=DEFAULT_MODEL_PATH / LINEAR_MODEL_FILENAME,
+    )
+    for subparser in (train_parser, eval_parser):
+        subparser.add_argument(
+            "--holdout-percent",
+            type=int,
+            default=HOLDOUT_PERCENT,
+            help="Part des textes réservés à l'évaluation (identique pour les deux)",
+        )
+    args = parser.parse_args(argv)
+
+    split = "train" if args.command == "train" else "holdout"
+    texts, labels = _split(
+        sample_sentiment140(
+            args.data, args.samples, args.seed, split, args.holdout_percent
+        )
+    )
+    if not texts:
+        parser.error(f"Aucun texte dans la partie {split} de {args.data}")
+
+    if args.command == "train":
+        print(f"🔄 Entraînement sur {len(texts)} textes...")
+        pipeline = train_linear_model(texts, labels, max_features=args.max_features)
+        path = LinearTier(pipeline).save(args.output)
+        print(f"✅ Classifieur linéaire enregistré dans {path}")
+        return 0
+
+    report = evaluate_bands(LinearTier.load(args.model), texts, labels)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
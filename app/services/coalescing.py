@@ -0,0 +1,76 @@
+"""
+Coalescence des prédictions en cours (single-flight par texte)
+
+Le cache ne sert qu'une fois le premier résultat calculé : pendant le calcul,
+chaque copie d'un texte viral déclencherait sa propre inférence. Le registre
+associe la clé de cache (texte normalisé + version du modèle) d'un calcul en
+cours à un ``Future`` ; les requêtes suivantes pour la même clé attendent ce
+résultat au lieu d'appeler le modèle.
+"""
+
+import threading
+from concurrent.futures import Future
+from typing import Dict, Iterable, List, Tuple
+
+# Étage des prédictions obtenues en attendant le calcul d'une autre requête
+TIER_COALESCED = "coalesced"
+
+
+class InFlightRegistry:
+    """
+    Calculs en cours indexés par clé de cache (thread-safe)
+
+    ``claim`` partage les clés entre celles que l'appelant doit calculer
+    (il devient leader) et celles déjà en cours de calcul (il attend leur
+    ``Future``). Le leader publie chaque résultat avec ``resolve`` ou
+    l'échec avec ``fail`` ; la clé est alors retirée du registre.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Future] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def claim(self, keys: Iterable[str]) -> Tuple[List[str], Dict[str, Future]]:
+        """Retourne (clés à calculer, futures des clés déjà en cours)"""
+        owned: List[str] = []
+        joined: Dict[str, Future] = {}
+        with self._lock:
+            for key in keys:
+                future = self._pending.get(key)
+                if future is None:
+                    self._pending[key] = Future()
+                    owned.append(key)
+                else:
+                    joined[key] = future
+            self.leaders += len(owned)
+            self.coalesced += len(joined)
+        return owned, joined
+
+    def resolve(self, key: str, value):
+        """Publie le résultat d'une clé et la retire du registre"""
+        with self._lock:
+            future = self._pending.pop(key)
+        future.set_result(value)
+
+    def fail(self, keys: Iterable[str], error: BaseException):
+        """Transmet l'échec du leader aux requêtes en attente"""
+        with self._lock:
+            futures = [self._pending.pop(key) for key in keys if key in self._pending]
+        for future in futures:
+            future.set_exception(error)
+
+    def snapshot(self) -> dict:
+        """Retourne les compteurs du registre"""
+        with self._lock:
+            total = self.leaders + self.coalesced
+            return {
+                "in_flight": len(self._pending),
+                "computed": self.leaders,
+                "coalesced": self.coalesced,
+                "coalesced_rate": self.coalesced / total if total else 0.0,
+            }
@@ -0,0 +1,149 @@
+"""
+Fonction d'inférence compilée à signature fixe
+"""
+
+import time
+from collections.abc import Mapping
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+
+from app.services.metrics import stage_timer
+
+SERVING_SIGNATURE = "serving_default"
+OUTPUT_KEY = "dense"
+
+
+class InferenceEngine:
+    """
+    Enveloppe compilée autour du modèle chargé par ``tf.saved_model.load``
+
+    La fonction de service concrète (signature ``serving_default``), ses noms
+    d'entrées et sa clé de sortie sont résolus une seule fois au chargement.
+    Une ``tf.function`` à signature explicite ``[None, longueur]`` est créée
+    par longueur de séquence supportée : aucun retraçage ni inspection du
+    résultat n'a lieu sur le chemin d'inférence.
+
+    Si le modèle n'expose pas de signature de service, l'appel générique
+    ``model([ids, mask], training=False)`` est compilé de la même façon.
+    """
+
+    def __init__(
+        self, model, sequence_lengths: Iterable[int], jit_compile: bool = False
+    ):
+        import tensorflow as tf
+
+        # Garder l'objet restauré : ses variables sont référencées faiblement
+        self._model = model
+        self.jit_compile = jit_compile
+        self.fixed_length: Optional[int] = None
+        signatures = getattr(model, "signatures", None)
+        if isinstance(signatures, Mapping) and SERVING_SIGNATURE in signatures:
+            self.mode = "signature"
+            call = self._resolve_signature(signatures[SERVING_SIGNATURE])
+        else:
+            self.mode = "call"
+            call = self._resolve_call(model)
+
+        lengths = sorted(set(sequence_lengths))
+        if self.fixed_length is not None:
+            # Le graphe exporté n'accepte qu'une seule longueur
+            lengths = [self.fixed_length]
+        self.sequence_lengths: Tuple[int, ...] = tuple(lengths)
+
+        self._functions = {
+            length: tf.function(
+                call,
+                input_signature=[
+                    tf.TensorSpec([None, length], tf.int32, name="input_ids"),
+                    tf.TensorSpec([None, length], tf.int32, name="attention_mask"),
+                ],
+                jit_compile=jit_compile,
+            )
+            for length in self.sequence_lengths
+        }
+        self.trace_duration_s: Optional[float] = None
+
+    @staticmethod
+    def supports(model) -> bool:
+        """Vrai pour un objet restauré par ``tf.saved_model.load``"""
+        return isinstance(getattr(model, "signatures", None), Mapping)
+
+    def _resolve_signature(self, function):
+        """Résout les noms d'entrées et la clé de sortie de la signature"""
+        import tensorflow as tf
+
+        # Import local : le paquet backends importe ce module
+        from app.services.backends.base import input_names
+
+        _, inputs = function.structured_input_signature
+        ids_name, mask_name = input_names(inputs)
+        ids_dtype = inputs[ids_name].dtype
+        mask_dtype = inputs[mask_name].dtype
+
+        length = inputs[ids_name].shape[-1]
+        if length is not None:
+            self.fixed_length = int(length)
+
+        outputs = function.structured_outputs
+        if OUTPUT_KEY in outputs:
+            output_key = OUTPUT_KEY
+        elif len(outputs) == 1:
+            output_key = next(iter(outputs))
+        else:
+            raise ValueError(f"Sortie de modèle ambiguë: {list(outputs)}")
+
+        def call(input_ids, attention_mask):
+            outputs = function(
+                **{
+                    ids_name: tf.cast(input_ids, ids_dtype),
+                    mask_name: tf.cast(attention_mask, mask_dtype),
+                }
+            )
+            return outputs[output_key]
+
+        return call
+
+    @staticmethod
+    def _resolve_call(model):
+        """Appel générique ; la sortie est résolue une fois, au traçage"""
+
+        def call(input_ids, attention_mask):
+            prediction = model([input_ids, attention_mask], training=False)
+            if isinstance(prediction, Mapping):
+                prediction = prediction.get(OUTPUT_KEY)
+            if prediction is None:
+                raise ValueError("Impossible d'extraire la prédiction du modèle")
+            return prediction
+
+        return call
+
+    def warmup(self) -> float:
+        """Trace le graphe de chaque longueur de séquence supportée"""
+        started_at = time.perf_counter()
+        for function in self._functions.values():
+            function.get_concrete_function()
+        self.trace_duration_s = time.perf_counter() - started_at
+        return self.trace_duration_s
+
+    def __call__(self, input_ids, attention_mask) -> np.ndarray:
+        """Retourne la probabilité positive de chaque ligne"""
+        length = int(input_ids.shape[1])
+        function = self._functions.get(length)
+        if function is None:
+            raise ValueError(
+                f"Longueur de séquence {length} non compilée "
+                f"(supportées: {self.sequence_lengths})"
+            )
+        with stage_timer("model"):
+            outputs = function(input_ids, attention_mask)
+        with stage_timer("transfer"):
+            return outputs.numpy()[:, 0]
+
+    def snapshot(self) -> dict:
+        return {
+            "mode": self.mode,
+            "sequence_lengths": list(self.sequence_lengths),
+            "jit_compile": self.jit_compile,
+            "trace_duration_s": self.trace_duration_s,
+        }
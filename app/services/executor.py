@@ -0,0 +1,76 @@
+"""
+Exécution de l'inférence hors de la boucle asyncio
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+
+class InferenceExecutor:
+    """
+    Pool de threads borné pour les appels d'inférence bloquants
+
+    Les appels au modèle (et son chargement) sont exécutés dans le pool afin
+    que la boucle d'événements reste disponible pour les autres requêtes,
+    notamment ``/health``.
+    """
+
+    def __init__(self, max_workers: int = 2):
+        if max_workers < 1:
+            raise ValueError("max_workers doit être supérieur ou égal à 1")
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="inference"
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._completed_total = 0
+        self._errors_total = 0
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Exécute ``fn(*args)`` dans le pool et attend son résultat"""
+        with self._lock:
+            self._queued += 1
+        future = self._pool.submit(self._call, fn, *args)
+        future.add_done_callback(self._on_done)
+        return await asyncio.wrap_future(future)
+
+    def _call(self, fn: Callable[..., Any], *args: Any) -> Any:
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+        try:
+            return fn(*args)
+        except Exception:
+            with self._lock:
+                self._errors_total += 1
+            raise
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed_total += 1
+
+    def _on_done(self, future: Future):
+        # Une tâche annulée avant son démarrage n'est jamais passée par _call
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+
+    def snapshot(self) -> dict:
+        """Retourne l'état courant du pool"""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "running": self._running,
+                "queued": self._queued,
+                "saturation": self._running / self.max_workers,
+                "completed_total": self._completed_total,
+                "errors_total": self._errors_total,
+            }
+
+    def shutdown(self, wait: bool = True):
+        """Arrête le pool de threads"""
+        self._pool.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,134 @@
+"""
+Chargement unique (single-flight) du modèle avec états explicites
+
+    not_loaded ──► loading ──► ready
+                      │
+                      ▼
+                   failed ──(après le délai de backoff)──► loading
+
+Un seul thread exécute le chargement ; les appels concurrents attendent
+son issue au lieu de charger chacun le modèle. Après un échec, les appels
+reçoivent ``ModelLoadError`` sans nouvelle tentative jusqu'à l'expiration
+d'un délai qui double à chaque échec consécutif (borné).
+"""
+
+import threading
+import time
+from enum import Enum
+from typing import Callable, Optional
+
+
+class LoadState(str, Enum):
+    """État du chargement du modèle"""
+
+    NOT_LOADED = "not_loaded"
+    LOADING = "loading"
+    READY = "ready"
+    FAILED = "failed"
+
+
+class ModelLoadError(RuntimeError):
+    """Modèle indisponible : dernier chargement en échec, backoff en cours"""
+
+    def __init__(self, message: str, retry_in_s: float):
+        super().__init__(message)
+        self.retry_in_s = retry_in_s
+
+
+class SingleFlightLoader:
+    """Exécute ``load`` une seule fois à la fois, avec backoff après échec"""
+
+    def __init__(
+        self,
+        load: Callable[[], None],
+        backoff_s: float = 1.0,
+        backoff_max_s: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._load = load
+        self.backoff_s = backoff_s
+        self.backoff_max_s = backoff_max_s
+        self._clock = clock
+        self._condition = threading.Condition()
+        self.state = LoadState.NOT_LOADED
+        self.attempts = 0
+        self.consecutive_failures = 0
+        self.last_error: Optional[str] = None
+        self.last_duration_s: Optional[float] = None
+        self._retry_at = 0.0
+
+    def _backoff_delay(self) -> float:
+        return min(
+            self.backoff_s * 2 ** (self.consecutive_failures - 1), self.backoff_max_s
+        )
+
+    def ensure_loaded(self):
+        """
+        Retourne dès que le modèle est prêt ; charge, attend le chargement en
+        cours, ou lève ``ModelLoadError`` pendant le backoff
+        """
+        if self.state is LoadState.READY:
+            return
+
+        with self._condition:
+            while self.state is LoadState.LOADING:
+                self._condition.wait()
+            if self.state is LoadState.READY:
+                return
+            if self.state is LoadState.FAILED:
+                retry_in_s = self._retry_at - self._clock()
+                if retry_in_s > 0:
+                    raise ModelLoadError(
+                        f"Chargement du modèle en échec ({self.last_error}), "
+                        f"nouvelle tentative dans {retry_in_s:.1f}s",
+                        retry_in_s,
+                    )
+            self.state = LoadState.LOADING
+            self.attempts += 1
+
+        started_at = time.perf_counter()
+        try:
+            self._load()
+        except BaseException as e:
+            with self._condition:
+                self.consecutive_failures += 1
+                delay = self._backoff_delay()
+                self._retry_at = self._clock() + delay
+                self.last_error = str(e)
+                self.last_duration_s = time.perf_counter() - started_at
+                self.state = LoadState.FAILED
+                self._condition.notify_all()
+            print(f"⏳ Nouvelle tentative de chargement possible dans {delay:.1f}s")
+            raise
+
+        with self._condition:
+            self.consecutive_failures = 0
+            self.last_error = None
+            self.last_duration_s = time.perf_counter() - started_at
+            self.state = LoadState.READY
+            self._condition.notify_all()
+
+    def reset(self, state: LoadState = LoadState.NOT_LOADED):
+        """Force l'état (modèle affecté ou retiré sans chargement)"""
+        with self._condition:
+            self.state = state
+            self.consecutive_failures = 0
+            self.last_error = None
+            self._retry_at = 0.0
+            self._condition.notify_all()
+
+    def snapshot(self) -> dict:
+        with self._condition:
+            retry_in_s = (
+                max(self._retry_at - self._clock(), 0.0)
+                if self.state is LoadState.FAILED
+                else None
+            )
+            return {
+                "state": self.state.value,
+                "attempts": self.attempts,
+                "consecutive_failures": self.consecutive_failures,
+                "last_error": self.last_error,
+                "last_duration_s": self.last_duration_s,
+                "retry_in_s": retry_in_s,
+            }
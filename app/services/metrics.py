@@ -0,0 +1,313 @@
+"""
+Métriques au format d'exposition texte Prometheus, sans dépendance
+
+Compteurs, jauges et histogrammes à étiquettes, protégés par un verrou
+(mis à jour depuis le pool d'inférence). Une observation coûte un appel à
+``time.perf_counter`` et une recherche dichotomique dans les bornes : les
+métriques restent actives en production.
+
+Chaque processus a son propre registre : avec plusieurs workers
+(``app.serving``), ``/metrics`` expose les métriques du worker qui répond.
+"""
+
+import bisect
+import math
+import threading
+import time
+from typing import Dict, List, Sequence, Tuple
+
+# Bornes des histogrammes de durée (secondes)
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_value(value: float) -> str:
+    value = float(value)
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _escape_help(value: str) -> str:
+    # Dans HELP, seuls la barre oblique inverse et le saut de ligne sont échappés
+    return value.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _escape(value) -> str:
+    return _escape_help(str(value)).replace('"', '\\"')
+
+
+def _format_labels(labels: Sequence[Tuple[str, object]]) -> str:
+    if not labels:
+        return ""
+    pairs = []
+    for name, value in labels:
+        if name == "le":
+            value = _format_value(value)
+        pairs.append(f'{name}="{_escape(value)}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: Dict[Tuple[str, ...], object] = {}
+        if not self.labelnames:
+            self._children[()] = self._new_child()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _samples(self) -> List[Tuple[str, Sequence[Tuple[str, str]], float]]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {_escape_help(self.documentation)}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        for name, labels, value in self._samples():
+            lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+class _Value:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float):
+        self.value = float(value)
+
+
+class Counter(_Metric):
+    """Compteur monotone"""
+
+    type_name = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1.0):
+        self._children[()].inc(amount)
+
+    def _samples(self):
+        return [
+            (self.name, tuple(zip(self.labelnames, key)), child.value)
+            for key, child in list(self._children.items())
+        ]
+
+
+class Gauge(Counter):
+    """Valeur instantanée"""
+
+    type_name = "gauge"
+
+    def dec(self, amount: float = 1.0):
+        self._children[()].dec(amount)
+
+    def set(self, value: float):
+        self._children[()].set(value)
+
+
+class _Timer:
+    __slots__ = ("_histogram", "_started_at")
+
+    def __init__(self, histogram: "_HistogramValue"):
+        self._histogram = histogram
+
+    def __enter__(self):
+        self._started_at = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._histogram.observe(time.perf_counter() - self._started_at)
+
+
+class _HistogramValue:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def time(self) -> _Timer:
+        """Mesure la durée d'un bloc ``with``"""
+        return _Timer(self)
+
+
+class Histogram(_Metric):
+    """Distribution cumulée par bornes fixes"""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float):
+        self._children[()].observe(value)
+
+    def time(self) -> _Timer:
+        return self._children[()].time()
+
+    def _samples(self):
+        samples = []
+        for key, child in list(self._children.items()):
+            labels = tuple(zip(self.labelnames, key))
+            with child._lock:
+                counts, total = list(child.counts), child.sum
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                samples.append(
+                    (f"{self.name}_bucket", labels + (("le", bound),), cumulative)
+                )
+            samples.append((f"{self.name}_sum", labels, total))
+            samples.append((f"{self.name}_count", labels, cumulative))
+        return samples
+
+
+class MetricsRegistry:
+    """Ensemble des métriques exposées par ``/metrics``"""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, *args, **kwargs) -> Counter:
+        return self.register(Counter(*args, **kwargs))
+
+    def gauge(self, *args, **kwargs) -> Gauge:
+        return self.register(Gauge(*args, **kwargs))
+
+    def histogram(self, *args, **kwargs) -> Histogram:
+        return self.register(Histogram(*args, **kwargs))
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics) + "\n"
+
+
+# Registre de l'application
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "sentiment_stage_duration_seconds",
+    "Durée de chaque étape de la prédiction (persistent_cache, linear, tokenize, "
+    "model, transfer, decode)",
+    ["stage"],
+)
+MODEL_BATCH_SIZE = REGISTRY.histogram(
+    "sentiment_model_batch_size",
+    "Nombre de textes par appel du modèle",
+    buckets=BATCH_SIZE_BUCKETS,
+)
+MODEL_LOAD_SECONDS = REGISTRY.gauge(
+    "sentiment_model_load_duration_seconds",
+    "Durée de chargement par composant (model, trace, tokenizer, label_encoder)",
+    ["component"],
+)
+CASCADE_PREDICTIONS = REGISTRY.counter(
+    "sentiment_cascade_predictions_total",
+    "Textes prédits par étage de la cascade (linear, transformer)",
+    ["tier"],
+)
+COALESCED_PREDICTIONS = REGISTRY.counter(
+    "sentiment_coalesced_predictions_total",
+    "Textes servis par un calcul déjà en cours pour une autre requête",
+)
+ADMISSION_REJECTED = REGISTRY.counter(
+    "sentiment_admission_rejected_total",
+    "Requêtes refusées ou abandonnées avant exécution (queue_full, deadline, "
+    "disconnected)",
+    ["reason"],
+)
+HTTP_REQUESTS = REGISTRY.counter(
+    "http_requests_total", "Requêtes HTTP traitées", ["method", "path", "status"]
+)
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "http_request_duration_seconds",
+    "Durée des requêtes HTTP",
+    ["method", "path"],
+)
+HTTP_IN_FLIGHT = REGISTRY.gauge(
+    "http_requests_in_flight", "Requêtes HTTP en cours de traitement"
+)
+
+# Étapes de la prédiction, résolues une fois (pas de recherche par appel)
+STAGES = {
+    stage: STAGE_SECONDS.labels(stage=stage)
+    for stage in (
+        "persistent_cache",
+        "linear",
+        "tokenize",
+        "model",
+        "transfer",
+        "decode",
+    )
+}
+
+
+def stage_timer(stage: str) -> _Timer:
+    """``with stage_timer("model"): ...`` mesure une étape de la prédiction"""
+    return STAGES[stage].time()
@@ -0,0 +1,53 @@
+"""
+Padding dynamique et regroupement des séquences par longueur
+"""
+
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+
+def bucket_length(length: int, buckets: Sequence[int]) -> int:
+    """Retourne la plus petite longueur de bucket pouvant contenir ``length``"""
+    for bucket in buckets:
+        if length <= bucket:
+            return bucket
+    return buckets[-1]
+
+
+def plan_batches(
+    lengths: Sequence[int], buckets: Sequence[int], max_tokens: int
+) -> List[Tuple[int, List[int]]]:
+    """
+    Regroupe les séquences par bucket de longueur
+
+    Chaque groupe est découpé pour que ``lignes * longueur`` ne dépasse pas
+    ``max_tokens`` (au moins une ligne par lot).
+
+    Returns:
+        List[Tuple[int, List[int]]]: (longueur paddée, indices des séquences)
+    """
+    groups: Dict[int, List[int]] = {}
+    for index, length in enumerate(lengths):
+        groups.setdefault(bucket_length(length, buckets), []).append(index)
+
+    plan = []
+    for length in sorted(groups):
+        indices = groups[length]
+        rows = max(1, max_tokens // length)
+        for start in range(0, len(indices), rows):
+            plan.append((length, indices[start : start + rows]))
+    return plan
+
+
+def pad_sequences(
+    sequences: Sequence[Sequence[int]], length: int, pad_id: int = 0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Construit les tenseurs ``input_ids`` et ``attention_mask`` paddés"""
+    input_ids = np.full((len(sequences), length), pad_id, dtype=np.int32)
+    attention_mask = np.zeros((len(sequences), length), dtype=np.int32)
+    for row, sequence in enumerate(sequences):
+        size = min(len(sequence), length)
+        input_ids[row, :size] = sequence[:size]
+        attention_mask[row, :size] = 1
+    return input_ids, attention_mask
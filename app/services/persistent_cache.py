@@ -0,0 +1,238 @@
+"""
+Cache persistant des prédictions partagé entre processus (SQLite sous /tmp)
+
+Second niveau derrière le cache mémoire : tous les workers uvicorn d'un
+hôte lisent et écrivent le même fichier, et sur Lambda le fichier survit
+entre les invocations d'un conteneur chaud. La clé est celle du cache
+mémoire (hash du texte normalisé et de la version du modèle).
+
+Le journal WAL permet des lectures concurrentes pendant une écriture. La
+taille est bornée par ``max_entries`` : les entrées expirées puis les plus
+anciennes sont supprimées. Une erreur SQLite (fichier verrouillé, disque
+plein, base corrompue) n'interrompt jamais une prédiction : la recherche
+est comptée comme un échec et le modèle est appelé.
+"""
+
+import os
+import pathlib
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+Prediction = Tuple[str, float]
+
+# Étage des prédictions servies par le cache persistant
+TIER_PERSISTENT_CACHE = "persistent_cache"
+
+# Erreurs qui désactivent une opération sans interrompre la prédiction
+# (OSError : répertoire non inscriptible)
+_CACHE_ERRORS = (sqlite3.Error, OSError)
+
+# Limite du nombre de paramètres d'une requête SQLite (anciennes versions)
+_MAX_PARAMETERS = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS predictions (
+    key TEXT PRIMARY KEY,
+    label TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    created_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS predictions_created_at ON predictions (created_at);
+"""
+
+
+class PersistentCache:
+    """
+    Cache des prédictions dans une base SQLite locale (thread-safe)
+
+    La connexion est ouverte au premier accès et rouverte après un
+    ``fork`` : une connexion SQLite ne doit pas être partagée entre
+    processus.
+    """
+
+    def __init__(
+        self,
+        path,
+        max_entries: int = 1_000_000,
+        ttl_seconds: float = 86400.0,
+        busy_timeout_s: float = 0.05,
+        clock: Callable[[], float] = time.time,
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries doit être supérieur ou égal à 1")
+        self.path = pathlib.Path(path)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.busy_timeout_s = busy_timeout_s
+        # Horloge murale : les dates sont partagées entre processus
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        # Éviction vérifiée toutes les ``_evict_every`` écritures (la borne
+        # peut être dépassée d'au plus 10 % entre deux vérifications)
+        self._evict_every = max(1, max_entries // 10)
+        self._writes_since_eviction = 0
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.errors = 0
+        self.lookups = 0
+        self.lookup_seconds_total = 0.0
+        self.last_error: Optional[str] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(
+                str(self.path), timeout=self.busy_timeout_s, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(_SCHEMA)
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    def _failed(self, error: Exception):
+        self.errors += 1
+        if self.last_error is None:
+            print(f"⚠️ Cache persistant indisponible ({self.path}): {error}")
+        self.last_error = str(error)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Prediction]:
+        """Retourne les prédictions en cache (non expirées) parmi ``keys``"""
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+
+        started_at = time.perf_counter()
+        found: Dict[str, Prediction] = {}
+        with self._lock:
+            try:
+                connection = self._connect()
+                oldest = self._clock() - self.ttl_seconds
+                for start in range(0, len(keys), _MAX_PARAMETERS):
+                    chunk = keys[start : start + _MAX_PARAMETERS]
+                    rows = connection.execute(
+                        "SELECT key, label, confidence FROM predictions "
+                        f"WHERE key IN ({','.join('?' * len(chunk))}) "
+                        "AND created_at > ?",
+                        (*chunk, oldest),
+                    )
+                    for key, label, confidence in rows:
+                        found[key] = (label, confidence)
+            except _CACHE_ERRORS as e:
+                self._failed(e)
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+            self.lookups += 1
+            self.lookup_seconds_total += time.perf_counter() - started_at
+        return found
+
+    def get(self, key: str) -> Optional[Prediction]:
+        """Retourne la prédiction en cache ou None"""
+        return self.get_many([key]).get(key)
+
+    def put_many(self, items: Dict[str, Prediction]):
+        """Ajoute ou remplace des prédictions en une transaction"""
+        if not items:
+            return
+
+        with self._lock:
+            try:
+                connection = self._connect()
+                now = self._clock()
+                with connection:
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO predictions "
+                        "(key, label, confidence, created_at) VALUES (?, ?, ?, ?)",
+                        [
+                            (key, label, float(confidence), now)
+                            for key, (label, confidence) in items.items()
+                        ],
+                    )
+                self.writes += len(items)
+                self._writes_since_eviction += len(items)
+                if self._writes_since_eviction >= self._evict_every:
+                    self._evict(connection, now)
+            except _CACHE_ERRORS as e:
+                self._failed(e)
+
+    def put(self, key: str, value: Prediction):
+        """Ajoute ou remplace une prédiction"""
+        self.put_many({key: value})
+
+    def _evict(self, connection: sqlite3.Connection, now: float):
+        """Supprime les entrées expirées puis les plus anciennes"""
+        self._writes_since_eviction = 0
+        with connection:
+            expired = connection.execute(
+                "DELETE FROM predictions WHERE created_at <= ?",
+                (now - self.ttl_seconds,),
+            ).rowcount
+            (size,) = connection.execute("SELECT COUNT(*) FROM predictions").fetchone()
+            excess = max(size - self.max_entries, 0)
+            if excess:
+                connection.execute(
+                    "DELETE FROM predictions WHERE key IN (SELECT key FROM "
+                    "predictions ORDER BY created_at LIMIT ?)",
+                    (excess,),
+                )
+        self.evictions += expired + excess
+
+    def __len__(self) -> int:
+        with self._lock:
+            try:
+                return (
+                    self._connect()
+                    .execute("SELECT COUNT(*) FROM predictions")
+                    .fetchone()[0]
+                )
+            except _CACHE_ERRORS as e:
+                self._failed(e)
+                return 0
+
+    def clear(self):
+        """Vide le cache (pour tous les processus)"""
+        with self._lock:
+            try:
+                connection = self._connect()
+                with connection:
+                    connection.execute("DELETE FROM predictions")
+            except _CACHE_ERRORS as e:
+                self._failed(e)
+
+    def close(self):
+        """Ferme la connexion du processus courant"""
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+
+    def snapshot(self) -> dict:
+        """Retourne les compteurs et la latence moyenne des recherches"""
+        size = len(self)
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "path": str(self.path),
+                "size": size,
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "writes": self.writes,
+                "evictions": self.evictions,
+                "errors": self.errors,
+                "last_error": self.last_error,
+                "avg_lookup_ms": (
+                    self.lookup_seconds_total / self.lookups * 1000
+                    if self.lookups
+                    else 0.0
+                ),
+            }
@@ -0,0 +1,260 @@
+"""
+Profilage à la demande du chemin d'inférence
+
+Une session capture les ``N`` prochaines prédictions (appels de
+``SentimentService.predict_batch``) ou une fenêtre de temps, puis écrit le
+profil dans ``PROFILING_DIR/<session>/`` :
+
+    cprofile     profile.pstats (``python -m pstats``, snakeviz) et
+                 profile.txt (fonctions triées par temps cumulé)
+    tensorflow   trace du profileur TensorFlow (``tensorboard --logdir``)
+
+Chaque prédiction capturée est profilée avec son propre ``cProfile.Profile``
+et les profils sont fusionnés à la fin de la session. Un seul profileur
+peut être actif à la fois dans l'interpréteur (``sys.monitoring`` depuis
+Python 3.12) : une prédiction lancée pendant qu'une autre est profilée
+s'exécute sans profilage et ne compte pas dans la session. Le profileur
+TensorFlow est global : il trace tous les threads pendant la session.
+
+Désactivé, le chemin d'inférence ne teste qu'un booléen (``active``).
+"""
+
+import cProfile
+import io
+import json
+import pathlib
+import pstats
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from typing import List, Optional
+
+PROFILING_MODES = ("cprofile", "tensorflow")
+
+# Fonctions listées dans profile.txt
+TEXT_REPORT_LIMIT = 60
+
+
+class ProfilingBusyError(RuntimeError):
+    """Une session de profilage est déjà en cours"""
+
+
+@dataclass
+class ProfileSession:
+    """État d'une session de profilage"""
+
+    id: str
+    mode: str
+    directory: str
+    max_predictions: Optional[int] = None
+    duration_s: Optional[float] = None
+    started_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    predictions: int = 0
+    status: str = "running"
+    error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class Profiler:
+    """Sessions de profilage du chemin d'inférence"""
+
+    def __init__(self, output_dir="/tmp/sentiment-profiles"):
+        self.output_dir = pathlib.Path(output_dir)
+        # Seul attribut lu par le chemin d'inférence
+        self.active = False
+        self.session: Optional[ProfileSession] = None
+        self._lock = threading.Lock()
+        # Détenu pendant une prédiction profilée par cProfile
+        self._cprofile_lock = threading.Lock()
+        self._profiles: List[cProfile.Profile] = []
+        self._deadline: Optional[float] = None
+        self._timer: Optional[threading.Timer] = None
+
+    def start(
+        self,
+        mode: str = "cprofile",
+        predictions: Optional[int] = None,
+        duration_s: Optional[float] = None,
+    ) -> ProfileSession:
+        """
+        Démarre une session pour les ``predictions`` prochaines prédictions
+        et/ou pendant ``duration_s`` secondes (la première limite atteinte
+        termine la session)
+        """
+        if mode not in PROFILING_MODES:
+            raise ValueError(f"Mode de profilage inconnu: {mode}")
+        if predictions is None and duration_s is None:
+            raise ValueError("Indiquer un nombre de prédictions ou une durée")
+
+        with self._lock:
+            if self.active:
+                raise ProfilingBusyError(
+                    f"Session de profilage en cours: {self.session.id}"
+                )
+            session_id = time.strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
+            directory = self.output_dir / session_id
+            directory.mkdir(parents=True, exist_ok=True)
+            session = ProfileSession(
+                id=session_id,
+                mode=mode,
+                directory=str(directory),
+                max_predictions=predictions,
+                duration_s=duration_s,
+            )
+            if mode == "tensorflow":
+                import tensorflow as tf
+
+                tf.profiler.experimental.start(str(directory))
+            self._profiles = []
+            self._deadline = (
+                time.monotonic() + duration_s if duration_s is not None else None
+            )
+            if duration_s is not None:
+                self._timer = threading.Timer(duration_s, self.stop)
+                self._timer.daemon = True
+                self._timer.start()
+            self.session = session
+            self.active = True
+
+        print(f"🔬 Profilage {mode} démarré ({session_id})")
+        return session
+
+    def _claim(self) -> bool:
+        """Réserve une prédiction de la session (False si elle est terminée)"""
+        with self._lock:
+            session = self.session
+            if not self.active:
+                return False
+            if self._deadline is not None and time.monotonic() >= self._deadline:
+                return False
+            if (
+                session.max_predictions is not None
+                and session.predictions >= session.max_predictions
+            ):
+                return False
+            session.predictions += 1
+            return True
+
+    def _is_exhausted(self) -> bool:
+        session = self.session
+        return (
+            session is not None
+            and session.max_predictions is not None
+            and session.predictions >= session.max_predictions
+        )
+
+    def run(self, function, *args, **kwargs):
+        """Exécute une prédiction, profilée si la session en a encore besoin"""
+        session = self.session
+        if not self.active or session is None:
+            return function(*args, **kwargs)
+
+        # Une seule prédiction profilée à la fois : les autres ne sont pas
+        # profilées plutôt que d'attendre ou d'échouer
+        exclusive = self._cprofile_lock if session.mode == "cprofile" else None
+        if exclusive is not None and not exclusive.acquire(blocking=False):
+            return function(*args, **kwargs)
+        try:
+            if not self._claim():
+                return function(*args, **kwargs)
+
+            profile = cProfile.Profile() if exclusive is not None else None
+            try:
+                if profile is None:
+                    return function(*args, **kwargs)
+                return profile.runcall(function, *args, **kwargs)
+            finally:
+                with self._lock:
+                    if profile is not None:
+                        self._profiles.append(profile)
+                    exhausted = self._is_exhausted()
+                if exhausted:
+                    self.stop()
+        finally:
+            if exclusive is not None:
+                exclusive.release()
+
+    def stop(self) -> Optional[ProfileSession]:
+        """Termine la session en cours et écrit le profil"""
+        with self._lock:
+            if not self.active:
+                return None
+            self.active = False
+            session, profiles = self.session, self._profiles
+            self._profiles = []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+        try:
+            self._write(session, profiles)
+            session.status = "completed"
+        except Exception as e:
+            session.status = "failed"
+            session.error = str(e)
+        session.finished_at = time.time()
+        directory = pathlib.Path(session.directory)
+        (directory / "session.json").write_text(json.dumps(session.to_dict(), indent=2))
+        print(
+            f"🔬 Profilage {session.mode} terminé ({session.id}): "
+            f"{session.predictions} prédiction(s)"
+        )
+        return session
+
+    def _write(self, session: ProfileSession, profiles: List[cProfile.Profile]):
+        directory = pathlib.Path(session.directory)
+        if session.mode == "tensorflow":
+            import tensorflow as tf
+
+            tf.profiler.experimental.stop()
+            return
+        if not profiles:
+            return
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+        stats.dump_stats(str(directory / "profile.pstats"))
+        report = io.StringIO()
+        pstats.Stats(str(directory / "profile.pstats"), stream=report).sort_stats(
+            "cumulative"
+        ).print_stats(TEXT_REPORT_LIMIT)
+        (directory / "profile.txt").write_text(report.getvalue())
+
+    def status(self) -> dict:
+        """Session en cours (ou dernière session) et sessions disponibles"""
+        session = self.session
+        return {
+            "active": self.active,
+            "session": session.to_dict() if session is not None else None,
+            "sessions": self.list_sessions(),
+        }
+
+    def list_sessions(self) -> List[str]:
+        if not self.output_dir.is_dir():
+            return []
+        return sorted(path.name for path in self.output_dir.iterdir() if path.is_dir())
+
+    def session_directory(self, session_id: str) -> Optional[pathlib.Path]:
+        """Répertoire d'une session terminée (None si inconnue ou en cours)"""
+        if session_id not in self.list_sessions():
+            return None
+        if self.active and self.session.id == session_id:
+            return None
+        return self.output_dir / session_id
+
+
+# Profileur de l'application (répertoire fixé par ``get_profiler``)
+_profiler: Optional[Profiler] = None
+
+
+def get_profiler() -> Profiler:
+    global _profiler
+    if _profiler is None:
+        from app.config import get_settings
+
+        _profiler = Profiler(get_settings().profiling_dir)
+    return _profiler
@@ -0,0 +1,121 @@
+"""
+Registre applicatif des composants partagés
+"""
+
+from typing import Optional
+
+from app.config import Settings, get_settings
+from app.services.admission import AdmissionController
+from app.services.batcher import MicroBatcher
+from app.services.executor import InferenceExecutor
+from app.services.sentiment_service import SentimentService
+
+MODEL_LOADING_MODES = ("eager", "lazy")
+
+
+class ServiceRegistry:
+    """
+    Instances uniques du service de sentiment, du pool d'inférence, du
+    micro-batcher et du contrôle d'admission, partagées par tous les
+    endpoints
+
+    En mode ``eager``, ``startup`` charge le modèle et exécute le warm-up
+    avant que l'application n'accepte du trafic. En mode ``lazy`` (Lambda),
+    le chargement a lieu lors de la première prédiction.
+    """
+
+    def __init__(self, settings: Optional[Settings] = None):
+        self.settings = settings or get_settings()
+        if self.settings.model_loading not in MODEL_LOADING_MODES:
+            raise ValueError(
+                f"Mode de chargement inconnu: {self.settings.model_loading}"
+            )
+        self._sentiment_service: Optional[SentimentService] = None
+        self._executor: Optional[InferenceExecutor] = None
+        self._batcher: Optional[MicroBatcher] = None
+        self._admission: Optional[AdmissionController] = None
+
+    @property
+    def sentiment_service(self) -> SentimentService:
+        if self._sentiment_service is None:
+            self._sentiment_service = SentimentService(self.settings)
+        return self._sentiment_service
+
+    @property
+    def executor(self) -> InferenceExecutor:
+        if self._executor is None:
+            self._executor = InferenceExecutor(
+                max_workers=self.settings.inference_workers
+            )
+        return self._executor
+
+    @property
+    def batcher(self) -> Optional[MicroBatcher]:
+        """Micro-batcher, ou None si le micro-batching est désactivé"""
+        if not self.settings.micro_batching_enabled:
+            return None
+        if self._batcher is None:
+            self._batcher = MicroBatcher(
+                lambda texts, use_cache: self.sentiment_service.predict_batch(
+                    texts, use_cache=use_cache
+                ),
+                max_batch_size=self.settings.batch_max_size,
+                max_wait_ms=self.settings.batch_max_wait_ms,
+                executor=self.executor,
+            )
+        return self._batcher
+
+    @property
+    def admission(self) -> Optional[AdmissionController]:
+        """
+        Contrôle d'admission, ou None s'il est désactivé
+
+        Avec le micro-batching, chaque worker traite un lot complet : autant
+        de requêtes que ``batch_max_size`` peuvent s'exécuter par worker.
+        """
+        if not self.settings.admission_enabled:
+            return None
+        if self._admission is None:
+            per_worker = (
+                self.settings.batch_max_size
+                if self.settings.micro_batching_enabled
+                else 1
+            )
+            self._admission = AdmissionController(
+                max_concurrency=self.settings.inference_workers * per_worker,
+                max_queue=self.settings.admission_max_queue,
+                default_deadline_s=self.settings.request_deadline_ms / 1000,
+            )
+        return self._admission
+
+    async def startup(self):
+        """Charge et préchauffe le modèle en mode ``eager``"""
+        if self.settings.model_loading != "eager":
+            print("💤 Chargement du modèle différé à la première prédiction")
+            return
+
+        try:
+            await self.executor.run(self.sentiment_service.warmup)
+        except Exception as e:
+            # L'API reste disponible ; /health signale le modèle non chargé
+            print(f"❌ Échec du chargement du modèle au démarrage: {e}")
+
+    async def shutdown(self):
+        """Arrête le micro-batcher et le pool d'inférence"""
+        if self._batcher is not None:
+            await self._batcher.close()
+            self._batcher = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+# Registre singleton de l'application
+_registry: Optional[ServiceRegistry] = None
+
+
+def get_registry() -> ServiceRegistry:
+    global _registry
+    if _registry is None:
+        _registry = ServiceRegistry()
+    return _registry
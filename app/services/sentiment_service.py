@@ -1,44 +1,222 @@
 import os
 import pathlib
 import pickle
-from typing import Tuple
+import time
+from typing import List, Optional, Tuple
 
-import tensorflow as tf
-from transformers import AutoTokenizer
+import numpy as np
 
-# Set cache directory for transformers to writable location in Lambda
-os.environ["TRANSFORMERS_CACHE"] = "/tmp/transformers_cache"
-os.environ["HF_HOME"] = "/tmp/huggingface_cache"
-os.environ["HF_DATASETS_CACHE"] = "/tmp/huggingface_datasets"
-os.environ["TORCH_HOME"] = "/tmp/torch_cache"
+from app.config import Settings, get_settings
+from app.services.backends import (
+    InferenceBackend,
+    TensorFlowBackend,
+    get_backend_class,
+    load_backend,
+)
+from app.services.cache import PredictionCache, cache_key
+from app.services.cascade import (
+    LINEAR_MODEL_FILENAME,
+    TIER_CACHE,
+    TIER_LINEAR,
+    TIER_TRANSFORMER,
+    CascadeStats,
+    LinearTier,
+    uncertain,
+)
+from app.services.coalescing import TIER_COALESCED, InFlightRegistry
+from app.services.loading import LoadState, SingleFlightLoader
+from app.services.metrics import (
+    CASCADE_PREDICTIONS,
+    COALESCED_PREDICTIONS,
+    MODEL_BATCH_SIZE,
+    MODEL_LOAD_SECONDS,
+    stage_timer,
+)
+from app.services.padding import pad_sequences, plan_batches
+from app.services.persistent_cache import TIER_PERSISTENT_CACHE, PersistentCache
+from app.services.profiling import get_profiler
+from app.services.tokenizer import TOKENIZER_FILENAME, FastTokenizer
 
-# Create cache directories if they don't exist
-cache_dirs = [
-    "/tmp/transformers_cache",
-    "/tmp/huggingface_cache",
-    "/tmp/huggingface_datasets",
-    "/tmp/torch_cache",
-]
+# Répertoires de cache inscriptibles (Lambda : seul /tmp l'est)
+CACHE_DIRS = {
+    "TRANSFORMERS_CACHE": "/tmp/transformers_cache",
+    "HF_HOME": "/tmp/huggingface_cache",
+    "HF_DATASETS_CACHE": "/tmp/huggingface_datasets",
+    "TORCH_HOME": "/tmp/torch_cache",
+}
 
-for cache_dir in cache_dirs:
-    pathlib.Path(cache_dir).mkdir(parents=True, exist_ok=True)
+
+def configure_cache_dirs():
+    """
+    Configure et crée les répertoires de cache des bibliothèques ML
+
+    Appelé explicitement avant le premier import de ``transformers`` ; les
+    valeurs déjà définies dans l'environnement sont conservées.
+    """
+    for env_var, default in CACHE_DIRS.items():
+        path = os.environ.setdefault(env_var, default)
+        pathlib.Path(path).mkdir(parents=True, exist_ok=True)
+
+
+def __getattr__(name: str):
+    """
+    Imports lourds différés : ``tensorflow`` et ``transformers`` ne sont
+    importés qu'au premier accès (chargement du modèle), pas à l'import du
+    module. ``sentiment_service.tf`` et ``sentiment_service.AutoTokenizer``
+    restent accessibles.
+    """
+    if name == "tf":
+        import tensorflow
+
+        return tensorflow
+    if name == "AutoTokenizer":
+        from transformers import AutoTokenizer
+
+        return AutoTokenizer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+PADDING_STRATEGIES = ("max_length", "dynamic")
+TOKENIZER_SOURCES = ("auto", "bundled", "hub")
+
+# Textes de warm-up de longueurs variées (un par bucket de longueur)
+WARMUP_TEXTS = (
+    "ok",
+    "I really enjoyed this movie, it was great",
+    " ".join(["this film was long but honestly quite good"] * 5),
+    " ".join(["the plot, the acting and the music were all terrible"] * 10),
+)
 
 
 class SentimentService:
     """Service pour l'analyse de sentiment avec DistilBERT"""
 
-    def __init__(self):
+    def __init__(self, settings: Optional[Settings] = None):
+        settings = settings or get_settings()
+        if settings.padding_strategy not in PADDING_STRATEGIES:
+            raise ValueError(
+                f"Stratégie de padding inconnue: {settings.padding_strategy}"
+            )
         self.model = None
+        self.backend: Optional[InferenceBackend] = None
         self.tokenizer = None
         self.label_encoder = None
+        if settings.tokenizer_source not in TOKENIZER_SOURCES:
+            raise ValueError(
+                f"Source de tokenizer inconnue: {settings.tokenizer_source}"
+            )
+        self.backend_class = get_backend_class(settings.inference_backend)
+        self.backend_class.check_precision(settings.model_precision)
+        self.precision = settings.model_precision
+        self.inference_threads = settings.inference_threads
         self.model_path = pathlib.Path("models/bert_curriculum_HF_last_version")
         self.model_name = "distilbert-base-uncased"
-        self._is_loaded = False
+        self.tokenizer_source = settings.tokenizer_source
+        self.max_length = 128
+        self.padding_strategy = settings.padding_strategy
+        self.sequence_buckets = tuple(
+            b for b in settings.sequence_buckets if b < self.max_length
+        ) + (self.max_length,)
+        self.max_tokens_per_batch = settings.max_tokens_per_batch
+        self.compiled_inference = settings.compiled_inference
+        self.xla_jit_compile = settings.xla_jit_compile
+        # Les prédictions quantifiées diffèrent légèrement : clés de cache
+        # distinctes
+        self.model_version = settings.model_version
+        if self.precision != "fp32":
+            self.model_version += f"-{self.precision}"
+        # Cascade : classifieur linéaire d'abord, DistilBERT pour les textes
+        # dont la probabilité tombe dans [cascade_low, cascade_high]
+        self.cascade_enabled = settings.cascade_enabled
+        self.cascade_low = settings.cascade_low
+        self.cascade_high = settings.cascade_high
+        self.linear_tier: Optional[LinearTier] = None
+        self.cascade_stats: Optional[CascadeStats] = None
+        if self.cascade_enabled:
+            if not 0.0 <= self.cascade_low <= self.cascade_high <= 1.0:
+                raise ValueError(
+                    f"Bande d'incertitude invalide: "
+                    f"[{self.cascade_low}, {self.cascade_high}]"
+                )
+            self.cascade_stats = CascadeStats(self.cascade_low, self.cascade_high)
+            self.model_version += f"-cascade{self.cascade_low}-{self.cascade_high}"
+        self.cache = (
+            PredictionCache(
+                max_entries=settings.prediction_cache_max_entries,
+                ttl_seconds=settings.prediction_cache_ttl_s,
+            )
+            if settings.prediction_cache_enabled
+            else None
+        )
+        # Second niveau partagé par les processus de l'hôte (SQLite)
+        self.persistent_cache = (
+            PersistentCache(
+                settings.persistent_cache_path,
+                max_entries=settings.persistent_cache_max_entries,
+                ttl_seconds=settings.persistent_cache_ttl_s,
+            )
+            if settings.persistent_cache_enabled
+            else None
+        )
+        # Les copies d'un texte en cours de calcul attendent son résultat
+        self.inflight = InFlightRegistry() if settings.coalescing_enabled else None
+        self.warmup_duration_s: Optional[float] = None
+        self.load_timings: dict = {}
+        self.profiler = get_profiler()
+        # Chargement unique partagé par les threads d'inférence
+        self._loader = SingleFlightLoader(
+            lambda: self._load_model(),
+            backoff_s=settings.model_load_backoff_s,
+            backoff_max_s=settings.model_load_backoff_max_s,
+        )
+
+    @property
+    def _is_loaded(self) -> bool:
+        return self._loader.state is LoadState.READY
+
+    @_is_loaded.setter
+    def _is_loaded(self, value: bool):
+        self._loader.reset(LoadState.READY if value else LoadState.NOT_LOADED)
+
+    @property
+    def load_state(self) -> LoadState:
+        """État du chargement : not_loaded, loading, ready ou failed"""
+        return self._loader.state
+
+    def load(self):
+        """
+        Charge le modèle, le tokenizer et le label encoder si nécessaire
+
+        Les appels concurrents attendent le chargement en cours. Après un
+        échec, ``ModelLoadError`` est levée sans nouvelle tentative tant que
+        le délai de backoff n'est pas écoulé.
+        """
+        self._loader.ensure_loaded()
+
+    def warmup(self):
+        """
+        Charge le modèle puis exécute quelques inférences de warm-up
+
+        Les inférences couvrent chaque forme de tenseur utilisée en
+        production (lot unitaire et lot multiple, chaque bucket en mode
+        ``dynamic``) afin que le traçage des graphes soit fait avant le
+        premier appel utilisateur. Le cache n'est pas alimenté.
+        """
+        self.load()
+        started_at = time.perf_counter()
+        for text in WARMUP_TEXTS:
+            self._predict_model([text])
+        self._predict_model(list(WARMUP_TEXTS))
+        if self.linear_tier is not None:
+            self.linear_tier.predict_proba(list(WARMUP_TEXTS))
+        self.warmup_duration_s = time.perf_counter() - started_at
+        print(f"🔥 Warm-up terminé en {self.warmup_duration_s:.2f}s")
 
     def _load_model(self):
         """Charge le modèle DistilBERT et les composants nécessaires"""
         try:
             print("🔍 Début du chargement du modèle...")
+            configure_cache_dirs()
             print(f"📁 Répertoire de travail: {os.getcwd()}")
             cache_dir_env = os.environ.get("TRANSFORMERS_CACHE", "Non défini")
             print("📁 Cache directory:")
@@ -61,32 +239,69 @@ class SentimentService:
             except Exception as e:
                 print(f"❌ Erreur d'écriture dans /tmp: {e}")
 
-            # Chemin vers le modèle SavedModel
+            # Chemin vers le modèle SavedModel et l'artefact du moteur
             model_dir = self.model_path / "distilbert_HF_100000k"
-            print(f"📁 Chemin du modèle: {model_dir}")
+            artifact = self.backend_class.artifact_path(model_dir, self.precision)
+            print(f"📁 Chemin du modèle: {artifact}")
+
+            if not artifact.exists():
+                raise FileNotFoundError(f"Modèle non trouvé: {artifact}")
+
+            print(
+                f"🔄 Chargement du modèle ({self.backend_class.name}, "
+                f"{self.precision})..."
+            )
+            started_at = time.perf_counter()
+            self.backend = load_backend(
+                self.backend_class.name,
+                model_dir,
+                sequence_lengths=self._sequence_lengths(),
+                compiled=self.compiled_inference,
+                jit_compile=self.xla_jit_compile,
+                num_threads=self.inference_threads,
+                precision=self.precision,
+            )
+            self.model = self.backend.model
+            self.load_timings["model_s"] = time.perf_counter() - started_at
 
-            if not model_dir.exists():
-                raise FileNotFoundError(f"Dossier du modèle non trouvé: {model_dir}")
+            fixed_length = self.backend.fixed_length
+            if fixed_length is not None and self.padding_strategy == "dynamic":
+                print(
+                    f"⚠️ Modèle exporté à longueur fixe ({fixed_length}) : "
+                    "buckets de padding désactivés"
+                )
+                self.sequence_buckets = (fixed_length,)
 
-            print("🔄 Chargement du modèle TensorFlow...")
-            # Charger le modèle avec tf.saved_model.load (plus compatible)
-            self.model = tf.saved_model.load(str(model_dir))
+            print("🔄 Préparation du moteur d'inférence...")
+            self.load_timings["trace_s"] = self.backend.warmup()
 
             print("🔄 Chargement du tokenizer...")
-            # Charger le tokenizer avec cache directory
-            self.tokenizer = AutoTokenizer.from_pretrained(
-                self.model_name,
-                cache_dir="/tmp/transformers_cache",
-                local_files_only=False,
-            )
+            started_at = time.perf_counter()
+            self.tokenizer = self._create_tokenizer()
+            self.load_timings["tokenizer_s"] = time.perf_counter() - started_at
 
             print("🔄 Chargement du label encoder...")
+            started_at = time.perf_counter()
             # Charger le label encoder
             le_path = self.model_path / "label_encoder.pkl"
             with open(le_path, "rb") as f:
                 self.label_encoder = pickle.load(f)
+            self.load_timings["label_encoder_s"] = time.perf_counter() - started_at
+
+            if self.cascade_enabled:
+                print("🔄 Chargement du classifieur linéaire (cascade)...")
+                started_at = time.perf_counter()
+                self.linear_tier = LinearTier.load(
+                    self.model_path / LINEAR_MODEL_FILENAME
+                )
+                self.load_timings["linear_s"] = time.perf_counter() - started_at
+
+            for key, value in self.load_timings.items():
+                if key.endswith("_s"):
+                    MODEL_LOAD_SECONDS.labels(component=key[:-2]).set(value)
 
             print("✅ Modèle DistilBERT chargé avec succès!")
+            print(f"⏱️ Temps de chargement: {self.load_timings}")
 
         except Exception as e:
             print(f"❌ Erreur lors du chargement du modèle: {e}")
@@ -95,51 +310,319 @@ class SentimentService:
             print(f"📋 Stack trace: {traceback.format_exc()}")
             raise
 
-    def predict_sentiment(self, text: str) -> Tuple[str, float]:
+    def _sequence_lengths(self) -> Tuple[int, ...]:
+        """Longueurs de séquence passées au modèle selon le padding"""
+        if self.padding_strategy == "dynamic":
+            return self.sequence_buckets
+        return (self.max_length,)
+
+    def _create_tokenizer(self):
+        """
+        Charge le tokenizer embarqué (``tokenizer.json``) sans accès réseau,
+        ou depuis le Hub Hugging Face selon ``TOKENIZER_SOURCE``
+        """
+        tokenizer_file = self.model_path / TOKENIZER_FILENAME
+        if self.tokenizer_source != "hub" and tokenizer_file.exists():
+            print(f"📦 Tokenizer embarqué: {tokenizer_file}")
+            self.load_timings["tokenizer_source"] = "bundled"
+            return FastTokenizer.from_file(tokenizer_file, max_length=self.max_length)
+
+        if self.tokenizer_source == "bundled":
+            raise FileNotFoundError(f"Tokenizer embarqué non trouvé: {tokenizer_file}")
+
+        self.load_timings["tokenizer_source"] = "hub"
+        from transformers import AutoTokenizer
+
+        # Charger le tokenizer avec cache directory
+        return AutoTokenizer.from_pretrained(
+            self.model_name,
+            cache_dir="/tmp/transformers_cache",
+            local_files_only=False,
+        )
+
+    def predict_sentiment(self, text: str, use_cache: bool = True) -> Tuple[str, float]:
         """
         Prédit le sentiment d'un texte
 
         Args:
             text: Le texte à analyser
+            use_cache: False pour ignorer le cache (le résultat y est rafraîchi)
 
         Returns:
             Tuple[str, float]: (sentiment, confidence)
                 - sentiment: "0" pour négatif, "4" pour positif
                 - confidence: Score de confiance entre 0 et 1
         """
-        if not self._is_loaded:
-            self._load_model()
-            self._is_loaded = True
-
-        # Tokeniser le texte
-        toks = self.tokenizer(
-            text,
-            truncation=True,
-            padding="max_length",
-            max_length=128,
-            return_tensors="tf",
-        )
+        return self.predict_batch([text], use_cache=use_cache)[0]
 
-        # Faire la prédiction avec tf.saved_model.load
-        # Le modèle attend une liste [ids, mask]
-        prediction = self.model(
-            [toks["input_ids"], toks["attention_mask"]], training=False
-        )
+    def predict_batch(
+        self, texts: List[str], use_cache: bool = True
+    ) -> List[Tuple[str, float]]:
+        """
+        Prédit le sentiment d'une liste de textes en un seul passage
 
-        # Extraire la probabilité
-        if isinstance(prediction, dict):
-            proba = prediction.get("dense", None)
+        Les textes absents du cache sont tokenisés en un seul appel, passés
+        au modèle en un seul appel et décodés en un seul appel au label
+        encoder. Les doublons du lot ne sont calculés qu'une fois, et les
+        textes en cours de calcul pour une autre requête sont attendus au
+        lieu d'être recalculés.
+
+        Args:
+            texts: Les textes à analyser
+            use_cache: False pour ignorer le cache (les résultats y sont
+                rafraîchis)
+
+        Returns:
+            List[Tuple[str, float]]: (sentiment, confidence) pour chaque
+            texte, dans l'ordre d'entrée
+        """
+        return self._profiled_batch(texts, use_cache)[0]
+
+    def predict_batch_with_tiers(
+        self, texts: List[str], use_cache: bool = True
+    ) -> List[Tuple[str, float, str]]:
+        """
+        Comme ``predict_batch``, avec l'étage qui a répondu pour chaque
+        texte : ``cache``, ``persistent_cache`` (cache SQLite partagé par les
+        processus), ``coalesced`` (résultat d'un calcul en cours pour
+        une autre requête), ``linear`` (cascade) ou ``transformer``
+        """
+        results, tiers = self._profiled_batch(texts, use_cache)
+        return [
+            (label, confidence, tier)
+            for (label, confidence), tier in zip(results, tiers)
+        ]
+
+    def _profiled_batch(self, texts: List[str], use_cache: bool):
+        if self.profiler.active:
+            return self.profiler.run(self._predict_batch, texts, use_cache)
+        return self._predict_batch(texts, use_cache)
+
+    def _predict_batch(
+        self, texts: List[str], use_cache: bool
+    ) -> Tuple[List[Tuple[str, float]], List[str]]:
+        if not texts:
+            return [], []
+
+        if (
+            self.cache is None
+            and self.persistent_cache is None
+            and self.inflight is None
+        ):
+            return self._predict_uncached(texts)
+
+        keys = [cache_key(text, self.model_version) for text in texts]
+        results: List[Optional[Tuple[str, float]]] = [None] * len(texts)
+        if use_cache and self.cache is not None:
+            results = [self.cache.get(key) for key in keys]
+        tiers = [TIER_CACHE] * len(texts)
+        if use_cache and self.persistent_cache is not None:
+            self._lookup_persistent(keys, results, tiers)
+
+        # Un seul calcul par clé manquante
+        missing = {}
+        for index, (key, result) in enumerate(zip(keys, results)):
+            if result is None:
+                missing.setdefault(key, index)
+
+        if missing:
+            by_key = self._predict_missing(texts, missing)
+            for index, (key, result) in enumerate(zip(keys, results)):
+                if result is None:
+                    results[index], tiers[index] = by_key[key]
+
+        return results, tiers
+
+    def _lookup_persistent(
+        self,
+        keys: List[str],
+        results: List[Optional[Tuple[str, float]]],
+        tiers: List[str],
+    ):
+        """
+        Complète ``results`` avec le cache persistant (absents du cache
+        mémoire uniquement) ; les entrées trouvées sont remises en mémoire
+        """
+        pending = [key for key, result in zip(keys, results) if result is None]
+        if not pending:
+            return
+
+        with stage_timer("persistent_cache"):
+            found = self.persistent_cache.get_many(pending)
+        for key, prediction in found.items():
+            if self.cache is not None:
+                self.cache.put(key, prediction)
+        for index, key in enumerate(keys):
+            if results[index] is None and key in found:
+                results[index] = found[key]
+                tiers[index] = TIER_PERSISTENT_CACHE
+
+    def _predict_missing(self, texts: List[str], missing: dict) -> dict:
+        """
+        Calcule les clés manquantes ; celles déjà en cours de calcul pour
+        une autre requête sont attendues au lieu d'être recalculées
+
+        Returns:
+            dict: clé -> ((sentiment, confidence), étage)
+        """
+        if self.inflight is None:
+            owned, joined = list(missing), {}
+        else:
+            owned, joined = self.inflight.claim(missing)
+
+        by_key = {}
+        if owned:
+            try:
+                computed, computed_tiers = self._predict_uncached(
+                    [texts[missing[key]] for key in owned]
+                )
+            except BaseException as e:
+                if self.inflight is not None:
+                    self.inflight.fail(owned, e)
+                raise
+            for key, prediction, tier in zip(owned, computed, computed_tiers):
+                # Mise en cache avant publication : pas de fenêtre sans résultat
+                if self.cache is not None:
+                    self.cache.put(key, prediction)
+                if self.inflight is not None:
+                    self.inflight.resolve(key, prediction)
+                by_key[key] = (prediction, tier)
+            if self.persistent_cache is not None:
+                self.persistent_cache.put_many(
+                    {key: prediction for key, (prediction, _) in by_key.items()}
+                )
+
+        # Les clés calculées par cette requête sont publiées avant l'attente
+        # des autres : deux requêtes qui s'attendent mutuellement progressent
+        if joined:
+            COALESCED_PREDICTIONS.inc(len(joined))
+            for key, future in joined.items():
+                by_key[key] = (future.result(), TIER_COALESCED)
+        return by_key
+
+    def _predict_uncached(
+        self, texts: List[str]
+    ) -> Tuple[List[Tuple[str, float]], List[str]]:
+        """
+        Prédit le sentiment des textes sans cache ; avec la cascade, seuls
+        les textes incertains pour le classifieur linéaire passent par
+        DistilBERT
+        """
+        self.load()
+        if self.linear_tier is None:
+            return self._predict_model(texts), [TIER_TRANSFORMER] * len(texts)
+
+        with stage_timer("linear"):
+            proba_values = self.linear_tier.predict_proba(texts)
+        escalate = uncertain(proba_values, self.cascade_low, self.cascade_high)
+        escalated = [text for text, flag in zip(texts, escalate) if flag]
+        transformer_results = iter(self._predict_model(escalated) if escalated else ())
+
+        results, tiers = [], []
+        for proba_value, flag in zip(proba_values, escalate):
+            if flag:
+                results.append(next(transformer_results))
+                tiers.append(TIER_TRANSFORMER)
+            else:
+                # Confiance : probabilité positive, comme pour DistilBERT
+                results.append(
+                    (self.linear_tier.label(proba_value), float(proba_value))
+                )
+                tiers.append(TIER_LINEAR)
+
+        self.cascade_stats.record(len(texts), len(escalated))
+        CASCADE_PREDICTIONS.labels(tier=TIER_LINEAR).inc(len(texts) - len(escalated))
+        CASCADE_PREDICTIONS.labels(tier=TIER_TRANSFORMER).inc(len(escalated))
+        return results, tiers
+
+    def _predict_model(self, texts: List[str]) -> List[Tuple[str, float]]:
+        """Prédit le sentiment des textes avec DistilBERT (modèle chargé)"""
+        if self.padding_strategy == "dynamic":
+            proba_values = self._predict_bucketed(texts)
         else:
-            proba = prediction
+            # Tokeniser tous les textes en un seul appel
+            with stage_timer("tokenize"):
+                toks = self.tokenizer(
+                    list(texts),
+                    truncation=True,
+                    padding="max_length",
+                    max_length=self.max_length,
+                    return_tensors="np",
+                )
+            proba_values = self._run_model(toks["input_ids"], toks["attention_mask"])
+
+        with stage_timer("decode"):
+            return self._decode(proba_values)
+
+    def _predict_bucketed(self, texts: List[str]) -> np.ndarray:
+        """
+        Prédit avec un padding limité au bucket de longueur de chaque texte
+
+        Les textes sont regroupés par bucket (``SEQUENCE_BUCKETS``) afin que
+        seules quelques formes de tenseurs soient tracées, et chaque lot
+        respecte le budget ``MAX_TOKENS_PER_BATCH``.
+        """
+        with stage_timer("tokenize"):
+            encoded = self.tokenizer(
+                list(texts), truncation=True, max_length=self.max_length, padding=False
+            )
+        sequences = encoded["input_ids"]
+        pad_id = self.tokenizer.pad_token_id or 0
+
+        proba_values = np.empty(len(sequences), dtype=np.float32)
+        plan = plan_batches(
+            [len(seq) for seq in sequences],
+            self.sequence_buckets,
+            self.max_tokens_per_batch,
+        )
+        for length, indices in plan:
+            with stage_timer("tokenize"):
+                input_ids, attention_mask = pad_sequences(
+                    [sequences[i] for i in indices], length, pad_id
+                )
+            proba_values[indices] = self._run_model(input_ids, attention_mask)
+        return proba_values
+
+    def _run_model(self, input_ids, attention_mask) -> np.ndarray:
+        """Exécute le modèle et retourne la probabilité positive par ligne"""
+        MODEL_BATCH_SIZE.observe(len(input_ids))
+        backend = self.backend
+        if backend is None:
+            # Modèle affecté directement (sans chargement) : appel générique
+            backend = TensorFlowBackend(self.model, compiled=False)
+        return backend.predict(input_ids, attention_mask)
+
+    def _decode(self, proba_values: np.ndarray) -> List[Tuple[str, float]]:
+        """Convertit les probabilités en (sentiment, confidence)"""
+        label_idx = (proba_values >= 0.5).astype(int)  # 0 = négatif, 1 = positif
+        labels = self.label_encoder.inverse_transform(label_idx)
+
+        return [
+            (str(label), float(proba_value))
+            for label, proba_value in zip(labels, proba_values)
+        ]
+
+    def cache_snapshot(self) -> Optional[dict]:
+        """Retourne les compteurs du cache (None s'il est désactivé)"""
+        return self.cache.snapshot() if self.cache is not None else None
+
+    def persistent_cache_snapshot(self) -> Optional[dict]:
+        """Compteurs et latence du cache persistant (None s'il est désactivé)"""
+        if self.persistent_cache is None:
+            return None
+        return self.persistent_cache.snapshot()
 
-        if proba is None:
-            raise ValueError("Impossible d'extraire la prédiction du modèle")
+    def coalescing_snapshot(self) -> Optional[dict]:
+        """Calculs en cours et prédictions coalescées (None si désactivé)"""
+        return self.inflight.snapshot() if self.inflight is not None else None
 
-        proba_value = proba.numpy()[0, 0]
-        label_idx = int(proba_value >= 0.5)  # 0 = négatif, 1 = positif
-        label = self.label_encoder.inverse_transform([label_idx])[0]
+    def cascade_snapshot(self) -> Optional[dict]:
+        """Réponses par étage et taux d'escalade (None sans cascade)"""
+        return self.cascade_stats.snapshot() if self.cascade_stats else None
 
-        return str(label), float(proba_value)
+    def load_snapshot(self) -> dict:
+        """État du chargement, tentatives, dernière erreur et backoff"""
+        return self._loader.snapshot()
 
     def is_model_loaded(self) -> bool:
         """Vérifie si le modèle est chargé"""
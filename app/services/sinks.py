@@ -0,0 +1,92 @@
+"""
+Destinations des résultats du scoring asynchrone (SQS / S3)
+
+``RESULT_SINK`` choisit la destination :
+    file:///tmp/sentiment-results   fichiers JSONL locaux (tests, débogage)
+    s3://bucket/prefix              objets JSONL sur S3 (boto3)
+
+Chaque écriture produit un objet JSONL ``<clé>.jsonl`` ; les clés sont
+déterministes, une nouvelle tentative réécrit donc le même objet.
+"""
+
+import json
+import pathlib
+from abc import ABC, abstractmethod
+from typing import List
+from urllib.parse import urlparse
+
+
+def encode_jsonl(records: List[dict]) -> bytes:
+    return "".join(
+        json.dumps(record, ensure_ascii=False) + "\n" for record in records
+    ).encode("utf-8")
+
+
+class ResultSink(ABC):
+    """Destination des lots de résultats"""
+
+    @abstractmethod
+    def write(self, key: str, records: List[dict]) -> str:
+        """Écrit un lot de résultats ; retourne son emplacement"""
+
+    def contains(self, bucket: str, key: str) -> bool:
+        """Indique si l'objet S3 ``bucket/key`` est sous cette destination"""
+        return False
+
+
+class LocalSink(ResultSink):
+    """Fichiers JSONL dans un répertoire local"""
+
+    def __init__(self, directory):
+        self.directory = pathlib.Path(directory)
+
+    def write(self, key: str, records: List[dict]) -> str:
+        path = self.directory / f"{key}.jsonl"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(encode_jsonl(records))
+        tmp.replace(path)
+        return str(path)
+
+
+class S3Sink(ResultSink):
+    """Objets JSONL sous ``s3://bucket/prefix``"""
+
+    def __init__(self, bucket: str, prefix: str = "", client=None):
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self._client = client
+
+    @property
+    def client(self):
+        if self._client is None:
+            # Import différé : boto3 n'est utile qu'avec ce sink
+            import boto3
+
+            self._client = boto3.client("s3")
+        return self._client
+
+    def contains(self, bucket: str, key: str) -> bool:
+        return bucket == self.bucket and (
+            not self.prefix or key.startswith(f"{self.prefix}/")
+        )
+
+    def write(self, key: str, records: List[dict]) -> str:
+        object_key = f"{self.prefix}/{key}.jsonl" if self.prefix else f"{key}.jsonl"
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=object_key,
+            Body=encode_jsonl(records),
+            ContentType="application/x-ndjson",
+        )
+        return f"s3://{self.bucket}/{object_key}"
+
+
+def sink_from_url(url: str) -> ResultSink:
+    """Construit le sink décrit par ``RESULT_SINK``"""
+    parsed = urlparse(url)
+    if parsed.scheme == "s3":
+        return S3Sink(parsed.netloc, parsed.path)
+    if parsed.scheme in ("file", ""):
+        return LocalSink(parsed.path if parsed.scheme else url)
+    raise ValueError(f"Destination de résultats inconnue: {url}")
@@ -0,0 +1,143 @@
+"""
+Scoring en flux de textes au format NDJSON (un objet JSON par ligne)
+
+Entrée : une ligne par texte, ``{"text": "...", "id": ...}`` (``id``
+facultatif, renvoyé tel quel) ou une simple chaîne JSON ``"..."``.
+Sortie : une ligne par texte, dans l'ordre d'entrée,
+``{"id": ..., "text": "...", "sentiment": "4", "confidence": 0.93}`` ou
+``{"line": 12, "error": "..."}`` pour une ligne invalide.
+
+La mémoire utilisée est bornée par ``batch_size`` lignes (et une ligne d'au
+plus ``max_line_bytes`` octets), quelle que soit la taille du corps.
+"""
+
+import json
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional, Tuple
+
+PredictBatch = Callable[[List[str]], Awaitable[List[Tuple[str, float]]]]
+
+
+class LineTooLongError(ValueError):
+    """Ligne NDJSON dépassant la taille maximale autorisée"""
+
+
+@dataclass
+class StreamItem:
+    """Ligne d'entrée analysée"""
+
+    line: int
+    text: Optional[str] = None
+    id: Any = None
+    error: Optional[str] = None
+
+
+async def iter_lines(
+    chunks: AsyncIterator[bytes], max_line_bytes: int
+) -> AsyncIterator[bytes]:
+    """
+    Découpe un flux d'octets en lignes sans le charger entièrement
+
+    Raises:
+        LineTooLongError: une ligne, complète ou encore en cours de lecture,
+            dépasse ``max_line_bytes`` octets
+    """
+    buffer = bytearray()
+    async for chunk in chunks:
+        buffer.extend(chunk)
+        start = 0
+        while True:
+            end = buffer.find(b"\n", start)
+            if end < 0:
+                break
+            if end - start > max_line_bytes:
+                raise LineTooLongError(f"Ligne de plus de {max_line_bytes} octets")
+            yield bytes(buffer[start:end])
+            start = end + 1
+        del buffer[:start]
+        if len(buffer) > max_line_bytes:
+            raise LineTooLongError(f"Ligne de plus de {max_line_bytes} octets")
+    if buffer:
+        yield bytes(buffer)
+
+
+def parse_line(line: bytes, number: int) -> Optional[StreamItem]:
+    """Analyse une ligne ; None pour une ligne vide"""
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        value = json.loads(line)
+    except ValueError as e:
+        return StreamItem(line=number, error=f"JSON invalide: {e}")
+
+    if isinstance(value, str):
+        return StreamItem(line=number, text=value)
+    if isinstance(value, dict) and isinstance(value.get("text"), str):
+        return StreamItem(line=number, text=value["text"], id=value.get("id"))
+    return StreamItem(line=number, error="Champ 'text' (chaîne) manquant")
+
+
+def _encode(record: dict) -> bytes:
+    return json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+async def _score(items: List[StreamItem], predict: PredictBatch) -> bytes:
+    texts = [item.text for item in items if item.error is None]
+    predictions = iter([])
+    error = None
+    if texts:
+        try:
+            predictions = iter(await predict(texts))
+        except Exception as e:
+            error = f"Erreur lors de la prédiction: {e}"
+
+    output = bytearray()
+    for item in items:
+        if item.error is not None or error is not None:
+            output += _encode({"line": item.line, "error": item.error or error})
+            continue
+        label, confidence = next(predictions)
+        record = {"text": item.text, "sentiment": label, "confidence": confidence}
+        if item.id is not None:
+            record = {"id": item.id, **record}
+        output += _encode(record)
+    return bytes(output)
+
+
+async def score_ndjson(
+    chunks: AsyncIterator[bytes],
+    predict: PredictBatch,
+    batch_size: int = 64,
+    max_line_bytes: int = 65536,
+) -> AsyncIterator[bytes]:
+    """
+    Score les lignes par lots de ``batch_size`` lignes au fil de leur
+    arrivée et produit les lignes de résultat de chaque lot
+
+    Une ligne invalide sans texte en attente avant elle est renvoyée
+    immédiatement ; sinon elle est renvoyée avec le lot, dans l'ordre.
+    """
+    items: List[StreamItem] = []
+    number = 0
+    try:
+        async for line in iter_lines(chunks, max_line_bytes):
+            number += 1
+            item = parse_line(line, number)
+            if item is None:
+                continue
+            if item.error is not None and not items:
+                yield _encode({"line": item.line, "error": item.error})
+                continue
+            items.append(item)
+            if len(items) >= batch_size:
+                yield await _score(items, predict)
+                items = []
+    except LineTooLongError as e:
+        if items:
+            yield await _score(items, predict)
+        yield _encode({"line": number + 1, "error": str(e)})
+        return
+
+    if items:
+        yield await _score(items, predict)
@@ -0,0 +1,198 @@
+"""
+Tokenizer DistilBERT embarqué, chargé hors ligne depuis un ``tokenizer.json``
+
+Usage :
+    python -m app.services.tokenizer export   # télécharge et enregistre le fichier
+    python -m app.services.tokenizer bench    # compare les temps de chargement
+"""
+
+import argparse
+import json
+import pathlib
+import subprocess
+import sys
+from typing import List, Optional, Sequence, Union
+
+from app.services.padding import pad_sequences
+
+TOKENIZER_FILENAME = "tokenizer.json"
+DEFAULT_MODEL_PATH = pathlib.Path("models/bert_curriculum_HF_last_version")
+DEFAULT_MODEL_NAME = "distilbert-base-uncased"
+
+
+class FastTokenizer:
+    """
+    Tokenizer Rust (bibliothèque ``tokenizers``) avec l'interface utilisée
+    par ``SentimentService``
+
+    Aucun accès au Hub Hugging Face ni import de ``transformers`` : le
+    fichier ``tokenizer.json`` contient la normalisation, la
+    pré-tokenisation, le vocabulaire et les tokens spéciaux.
+    """
+
+    def __init__(self, tokenizer, max_length: int = 128):
+        self._tokenizer = tokenizer
+        self.max_length = max_length
+        # Configuration fixée une fois : l'objet est partagé entre threads
+        self._tokenizer.no_padding()
+        self._tokenizer.enable_truncation(max_length)
+        pad_id = tokenizer.token_to_id("[PAD]")
+        self.pad_token_id = pad_id if pad_id is not None else 0
+
+    @classmethod
+    def from_file(
+        cls, path: Union[str, pathlib.Path], max_length: int = 128
+    ) -> "FastTokenizer":
+        from tokenizers import Tokenizer
+
+        return cls(Tokenizer.from_file(str(path)), max_length=max_length)
+
+    def __call__(
+        self,
+        texts: Union[str, Sequence[str]],
+        truncation: bool = True,
+        padding: Union[bool, str] = False,
+        max_length: Optional[int] = None,
+        return_tensors: Optional[str] = None,
+    ) -> dict:
+        """
+        Tokenise un texte ou une liste de textes
+
+        Args:
+            padding: False, "longest"/True ou "max_length"
+            return_tensors: None (listes), "np" ou "tf"
+        """
+        if max_length is not None and max_length != self.max_length:
+            raise ValueError(
+                f"max_length={max_length} différent de celui du tokenizer "
+                f"({self.max_length})"
+            )
+        if isinstance(texts, str):
+            texts = [texts]
+
+        sequences: List[List[int]] = [
+            encoding.ids for encoding in self._tokenizer.encode_batch(list(texts))
+        ]
+
+        if not padding:
+            if return_tensors is not None:
+                raise ValueError("return_tensors nécessite un padding")
+            return {
+                "input_ids": sequences,
+                "attention_mask": [[1] * len(seq) for seq in sequences],
+            }
+
+        if padding == "max_length":
+            length = self.max_length
+        else:
+            length = max(len(seq) for seq in sequences)
+        input_ids, attention_mask = pad_sequences(sequences, length, self.pad_token_id)
+
+        if return_tensors == "tf":
+            import tensorflow as tf
+
+            input_ids, attention_mask = tf.constant(input_ids), tf.constant(
+                attention_mask
+            )
+        elif return_tensors not in (None, "np"):
+            raise ValueError(f"return_tensors non supporté: {return_tensors}")
+
+        return {"input_ids": input_ids, "attention_mask": attention_mask}
+
+
+def export_tokenizer(
+    model_name: str = DEFAULT_MODEL_NAME,
+    output: pathlib.Path = DEFAULT_MODEL_PATH / TOKENIZER_FILENAME,
+) -> pathlib.Path:
+    """Télécharge le tokenizer rapide depuis le Hub et l'enregistre en JSON"""
+    from transformers import AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    if not tokenizer.is_fast:
+        raise ValueError(f"Le tokenizer {model_name} n'a pas de version rapide")
+
+    output = pathlib.Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tokenizer.backend_tokenizer.save(str(output))
+    return output
+
+
+_BENCH_BUNDLED = """
+import time
+t0 = time.perf_counter()
+from app.services.tokenizer import FastTokenizer
+tok = FastTokenizer.from_file({path!r})
+tok(["warm up"], padding="max_length", return_tensors="np")
+print(time.perf_counter() - t0)
+"""
+
+_BENCH_HUB = """
+import time
+t0 = time.perf_counter()
+from transformers import AutoTokenizer
+tok = AutoTokenizer.from_pretrained({name!r}, cache_dir="/tmp/transformers_cache")
+tok(["warm up"], padding="max_length", max_length=128, return_tensors="np")
+print(time.perf_counter() - t0)
+"""
+
+
+def benchmark_loading(
+    tokenizer_file: pathlib.Path, model_name: str = DEFAULT_MODEL_NAME, runs: int = 3
+) -> dict:
+    """
+    Mesure le temps de chargement (imports compris) de chaque source de
+    tokenizer, chaque mesure dans un processus neuf
+    """
+
+    def measure(code: str) -> List[float]:
+        timings = []
+        for _ in range(runs):
+            result = subprocess.run(
+                [sys.executable, "-c", code],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            timings.append(float(result.stdout.strip().splitlines()[-1]))
+        return timings
+
+    report = {"bundled_s": measure(_BENCH_BUNDLED.format(path=str(tokenizer_file)))}
+    try:
+        report["hub_s"] = measure(_BENCH_HUB.format(name=model_name))
+    except subprocess.CalledProcessError as e:
+        report["hub_error"] = e.stderr.strip().splitlines()[-1]
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tokenizer embarqué")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="Exporter tokenizer.json")
+    export_parser.add_argument("--model-name", default=DEFAULT_MODEL_NAME)
+    export_parser.add_argument(
+        "--output", type=pathlib.Path, default=DEFAULT_MODEL_PATH / TOKENIZER_FILENAME
+    )
+
+    bench_parser = subparsers.add_parser(
+        "bench", help="Comparer les temps de chargement embarqué / Hub"
+    )
+    bench_parser.add_argument(
+        "--tokenizer-file",
+        type=pathlib.Path,
+        default=DEFAULT_MODEL_PATH / TOKENIZER_FILENAME,
+    )
+    bench_parser.add_argument("--model-name", default=DEFAULT_MODEL_NAME)
+    bench_parser.add_argument("--runs", type=int, default=3)
+
+    args = parser.parse_args(argv)
+    if args.command == "export":
+        path = export_tokenizer(args.model_name, args.output)
+        print(f"✅ Tokenizer exporté: {path}")
+    else:
+        report = benchmark_loading(args.tokenizer_file, args.model_name, args.runs)
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""
+Serveur multi-processus : workers forkés partageant les poids du modèle
+
+Usage :
+    python -m app.serving --workers 8 --port 8000
+    WORKERS=8 INFERENCE_BACKEND=onnx python -m app.serving
+
+Le processus parent ouvre le socket d'écoute, projette en mémoire
+(``mmap``) l'artefact du modèle puis forke les workers uvicorn, qui
+acceptent les connexions sur le socket hérité. Les pages du fichier
+projeté sont partagées par tous les processus via le cache de pages du
+noyau. Avec le moteur ``tflite``, l'interpréteur exécute le flatbuffer
+directement depuis le fichier projeté : les poids ne sont présents qu'une
+fois en mémoire quel que soit le nombre de workers. Avec ``onnx``, le
+fichier n'est lu qu'une fois depuis le disque mais chaque session ONNX
+Runtime garde sa copie des initialiseurs.
+
+Les threads intra-op sont répartis entre les workers
+(``cpu_count // workers``) pour éviter la sur-souscription des cœurs.
+
+Le moteur ``tensorflow`` n'est pas fork-safe : le parent n'importe jamais
+TensorFlow et chaque worker chargerait sa propre copie privée du SavedModel
+(mémoire multipliée par le nombre de workers). Le serveur démarre donc un
+seul worker avec ce moteur ; utiliser ``INFERENCE_BACKEND=tflite`` pour
+plusieurs workers.
+"""
+
+import argparse
+import mmap
+import os
+import pathlib
+import signal
+import socket
+import sys
+import time
+from typing import Dict, Optional
+
+from app.config import Settings, get_settings
+from app.services.backends import get_backend_class
+
+# Variables lues par les bibliothèques de calcul pour dimensionner leurs pools
+THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "TF_NUM_INTRAOP_THREADS",
+)
+
+# Un worker qui s'arrête plus tôt est considéré en échec de démarrage
+MIN_WORKER_UPTIME_S = 5.0
+
+
+def threads_per_worker(workers: int, cpu_count: Optional[int] = None) -> int:
+    """Threads intra-op par worker pour ne pas dépasser le nombre de cœurs"""
+    cpu_count = cpu_count or len(os.sched_getaffinity(0))
+    return max(1, cpu_count // max(1, workers))
+
+
+def worker_environment(threads: int) -> Dict[str, str]:
+    """Variables d'environnement d'un worker (pools de threads bornés)"""
+    environment = {name: str(threads) for name in THREAD_ENV_VARS}
+    environment["TF_NUM_INTEROP_THREADS"] = "1"
+    environment["INFERENCE_THREADS"] = str(threads)
+    return environment
+
+
+def effective_workers(settings: Settings, workers: int) -> int:
+    """
+    Nombre de workers à démarrer : un seul avec le moteur ``tensorflow``,
+    dont les poids ne sont pas partagés entre processus
+    """
+    if workers > 1 and settings.inference_backend == "tensorflow":
+        print(
+            f"⚠️ Moteur tensorflow : {workers} workers demandés mais poids non "
+            "partagés (une copie du SavedModel par worker), démarrage d'un seul "
+            "worker (utiliser INFERENCE_BACKEND=tflite pour plusieurs workers)"
+        )
+        return 1
+    return max(1, workers)
+
+
+def model_artifact(settings: Settings, model_path: pathlib.Path) -> pathlib.Path:
+    backend_class = get_backend_class(settings.inference_backend)
+    model_dir = model_path / "distilbert_HF_100000k"
+    return backend_class.artifact_path(model_dir, settings.model_precision)
+
+
+def preload_weights(
+    settings: Settings,
+    model_path: pathlib.Path = pathlib.Path("models/bert_curriculum_HF_last_version"),
+) -> Optional[mmap.mmap]:
+    """
+    Projette l'artefact du modèle en lecture seule et le charge dans le
+    cache de pages avant le fork
+
+    Retourne la projection (à garder ouverte pendant la vie du serveur), ou
+    None pour le moteur ``tensorflow`` et si l'artefact est absent.
+    """
+    if settings.inference_backend == "tensorflow":
+        print(
+            "⚠️ Moteur tensorflow : poids non partagés, chaque worker charge "
+            "sa propre copie du SavedModel (utiliser tflite ou onnx)"
+        )
+        return None
+
+    artifact = model_artifact(settings, model_path)
+    if not artifact.is_file():
+        print(f"⚠️ Artefact du modèle absent, pas de préchargement: {artifact}")
+        return None
+
+    with open(artifact, "rb") as f:
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if hasattr(mapping, "madvise"):
+        mapping.madvise(mmap.MADV_WILLNEED)
+    # Toucher chaque page pour la charger une seule fois, dans le parent
+    for offset in range(0, len(mapping), mmap.PAGESIZE):
+        mapping[offset]
+    print(f"📦 Poids projetés en mémoire: {artifact} ({len(mapping) / 1e6:.1f} Mo)")
+    return mapping
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+class WorkerPool:
+    """
+    Superviseur des workers forkés
+
+    Les workers arrêtés de façon inattendue sont relancés, sauf s'ils
+    échouent dès le démarrage ; SIGTERM/SIGINT sont relayés aux workers, qui
+    terminent leurs requêtes en cours.
+    """
+
+    def __init__(
+        self,
+        app,
+        sock: socket.socket,
+        workers: int,
+        threads: int,
+        log_level: str = "info",
+        weights: Optional[mmap.mmap] = None,
+    ):
+        self.app = app
+        self.sock = sock
+        # Projection des poids gardée ouverte pendant la vie du serveur
+        self.weights = weights
+        self.workers = workers
+        self.threads = threads
+        self.log_level = log_level
+        self.pids: Dict[int, int] = {}
+        self._started_at: Dict[int, float] = {}
+        self._stopping = False
+        self._failed = False
+
+    def _spawn(self, index: int):
+        # Vider les tampons : sinon dupliqués dans l'enfant
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid:
+            self.pids[pid] = index
+            self._started_at[pid] = time.monotonic()
+            return
+
+        # Processus enfant
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        os.environ.update(worker_environment(self.threads))
+        get_settings.cache_clear()
+        exit_code = 0
+        try:
+            import uvicorn
+
+            config = uvicorn.Config(self.app, log_level=self.log_level)
+            uvicorn.Server(config).run(sockets=[self.sock])
+        except BaseException as e:
+            print(f"❌ Worker {index} (pid {os.getpid()}) arrêté: {e}")
+            exit_code = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(exit_code)
+
+    def _stop(self, signum, frame):
+        self._stopping = True
+        for pid in list(self.pids):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run(self) -> int:
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+        for index in range(self.workers):
+            self._spawn(index)
+        print(
+            f"🚀 {self.workers} workers démarrés ({self.threads} threads "
+            f"intra-op chacun): {sorted(self.pids)}"
+        )
+
+        while self.pids:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+            index = self.pids.pop(pid, None)
+            if index is None or self._stopping:
+                continue
+            uptime = time.monotonic() - self._started_at.pop(pid)
+            if uptime < MIN_WORKER_UPTIME_S:
+                print(f"❌ Worker {index} (pid {pid}) en échec au démarrage")
+                self._failed = True
+                self._stop(signal.SIGTERM, None)
+                continue
+            print(f"⚠️ Worker {index} (pid {pid}) terminé ({status}), relance")
+            self._spawn(index)
+        print("👋 Arrêt du serveur")
+        return 1 if self._failed else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Serveur multi-processus")
+    parser.add_argument("--app", default="main:app")
+    parser.add_argument("--host", default=os.environ.get("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", 8000)))
+    parser.add_argument(
+        "--workers", type=int, default=int(os.environ.get("WORKERS", 1))
+    )
+    parser.add_argument(
+        "--threads-per-worker",
+        type=int,
+        default=None,
+        help="Par défaut : cœurs disponibles // workers",
+    )
+    parser.add_argument("--log-level", default=os.environ.get("LOG_LEVEL", "info"))
+    args = parser.parse_args(argv)
+
+    settings = Settings.from_env()
+    workers = effective_workers(settings, args.workers)
+    threads = args.threads_per_worker or threads_per_worker(workers)
+    sock = bind_socket(args.host, args.port)
+    weights = preload_weights(settings)
+
+    # Import de l'application avant le fork : modules partagés en
+    # copie-sur-écriture (TensorFlow n'est pas importé à ce stade)
+    import uvicorn.importer
+
+    app = uvicorn.importer.import_from_string(args.app)
+    print(f"🌐 Écoute sur http://{args.host}:{args.port}")
+    pool = WorkerPool(app, sock, workers, threads, args.log_level, weights)
+    return pool.run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,3 @@
+"""
+Benchmarks de l'API d'analyse de sentiment
+"""
@@ -0,0 +1,156 @@
+"""
+Surcoût par invocation Lambda : chemin rapide contre Mangum/FastAPI
+
+Usage :
+    python -m benchmarks.lambda_paths
+    python -m benchmarks.lambda_paths --events events.jsonl --iterations 2000
+    python -m benchmarks.lambda_paths --service real --output lambda_paths.json
+
+Les événements API Gateway (un par ligne dans ``--events``, sinon un jeu
+par défaut de prédictions unitaires et par lot) sont rejoués dans le
+processus par ``fast_path.handle`` puis par le handler Mangum. Avec
+``--service stub`` (défaut), le service renvoie une prédiction constante :
+la mesure isole le coût du routage, de la validation et de la
+sérialisation. ``--service real`` utilise le modèle chargé.
+"""
+
+import argparse
+import asyncio
+import json
+import pathlib
+import sys
+import time
+from typing import List, Optional
+
+import numpy as np
+
+DEFAULT_EVENTS = [
+    ("/predict-sentiment/", {"text": "I really enjoyed this movie!"}),
+    ("/predict-sentiment/", {"text": "This movie was terrible and boring."}),
+    (
+        "/predict-sentiment/batch",
+        {"texts": ["I love it!", "I hate it!", "Not bad at all", "Meh."]},
+    ),
+]
+
+
+class StubService:
+    """Service à réponse constante : isole le surcoût de la pile HTTP"""
+
+    def predict_sentiment(self, text, use_cache=True):
+        return "4", 0.95
+
+    def predict_batch(self, texts, use_cache=True):
+        return [("4", 0.95)] * len(texts)
+
+
+def api_gateway_event(path: str, body: dict, method: str = "POST") -> dict:
+    """Événement API Gateway REST (v1) minimal accepté par Mangum"""
+    headers = {"content-type": "application/json"}
+    return {
+        "resource": "/{proxy+}",
+        "path": path,
+        "httpMethod": method,
+        "headers": headers,
+        "multiValueHeaders": {k: [v] for k, v in headers.items()},
+        "queryStringParameters": None,
+        "multiValueQueryStringParameters": None,
+        "requestContext": {
+            "resourcePath": "/{proxy+}",
+            "httpMethod": method,
+            "path": f"/prod{path}",
+            "stage": "prod",
+            "identity": {"sourceIp": "127.0.0.1"},
+        },
+        "body": json.dumps(body),
+        "isBase64Encoded": False,
+    }
+
+
+def load_events(path: Optional[pathlib.Path] = None) -> List[dict]:
+    if path is None:
+        return [api_gateway_event(p, body) for p, body in DEFAULT_EVENTS]
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _percentiles_us(durations: List[float]) -> dict:
+    values = np.asarray(durations) * 1e6
+    return {
+        "p50_us": round(float(np.percentile(values, 50)), 1),
+        "p95_us": round(float(np.percentile(values, 95)), 1),
+        "mean_us": round(float(values.mean()), 1),
+    }
+
+
+def replay(invoke, events: List[dict], iterations: int, warmup: int = 50) -> dict:
+    for index in range(warmup):
+        invoke(events[index % len(events)])
+    durations = []
+    for index in range(iterations):
+        event = events[index % len(events)]
+        started_at = time.perf_counter()
+        invoke(event)
+        durations.append(time.perf_counter() - started_at)
+    return _percentiles_us(durations)
+
+
+def run(events: List[dict], iterations: int, service_kind: str = "stub") -> dict:
+    # Mangum utilise la boucle courante du thread
+    asyncio.set_event_loop(asyncio.new_event_loop())
+    from app.api import fast_path
+    from app.api.dependencies import get_batcher, get_sentiment_service
+    from main import app
+    from main_lambda import handler
+
+    if service_kind == "stub":
+        service = StubService()
+    else:
+        service = get_sentiment_service()
+        service.warmup()
+    app.dependency_overrides[get_sentiment_service] = lambda: service
+    app.dependency_overrides[get_batcher] = lambda: None
+
+    try:
+        routed = [event for event in events if fast_path.route(event)]
+        mismatches = sum(
+            fast_path.handle(event, service)["body"] != handler(event, None)["body"]
+            for event in routed
+        )
+        fast = replay(
+            lambda event: fast_path.handle(event, service), routed, iterations
+        )
+        mangum = replay(lambda event: handler(event, None), routed, iterations)
+    finally:
+        app.dependency_overrides.clear()
+
+    return {
+        "service": service_kind,
+        "events": len(routed),
+        "iterations": iterations,
+        "body_mismatches": mismatches,
+        "fast_path": fast,
+        "mangum": mangum,
+        "overhead_saved_us": round(mangum["mean_us"] - fast["mean_us"], 1),
+        "speedup": round(mangum["mean_us"] / fast["mean_us"], 2),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Chemin rapide Lambda vs Mangum")
+    parser.add_argument("--events", type=pathlib.Path, default=None)
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--service", choices=("stub", "real"), default="stub")
+    parser.add_argument("--output", type=pathlib.Path, default=None)
+    args = parser.parse_args(argv)
+
+    result = run(load_events(args.events), args.iterations, args.service)
+    print(json.dumps(result, indent=2))
+    if args.output:
+        args.output.write_text(json.dumps(result, indent=2))
+        print(f"📄 Résultats écrits dans {args.output}")
+    return 1 if result["body_mismatches"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,266 @@
+"""
+SavedModel DistilBERT à poids aléatoires pour les benchmarks
+
+Quand les poids suivis par DVC ne sont pas disponibles, les benchmarks
+utilisent un modèle de même architecture (6 couches, 12 têtes, dimension
+768, vocabulaire de 30522 tokens) initialisé aléatoirement : le coût
+d'inférence est celui du vrai modèle, seules les prédictions diffèrent.
+
+Le répertoire produit a la disposition attendue par ``SentimentService`` :
+
+    <répertoire>/distilbert_HF_100000k/   SavedModel (signature serving_default)
+    <répertoire>/label_encoder.pkl        classes "0" / "4"
+    <répertoire>/tokenizer.json           tokenizer embarqué du dépôt s'il
+                                          existe, sinon WordPiece synthétique
+    <répertoire>/model_config.json        configuration (réutilisation)
+
+Usage :
+    python -m benchmarks.random_model /tmp/sentiment-bench-model
+    python -m benchmarks.random_model /tmp/tiny --layers 1 --dim 64 --heads 2
+"""
+
+import argparse
+import json
+import math
+import pathlib
+import pickle
+import shutil
+import sys
+from dataclasses import asdict, dataclass
+
+from app.services.tokenizer import DEFAULT_MODEL_PATH, TOKENIZER_FILENAME
+
+MODEL_DIRNAME = "distilbert_HF_100000k"
+CONFIG_FILENAME = "model_config.json"
+# Incrémenté quand le SavedModel produit change (modèles existants reconstruits)
+MODEL_FORMAT = 2
+
+# Mots des textes générés et du vocabulaire synthétique (un token par mot)
+WORDS = (
+    "the movie film plot story acting actor actress music scene scenes "
+    "director script ending character characters camera sound effects "
+    "was is were are been being it this that these those and but or so "
+    "very really quite truly almost never always too not no yes just "
+    "good great excellent amazing wonderful brilliant fantastic perfect "
+    "bad terrible awful boring poor horrible weak dull stupid waste "
+    "love loved like liked enjoyed hate hated disliked recommend watch "
+    "watched see saw again time times first last long short slow fast "
+    "funny sad scary beautiful ugly smart clever predictable original "
+    "i you we they he she my your our their me us them his her "
+    "with without about from into over after before during while "
+    "a an of in on at to for by as one two three all some most more "
+    "best worst better worse much many few lot little nothing something "
+    "year years people fans friends family kids night day hours minutes "
+    ". , ! ?"
+).split()
+
+SPECIAL_TOKENS = ("[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]")
+
+
+@dataclass(frozen=True)
+class ModelConfig:
+    """Dimensions du modèle (DistilBERT base par défaut)"""
+
+    vocab_size: int = 30522
+    dim: int = 768
+    layers: int = 6
+    heads: int = 12
+    hidden_dim: int = 3072
+    max_position: int = 512
+    seed: int = 0
+
+
+def synthetic_tokenizer(path: pathlib.Path):
+    """Tokenizer WordPiece (normalisation BERT) sur le vocabulaire ``WORDS``"""
+    from tokenizers import Tokenizer, models, normalizers, pre_tokenizers
+    from tokenizers.processors import BertProcessing
+
+    letters = "abcdefghijklmnopqrstuvwxyz0123456789"
+    vocab = list(SPECIAL_TOKENS) + sorted(set(WORDS))
+    vocab += [c for c in letters if c not in vocab] + [f"##{c}" for c in letters]
+    ids = {token: i for i, token in enumerate(vocab)}
+    tokenizer = Tokenizer(models.WordPiece(ids, unk_token="[UNK]"))
+    tokenizer.normalizer = normalizers.BertNormalizer(lowercase=True)
+    tokenizer.pre_tokenizer = pre_tokenizers.BertPreTokenizer()
+    tokenizer.post_processor = BertProcessing(
+        ("[SEP]", ids["[SEP]"]), ("[CLS]", ids["[CLS]"])
+    )
+    tokenizer.save(str(path))
+    return path
+
+
+def _module(config: ModelConfig):
+    import tensorflow as tf
+
+    INPUT_SIGNATURE = [
+        tf.TensorSpec([None, None], tf.int32, name="input_ids"),
+        tf.TensorSpec([None, None], tf.int32, name="attention_mask"),
+    ]
+
+    class RandomDistilBert(tf.Module):
+        """Encodeur DistilBERT et tête de classification binaire"""
+
+        def __init__(self):
+            super().__init__()
+            rng = tf.random.Generator.from_seed(config.seed)
+
+            def weight(*shape):
+                return tf.Variable(rng.normal(shape, stddev=0.02))
+
+            def zeros(*shape):
+                return tf.Variable(tf.zeros(shape))
+
+            def ones(*shape):
+                return tf.Variable(tf.ones(shape))
+
+            dim, hidden = config.dim, config.hidden_dim
+            self.word_embeddings = weight(config.vocab_size, dim)
+            self.position_embeddings = weight(config.max_position, dim)
+            self.embedding_norm = (ones(dim), zeros(dim))
+            self.blocks = [
+                {
+                    "qkv": weight(dim, 3 * dim),
+                    "qkv_bias": zeros(3 * dim),
+                    "out": weight(dim, dim),
+                    "out_bias": zeros(dim),
+                    "attention_norm": (ones(dim), zeros(dim)),
+                    "ffn_in": weight(dim, hidden),
+                    "ffn_in_bias": zeros(hidden),
+                    "ffn_out": weight(hidden, dim),
+                    "ffn_out_bias": zeros(dim),
+                    "output_norm": (ones(dim), zeros(dim)),
+                }
+                for _ in range(config.layers)
+            ]
+            self.pre_classifier = (weight(dim, dim), zeros(dim))
+            self.classifier = (weight(dim, 1), zeros(1))
+
+        @staticmethod
+        def _norm(x, params):
+            gamma, beta = params
+            mean, variance = tf.nn.moments(x, axes=[-1], keepdims=True)
+            return (x - mean) * tf.math.rsqrt(variance + 1e-12) * gamma + beta
+
+        def _block(self, x, bias, block):
+            batch, length = tf.shape(x)[0], tf.shape(x)[1]
+            heads, head_dim = config.heads, config.dim // config.heads
+
+            qkv = tf.matmul(x, block["qkv"]) + block["qkv_bias"]
+            qkv = tf.reshape(qkv, [batch, length, 3, heads, head_dim])
+            q, k, v = tf.unstack(tf.transpose(qkv, [2, 0, 3, 1, 4]))
+            scores = tf.matmul(q, k, transpose_b=True) / math.sqrt(head_dim)
+            context = tf.matmul(tf.nn.softmax(scores + bias, axis=-1), v)
+            context = tf.reshape(
+                tf.transpose(context, [0, 2, 1, 3]), [batch, length, config.dim]
+            )
+            attention = tf.matmul(context, block["out"]) + block["out_bias"]
+            x = self._norm(x + attention, block["attention_norm"])
+
+            hidden = tf.nn.gelu(tf.matmul(x, block["ffn_in"]) + block["ffn_in_bias"])
+            output = tf.matmul(hidden, block["ffn_out"]) + block["ffn_out_bias"]
+            return self._norm(x + output, block["output_norm"])
+
+        @tf.function(input_signature=INPUT_SIGNATURE)
+        def serve(self, input_ids, attention_mask):
+            return self._forward(input_ids, attention_mask)
+
+        @tf.function
+        def __call__(self, inputs, training=False):
+            # Appel direct ``model([ids, mask])`` (COMPILED_INFERENCE=false,
+            # vérification des exports)
+            return self._forward(*inputs)
+
+        def _forward(self, input_ids, attention_mask):
+            length = tf.shape(input_ids)[1]
+            x = tf.gather(self.word_embeddings, input_ids)
+            x += self.position_embeddings[:length]
+            x = self._norm(x, self.embedding_norm)
+            # Masque additif [batch, 1, 1, longueur] sur les positions de padding
+            bias = (1.0 - tf.cast(attention_mask, tf.float32)) * -1e9
+            bias = bias[:, tf.newaxis, tf.newaxis, :]
+            for block in self.blocks:
+                x = self._block(x, bias, block)
+            weights, biases = self.pre_classifier
+            pooled = tf.nn.relu(tf.matmul(x[:, 0], weights) + biases)
+            weights, biases = self.classifier
+            return {"dense": tf.sigmoid(tf.matmul(pooled, weights) + biases)}
+
+    module = RandomDistilBert()
+    # Tracé avant l'enregistrement : seules les fonctions tracées sont sauvées
+    module.__call__.get_concrete_function(INPUT_SIGNATURE)
+    return module
+
+
+def _saved_config(config: ModelConfig) -> dict:
+    return {**asdict(config), "format": MODEL_FORMAT}
+
+
+def build_random_model(
+    directory, config: ModelConfig = ModelConfig(), force: bool = False
+) -> pathlib.Path:
+    """
+    Construit (ou réutilise, si la configuration est identique) le modèle
+    aléatoire dans ``directory`` ; retourne ``directory``
+    """
+    directory = pathlib.Path(directory)
+    config_file = directory / CONFIG_FILENAME
+    if not force and config_file.exists():
+        if json.loads(config_file.read_text()) == _saved_config(config):
+            return directory
+
+    import tensorflow as tf
+    from sklearn.preprocessing import LabelEncoder
+
+    if directory.exists():
+        shutil.rmtree(directory)
+    directory.mkdir(parents=True)
+
+    print(
+        f"🔄 Construction du modèle aléatoire ({config.layers} couches, "
+        f"dimension {config.dim})..."
+    )
+    module = _module(config)
+    tf.saved_model.save(
+        module,
+        str(directory / MODEL_DIRNAME),
+        signatures={"serving_default": module.serve},
+    )
+    with open(directory / "label_encoder.pkl", "wb") as f:
+        pickle.dump(LabelEncoder().fit(["0", "4"]), f)
+
+    bundled = DEFAULT_MODEL_PATH / TOKENIZER_FILENAME
+    if bundled.exists():
+        shutil.copyfile(bundled, directory / TOKENIZER_FILENAME)
+    else:
+        synthetic_tokenizer(directory / TOKENIZER_FILENAME)
+
+    config_file.write_text(json.dumps(_saved_config(config), indent=2))
+    print(f"✅ Modèle aléatoire enregistré dans {directory}")
+    return directory
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Modèle DistilBERT aléatoire")
+    parser.add_argument("directory", type=pathlib.Path)
+    defaults = ModelConfig()
+    for name in ("vocab_size", "dim", "layers", "heads", "hidden_dim", "seed"):
+        parser.add_argument(
+            f"--{name.replace('_', '-')}", type=int, default=getattr(defaults, name)
+        )
+    parser.add_argument("--force", action="store_true")
+    args = parser.parse_args(argv)
+
+    config = ModelConfig(
+        vocab_size=args.vocab_size,
+        dim=args.dim,
+        layers=args.layers,
+        heads=args.heads,
+        hidden_dim=args.hidden_dim,
+        seed=args.seed,
+    )
+    build_random_model(args.directory, config, force=args.force)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
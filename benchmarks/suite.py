@@ -0,0 +1,442 @@
+"""
+Débit et percentiles de latence du chemin de prédiction
+
+Usage :
+    python -m benchmarks.suite --output benchmark.json
+    python -m benchmarks.suite --baseline benchmarks/baseline.json
+    python -m benchmarks.suite --targets service --lengths short --requests 20
+    python -m benchmarks.suite --random-model --layers 2 --output quick.json
+
+Chaque scénario est mesuré pour chaque longueur de texte (``short``,
+``medium``, ``long`` : 8, 32 et 128 tokens environ) :
+
+    single       requêtes unitaires successives
+    batch        requêtes de ``--batch-size`` textes successives
+    concurrent   ``--concurrency`` clients de requêtes unitaires simultanés
+
+sur chaque cible :
+
+    service      ``SentimentService.predict_sentiment`` / ``predict_batch``
+    app          application FastAPI dans le processus (httpx, ASGI)
+    lambda       handler Lambda (``main_lambda.lambda_handler``, chemin rapide)
+    mangum       handler Mangum (pile ASGI complète)
+
+Les handlers Lambda traitent un événement à la fois par conteneur : le
+scénario ``concurrent`` n'est pas mesuré pour ces cibles.
+
+Le cache des prédictions est désactivé : chaque requête exécute le modèle.
+Sans les poids suivis par DVC, un modèle DistilBERT à poids aléatoires est
+construit (``benchmarks.random_model``) ; ``--random-model`` le force.
+
+Avec ``--baseline``, les résultats sont comparés à une exécution de
+référence : une hausse de la latence p50/p99 ou une baisse du débit
+au-delà de ``--threshold`` (20 % par défaut) est signalée comme régression
+et le code de sortie vaut 1. ``--update-baseline`` enregistre l'exécution
+comme nouvelle référence.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import pathlib
+import platform
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from benchmarks.lambda_paths import api_gateway_event
+from benchmarks.random_model import MODEL_DIRNAME, WORDS, ModelConfig
+
+TARGETS = ("service", "app", "lambda", "mangum")
+SCENARIOS = ("single", "batch", "concurrent")
+# Longueurs approximatives en tokens (un mot du générateur = un token)
+LENGTHS = {"short": 8, "medium": 32, "long": 128}
+
+DEFAULT_MODEL_PATH = pathlib.Path("models/bert_curriculum_HF_last_version")
+RANDOM_MODEL_DIR = pathlib.Path("/tmp/sentiment-bench-model")
+
+# Métriques comparées à la référence : (clé, sens de l'amélioration)
+COMPARED_METRICS = (("p50_ms", -1), ("p99_ms", -1), ("throughput_texts_s", 1))
+
+
+def make_texts(tokens: int, count: int, seed: int = 0) -> List[str]:
+    """Textes distincts d'environ ``tokens`` tokens ([CLS] et [SEP] compris)"""
+    rng = random.Random(seed * 1000 + tokens)
+    words = max(tokens - 2, 1)
+    return [" ".join(rng.choice(WORDS) for _ in range(words)) for _ in range(count)]
+
+
+def summarize(durations: Sequence[float], texts: int, wall_s: float) -> dict:
+    """Percentiles de latence (ms) et débit (textes/s)"""
+    values = np.asarray(durations) * 1000
+    return {
+        "requests": len(values),
+        "texts": texts,
+        "p50_ms": round(float(np.percentile(values, 50)), 3),
+        "p90_ms": round(float(np.percentile(values, 90)), 3),
+        "p99_ms": round(float(np.percentile(values, 99)), 3),
+        "mean_ms": round(float(values.mean()), 3),
+        "throughput_texts_s": round(texts / wall_s, 2) if wall_s > 0 else None,
+    }
+
+
+def _timed(call: Callable, payload) -> float:
+    started_at = time.perf_counter()
+    call(payload)
+    return time.perf_counter() - started_at
+
+
+def measure(call: Callable, payloads: Sequence, concurrency: int = 1):
+    """Durées de ``call(payload)`` pour chaque charge utile et durée totale"""
+    started_at = time.perf_counter()
+    if concurrency <= 1:
+        durations = [_timed(call, payload) for payload in payloads]
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            durations = list(pool.map(lambda p: _timed(call, p), payloads))
+    return durations, time.perf_counter() - started_at
+
+
+async def measure_async(call: Callable, payloads: Sequence, concurrency: int = 1):
+    """Équivalent asynchrone de ``measure`` (``concurrency`` tâches)"""
+    queue = list(reversed(payloads))
+    durations: List[float] = []
+
+    async def client():
+        while queue:
+            payload = queue.pop()
+            started_at = time.perf_counter()
+            await call(payload)
+            durations.append(time.perf_counter() - started_at)
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(max(concurrency, 1))))
+    return durations, time.perf_counter() - started_at
+
+
+class ServiceTarget:
+    """Appels directs du service"""
+
+    name = "service"
+    supports_concurrency = True
+
+    def __init__(self, service):
+        self.service = service
+
+    def single(self, text: str):
+        self.service.predict_sentiment(text, use_cache=False)
+
+    def batch(self, texts: List[str]):
+        self.service.predict_batch(texts, use_cache=False)
+
+    def run(self, payloads, batch: bool, concurrency: int = 1):
+        return measure(self.batch if batch else self.single, payloads, concurrency)
+
+
+class AppTarget:
+    """Application FastAPI dans le processus, sans réseau (transport ASGI)"""
+
+    name = "app"
+    supports_concurrency = True
+
+    def __init__(self, app):
+        self.app = app
+
+    def run(self, payloads, batch: bool, concurrency: int = 1):
+        import httpx
+
+        async def scenario():
+            transport = httpx.ASGITransport(app=self.app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://bench"
+            ) as client:
+
+                async def call(payload):
+                    if batch:
+                        request = ("/predict-sentiment/batch", {"texts": payload})
+                    else:
+                        request = ("/predict-sentiment/", {"text": payload})
+                    response = await client.post(request[0], json=request[1])
+                    response.raise_for_status()
+
+                return await measure_async(call, payloads, concurrency)
+
+        return asyncio.run(scenario())
+
+
+class LambdaTarget:
+    """Handler Lambda appelé avec des événements API Gateway"""
+
+    supports_concurrency = False
+
+    def __init__(self, name: str, handler):
+        self.name = name
+        self.handler = handler
+
+    def _invoke(self, event):
+        response = self.handler(event, None)
+        if response["statusCode"] != 200:
+            raise RuntimeError(f"{self.name}: statut {response['statusCode']}")
+
+    def run(self, payloads, batch: bool, concurrency: int = 1):
+        if batch:
+            events = [
+                api_gateway_event("/predict-sentiment/batch", {"texts": texts})
+                for texts in payloads
+            ]
+        else:
+            events = [
+                api_gateway_event("/predict-sentiment/", {"text": text})
+                for text in payloads
+            ]
+        # Mangum utilise la boucle courante du thread
+        asyncio.set_event_loop(asyncio.new_event_loop())
+        return measure(self._invoke, events)
+
+
+def resolve_model(
+    model_path: Optional[pathlib.Path], random_model: bool, config: ModelConfig
+) -> dict:
+    """Modèle réel s'il est disponible, sinon modèle aléatoire construit"""
+    model_path = model_path or DEFAULT_MODEL_PATH
+    saved_model = model_path / MODEL_DIRNAME / "saved_model.pb"
+    if not random_model and saved_model.exists():
+        return {"kind": "real", "path": str(model_path)}
+
+    from benchmarks.random_model import build_random_model
+
+    if not random_model:
+        print(f"⚠️ Modèle absent ({saved_model}) : modèle à poids aléatoires")
+    path = build_random_model(RANDOM_MODEL_DIR, config)
+    return {"kind": "random", "path": str(path), "config": config.__dict__}
+
+
+def prepare_service(model: dict):
+    """Service partagé de l'application, chargé sur le modèle à mesurer"""
+    from app.services.registry import get_registry
+
+    service = get_registry().sentiment_service
+    service.model_path = pathlib.Path(model["path"])
+    if model["kind"] == "random":
+        service.tokenizer_source = "bundled"
+    # Chaque requête exécute le modèle
+    service.cache = None
+    service.warmup()
+    return service
+
+
+def build_targets(names: Sequence[str], service) -> list:
+    targets = []
+    for name in names:
+        if name == "service":
+            targets.append(ServiceTarget(service))
+        elif name == "app":
+            from main import app
+
+            targets.append(AppTarget(app))
+        elif name == "lambda":
+            from main_lambda import lambda_handler
+
+            targets.append(LambdaTarget("lambda", lambda_handler))
+        elif name == "mangum":
+            from main_lambda import handler
+
+            targets.append(LambdaTarget("mangum", handler))
+        else:
+            raise ValueError(f"Cible inconnue: {name}")
+    return targets
+
+
+def run_suite(
+    targets: list,
+    scenarios: Sequence[str] = SCENARIOS,
+    lengths: Sequence[str] = tuple(LENGTHS),
+    requests: int = 30,
+    batch_size: int = 16,
+    concurrency: int = 4,
+    warmup: int = 3,
+) -> List[dict]:
+    """Mesure chaque (cible, scénario, longueur) ; une entrée par mesure"""
+    results = []
+    for length in lengths:
+        tokens = LENGTHS[length]
+        for target in targets:
+            for scenario in scenarios:
+                if scenario == "concurrent" and not target.supports_concurrency:
+                    continue
+                batch = scenario == "batch"
+                workers = concurrency if scenario == "concurrent" else 1
+                per_request = batch_size if batch else 1
+                texts = make_texts(tokens, (warmup + requests) * per_request)
+                if batch:
+                    payloads = [
+                        texts[i : i + batch_size]
+                        for i in range(0, len(texts), batch_size)
+                    ]
+                else:
+                    payloads = texts
+                target.run(payloads[:warmup], batch)
+                durations, wall_s = target.run(payloads[warmup:], batch, workers)
+                result = {
+                    "target": target.name,
+                    "scenario": scenario,
+                    "length": length,
+                    "tokens": tokens,
+                    "batch_size": batch_size if batch else 1,
+                    "concurrency": workers,
+                    **summarize(durations, requests * per_request, wall_s),
+                }
+                print(
+                    f"⏱️ {target.name:8} {scenario:10} {length:6} "
+                    f"p50={result['p50_ms']:.1f}ms p99={result['p99_ms']:.1f}ms "
+                    f"{result['throughput_texts_s']} textes/s"
+                )
+                results.append(result)
+    return results
+
+
+def _key(result: dict) -> tuple:
+    return result["target"], result["scenario"], result["length"]
+
+
+def compare(report: dict, baseline: dict, threshold: float = 0.2) -> dict:
+    """
+    Écarts relatifs de chaque mesure par rapport à la référence ; une
+    dégradation au-delà de ``threshold`` est une régression
+    """
+    reference: Dict[tuple, dict] = {_key(r): r for r in baseline["results"]}
+    regressions, improvements = [], []
+    for result in report["results"]:
+        previous = reference.get(_key(result))
+        if previous is None:
+            continue
+        for metric, direction in COMPARED_METRICS:
+            before, after = previous.get(metric), result.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            entry = {
+                "target": result["target"],
+                "scenario": result["scenario"],
+                "length": result["length"],
+                "metric": metric,
+                "baseline": before,
+                "current": after,
+                "change": round(change, 4),
+            }
+            if change * direction < -threshold:
+                regressions.append(entry)
+            elif change * direction > threshold:
+                improvements.append(entry)
+
+    warnings = []
+    for field in ("model", "machine"):
+        if report["metadata"].get(field) != baseline["metadata"].get(field):
+            warnings.append(f"{field} différent de la référence")
+    return {
+        "threshold": threshold,
+        "regressions": regressions,
+        "improvements": improvements,
+        "warnings": warnings,
+    }
+
+
+def metadata(model: dict, service, args) -> dict:
+    import tensorflow as tf
+
+    return {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "model": {key: value for key, value in model.items() if key != "path"},
+        "machine": {
+            "platform": platform.platform(),
+            "processor": platform.machine(),
+            "cpus": os.cpu_count(),
+        },
+        "python": platform.python_version(),
+        "tensorflow": tf.__version__,
+        "backend": service.backend_class.name,
+        "padding_strategy": service.padding_strategy,
+        "requests": args.requests,
+        "batch_size": args.batch_size,
+        "concurrency": args.concurrency,
+    }
+
+
+def _csv(value: str) -> List[str]:
+    return [part.strip() for part in value.split(",") if part.strip()]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks de prédiction")
+    parser.add_argument("--targets", type=_csv, default=list(TARGETS))
+    parser.add_argument("--scenarios", type=_csv, default=list(SCENARIOS))
+    parser.add_argument("--lengths", type=_csv, default=list(LENGTHS))
+    parser.add_argument("--requests", type=int, default=30)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--model-path", type=pathlib.Path, default=None)
+    parser.add_argument("--random-model", action="store_true")
+    parser.add_argument("--layers", type=int, default=ModelConfig.layers)
+    parser.add_argument("--output", type=pathlib.Path, default=None)
+    parser.add_argument("--baseline", type=pathlib.Path, default=None)
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    for name, allowed in (
+        ("targets", TARGETS),
+        ("scenarios", SCENARIOS),
+        ("lengths", LENGTHS),
+    ):
+        unknown = set(getattr(args, name)) - set(allowed)
+        if unknown:
+            parser.error(f"{name} inconnu(s): {sorted(unknown)}")
+
+    model = resolve_model(
+        args.model_path, args.random_model, ModelConfig(layers=args.layers)
+    )
+    service = prepare_service(model)
+    results = run_suite(
+        build_targets(args.targets, service),
+        args.scenarios,
+        args.lengths,
+        requests=args.requests,
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+    )
+    report = {"metadata": metadata(model, service, args), "results": results}
+
+    exit_code = 0
+    if args.baseline and args.baseline.exists() and not args.update_baseline:
+        report["comparison"] = compare(
+            report, json.loads(args.baseline.read_text()), args.threshold
+        )
+        for warning in report["comparison"]["warnings"]:
+            print(f"⚠️ {warning}")
+        for entry in report["comparison"]["regressions"]:
+            print(
+                f"❌ Régression {entry['target']}/{entry['scenario']}/"
+                f"{entry['length']} {entry['metric']}: {entry['baseline']} → "
+                f"{entry['current']} ({entry['change']:+.0%})"
+            )
+        if report["comparison"]["regressions"]:
+            exit_code = 1
+        else:
+            print("✅ Aucune régression par rapport à la référence")
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"📄 Résultats écrits dans {args.output}")
+    if args.baseline and args.update_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2))
+        print(f"📄 Référence mise à jour: {args.baseline}")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
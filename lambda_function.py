@@ -2,12 +2,11 @@
 Lambda handler for FastAPI application
 """
 
-import os
 from mangum import Mangum
 from main import app
 
-# Ensure cache directories exist
-os.makedirs("/tmp/hf", exist_ok=True)
+# Les répertoires de cache sont créés au chargement du modèle
+# (app.services.sentiment_service.configure_cache_dirs)
 
 # Create Mangum handler
 handler = Mangum(app, lifespan="off") 
\ No newline at end of file
@@ -2,11 +2,30 @@
 Application FastAPI principale - Version refactorisée
 """
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import os
 
-from app.api import health_router, sentiment_router
+from app.api import (
+    MetricsMiddleware,
+    health_router,
+    metrics_router,
+    profiling_router,
+    sentiment_router,
+)
+from app.services.registry import get_registry
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Charge le modèle au démarrage (mode eager) et libère les ressources"""
+    registry = get_registry()
+    await registry.startup()
+    yield
+    await registry.shutdown()
+
 
 # Créer l'instance FastAPI
 app = FastAPI(
@@ -15,6 +34,7 @@ app = FastAPI(
     version="2.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # Configuration CORS
@@ -26,9 +46,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Métriques des requêtes HTTP (exposées par /metrics)
+app.add_middleware(MetricsMiddleware)
+
 # Inclure les routers
 app.include_router(health_router)
 app.include_router(sentiment_router)
+app.include_router(metrics_router)
+app.include_router(profiling_router)
 
 if __name__ == "__main__":
     # Only import uvicorn when running locally (not in Lambda)
@@ -1,5 +1,6 @@
 import os
 import sys
+import time
 from pathlib import Path
 
 # Add the app directory to Python path
@@ -7,11 +8,36 @@ sys.path.append(str(Path(__file__).parent / "app"))
 
 from mangum import Mangum
 from main import app
+from app.api import fast_path
+from app.api.dependencies import get_sentiment_service
+from app.config import get_settings
+from app.lambda_events import event_source, get_bulk_scorer
+from app.lambda_runtime import LambdaRuntime, is_lambda, is_warmer_event
 
 # Create handler for Lambda
 handler = Mangum(app, lifespan="off")
 
+# Chargement du modèle pendant la phase init (hors première invocation)
+runtime = LambdaRuntime(get_sentiment_service)
+if is_lambda():
+    runtime.initialize(get_settings().model_loading)
+
 # Lambda handler function
 def lambda_handler(event, context):
-    """Lambda handler for FastAPI application"""
-    return handler(event, context) 
\ No newline at end of file
+    """Lambda handler for FastAPI application
+
+    Les événements de préchauffage reçoivent une réponse immédiate, les
+    événements SQS / S3 sont scorés en masse, les prédictions passent par
+    le chemin rapide (sans pile ASGI) et les autres routes par Mangum.
+    """
+    if is_warmer_event(event):
+        return runtime.warm()
+    if event_source(event) is not None:
+        return get_bulk_scorer().handle(event)
+
+    started_at = time.perf_counter()
+    response = fast_path.handle(event)
+    if response is None:
+        response = handler(event, context)
+    runtime.record_invocation(started_at, fast_path.route(event) or "mangum")
+    return response
@@ -2,11 +2,13 @@
 Configuration pytest avec fixtures communes
 """
 
+import json
 from unittest.mock import Mock, patch
 
 import pytest
 from fastapi.testclient import TestClient
 
+from app.api.dependencies import get_batcher, get_sentiment_service
 from app.services.sentiment_service import SentimentService
 from main import app
 
@@ -24,10 +26,109 @@ def mock_sentiment_service():
         service = Mock(spec=SentimentService)
         service.predict_sentiment.return_value = ("4", 0.95)
         service.is_model_loaded.return_value = True
+        service.load_snapshot.return_value = {"state": "ready", "attempts": 1}
+        service.cascade_snapshot.return_value = None
+        service.coalescing_snapshot.return_value = None
+        service.persistent_cache_snapshot.return_value = None
         mock.return_value = service
         yield service
 
 
+@pytest.fixture
+def override_sentiment_service(mock_sentiment_service):
+    """Remplace le service de sentiment injecté dans les endpoints"""
+    app.dependency_overrides[get_sentiment_service] = lambda: mock_sentiment_service
+    app.dependency_overrides[get_batcher] = lambda: None
+    yield mock_sentiment_service
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def tokenizer_file(tmp_path):
+    """Petit tokenizer WordPiece au format tokenizer.json (sans réseau)"""
+    from tokenizers import Tokenizer, models, normalizers, pre_tokenizers
+    from tokenizers.processors import BertProcessing
+
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "i", "love", "this", "movie", "!"]
+    tokenizer = Tokenizer(
+        models.WordPiece({token: i for i, token in enumerate(vocab)}, unk_token="[UNK]")
+    )
+    tokenizer.normalizer = normalizers.BertNormalizer(lowercase=True)
+    tokenizer.pre_tokenizer = pre_tokenizers.BertPreTokenizer()
+    tokenizer.post_processor = BertProcessing(("[SEP]", 3), ("[CLS]", 2))
+
+    path = tmp_path / "tokenizer.json"
+    tokenizer.save(str(path))
+    return path
+
+
+@pytest.fixture
+def tiny_saved_model(tmp_path):
+    """
+    Fabrique de SavedModel minuscules (entrées ``ids``/``mask``, sortie
+    ``dense``) au format du classifieur DistilBERT
+    """
+    import tensorflow as tf
+
+    class TinyClassifier(tf.Module):
+        def __init__(self, length=None):
+            super().__init__()
+            self.embeddings = tf.Variable(tf.random.normal([16, 4], seed=1))
+            self.weights = tf.Variable(tf.random.normal([4, 1], seed=2))
+            spec = [
+                tf.TensorSpec([None, length], tf.int32, name="ids"),
+                tf.TensorSpec([None, length], tf.int32, name="mask"),
+            ]
+            self.serve = tf.function(self._forward, input_signature=spec)
+            self.__call__.get_concrete_function(spec)
+
+        @tf.function
+        def __call__(self, inputs, training=False):
+            return self._forward(*inputs)
+
+        def _forward(self, ids, mask):
+            mask = tf.expand_dims(tf.cast(mask, tf.float32), -1)
+            pooled = tf.reduce_sum(tf.gather(self.embeddings, ids) * mask, axis=1)
+            return {"dense": tf.sigmoid(pooled @ self.weights)}
+
+    def build(name="distilbert_HF_100000k", length=None, signatures=True):
+        module = TinyClassifier(length)
+        path = tmp_path / name
+        serving = {"serving_default": module.serve} if signatures else {}
+        tf.saved_model.save(module, str(path), signatures=serving)
+        return path
+
+    return build
+
+
+@pytest.fixture
+def api_gateway_event():
+    """Fabrique d'événements API Gateway REST (v1) pour les handlers Lambda"""
+
+    def build(method="GET", path="/health", body=None, headers=None):
+        headers = {"content-type": "application/json", **(headers or {})}
+        return {
+            "resource": "/{proxy+}",
+            "path": path,
+            "httpMethod": method,
+            "headers": headers,
+            "multiValueHeaders": {k: [v] for k, v in headers.items()},
+            "queryStringParameters": None,
+            "multiValueQueryStringParameters": None,
+            "requestContext": {
+                "resourcePath": "/{proxy+}",
+                "httpMethod": method,
+                "path": f"/prod{path}",
+                "stage": "prod",
+                "identity": {"sourceIp": "127.0.0.1"},
+            },
+            "body": json.dumps(body) if body is not None else None,
+            "isBase64Encoded": False,
+        }
+
+    return build
+
+
 @pytest.fixture
 def sample_text():
     """Texte d'exemple pour les tests"""
@@ -2,8 +2,30 @@
 Tests d'intégration pour les endpoints API
 """
 
+import asyncio
+import io
+import json
+import threading
+import zipfile
 from unittest.mock import patch
 
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.dependencies import (
+    get_admission,
+    get_batcher,
+    get_profiler,
+    get_sentiment_service,
+)
+from app.config import Settings, get_settings
+from app.services.admission import AdmissionController
+from app.services.batcher import MicroBatcher
+from app.services.profiling import Profiler
+from app.services.registry import ServiceRegistry
+from main import app
+
 
 class TestHealthEndpoints:
     """Tests pour les endpoints de santé"""
@@ -28,6 +50,13 @@ class TestHealthEndpoints:
         assert data["status"] == "healthy"
         assert data["service"] == "sentiment-analysis-api"
 
+    def test_health_uses_shared_service(self, client, override_sentiment_service):
+        """Test que /health inspecte le service partagé par les prédictions"""
+        response = client.get("/health")
+
+        assert response.json()["model_status"] == "healthy"
+        override_sentiment_service.is_model_loaded.assert_called_once()
+
     def test_info_endpoint(self, client):
         """Test de l'endpoint d'informations"""
         response = client.get("/info")
@@ -40,57 +69,46 @@ class TestHealthEndpoints:
         assert isinstance(data["endpoints_disponibles"], list)
 
 
+@pytest.mark.usefixtures("override_sentiment_service")
 class TestSentimentEndpoints:
     """Tests pour les endpoints de sentiment"""
 
     def test_predict_sentiment_success(self, client, mock_sentiment_service):
         """Test de prédiction de sentiment réussie"""
-        with patch(
-            "app.api.sentiment.get_sentiment_service",
-            return_value=mock_sentiment_service,
-        ):
-            response = client.post(
-                "/predict-sentiment/", json={"text": "I really enjoyed this movie!"}
-            )
+        response = client.post(
+            "/predict-sentiment/", json={"text": "I really enjoyed this movie!"}
+        )
 
-            assert response.status_code == 200
-            data = response.json()
-            assert "text" in data
-            assert "sentiment" in data
-            assert "confidence" in data
-            assert data["text"] == "I really enjoyed this movie!"
-            assert data["sentiment"] == "4"
-            assert data["confidence"] == 0.95
+        assert response.status_code == 200
+        data = response.json()
+        assert "text" in data
+        assert "sentiment" in data
+        assert "confidence" in data
+        assert data["text"] == "I really enjoyed this movie!"
+        assert data["sentiment"] == "4"
+        assert data["confidence"] == 0.95
 
     def test_predict_sentiment_negative(self, client, mock_sentiment_service):
         """Test de prédiction de sentiment négatif"""
         # Modifier le mock pour retourner un sentiment négatif
         mock_sentiment_service.predict_sentiment.return_value = ("0", 0.85)
 
-        with patch(
-            "app.api.sentiment.get_sentiment_service",
-            return_value=mock_sentiment_service,
-        ):
-            response = client.post(
-                "/predict-sentiment/", json={"text": "I hate this movie!"}
-            )
+        response = client.post(
+            "/predict-sentiment/", json={"text": "I hate this movie!"}
+        )
 
-            assert response.status_code == 200
-            data = response.json()
-            assert data["sentiment"] == "0"
-            assert data["confidence"] == 0.85
+        assert response.status_code == 200
+        data = response.json()
+        assert data["sentiment"] == "0"
+        assert data["confidence"] == 0.85
 
     def test_predict_sentiment_empty_text(self, client, mock_sentiment_service):
         """Test avec texte vide"""
-        with patch(
-            "app.api.sentiment.get_sentiment_service",
-            return_value=mock_sentiment_service,
-        ):
-            response = client.post("/predict-sentiment/", json={"text": ""})
+        response = client.post("/predict-sentiment/", json={"text": ""})
 
-            assert response.status_code == 200
-            data = response.json()
-            assert data["text"] == ""
+        assert response.status_code == 200
+        data = response.json()
+        assert data["text"] == ""
 
     def test_predict_sentiment_missing_text(self, client):
         """Test avec texte manquant"""
@@ -104,22 +122,549 @@ class TestSentimentEndpoints:
 
         assert response.status_code == 422
 
+    def test_predict_sentiment_cache_bypass(self, client, mock_sentiment_service):
+        """Test que Cache-Control: no-cache désactive le cache"""
+        response = client.post(
+            "/predict-sentiment/",
+            json={"text": "I love this movie!"},
+            headers={"Cache-Control": "no-cache"},
+        )
+
+        assert response.status_code == 200
+        mock_sentiment_service.predict_sentiment.assert_called_once_with(
+            "I love this movie!", False
+        )
+
     def test_predict_sentiment_service_error(self, client, mock_sentiment_service):
         """Test avec erreur du service"""
         mock_sentiment_service.predict_sentiment.side_effect = Exception("Model error")
 
-        with patch(
-            "app.api.sentiment.get_sentiment_service",
-            return_value=mock_sentiment_service,
-        ):
+        response = client.post(
+            "/predict-sentiment/", json={"text": "I love this movie!"}
+        )
+
+        assert response.status_code == 500
+        data = response.json()
+        assert "detail" in data
+        assert "Erreur lors de la prédiction" in data["detail"]
+
+
+@pytest.mark.usefixtures("override_sentiment_service")
+class TestBatchSentimentEndpoints:
+    """Tests pour l'endpoint de prédiction par lot"""
+
+    def test_predict_batch_success(self, client, mock_sentiment_service):
+        """Test de prédiction par lot réussie"""
+        mock_sentiment_service.predict_batch.return_value = [("4", 0.9), ("0", 0.1)]
+
+        response = client.post(
+            "/predict-sentiment/batch",
+            json={"texts": ["I love it!", "I hate it!"]},
+        )
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [r["text"] for r in results] == ["I love it!", "I hate it!"]
+        assert [r["sentiment"] for r in results] == ["4", "0"]
+        mock_sentiment_service.predict_batch.assert_called_once_with(
+            ["I love it!", "I hate it!"], True
+        )
+
+    def test_predict_batch_empty_list(self, client):
+        """Test avec une liste vide"""
+        response = client.post("/predict-sentiment/batch", json={"texts": []})
+
+        assert response.status_code == 422
+
+    def test_predict_batch_service_error(self, client, mock_sentiment_service):
+        """Test avec erreur du service"""
+        mock_sentiment_service.predict_batch.side_effect = Exception("Model error")
+
+        response = client.post(
+            "/predict-sentiment/batch", json={"texts": ["I love it!"]}
+        )
+
+        assert response.status_code == 500
+        assert "Erreur lors de la prédiction" in response.json()["detail"]
+
+
+@pytest.mark.usefixtures("override_sentiment_service")
+class TestStreamEndpoints:
+    """Tests pour l'endpoint de scoring en flux NDJSON"""
+
+    def test_predict_stream_success(self, client, mock_sentiment_service):
+        """Test d'un corps NDJSON envoyé en plusieurs morceaux"""
+        mock_sentiment_service.predict_batch.side_effect = lambda texts, _: [
+            ("4", 0.9) for _ in texts
+        ]
+
+        def body():
+            yield b'{"text": "I love it!", "id": 1}\n"I hate'
+            yield b' it!"\nnot json\n'
+
+        response = client.post("/predict-sentiment/stream", content=body())
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        records = [json.loads(line) for line in response.text.splitlines()]
+        assert records[0] == {
+            "id": 1,
+            "text": "I love it!",
+            "sentiment": "4",
+            "confidence": 0.9,
+        }
+        assert records[1]["text"] == "I hate it!"
+        assert records[2]["line"] == 3
+        mock_sentiment_service.predict_batch.assert_called_once_with(
+            ["I love it!", "I hate it!"], True
+        )
+
+    def test_predict_stream_batches(self, client, mock_sentiment_service):
+        """Test du découpage en lots de STREAM_BATCH_SIZE textes"""
+        mock_sentiment_service.predict_batch.side_effect = lambda texts, _: [
+            ("0", 0.1) for _ in texts
+        ]
+        app.dependency_overrides[get_settings] = lambda: Settings(stream_batch_size=2)
+        try:
             response = client.post(
-                "/predict-sentiment/", json={"text": "I love this movie!"}
+                "/predict-sentiment/stream",
+                content="\n".join(json.dumps(f"text {i}") for i in range(5)),
+                headers={"Cache-Control": "no-cache"},
             )
+        finally:
+            del app.dependency_overrides[get_settings]
+
+        sizes = [
+            len(call.args[0])
+            for call in mock_sentiment_service.predict_batch.call_args_list
+        ]
+        assert len(response.text.splitlines()) == 5
+        assert sizes == [2, 2, 1]
+        assert mock_sentiment_service.predict_batch.call_args.args[1] is False
+
+
+class TestMicroBatchingEndpoints:
+    """Tests du chemin de prédiction avec micro-batching"""
+
+    def test_predict_sentiment_uses_batcher(self, client, mock_sentiment_service):
+        """Test que la prédiction unitaire passe par predict_batch"""
+        mock_sentiment_service.predict_batch.return_value = [("4", 0.9)]
+        mock_sentiment_service.cache_snapshot.return_value = None
+        batcher = MicroBatcher(
+            mock_sentiment_service.predict_batch, max_batch_size=8, max_wait_ms=1
+        )
+        app.dependency_overrides[get_sentiment_service] = lambda: (
+            mock_sentiment_service
+        )
+        app.dependency_overrides[get_batcher] = lambda: batcher
+
+        try:
+            response = client.post("/predict-sentiment/", json={"text": "Great!"})
+            stats = client.get("/predict-sentiment/stats").json()
+        finally:
+            app.dependency_overrides.clear()
+
+        assert response.status_code == 200
+        assert response.json()["confidence"] == 0.9
+        mock_sentiment_service.predict_batch.assert_called_once_with(["Great!"], True)
+        assert stats["micro_batching"]["items_total"] == 1
+
+    def test_stats_without_batching(self, client, override_sentiment_service):
+        """Test des statistiques quand le micro-batching est désactivé"""
+        override_sentiment_service.cache_snapshot.return_value = None
+
+        response = client.get("/predict-sentiment/stats")
+
+        assert response.status_code == 200
+        assert response.json()["micro_batching"] is None
+        assert "saturation" in response.json()["executor"]
+        assert response.json()["model_loading"]["state"] == "ready"
+
+
+class TestMetricsEndpoint:
+    """Tests pour l'endpoint /metrics"""
+
+    def test_metrics_exposition(self, client, override_sentiment_service):
+        """Test des compteurs de requêtes par route et statut"""
+        client.post("/predict-sentiment/", json={"text": "Great!"})
+        client.get("/does-not-exist")
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        text = response.text
+        assert (
+            'http_requests_total{method="POST",path="/predict-sentiment/",'
+            'status="200"}' in text
+        )
+        assert 'path="unmatched",status="404"' in text
+        assert "# TYPE sentiment_stage_duration_seconds histogram" in text
+        assert 'sentiment_stage_duration_seconds_bucket{stage="model"' in text
+        assert "http_requests_in_flight 1" in text
+
+
+class TestProfilingEndpoints:
+    """Tests pour les endpoints d'administration du profilage"""
+
+    @pytest.fixture
+    def profiler(self, tmp_path):
+        profiler = Profiler(tmp_path)
+        app.dependency_overrides[get_settings] = lambda: Settings(
+            profiling_enabled=True, profiling_token="secret"
+        )
+        app.dependency_overrides[get_profiler] = lambda: profiler
+        yield profiler
+        app.dependency_overrides.pop(get_settings, None)
+        app.dependency_overrides.pop(get_profiler, None)
+
+    def test_disabled_by_default(self, client):
+        """Test que les endpoints sont absents sans PROFILING_ENABLED"""
+        response = client.post(
+            "/admin/profiling/start", headers={"X-Profiling-Token": "secret"}, json={}
+        )
+        assert response.status_code == 404
+
+    def test_token_required(self, client, profiler):
+        """Test du refus sans jeton valide"""
+        assert client.get("/admin/profiling").status_code == 403
+        response = client.get(
+            "/admin/profiling", headers={"X-Profiling-Token": "wrong"}
+        )
+        assert response.status_code == 403
+
+    def test_profile_session(self, client, profiler):
+        """Test du cycle démarrage, arrêt et téléchargement d'une session"""
+        headers = {"X-Profiling-Token": "secret"}
+
+        response = client.post(
+            "/admin/profiling/start", headers=headers, json={"predictions": 5}
+        )
+        assert response.status_code == 200
+        session_id = response.json()["id"]
+        assert response.json()["max_predictions"] == 5
+
+        busy = client.post("/admin/profiling/start", headers=headers, json={})
+        assert busy.status_code == 409
+        profiler.run(sum, range(10))
+
+        response = client.post("/admin/profiling/stop", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["predictions"] == 1
+        assert client.post("/admin/profiling/stop", headers=headers).status_code == 409
+
+        status = client.get("/admin/profiling", headers=headers).json()
+        assert status["active"] is False
+        assert status["sessions"] == [session_id]
+
+        response = client.get(
+            f"/admin/profiling/sessions/{session_id}", headers=headers
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/zip"
+        names = zipfile.ZipFile(io.BytesIO(response.content)).namelist()
+        assert f"{session_id}/profile.pstats" in names
+        assert f"{session_id}/session.json" in names
+
+        missing = client.get("/admin/profiling/sessions/unknown", headers=headers)
+        assert missing.status_code == 404
+
+    def test_default_session(self, client, profiler):
+        """Test de la session par défaut (100 prédictions)"""
+        response = client.post(
+            "/admin/profiling/start",
+            headers={"X-Profiling-Token": "secret"},
+            json={"mode": "cprofile"},
+        )
+        assert response.json()["max_predictions"] == 100
+        profiler.stop()
+
+    def test_invalid_request(self, client, profiler):
+        """Test de la validation des paramètres de session"""
+        response = client.post(
+            "/admin/profiling/start",
+            headers={"X-Profiling-Token": "secret"},
+            json={"mode": "perf"},
+        )
+        assert response.status_code == 422
+
+
+class TestAdmissionEndpoints:
+    """Tests du contrôle d'admission sur les endpoints de prédiction"""
+
+    @pytest.fixture
+    def admission(self):
+        admission = AdmissionController(max_concurrency=1, max_queue=1)
+        app.dependency_overrides[get_admission] = lambda: admission
+        yield admission
+        app.dependency_overrides.pop(get_admission, None)
+
+    @pytest.fixture
+    def release(self, override_sentiment_service):
+        """Bloque les prédictions jusqu'à ``release.set()``"""
+        release = threading.Event()
+
+        def predict(text, use_cache=True):
+            release.wait(5)
+            return ("4", 0.95)
+
+        override_sentiment_service.predict_sentiment.side_effect = predict
+        yield release
+        release.set()
+
+    @staticmethod
+    async def _until(condition):
+        for _ in range(500):
+            if condition():
+                return
+            await asyncio.sleep(0.01)
+        raise AssertionError("condition jamais remplie")
+
+    @staticmethod
+    def _post(client, text, **headers):
+        return asyncio.ensure_future(
+            client.post("/predict-sentiment/", json={"text": text}, headers=headers)
+        )
+
+    def test_queue_full_returns_429(self, admission, release):
+        """Test du refus immédiat quand la file est pleine"""
+
+        async def scenario():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://test"
+            ) as client:
+                first = self._post(client, "a")
+                await self._until(lambda: admission.snapshot()["running"] == 1)
+                second = self._post(client, "b")
+                await self._until(lambda: admission.queue_depth == 1)
+                rejected = await client.post("/predict-sentiment/", json={"text": "c"})
+                release.set()
+                return rejected, await first, await second
+
+        rejected, first, second = asyncio.run(scenario())
+
+        assert rejected.status_code == 429
+        assert int(rejected.headers["Retry-After"]) >= 1
+        assert first.status_code == 200
+        assert second.status_code == 200
+
+    def test_deadline_header_returns_503(self, admission, release):
+        """Test du refus d'une échéance impossible à tenir"""
+        admission.service_time_s = 10.0
+
+        async def scenario():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://test"
+            ) as client:
+                first = self._post(client, "a")
+                await self._until(lambda: admission.snapshot()["running"] == 1)
+                rejected = await client.post(
+                    "/predict-sentiment/batch",
+                    json={"texts": ["b"]},
+                    headers={"X-Request-Timeout-Ms": "500"},
+                )
+                release.set()
+                return rejected, await first
+
+        rejected, first = asyncio.run(scenario())
+
+        assert rejected.status_code == 503
+        assert "impossible à tenir" in rejected.json()["detail"]
+        assert first.status_code == 200
+        assert admission.snapshot()["rejected_deadline"] == 1
+
+    def test_invalid_deadline_header(self, client, admission, release):
+        """Test d'une échéance invalide"""
+        response = client.post(
+            "/predict-sentiment/",
+            json={"text": "a"},
+            headers={"X-Request-Timeout-Ms": "0"},
+        )
+        assert response.status_code == 422
+
+    @staticmethod
+    async def _asgi_post(text, disconnected):
+        """
+        POST brut sur ``/`` ; le client se déconnecte quand ``disconnected``
+        est levé
+        """
+        messages = [
+            {
+                "type": "http.request",
+                "body": json.dumps({"text": text}).encode(),
+                "more_body": False,
+            }
+        ]
+
+        async def receive():
+            if messages:
+                return messages.pop(0)
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "POST",
+            "scheme": "http",
+            "path": "/predict-sentiment/",
+            "raw_path": b"/predict-sentiment/",
+            "root_path": "",
+            "query_string": b"",
+            "headers": [(b"content-type", b"application/json")],
+            "client": ("client", 1234),
+            "server": ("test", 80),
+        }
+        await app(scope, receive, send)
+        return sent[0]["status"]
+
+    def test_disconnected_client_is_dropped(
+        self, admission, release, override_sentiment_service
+    ):
+        """Test qu'une requête en file dont le client est parti n'est pas prédite"""
+
+        async def scenario():
+            stays, leaves = asyncio.Event(), asyncio.Event()
+            first = asyncio.ensure_future(self._asgi_post("a", stays))
+            await self._until(lambda: admission.snapshot()["running"] == 1)
+            second = asyncio.ensure_future(self._asgi_post("b", leaves))
+            await self._until(lambda: admission.queue_depth == 1)
+            leaves.set()
+            dropped = await second
+            release.set()
+            return await first, dropped
+
+        first, dropped = asyncio.run(scenario())
+
+        assert first == 200
+        assert dropped == 499
+        texts = [
+            c.args[0] for c in override_sentiment_service.predict_sentiment.mock_calls
+        ]
+        assert texts == ["a"]
+        assert admission.snapshot()["cancelled_in_queue"] == 1
+
+    def test_disconnect_keeps_running_slot(self, admission, release):
+        """Test qu'une prédiction en cours garde son emplacement si le client part"""
+
+        async def scenario():
+            leaves = asyncio.Event()
+            request = asyncio.ensure_future(self._asgi_post("a", leaves))
+            await self._until(lambda: admission.snapshot()["running"] == 1)
+            leaves.set()
+            status = await request
+            running = admission.snapshot()["running"]
+            release.set()
+            await self._until(lambda: admission.snapshot()["running"] == 0)
+            return status, running
+
+        status, running = asyncio.run(scenario())
+
+        assert status == 499
+        assert running == 1
+
+    def test_stream_rejected_up_front(
+        self, admission, release, override_sentiment_service
+    ):
+        """Test du refus d'un flux avant toute réponse quand la file est pleine"""
+
+        async def scenario():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://test"
+            ) as client:
+                first = self._post(client, "a")
+                await self._until(lambda: admission.snapshot()["running"] == 1)
+                second = self._post(client, "b")
+                await self._until(lambda: admission.queue_depth == 1)
+                rejected = await client.post(
+                    "/predict-sentiment/stream", content=b'"c"\n'
+                )
+                release.set()
+                await asyncio.gather(first, second)
+                return rejected
+
+        rejected = asyncio.run(scenario())
+
+        assert rejected.status_code == 429
+        assert int(rejected.headers["Retry-After"]) >= 1
+        override_sentiment_service.predict_batch.assert_not_called()
+
+    def test_stream_batches_admitted(
+        self, admission, release, override_sentiment_service
+    ):
+        """Test que chaque lot du flux passe par le contrôle d'admission"""
+        override_sentiment_service.predict_batch.side_effect = lambda texts, _: [
+            ("4", 0.9) for _ in texts
+        ]
+        app.dependency_overrides[get_settings] = lambda: Settings(stream_batch_size=2)
+
+        async def scenario():
+            async def body():
+                yield b'"a"\n"b"\n'
+                # Emplacement occupé entre deux lots : file pleine (max_queue=0)
+                blocking = self._post(client, "x")
+                await self._until(lambda: admission.snapshot()["running"] == 1)
+                yield b'"c"\n"d"\n'
+                release.set()
+                await blocking
+                yield b'"e"\n'
+
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://test"
+            ) as client:
+                return await client.post("/predict-sentiment/stream", content=body())
+
+        admission.max_queue = 0
+        try:
+            response = asyncio.run(scenario())
+        finally:
+            del app.dependency_overrides[get_settings]
+
+        records = [json.loads(line) for line in response.text.splitlines()]
+        assert response.status_code == 200
+        assert [r.get("sentiment") for r in records] == ["4", "4", None, None, "4"]
+        assert "File d'attente pleine" in records[2]["error"]
+        assert admission.snapshot()["admitted_total"] == 3
+        assert admission.snapshot()["rejected_queue_full"] == 1
+
+    def test_stats(self, client, admission, override_sentiment_service):
+        """Test de l'état du contrôle d'admission dans /stats"""
+        override_sentiment_service.cache_snapshot.return_value = None
+
+        response = client.get("/predict-sentiment/stats")
+
+        assert response.json()["admission"]["max_queue"] == 1
+
+
+class TestLifespan:
+    """Tests du cycle de vie de l'application"""
+
+    def test_startup_warms_up_shared_service(self):
+        """Test que le démarrage préchauffe le service utilisé par /health"""
+        registry = ServiceRegistry(Settings(model_loading="eager"))
+
+        def fake_warmup():
+            registry.sentiment_service._is_loaded = True
+
+        with (
+            patch("main.get_registry", return_value=registry),
+            patch("app.api.dependencies.get_registry", return_value=registry),
+            patch.object(registry.sentiment_service, "warmup", fake_warmup),
+        ):
+            with TestClient(app) as client:
+                response = client.get("/health")
 
-            assert response.status_code == 500
-            data = response.json()
-            assert "detail" in data
-            assert "Erreur lors de la prédiction" in data["detail"]
+        assert response.json()["model_status"] == "healthy"
 
 
 class TestAPIStructure:
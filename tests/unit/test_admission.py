@@ -0,0 +1,200 @@
+"""
+Tests unitaires pour le contrôle d'admission
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.admission import (
+    AdmissionController,
+    DeadlineExceededError,
+    QueueFullError,
+)
+
+
+async def _blocked(release: asyncio.Event, value="ok"):
+    await release.wait()
+    return value
+
+
+class TestAdmissionController:
+    """Tests de la file bornée, des échéances et de l'estimation"""
+
+    def test_free_slot_runs_immediately(self):
+        """Test d'une exécution directe et de la mesure du temps de service"""
+        controller = AdmissionController(max_concurrency=2)
+
+        async def scenario():
+            return await controller.run(lambda: asyncio.sleep(0.01, "done"))
+
+        assert asyncio.run(scenario()) == "done"
+        snapshot = controller.snapshot()
+        assert snapshot["admitted_total"] == 1
+        assert snapshot["running"] == 0
+        assert snapshot["service_time_ms"] >= 10
+
+    def test_queue_full(self):
+        """Test du refus immédiat quand la file est pleine"""
+        controller = AdmissionController(max_concurrency=1, max_queue=1)
+
+        async def scenario():
+            release = asyncio.Event()
+            running = asyncio.ensure_future(controller.run(lambda: _blocked(release)))
+            queued = asyncio.ensure_future(controller.run(lambda: _blocked(release)))
+            await asyncio.sleep(0)
+            assert controller.queue_depth == 1
+
+            with pytest.raises(QueueFullError) as error:
+                await controller.run(lambda: _blocked(release))
+
+            release.set()
+            return error.value, await running, await queued
+
+        error, *results = asyncio.run(scenario())
+        assert error.status_code == 429
+        assert error.retry_after_s >= 1
+        assert results == ["ok", "ok"]
+        assert controller.snapshot()["rejected_queue_full"] == 1
+
+    def test_deadline_cannot_be_met(self):
+        """Test du refus quand l'attente estimée dépasse l'échéance"""
+        controller = AdmissionController(max_concurrency=1)
+        controller.service_time_s = 0.5
+
+        async def scenario():
+            release = asyncio.Event()
+            running = asyncio.ensure_future(controller.run(lambda: _blocked(release)))
+            await asyncio.sleep(0)
+            # Un tour d'attente plus l'exécution : 1s estimée
+            with pytest.raises(DeadlineExceededError) as error:
+                await controller.run(lambda: _blocked(release), deadline_s=0.9)
+            queued = asyncio.ensure_future(
+                controller.run(lambda: _blocked(release), deadline_s=5.0)
+            )
+            await asyncio.sleep(0)
+            release.set()
+            await asyncio.gather(running, queued)
+            return error.value
+
+        error = asyncio.run(scenario())
+        assert error.status_code == 503
+        assert controller.snapshot()["rejected_deadline"] == 1
+        assert controller.snapshot()["admitted_total"] == 2
+
+    def test_deadline_expires_in_queue(self):
+        """Test du retrait d'une requête dont l'échéance expire dans la file"""
+        controller = AdmissionController(max_concurrency=1)
+        calls = []
+
+        async def scenario():
+            release = asyncio.Event()
+            running = asyncio.ensure_future(controller.run(lambda: _blocked(release)))
+            await asyncio.sleep(0)
+
+            def call():
+                calls.append(1)
+                return _blocked(release)
+
+            with pytest.raises(DeadlineExceededError, match="expirée"):
+                await controller.run(call, deadline_s=0.02)
+            release.set()
+            await running
+
+        asyncio.run(scenario())
+        assert calls == []
+        snapshot = controller.snapshot()
+        assert snapshot["expired_in_queue"] == 1
+        assert snapshot["queue_depth"] == 0
+        assert snapshot["running"] == 0
+
+    def test_check_without_queueing(self):
+        """Test du refus anticipé sans ajout à la file"""
+        controller = AdmissionController(max_concurrency=1, max_queue=1)
+        controller.service_time_s = 0.5
+
+        async def scenario():
+            controller.check()
+            release = asyncio.Event()
+            running = asyncio.ensure_future(controller.run(lambda: _blocked(release)))
+            await asyncio.sleep(0)
+            # Une requête devrait attendre : admise si l'échéance le permet
+            controller.check(deadline_s=5.0)
+            with pytest.raises(DeadlineExceededError):
+                controller.check(deadline_s=0.1)
+            queued = asyncio.ensure_future(controller.run(lambda: _blocked(release)))
+            await asyncio.sleep(0)
+            with pytest.raises(QueueFullError):
+                controller.check()
+            assert controller.queue_depth == 1
+            release.set()
+            await asyncio.gather(running, queued)
+
+        asyncio.run(scenario())
+        snapshot = controller.snapshot()
+        assert snapshot["admitted_total"] == 2
+        assert snapshot["rejected_deadline"] == 1
+        assert snapshot["rejected_queue_full"] == 1
+
+    def test_cancelled_waiter_is_dropped(self):
+        """Test qu'une requête annulée dans la file n'est jamais exécutée"""
+        controller = AdmissionController(max_concurrency=1)
+        order = []
+
+        async def scenario():
+            release = asyncio.Event()
+            running = asyncio.ensure_future(controller.run(lambda: _blocked(release)))
+            await asyncio.sleep(0)
+            dropped = asyncio.ensure_future(
+                controller.run(lambda: order.append("dropped") or _blocked(release))
+            )
+            kept = asyncio.ensure_future(
+                controller.run(lambda: order.append("kept") or _blocked(release))
+            )
+            await asyncio.sleep(0)
+            dropped.cancel()
+            await asyncio.sleep(0)
+            release.set()
+            await asyncio.gather(running, kept)
+
+        asyncio.run(scenario())
+        assert order == ["kept"]
+        snapshot = controller.snapshot()
+        assert snapshot["cancelled_in_queue"] == 1
+        assert snapshot["running"] == 0
+
+    def test_fifo_slots(self):
+        """Test de l'attribution des emplacements dans l'ordre d'arrivée"""
+        controller = AdmissionController(max_concurrency=1)
+        order = []
+
+        async def job(name):
+            order.append(name)
+            await asyncio.sleep(0)
+
+        async def scenario():
+            await asyncio.gather(*(controller.run(lambda n=n: job(n)) for n in "abcd"))
+
+        asyncio.run(scenario())
+        assert order == ["a", "b", "c", "d"]
+
+    def test_estimated_wait(self):
+        """Test de l'estimation à partir de la moyenne mobile"""
+        controller = AdmissionController(max_concurrency=2, ewma_alpha=0.5)
+        assert controller.estimated_wait_s() is None
+
+        controller._record(1.0)
+        controller._record(3.0)
+        assert controller.service_time_s == pytest.approx(2.0)
+        # Emplacement libre : pas d'attente
+        assert controller.estimated_wait_s() is None
+
+        controller._running = 2
+        assert controller.estimated_wait_s() == pytest.approx(4.0)
+
+    def test_invalid_arguments(self):
+        """Test des paramètres invalides"""
+        with pytest.raises(ValueError):
+            AdmissionController(max_concurrency=0)
+        with pytest.raises(ValueError):
+            AdmissionController(max_concurrency=1, max_queue=-1)
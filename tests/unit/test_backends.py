@@ -0,0 +1,148 @@
+"""
+Tests unitaires pour les moteurs d'inférence et l'export TFLite / ONNX
+"""
+
+import pickle
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+from sklearn.preprocessing import LabelEncoder
+
+from app.config import Settings
+from app.services.backends import (
+    OnnxBackend,
+    TensorFlowBackend,
+    TFLiteBackend,
+    get_backend_class,
+    load_backend,
+)
+from app.services.backends.base import input_names
+from app.services.backends.export import (
+    check_parity,
+    export_and_check,
+    main,
+    sample_inputs,
+)
+from app.services.sentiment_service import SentimentService
+
+
+class TestBackendHelpers:
+    """Tests des utilitaires communs"""
+
+    def test_artifact_path(self, tmp_path):
+        """Test des chemins d'artefacts à côté du SavedModel"""
+        model_dir = tmp_path / "distilbert_HF_100000k"
+
+        assert TensorFlowBackend.artifact_path(model_dir) == model_dir
+        assert TFLiteBackend.artifact_path(model_dir) == (
+            tmp_path / "distilbert_HF_100000k.tflite"
+        )
+        assert OnnxBackend.artifact_path(model_dir).suffix == ".onnx"
+
+    def test_input_names(self):
+        """Test de l'identification des entrées ids / mask"""
+        assert input_names(["serving_default_mask:0", "serving_default_ids:0"]) == (
+            "serving_default_ids:0",
+            "serving_default_mask:0",
+        )
+        with pytest.raises(ValueError):
+            input_names(["ids", "token_type_ids"])
+
+    def test_unknown_backend(self):
+        """Test d'un moteur inconnu"""
+        with pytest.raises(ValueError, match="inconnu"):
+            get_backend_class("torch")
+        with pytest.raises(ValueError):
+            SentimentService(Settings(inference_backend="torch"))
+
+    def test_tensorflow_backend_generic_call(self):
+        """Test de l'appel générique d'un modèle sans signatures"""
+        model = Mock(return_value={"dense": np.array([[0.2], [0.7]])})
+
+        backend = TensorFlowBackend(model)
+
+        assert backend.engine is None
+        np.testing.assert_allclose(
+            backend.predict(np.ones((2, 4)), np.ones((2, 4))), [0.2, 0.7]
+        )
+
+    def test_sample_inputs_without_tokenizer(self):
+        """Test des entrées de contrôle aléatoires déterministes"""
+        ids, mask = sample_inputs(16)
+
+        assert ids.shape == mask.shape == (8, 16)
+        np.testing.assert_array_equal(ids, sample_inputs(16)[0])
+        assert ((ids != 0) == (mask == 1)).all()
+
+    def test_check_parity(self):
+        """Test du rapport de parité entre deux moteurs"""
+        reference = Mock(predict=Mock(return_value=np.array([0.1, 0.6, 0.9])))
+        candidate = Mock(predict=Mock(return_value=np.array([0.1, 0.4, 0.9])))
+
+        report = check_parity(reference, candidate, None, None, atol=1e-3)
+
+        assert report["passed"] is False
+        assert report["label_agreement"] == pytest.approx(2 / 3)
+        assert report["max_abs_diff"] == pytest.approx(0.2)
+
+
+class TestExport:
+    """Tests de l'export avec un SavedModel minuscule"""
+
+    @pytest.fixture
+    def model_dir(self, tiny_saved_model, tokenizer_file):
+        model_dir = tiny_saved_model()
+        with open(model_dir.parent / "label_encoder.pkl", "wb") as f:
+            pickle.dump(LabelEncoder().fit(["0", "4"]), f)
+        return model_dir
+
+    def test_export_tflite(self, model_dir):
+        """Test de l'export TFLite et de sa parité"""
+        report = export_and_check(model_dir, ["tflite"])
+
+        assert report["tflite"]["passed"] is True
+        assert TFLiteBackend.artifact_path(model_dir).exists()
+
+        backend = load_backend("tflite", model_dir)
+        ids, mask = sample_inputs(16, model_dir.parent / "tokenizer.json")
+        assert backend.predict(ids, mask).shape == (8,)
+        assert backend.predict(ids[:1], mask[:1]).shape == (1,)
+
+    def test_export_onnx(self, model_dir):
+        """Test de l'export ONNX et de sa parité"""
+        pytest.importorskip("tf2onnx")
+        pytest.importorskip("onnxruntime")
+
+        assert main(["--model-dir", str(model_dir), "--formats", "onnx"]) == 0
+        assert OnnxBackend.artifact_path(model_dir).exists()
+
+    @pytest.mark.parametrize("backend", ["tflite", "onnx"])
+    def test_service_with_exported_backend(self, model_dir, backend):
+        """Test du service servi par un moteur exporté"""
+        if backend == "onnx":
+            pytest.importorskip("tf2onnx")
+            pytest.importorskip("onnxruntime")
+        export_and_check(model_dir, [backend])
+        service = SentimentService(
+            Settings(
+                tokenizer_source="bundled",
+                inference_backend=backend,
+                inference_threads=1,
+            )
+        )
+        service.model_path = model_dir.parent
+
+        results = service.predict_batch(["I love this movie!", "i"])
+
+        assert service.backend.name == backend
+        assert len(results) == 2
+        assert all(label in ("0", "4") for label, _ in results)
+
+    def test_missing_artifact(self, model_dir):
+        """Test d'un artefact absent pour le moteur configuré"""
+        service = SentimentService(Settings(inference_backend="onnx"))
+        service.model_path = model_dir.parent
+
+        with pytest.raises(FileNotFoundError, match="onnx"):
+            service.load()
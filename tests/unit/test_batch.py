@@ -0,0 +1,148 @@
+"""
+Tests unitaires pour le scoring hors ligne
+"""
+
+import csv
+import json
+import pickle
+
+import pytest
+from sklearn.preprocessing import LabelEncoder
+
+from app.batch import checkpoint_path, main, score_file, write_checkpoint
+
+
+@pytest.fixture
+def model_path(tiny_saved_model, tokenizer_file, monkeypatch):
+    model_dir = tiny_saved_model()
+    with open(model_dir.parent / "label_encoder.pkl", "wb") as f:
+        pickle.dump(LabelEncoder().fit(["0", "4"]), f)
+    # Variables héritées par les processus du pool
+    monkeypatch.setenv("TOKENIZER_SOURCE", "bundled")
+    return model_dir.parent
+
+
+@pytest.fixture
+def jsonl_file(tmp_path):
+    texts = ["i love this movie !", "i", "this movie", "love love love", "!"]
+    path = tmp_path / "input.jsonl"
+    path.write_text(
+        "\n".join(json.dumps({"id": i, "text": text}) for i, text in enumerate(texts))
+    )
+    return path
+
+
+class TestScoreFile:
+    """Tests du scoring d'un fichier par le pool de processus"""
+
+    def test_jsonl_in_order(self, model_path, jsonl_file, tmp_path):
+        """Test de l'ordre et du contenu des résultats avec deux workers"""
+        output = tmp_path / "scores.jsonl"
+
+        stats = score_file(
+            jsonl_file, output, workers=2, chunk_size=2, model_path=model_path
+        )
+
+        rows = [json.loads(line) for line in output.read_text().splitlines()]
+        assert [row["id"] for row in rows] == [0, 1, 2, 3, 4]
+        assert {row["sentiment"] for row in rows} <= {"0", "4"}
+        assert all(0 <= row["confidence"] <= 1 for row in rows)
+        assert stats["rows"] == 5
+        assert stats["rows_per_s"] > 0
+        assert 0 < stats["startup_s"] <= stats["duration_s"]
+        assert json.loads(checkpoint_path(output).read_text())["rows"] == 5
+
+    def test_sentiment140_to_csv(self, model_path, tmp_path):
+        """Test d'une entrée Sentiment140 écrite en CSV"""
+        source = tmp_path / "training.csv"
+        source.write_bytes(
+            b'"0","1","date","NO_QUERY","user","i love this movie !"\n'
+            b'"4","2","date","NO_QUERY","user","this movie"\n'
+        )
+        output = tmp_path / "scores.csv"
+
+        main(
+            [
+                str(source),
+                str(output),
+                "--workers",
+                "1",
+                "--model-path",
+                str(model_path),
+            ]
+        )
+
+        with open(output, newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert [row["id"] for row in rows] == ["1", "2"]
+        assert rows[0]["target"] == "0"
+        assert rows[1]["sentiment"] in {"0", "4"}
+
+    def test_malformed_rows_counted(self, model_path, tmp_path, capsys):
+        """Test du décompte des lignes mal formées dans le résumé"""
+        source = tmp_path / "training.csv"
+        source.write_bytes(
+            b'"0","1","date","NO_QUERY","user","i love this movie !"\n'
+            b'"4","2","truncated"\n'
+            b'"4","3","date","NO_QUERY","user","this movie"\n'
+        )
+        output = tmp_path / "scores.jsonl"
+
+        stats = score_file(source, output, workers=1, model_path=model_path)
+
+        assert stats["rows"] == 2
+        assert stats["malformed_rows"] == 1
+        assert json.loads(checkpoint_path(output).read_text())["malformed_rows"] == 1
+        assert "1 lignes mal formées ignorées (lignes 2)" in capsys.readouterr().out
+
+    def test_invalid_jsonl_line_skipped(self, model_path, jsonl_file, tmp_path):
+        """Test qu'une ligne JSON invalide au milieu du fichier n'arrête pas le job"""
+        lines = jsonl_file.read_text().splitlines()
+        lines.insert(2, '{"id": 99, "text": "truncated')
+        jsonl_file.write_text("\n".join(lines))
+        output = tmp_path / "scores.jsonl"
+
+        stats = score_file(
+            jsonl_file, output, workers=1, chunk_size=2, model_path=model_path
+        )
+
+        rows = [json.loads(line) for line in output.read_text().splitlines()]
+        assert [row["id"] for row in rows] == [0, 1, 2, 3, 4]
+        assert stats["malformed_rows"] == 1
+
+    def test_resume_from_checkpoint(self, model_path, jsonl_file, tmp_path):
+        """Test de la reprise : la sortie partielle est tronquée puis complétée"""
+        output = tmp_path / "scores.jsonl"
+        score_file(jsonl_file, output, chunk_size=2, model_path=model_path)
+        expected = output.read_text()
+
+        # Interruption simulée après deux lignes, en pleine écriture
+        lines = expected.splitlines(keepends=True)
+        partial = "".join(lines[:2]).encode()
+        output.write_bytes(partial + b'{"id": 2, "te')
+        write_checkpoint(
+            output,
+            {
+                "input": str(jsonl_file.resolve()),
+                "rows": 2,
+                "output_bytes": len(partial),
+            },
+        )
+
+        stats = score_file(
+            jsonl_file, output, chunk_size=2, model_path=model_path, resume=True
+        )
+
+        assert output.read_text() == expected
+        assert stats["rows"] == 3
+        assert stats["total_rows"] == 5
+
+    def test_existing_output_refused(self, jsonl_file, tmp_path):
+        """Test qu'une sortie existante n'est pas écrasée par défaut"""
+        output = tmp_path / "scores.jsonl"
+        output.write_text("{}\n")
+
+        with pytest.raises(FileExistsError):
+            score_file(jsonl_file, output)
+        with pytest.raises(ValueError, match="Format de sortie"):
+            score_file(jsonl_file, tmp_path / "scores.txt")
@@ -0,0 +1,124 @@
+"""
+Tests unitaires pour le micro-batcher
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.batcher import MicroBatcher
+from app.services.executor import InferenceExecutor
+
+
+class RecordingPredictor:
+    """Fonction de prédiction par lot qui enregistre ses appels"""
+
+    def __init__(self):
+        self.calls = []
+        self.use_cache_flags = []
+
+    def __call__(self, texts, use_cache=True):
+        self.calls.append(list(texts))
+        self.use_cache_flags.append(use_cache)
+        return [("4", float(len(text))) for text in texts]
+
+
+class TestMicroBatcher:
+    """Tests pour MicroBatcher"""
+
+    def test_concurrent_requests_share_one_call(self):
+        """Test que les requêtes concurrentes sont regroupées"""
+        predictor = RecordingPredictor()
+        batcher = MicroBatcher(predictor, max_batch_size=8, max_wait_ms=20)
+
+        async def scenario():
+            texts = ["a", "bb", "ccc", "dddd"]
+            results = await asyncio.gather(*(batcher.predict(t) for t in texts))
+            await batcher.close()
+            return results
+
+        results = asyncio.run(scenario())
+
+        assert predictor.calls == [["a", "bb", "ccc", "dddd"]]
+        assert [confidence for _, confidence in results] == [1.0, 2.0, 3.0, 4.0]
+
+    def test_max_batch_size_splits_batches(self):
+        """Test que la taille maximale de lot est respectée"""
+        predictor = RecordingPredictor()
+        batcher = MicroBatcher(predictor, max_batch_size=4, max_wait_ms=20)
+
+        async def scenario():
+            await asyncio.gather(*(batcher.predict(str(i)) for i in range(10)))
+            await batcher.close()
+
+        asyncio.run(scenario())
+
+        assert [len(call) for call in predictor.calls] == [4, 4, 2]
+        snapshot = batcher.snapshot()
+        assert snapshot["batches_total"] == 3
+        assert snapshot["items_total"] == 10
+        assert snapshot["batch_size_counts"] == {2: 1, 4: 2}
+        assert snapshot["queue_depth"] == 0
+
+    def test_batches_run_in_executor(self):
+        """Test que les lots sont exécutés dans le pool d'inférence"""
+        predictor = RecordingPredictor()
+        executor = InferenceExecutor(max_workers=2)
+        batcher = MicroBatcher(
+            predictor, max_batch_size=4, max_wait_ms=20, executor=executor
+        )
+
+        async def scenario():
+            results = await asyncio.gather(*(batcher.predict(str(i)) for i in range(8)))
+            await batcher.close()
+            return results
+
+        results = asyncio.run(scenario())
+        executor.shutdown()
+
+        assert len(results) == 8
+        assert sorted(len(call) for call in predictor.calls) == [4, 4]
+        assert executor.snapshot()["completed_total"] == 2
+
+    def test_errors_are_propagated_to_every_caller(self):
+        """Test qu'une erreur du modèle est renvoyée à chaque appelant"""
+
+        def failing(texts, use_cache):
+            raise RuntimeError("Model error")
+
+        batcher = MicroBatcher(failing, max_batch_size=4, max_wait_ms=5)
+
+        async def scenario():
+            results = await asyncio.gather(
+                batcher.predict("a"), batcher.predict("b"), return_exceptions=True
+            )
+            await batcher.close()
+            return results
+
+        results = asyncio.run(scenario())
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert batcher.stats.errors_total == 1
+
+    def test_cache_bypass_is_split_into_its_own_call(self):
+        """Test que les requêtes sans cache forment un appel séparé"""
+        predictor = RecordingPredictor()
+        batcher = MicroBatcher(predictor, max_batch_size=8, max_wait_ms=20)
+
+        async def scenario():
+            await asyncio.gather(
+                batcher.predict("a"),
+                batcher.predict("b", use_cache=False),
+                batcher.predict("c"),
+            )
+            await batcher.close()
+
+        asyncio.run(scenario())
+
+        assert predictor.calls == [["a", "c"], ["b"]]
+        assert predictor.use_cache_flags == [True, False]
+
+    def test_invalid_batch_size(self):
+        """Test avec une taille de lot invalide"""
+        with pytest.raises(ValueError):
+            MicroBatcher(RecordingPredictor(), max_batch_size=0)
@@ -0,0 +1,77 @@
+"""
+Tests unitaires pour le cache des prédictions
+"""
+
+import pytest
+
+from app.services.cache import PredictionCache, cache_key, normalize_text
+
+
+class FakeClock:
+    """Horloge contrôlable pour les tests d'expiration"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCacheKey:
+    """Tests pour la normalisation et les clés de cache"""
+
+    def test_normalize_text(self):
+        """Test de la normalisation du texte"""
+        assert normalize_text("  I LOVE\tthis\n movie ") == "i love this movie"
+
+    def test_key_depends_on_model_version(self):
+        """Test que la version du modèle fait partie de la clé"""
+        assert cache_key("great", "v1") == cache_key(" Great ", "v1")
+        assert cache_key("great", "v1") != cache_key("great", "v2")
+
+
+class TestPredictionCache:
+    """Tests pour PredictionCache"""
+
+    def test_hit_and_miss(self):
+        """Test des compteurs de hits et misses"""
+        cache = PredictionCache(max_entries=10)
+
+        assert cache.get("a") is None
+        cache.put("a", ("4", 0.9))
+        assert cache.get("a") == ("4", 0.9)
+
+        snapshot = cache.snapshot()
+        assert snapshot["hits"] == 1
+        assert snapshot["misses"] == 1
+        assert snapshot["hit_rate"] == 0.5
+
+    def test_lru_eviction(self):
+        """Test de l'éviction de l'entrée la moins récemment utilisée"""
+        cache = PredictionCache(max_entries=2)
+        cache.put("a", ("4", 0.9))
+        cache.put("b", ("0", 0.1))
+        cache.get("a")
+        cache.put("c", ("4", 0.7))
+
+        assert cache.get("b") is None
+        assert cache.get("a") == ("4", 0.9)
+        assert cache.snapshot()["evictions"] == 1
+        assert len(cache) == 2
+
+    def test_ttl_expiration(self):
+        """Test de l'expiration des entrées"""
+        clock = FakeClock()
+        cache = PredictionCache(max_entries=10, ttl_seconds=60, clock=clock)
+        cache.put("a", ("4", 0.9))
+
+        clock.now = 59
+        assert cache.get("a") == ("4", 0.9)
+        clock.now = 61
+        assert cache.get("a") is None
+        assert cache.snapshot()["expirations"] == 1
+
+    def test_invalid_size(self):
+        """Test avec une taille invalide"""
+        with pytest.raises(ValueError):
+            PredictionCache(max_entries=0)
@@ -0,0 +1,205 @@
+"""
+Tests unitaires pour la cascade classifieur linéaire / DistilBERT
+"""
+
+import json
+import pickle
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from sklearn.preprocessing import LabelEncoder
+
+from app.config import Settings
+from app.services.cascade import (
+    LINEAR_MODEL_FILENAME,
+    CascadeStats,
+    LinearTier,
+    evaluate_bands,
+    main,
+    train_linear_model,
+    uncertain,
+)
+from app.services.sentiment_service import SentimentService
+
+POSITIVE = ["i love this movie", "great film, loved it", "what a wonderful day"]
+NEGATIVE = ["i hate this movie", "awful film, hated it", "what a terrible day"]
+
+
+def _tier():
+    texts = POSITIVE * 10 + NEGATIVE * 10
+    labels = ["4"] * 30 + ["0"] * 30
+    return LinearTier(train_linear_model(texts, labels))
+
+
+def _write_csv(path, count):
+    lines = []
+    for i in range(count):
+        target, text = (4, POSITIVE[i % 3]) if i % 2 else (0, NEGATIVE[i % 3])
+        # Textes distincts : répartis entre entraînement et évaluation
+        text = f"{text} {i}"
+        lines.append(
+            f'"{target}","{i}","Mon Apr 06 22:19:45 PDT 2009","NO_QUERY",'
+            f'"user{i}","{text}"'
+        )
+    path.write_bytes("\n".join(lines).encode("ISO-8859-1"))
+    return path
+
+
+class TestLinearTier:
+    """Tests du classifieur linéaire"""
+
+    def test_predict_proba_and_labels(self, tmp_path):
+        """Test des probabilités positives, des labels et de la sauvegarde"""
+        tier = LinearTier.load(_tier().save(tmp_path / LINEAR_MODEL_FILENAME))
+
+        proba = tier.predict_proba(["i love it, wonderful", "terrible, i hate it"])
+
+        assert proba[0] > 0.5 > proba[1]
+        assert tier.label(proba[0]) == "4"
+        assert tier.label(proba[1]) == "0"
+
+    def test_unexpected_classes(self):
+        """Test du refus d'un modèle aux classes inattendues"""
+        pipeline = train_linear_model(["good", "bad"] * 3, ["pos", "neg"] * 3)
+
+        with pytest.raises(ValueError):
+            LinearTier(pipeline)
+
+    def test_uncertain_band(self):
+        """Test du masque des textes à escalader (bornes incluses)"""
+        mask = uncertain(np.array([0.05, 0.2, 0.5, 0.8, 0.95]), 0.2, 0.8)
+
+        assert mask.tolist() == [False, True, True, True, False]
+
+    def test_stats(self):
+        """Test des compteurs et du taux d'escalade"""
+        stats = CascadeStats(0.2, 0.8)
+        assert stats.snapshot()["escalation_rate"] is None
+
+        stats.record(texts=8, escalated=2)
+        stats.record(texts=2, escalated=0)
+
+        snapshot = stats.snapshot()
+        assert snapshot["texts_total"] == 10
+        assert snapshot["linear_total"] == 8
+        assert snapshot["escalated_total"] == 2
+        assert snapshot["escalation_rate"] == 0.2
+
+    def test_evaluate_bands(self):
+        """Test du rapport par bande"""
+        report = evaluate_bands(
+            _tier(),
+            POSITIVE + NEGATIVE,
+            ["4"] * 3 + ["0"] * 3,
+            bands=[(0.5, 0.5), (0, 1)],
+        )
+
+        assert report[0]["escalation_rate"] == 0.0
+        assert report[0]["linear_accuracy"] == 1.0
+        assert report[1]["escalation_rate"] == 1.0
+        assert report[1]["linear_accuracy"] is None
+
+    def test_cli_train_and_evaluate(self, tmp_path, capsys):
+        """Test de l'entraînement et de l'évaluation en ligne de commande"""
+        data = _write_csv(tmp_path / "data.csv", 200)
+        output = tmp_path / "linear.pkl"
+        split = ["--data", str(data), "--holdout-percent", "30"]
+
+        assert main(["train", *split, "--output", str(output)]) == 0
+        capsys.readouterr()
+        assert main(["evaluate", *split, "--model", str(output)]) == 0
+
+        report = json.loads(capsys.readouterr().out)
+        assert [entry["band"] for entry in report][0] == [0.5, 0.5]
+        assert report[0]["linear_accuracy"] == 1.0
+
+    def test_cli_empty_split(self, tmp_path):
+        """Test d'une partie d'évaluation vide"""
+        data = _write_csv(tmp_path / "data.csv", 20)
+
+        with pytest.raises(SystemExit):
+            main(["evaluate", "--data", str(data), "--holdout-percent", "0"])
+
+
+class TestServiceCascade:
+    """Tests de la cascade dans le service"""
+
+    @pytest.fixture
+    def model_path(self, tiny_saved_model, tokenizer_file):
+        model_dir = tiny_saved_model()
+        with open(model_dir.parent / "label_encoder.pkl", "wb") as f:
+            pickle.dump(LabelEncoder().fit(["0", "4"]), f)
+        _tier().save(model_dir.parent / LINEAR_MODEL_FILENAME)
+        return model_dir.parent
+
+    def _service(self, model_path, **settings):
+        service = SentimentService(
+            Settings(
+                tokenizer_source="bundled",
+                cascade_enabled=True,
+                cascade_low=0.35,
+                cascade_high=0.65,
+                **settings,
+            )
+        )
+        service.model_path = model_path
+        return service
+
+    def test_confident_texts_skip_transformer(self, model_path):
+        """Test que seuls les textes incertains passent par DistilBERT"""
+        service = self._service(model_path, prediction_cache_enabled=False)
+        service.load()
+        texts = ["i love this movie", "movie", "i hate this movie"]
+        proba = service.linear_tier.predict_proba(texts)
+        assert proba[0] > 0.65 and proba[2] < 0.35 and 0.35 <= proba[1] <= 0.65
+
+        with patch.object(
+            service, "_predict_model", wraps=service._predict_model
+        ) as predict_model:
+            results = service.predict_batch_with_tiers(texts)
+
+        predict_model.assert_called_once_with(["movie"])
+        assert [tier for _, _, tier in results] == ["linear", "transformer", "linear"]
+        assert results[0][:2] == ("4", pytest.approx(proba[0]))
+        assert results[2][0] == "0"
+        assert service.predict_batch(texts)[1] == results[1][:2]
+        snapshot = service.cascade_snapshot()
+        assert snapshot["texts_total"] == 6
+        assert snapshot["escalated_total"] == 2
+        assert snapshot["escalation_rate"] == pytest.approx(1 / 3, abs=1e-4)
+
+    def test_cache_tier_and_version(self, model_path):
+        """Test de l'étage cache et de la version distincte des clés"""
+        service = self._service(model_path)
+
+        first = service.predict_batch_with_tiers(["i love this movie"])
+        second = service.predict_batch_with_tiers(["i love this movie"])
+
+        assert first[0][2] == "linear"
+        assert second[0] == (first[0][0], first[0][1], "cache")
+        assert "cascade0.35-0.65" in service.model_version
+
+    def test_disabled_by_default(self):
+        """Test que la cascade est désactivée par défaut"""
+        service = SentimentService()
+
+        assert service.cascade_snapshot() is None
+        assert service.linear_tier is None
+
+    def test_invalid_band(self):
+        """Test d'une bande d'incertitude invalide"""
+        with pytest.raises(ValueError):
+            SentimentService(
+                Settings(cascade_enabled=True, cascade_low=0.9, cascade_high=0.1)
+            )
+
+    def test_missing_linear_model(self, tiny_saved_model, tokenizer_file):
+        """Test d'un chargement sans classifieur linéaire"""
+        model_dir = tiny_saved_model()
+        with open(model_dir.parent / "label_encoder.pkl", "wb") as f:
+            pickle.dump(LabelEncoder().fit(["0", "4"]), f)
+        service = self._service(model_dir.parent)
+
+        with pytest.raises(FileNotFoundError):
+            service.load()
@@ -0,0 +1,192 @@
+"""
+Tests unitaires pour la coalescence des prédictions en cours
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from app.config import Settings
+from app.services.coalescing import InFlightRegistry
+from app.services.metrics import COALESCED_PREDICTIONS
+from app.services.sentiment_service import SentimentService
+
+
+def _slow_predict(calls, started=None, release=None, delay_s=0.0):
+    """Remplace _predict_uncached : enregistre les lots, attend si demandé"""
+
+    def predict(texts):
+        calls.append(list(texts))
+        if started is not None:
+            started.set()
+            release.wait(5)
+        time.sleep(delay_s)
+        return [("4", 0.9)] * len(texts), ["transformer"] * len(texts)
+
+    return predict
+
+
+class TestInFlightRegistry:
+    """Tests du registre des calculs en cours"""
+
+    def test_claim_and_resolve(self):
+        """Test du partage leader / attente et de la publication"""
+        registry = InFlightRegistry()
+
+        owned, joined = registry.claim(["a", "b"])
+        assert owned == ["a", "b"] and joined == {}
+
+        owned, joined = registry.claim(["b", "c"])
+        assert owned == ["c"]
+        assert list(joined) == ["b"]
+
+        registry.resolve("b", ("4", 0.9))
+        assert joined["b"].result(timeout=1) == ("4", 0.9)
+        assert len(registry) == 2
+
+        # Clé publiée : un nouvel appel recalcule
+        owned, _ = registry.claim(["b"])
+        assert owned == ["b"]
+
+    def test_fail_propagates(self):
+        """Test de la transmission de l'échec aux requêtes en attente"""
+        registry = InFlightRegistry()
+        registry.claim(["a"])
+        _, joined = registry.claim(["a"])
+
+        registry.fail(["a"], RuntimeError("boom"))
+
+        with pytest.raises(RuntimeError, match="boom"):
+            joined["a"].result(timeout=1)
+        assert len(registry) == 0
+
+    def test_snapshot(self):
+        """Test des compteurs"""
+        registry = InFlightRegistry()
+        assert registry.snapshot()["coalesced_rate"] == 0.0
+
+        registry.claim(["a"])
+        registry.claim(["a"])
+        registry.claim(["a"])
+
+        snapshot = registry.snapshot()
+        assert snapshot["in_flight"] == 1
+        assert snapshot["computed"] == 1
+        assert snapshot["coalesced"] == 2
+        assert snapshot["coalesced_rate"] == pytest.approx(2 / 3)
+
+
+class TestServiceCoalescing:
+    """Tests de la coalescence dans le service"""
+
+    @pytest.mark.parametrize("cache_enabled", [True, False])
+    def test_burst_runs_one_inference(self, cache_enabled):
+        """Test qu'une rafale du même texte déclenche une seule inférence"""
+        service = SentimentService(Settings(prediction_cache_enabled=cache_enabled))
+        calls, started, release = [], threading.Event(), threading.Event()
+        texts = ["RT Great   news!", "rt great news!", "RT GREAT NEWS!"] * 4
+        coalesced_before = COALESCED_PREDICTIONS.labels().value
+
+        with patch.object(
+            service,
+            "_predict_uncached",
+            side_effect=_slow_predict(calls, started, release),
+        ):
+            with ThreadPoolExecutor(max_workers=len(texts)) as pool:
+                futures = [
+                    pool.submit(service.predict_batch_with_tiers, [text])
+                    for text in texts
+                ]
+                assert started.wait(5)
+                time.sleep(0.1)
+                release.set()
+                results = [future.result(timeout=5)[0] for future in futures]
+
+        assert calls == [[calls[0][0]]]
+        assert {result[:2] for result in results} == {("4", 0.9)}
+        tiers = [result[2] for result in results]
+        assert tiers.count("transformer") == 1
+        assert tiers.count("coalesced") == len(texts) - 1
+        assert COALESCED_PREDICTIONS.labels().value - coalesced_before == len(texts) - 1
+        assert service.coalescing_snapshot()["in_flight"] == 0
+
+    def test_partial_overlap(self):
+        """Test qu'un lot ne recalcule que les textes absents du calcul en cours"""
+        service = SentimentService(Settings(prediction_cache_enabled=False))
+        calls, started, release = [], threading.Event(), threading.Event()
+
+        with patch.object(
+            service,
+            "_predict_uncached",
+            side_effect=_slow_predict(calls, started, release),
+        ):
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                first = pool.submit(service.predict_batch, ["a", "b"])
+                assert started.wait(5)
+                started.clear()
+                second = pool.submit(service.predict_batch, ["b", "c"])
+                time.sleep(0.1)
+                release.set()
+                assert first.result(timeout=5) == [("4", 0.9)] * 2
+                assert second.result(timeout=5) == [("4", 0.9)] * 2
+
+        assert calls == [["a", "b"], ["c"]]
+
+    def test_failure_shared_with_waiters(self):
+        """Test que l'échec du calcul est transmis sans nouvelle inférence"""
+        service = SentimentService(Settings(prediction_cache_enabled=False))
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def failing(texts):
+            calls.append(texts)
+            started.set()
+            release.wait(5)
+            raise RuntimeError("model crashed")
+
+        with patch.object(service, "_predict_uncached", side_effect=failing):
+            with ThreadPoolExecutor(max_workers=3) as pool:
+                futures = [pool.submit(service.predict_sentiment, "x")]
+                assert started.wait(5)
+                futures += [pool.submit(service.predict_sentiment, "x") for _ in "ab"]
+                time.sleep(0.1)
+                release.set()
+                errors = [future.exception(timeout=5) for future in futures]
+
+        assert len(calls) == 1
+        assert all(str(error) == "model crashed" for error in errors)
+        assert service.coalescing_snapshot()["in_flight"] == 0
+
+    def test_sequential_requests_not_coalesced(self):
+        """Test que les requêtes successives passent par le cache"""
+        service = SentimentService()
+        calls = []
+
+        with patch.object(
+            service, "_predict_uncached", side_effect=_slow_predict(calls)
+        ):
+            service.predict_sentiment("hello")
+            tiers = service.predict_batch_with_tiers(["hello"])
+
+        assert tiers[0][2] == "cache"
+        assert len(calls) == 1
+        assert service.coalescing_snapshot()["coalesced"] == 0
+
+    def test_disabled(self):
+        """Test de la désactivation par configuration"""
+        service = SentimentService(
+            Settings(coalescing_enabled=False, prediction_cache_enabled=False)
+        )
+        calls = []
+
+        with patch.object(
+            service, "_predict_uncached", side_effect=_slow_predict(calls, delay_s=0.1)
+        ):
+            with ThreadPoolExecutor(max_workers=3) as pool:
+                list(pool.map(service.predict_sentiment, ["x"] * 3))
+
+        assert service.coalescing_snapshot() is None
+        assert len(calls) == 3
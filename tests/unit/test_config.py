@@ -0,0 +1,80 @@
+"""
+Tests unitaires pour la configuration
+"""
+
+from app.config import Settings
+
+
+class TestSettings:
+    """Tests pour Settings"""
+
+    def test_defaults(self, monkeypatch):
+        """Test des valeurs par défaut"""
+        monkeypatch.delenv("MICRO_BATCHING_ENABLED", raising=False)
+        monkeypatch.delenv("BATCH_MAX_SIZE", raising=False)
+
+        settings = Settings.from_env()
+
+        assert settings.micro_batching_enabled is False
+        assert settings.batch_max_size == 32
+
+    def test_from_env(self, monkeypatch):
+        """Test de lecture des variables d'environnement"""
+        monkeypatch.setenv("MICRO_BATCHING_ENABLED", "true")
+        monkeypatch.setenv("BATCH_MAX_SIZE", "64")
+        monkeypatch.setenv("BATCH_MAX_WAIT_MS", "2.5")
+
+        settings = Settings.from_env()
+
+        assert settings.micro_batching_enabled is True
+        assert settings.batch_max_size == 64
+        assert settings.batch_max_wait_ms == 2.5
+
+    def test_compiled_inference_from_env(self, monkeypatch):
+        """Test des options de compilation de l'inférence"""
+        monkeypatch.setenv("COMPILED_INFERENCE", "false")
+        monkeypatch.setenv("XLA_JIT_COMPILE", "1")
+
+        settings = Settings.from_env()
+
+        assert settings.compiled_inference is False
+        assert settings.xla_jit_compile is True
+
+    def test_profiling_from_env(self, monkeypatch):
+        """Test des options du profilage à la demande"""
+        monkeypatch.setenv("PROFILING_ENABLED", "true")
+        monkeypatch.setenv("PROFILING_TOKEN", "secret")
+        monkeypatch.setenv("PROFILING_DIR", "/tmp/profiles")
+
+        settings = Settings.from_env()
+
+        assert settings.profiling_enabled is True
+        assert settings.profiling_token == "secret"
+        assert settings.profiling_dir == "/tmp/profiles"
+        assert Settings().profiling_enabled is False
+
+    def test_admission_from_env(self, monkeypatch):
+        """Test des options du contrôle d'admission"""
+        monkeypatch.setenv("ADMISSION_ENABLED", "false")
+        monkeypatch.setenv("ADMISSION_MAX_QUEUE", "16")
+        monkeypatch.setenv("REQUEST_DEADLINE_MS", "250")
+
+        settings = Settings.from_env()
+
+        assert settings.admission_enabled is False
+        assert settings.admission_max_queue == 16
+        assert settings.request_deadline_ms == 250.0
+        assert Settings().admission_enabled is True
+
+    def test_persistent_cache_from_env(self, monkeypatch):
+        """Test des options du cache persistant"""
+        monkeypatch.setenv("PERSISTENT_CACHE_ENABLED", "1")
+        monkeypatch.setenv("PERSISTENT_CACHE_PATH", "/tmp/cache.sqlite3")
+        monkeypatch.setenv("PERSISTENT_CACHE_MAX_ENTRIES", "5000")
+
+        settings = Settings.from_env()
+
+        assert settings.persistent_cache_enabled is True
+        assert settings.persistent_cache_path == "/tmp/cache.sqlite3"
+        assert settings.persistent_cache_max_entries == 5000
+        assert Settings().persistent_cache_enabled is False
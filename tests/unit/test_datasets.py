@@ -0,0 +1,132 @@
+"""
+Tests unitaires pour la lecture des fichiers Sentiment140
+"""
+
+import pytest
+
+from app.datasets import (
+    detect_format,
+    in_holdout,
+    iter_jsonl,
+    iter_records,
+    iter_sentiment140,
+    sample_sentiment140,
+)
+
+
+def _write_csv(path, count):
+    lines = [
+        f'"{0 if i % 2 else 4}","{i}","Mon Apr 06 22:19:45 PDT 2009","NO_QUERY",'
+        f'"user{i}","tweet n°{i}, très bien"'
+        for i in range(count)
+    ]
+    path.write_bytes("\n".join(lines).encode("ISO-8859-1"))
+    return path
+
+
+class TestSentiment140:
+    """Tests pour le format Sentiment140"""
+
+    def test_iter_rows(self, tmp_path):
+        """Test de lecture des colonnes et de l'encodage"""
+        rows = list(iter_sentiment140(_write_csv(tmp_path / "data.csv", 3)))
+
+        assert len(rows) == 3
+        assert rows[0]["target"] == "4"
+        assert rows[1]["text"] == "tweet n°1, très bien"
+
+    def test_malformed_rows_reported(self, tmp_path):
+        """Test du signalement des lignes qui n'ont pas six colonnes"""
+        path = tmp_path / "data.csv"
+        path.write_bytes(
+            b'"4","1","date","NO_QUERY","user","ok"\n'
+            b'"4","2","truncated"\n'
+            b'"0","3","date","NO_QUERY","user","multi\nline"\n'
+            b'"0","4","date","NO_QUERY","user","extra","column"\n'
+        )
+        malformed = []
+
+        rows = list(iter_records(path, malformed=malformed))
+
+        assert [row["id"] for row in rows] == ["1", "3"]
+        assert malformed == [2, 5]
+
+    def test_train_and_holdout_disjoint(self, tmp_path):
+        """Test de la partition déterministe entraînement / évaluation"""
+        path = _write_csv(tmp_path / "data.csv", 400)
+
+        train = sample_sentiment140(path, 400, seed=0, split="train")
+        holdout = sample_sentiment140(path, 400, seed=1, split="holdout")
+        holdout_30 = sample_sentiment140(path, 400, split="holdout", holdout_percent=30)
+
+        train_texts = {row["text"] for row in train}
+        holdout_texts = {row["text"] for row in holdout}
+        assert not train_texts & holdout_texts
+        assert len(train) + len(holdout) == 400
+        assert 0 < len(holdout) < len(holdout_30) < 200
+        assert holdout_texts <= {row["text"] for row in holdout_30}
+        assert all(in_holdout(text) for text in holdout_texts)
+        assert sample_sentiment140(path, 5, seed=3, split="train") == (
+            sample_sentiment140(path, 5, seed=3, split="train")
+        )
+        with pytest.raises(ValueError):
+            sample_sentiment140(path, 5, split="test")
+
+    def test_sample_reproducible(self, tmp_path):
+        """Test de l'échantillonnage par réservoir"""
+        path = _write_csv(tmp_path / "data.csv", 200)
+
+        sample = sample_sentiment140(path, 20, seed=1)
+
+        assert len(sample) == 20
+        assert len({row["id"] for row in sample}) == 20
+        assert sample == sample_sentiment140(path, 20, seed=1)
+        assert len(sample_sentiment140(path, 500)) == 200
+
+
+class TestOtherFormats:
+    """Tests pour les formats JSONL et Parquet"""
+
+    def test_iter_jsonl(self, tmp_path):
+        """Test des objets, des chaînes et des lignes vides"""
+        path = tmp_path / "data.jsonl"
+        path.write_text('{"text": "a", "id": 1}\n\n"b"\n')
+
+        assert list(iter_records(path)) == [{"text": "a", "id": 1}, {"text": "b"}]
+
+    def test_iter_jsonl_invalid_line(self, tmp_path):
+        """Test du numéro de ligne dans l'erreur"""
+        path = tmp_path / "data.jsonl"
+        path.write_text('"a"\n{oops\n')
+
+        with pytest.raises(ValueError, match="ligne 2"):
+            list(iter_jsonl(path))
+
+    def test_iter_jsonl_skips_invalid_lines(self, tmp_path):
+        """Test des lignes invalides ignorées et signalées"""
+        path = tmp_path / "data.jsonl"
+        path.write_text('"a"\n{oops\n\n{"text": "b"}\n[1,\n"c"\n')
+        malformed = []
+
+        rows = list(iter_records(path, malformed=malformed))
+
+        assert rows == [{"text": "a"}, {"text": "b"}, {"text": "c"}]
+        assert malformed == [2, 5]
+
+    def test_detect_format(self):
+        """Test de la détection du format par l'extension"""
+        assert detect_format("a.ndjson") == "jsonl"
+        assert detect_format("training.csv") == "csv"
+        assert detect_format("a.parquet") == "parquet"
+        with pytest.raises(ValueError):
+            detect_format("a.txt")
+
+    def test_iter_parquet(self, tmp_path):
+        """Test de lecture Parquet (pyarrow facultatif)"""
+        pa = pytest.importorskip("pyarrow")
+        import pyarrow.parquet as pq
+
+        path = tmp_path / "data.parquet"
+        pq.write_table(pa.table({"text": ["a", "b", "c"]}), path)
+
+        assert [row["text"] for row in iter_records(path)] == ["a", "b", "c"]
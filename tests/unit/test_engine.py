@@ -0,0 +1,125 @@
+"""
+Tests unitaires pour la fonction d'inférence compilée
+"""
+
+import pickle
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+import tensorflow as tf
+from sklearn.preprocessing import LabelEncoder
+
+from app.config import Settings
+from app.services.engine import InferenceEngine
+from app.services.sentiment_service import SentimentService
+
+
+def _inputs(length, rows=2):
+    ids = np.zeros((rows, length), dtype=np.int32)
+    ids[:, :3] = [2, 5, 3]
+    mask = (ids != 0).astype(np.int32)
+    return tf.constant(ids), tf.constant(mask)
+
+
+def _load(path):
+    return tf.saved_model.load(str(path))
+
+
+class TestInferenceEngine:
+    """Tests pour InferenceEngine"""
+
+    def test_signature_fixed_length(self, tiny_saved_model):
+        """Test qu'une signature à longueur fixe restreint les longueurs"""
+        model = _load(tiny_saved_model(length=8))
+
+        engine = InferenceEngine(model, (16, 32))
+
+        assert engine.mode == "signature"
+        assert engine.fixed_length == 8
+        assert engine.sequence_lengths == (8,)
+        ids, mask = _inputs(8)
+        expected = model.signatures["serving_default"](ids=ids, mask=mask)["dense"]
+        np.testing.assert_allclose(engine(ids, mask), expected.numpy()[:, 0])
+
+    def test_signature_dynamic_length(self, tiny_saved_model):
+        """Test d'une fonction compilée par longueur demandée"""
+        engine = InferenceEngine(_load(tiny_saved_model()), (32, 16, 16))
+
+        assert engine.fixed_length is None
+        assert engine.sequence_lengths == (16, 32)
+        assert engine(*_inputs(16, rows=3)).shape == (3,)
+        assert engine(*_inputs(32, rows=1)).shape == (1,)
+
+    def test_unknown_length_rejected(self, tiny_saved_model):
+        """Test qu'une longueur non compilée n'est pas retracée"""
+        engine = InferenceEngine(_load(tiny_saved_model()), (16,))
+
+        with pytest.raises(ValueError, match="non compilée"):
+            engine(*_inputs(20))
+
+    def test_call_mode_without_signature(self, tiny_saved_model):
+        """Test du repli sur l'appel générique sans signature de service"""
+        model = _load(tiny_saved_model(signatures=False))
+
+        engine = InferenceEngine(model, (16,))
+
+        assert engine.mode == "call"
+        assert engine(*_inputs(16)).shape == (2,)
+
+    def test_warmup_traces_once(self, tiny_saved_model):
+        """Test que le warm-up trace chaque forme et évite les retraçages"""
+        engine = InferenceEngine(_load(tiny_saved_model()), (16, 32))
+
+        assert engine.warmup() >= 0
+        for _ in range(3):
+            engine(*_inputs(16, rows=1))
+            engine(*_inputs(16, rows=5))
+
+        for function in engine._functions.values():
+            assert function.experimental_get_tracing_count() == 1
+        assert engine.snapshot()["trace_duration_s"] is not None
+
+    def test_supports(self, tiny_saved_model):
+        """Test de la détection d'un modèle SavedModel"""
+        assert InferenceEngine.supports(_load(tiny_saved_model()))
+        assert not InferenceEngine.supports(Mock())
+
+
+class TestServiceWithEngine:
+    """Tests du service avec un vrai SavedModel minuscule"""
+
+    @pytest.fixture
+    def model_path(self, tiny_saved_model, tokenizer_file):
+        model_dir = tiny_saved_model()
+        with open(model_dir.parent / "label_encoder.pkl", "wb") as f:
+            pickle.dump(LabelEncoder().fit(["0", "4"]), f)
+        return model_dir.parent
+
+    @pytest.mark.parametrize("padding_strategy", ["max_length", "dynamic"])
+    def test_predictions_use_engine(self, model_path, padding_strategy):
+        """Test que le chargement compile et trace le moteur d'inférence"""
+        service = SentimentService(
+            Settings(tokenizer_source="bundled", padding_strategy=padding_strategy)
+        )
+        service.model_path = model_path
+
+        service.warmup()
+        results = service.predict_batch(["I love this movie!", "i"])
+
+        assert service.backend.engine is not None
+        assert "trace_s" in service.load_timings
+        assert [label for label, _ in results][0] in ("0", "4")
+        assert len(results) == 2
+
+    def test_compiled_inference_disabled(self, model_path):
+        """Test du chemin générique quand la compilation est désactivée"""
+        service = SentimentService(
+            Settings(tokenizer_source="bundled", compiled_inference=False)
+        )
+        service.model_path = model_path
+
+        service.load()
+
+        assert service.backend.engine is None
+        assert len(service.predict_batch(["i love this movie !"])) == 1
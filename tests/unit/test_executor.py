@@ -0,0 +1,67 @@
+"""
+Tests unitaires pour le pool d'exécution de l'inférence
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.services.executor import InferenceExecutor
+
+
+class TestInferenceExecutor:
+    """Tests pour InferenceExecutor"""
+
+    def test_runs_outside_event_loop_thread(self):
+        """Test que la fonction est exécutée hors du thread de la boucle"""
+        executor = InferenceExecutor(max_workers=1)
+
+        async def scenario():
+            loop_thread = threading.current_thread().name
+            worker_thread = await executor.run(lambda: threading.current_thread().name)
+            return loop_thread, worker_thread
+
+        loop_thread, worker_thread = asyncio.run(scenario())
+        executor.shutdown()
+
+        assert worker_thread != loop_thread
+        assert worker_thread.startswith("inference")
+
+    def test_event_loop_stays_responsive(self):
+        """Test que la boucle répond pendant une inférence bloquante"""
+        executor = InferenceExecutor(max_workers=1)
+        release = threading.Event()
+
+        async def scenario():
+            task = asyncio.ensure_future(executor.run(release.wait, 5))
+            await asyncio.sleep(0.05)
+            snapshot = executor.snapshot()
+            release.set()
+            await task
+            return snapshot
+
+        snapshot = asyncio.run(scenario())
+        executor.shutdown()
+
+        assert snapshot["running"] == 1
+        assert snapshot["saturation"] == 1.0
+        assert executor.snapshot()["completed_total"] == 1
+
+    def test_exception_is_propagated(self):
+        """Test qu'une exception est renvoyée à l'appelant"""
+        executor = InferenceExecutor(max_workers=1)
+
+        def failing():
+            raise RuntimeError("Model error")
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(executor.run(failing))
+        executor.shutdown()
+
+        assert executor.snapshot()["errors_total"] == 1
+
+    def test_invalid_max_workers(self):
+        """Test avec une taille de pool invalide"""
+        with pytest.raises(ValueError):
+            InferenceExecutor(max_workers=0)
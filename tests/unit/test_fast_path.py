@@ -0,0 +1,156 @@
+"""
+Tests unitaires pour le chemin rapide Lambda
+"""
+
+import asyncio
+import base64
+import json
+
+import pytest
+
+from app.api import fast_path
+from main_lambda import handler, lambda_handler
+
+
+@pytest.fixture(autouse=True)
+def mangum_event_loop():
+    """Boucle courante utilisée par Mangum (retirée par ``asyncio.run``)"""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    yield loop
+    asyncio.set_event_loop(None)
+    loop.close()
+
+
+def _json(response):
+    return json.loads(response["body"])
+
+
+@pytest.mark.usefixtures("override_sentiment_service")
+class TestFastPath:
+    """Tests du chemin rapide et de sa parité avec Mangum"""
+
+    def test_route(self, api_gateway_event):
+        """Test de la reconnaissance des routes (v1, v2, slash final)"""
+        v2_event = {
+            "version": "2.0",
+            "rawPath": "/predict-sentiment/batch",
+            "requestContext": {"http": {"method": "POST"}},
+        }
+
+        assert fast_path.route(api_gateway_event("POST", "/predict-sentiment/")) == (
+            "single"
+        )
+        assert fast_path.route(v2_event) == "batch"
+        assert fast_path.route(api_gateway_event("GET", "/predict-sentiment/")) is None
+        assert fast_path.route(api_gateway_event("GET", "/health")) is None
+
+    def test_single_matches_mangum(self, api_gateway_event, mock_sentiment_service):
+        """Test que la réponse est identique à celle de FastAPI"""
+        event = api_gateway_event(
+            "POST", "/predict-sentiment/", {"text": "J'adore ce film !"}
+        )
+
+        fast = fast_path.handle(event, mock_sentiment_service)
+        slow = handler(event, None)
+
+        assert fast["statusCode"] == slow["statusCode"] == 200
+        assert fast["body"] == slow["body"]
+        assert fast["headers"]["content-type"] == slow["headers"]["content-type"]
+
+    def test_batch_matches_mangum(self, api_gateway_event, mock_sentiment_service):
+        """Test de parité de la prédiction par lot"""
+        mock_sentiment_service.predict_batch.return_value = [("4", 0.9), ("0", 0.1)]
+        event = api_gateway_event(
+            "POST",
+            "/predict-sentiment/batch",
+            {"texts": ["I love it!", "I hate it!"]},
+            headers={"Cache-Control": "no-cache"},
+        )
+
+        fast = fast_path.handle(event, mock_sentiment_service)
+        slow = handler(event, None)
+
+        assert fast["body"] == slow["body"]
+        mock_sentiment_service.predict_batch.assert_called_with(
+            ["I love it!", "I hate it!"], False
+        )
+
+    def test_cors_headers(self, api_gateway_event, mock_sentiment_service):
+        """Test des en-têtes CORS ajoutés par CORSMiddleware"""
+        event = api_gateway_event(
+            "POST",
+            "/predict-sentiment/",
+            {"text": "Great"},
+            headers={"Origin": "https://example.com"},
+        )
+
+        fast = fast_path.handle(event, mock_sentiment_service)
+        slow = handler(event, None)
+
+        for header in (
+            "access-control-allow-origin",
+            "access-control-allow-credentials",
+        ):
+            assert fast["headers"][header] == slow["headers"][header]
+
+    def test_base64_body(self, api_gateway_event, mock_sentiment_service):
+        """Test d'un corps encodé en base64"""
+        event = api_gateway_event("POST", "/predict-sentiment/")
+        event["body"] = base64.b64encode(b'{"text": "Great"}').decode()
+        event["isBase64Encoded"] = True
+
+        assert (
+            _json(fast_path.handle(event, mock_sentiment_service))["sentiment"] == "4"
+        )
+
+    def test_service_error(self, api_gateway_event, mock_sentiment_service):
+        """Test que l'erreur du service est celle de l'API"""
+        mock_sentiment_service.predict_sentiment.side_effect = Exception("Model error")
+        event = api_gateway_event("POST", "/predict-sentiment/", {"text": "Great"})
+
+        fast = fast_path.handle(event, mock_sentiment_service)
+
+        assert fast["statusCode"] == 500
+        assert fast["body"] == handler(event, None)["body"]
+
+    @pytest.mark.parametrize(
+        "body", [{"texte": "Great"}, {"text": 3}, None, "not json"]
+    )
+    def test_invalid_body_falls_back(self, api_gateway_event, body):
+        """Test qu'un corps invalide passe par FastAPI (erreur 422)"""
+        event = api_gateway_event("POST", "/predict-sentiment/", body)
+
+        assert fast_path.handle(event) is None
+        assert lambda_handler(event, None)["statusCode"] == 422
+
+    def test_batch_too_large_falls_back(self, api_gateway_event):
+        """Test de la limite de taille des lots"""
+        event = api_gateway_event(
+            "POST", "/predict-sentiment/batch", {"texts": ["a"] * 257}
+        )
+
+        assert fast_path.handle(event) is None
+        assert lambda_handler(event, None)["statusCode"] == 422
+
+    def test_other_routes_use_mangum(self, api_gateway_event):
+        """Test que les autres routes passent par Mangum"""
+        response = lambda_handler(api_gateway_event("GET", "/health"), None)
+
+        assert response["statusCode"] == 200
+        assert _json(response)["status"] == "healthy"
+
+
+class TestLambdaBenchmark:
+    """Tests du benchmark chemin rapide / Mangum"""
+
+    def test_replay(self):
+        """Test du rejeu des événements par les deux chemins"""
+        from benchmarks.lambda_paths import load_events, run
+
+        result = run(load_events(), iterations=20)
+
+        assert result["events"] == 3
+        assert result["body_mismatches"] == 0
+        assert result["fast_path"]["p50_us"] > 0
+        assert result["mangum"]["p50_us"] > 0
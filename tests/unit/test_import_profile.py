@@ -0,0 +1,55 @@
+"""
+Tests du budget d'import et du profil des temps d'import
+"""
+
+import subprocess
+import sys
+
+from app.import_profile import build_report, parse_importtime
+
+SAMPLE_OUTPUT = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     numpy.core
+import time:       300 |        420 |   numpy
+import time:        80 |        500 | app.services
+"""
+
+
+class TestImportProfile:
+    """Tests pour le profil des temps d'import"""
+
+    def test_parse_importtime(self):
+        """Test de l'analyse de la sortie de -X importtime"""
+        timings = parse_importtime(SAMPLE_OUTPUT)
+
+        assert [t.module for t in timings] == ["numpy.core", "numpy", "app.services"]
+        assert [t.depth for t in timings] == [2, 1, 0]
+        assert timings[1].self_ms == 0.3
+        assert timings[2].cumulative_ms == 0.5
+
+    def test_build_report(self):
+        """Test du rapport trié par temps cumulé"""
+        report = build_report("app.services", parse_importtime(SAMPLE_OUTPUT), top=2)
+
+        assert report["total_ms"] == 0.5
+        assert report["modules_imported"] == 3
+        assert [t["module"] for t in report["top_cumulative"]] == [
+            "app.services",
+            "numpy",
+        ]
+
+
+class TestLazyImports:
+    """Tests de l'absence d'imports lourds à l'import de l'application"""
+
+    def test_app_import_does_not_load_ml_frameworks(self):
+        """Test que main n'importe ni TensorFlow ni transformers"""
+        code = (
+            "import sys, main; "
+            "print(sorted(m for m in ('tensorflow', 'transformers') "
+            "if m in sys.modules))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+
+        assert result.stdout.strip() == "[]"
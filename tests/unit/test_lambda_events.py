@@ -0,0 +1,272 @@
+"""
+Tests unitaires pour le scoring des événements SQS et S3
+"""
+
+import json
+from unittest.mock import Mock
+
+import pytest
+
+import main_lambda
+from app.lambda_events import BulkScorer, event_source
+from app.services.sentiment_service import SentimentService
+from app.services.sinks import LocalSink, S3Sink, sink_from_url
+
+
+def _sqs_event(*bodies):
+    return {
+        "Records": [
+            {
+                "messageId": f"m{i}",
+                "receiptHandle": f"r{i}",
+                "body": body,
+                "eventSource": "aws:sqs",
+                "eventSourceARN": "arn:aws:sqs:eu-west-3:123456789012:tweets",
+            }
+            for i, body in enumerate(bodies)
+        ]
+    }
+
+
+def _s3_event(bucket, *keys):
+    return {
+        "Records": [
+            {
+                "eventSource": "aws:s3",
+                "eventName": "ObjectCreated:Put",
+                "s3": {"bucket": {"name": bucket}, "object": {"key": key}},
+            }
+            for key in keys
+        ]
+    }
+
+
+def _read_jsonl(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+@pytest.fixture
+def service():
+    service = Mock(spec=SentimentService)
+    service.predict_batch.side_effect = lambda texts: [("4", 0.9) for _ in texts]
+    return service
+
+
+@pytest.fixture
+def scorer(service, tmp_path):
+    def open_object(bucket, key):
+        return open(tmp_path / "buckets" / bucket / key, "rb")
+
+    return BulkScorer(
+        service, LocalSink(tmp_path / "results"), open_object, chunk_size=2
+    )
+
+
+class TestSQS:
+    """Tests des lots SQS"""
+
+    def test_event_source(self):
+        """Test de la reconnaissance du type d'événement"""
+        assert event_source(_sqs_event('"a"')) == "sqs"
+        assert event_source(_s3_event("b", "k")) == "s3"
+        assert event_source({"httpMethod": "GET"}) is None
+        assert event_source({"Records": []}) is None
+
+    def test_batch_scored_per_chunk(self, scorer, service, tmp_path):
+        """Test d'un appel vectorisé par paquet et des résultats écrits"""
+        event = _sqs_event('{"text": "a", "id": 1}', '"b"', '"c"')
+
+        response = scorer.handle(event)
+
+        assert response == {"batchItemFailures": []}
+        assert [call.args[0] for call in service.predict_batch.call_args_list] == [
+            ["a", "b"],
+            ["c"],
+        ]
+        records = _read_jsonl(tmp_path / "results" / "sqs" / "m0.jsonl")
+        assert records[0] == {
+            "id": 1,
+            "text": "a",
+            "sentiment": "4",
+            "confidence": 0.9,
+            "message_id": "m0",
+        }
+        assert (tmp_path / "results" / "sqs" / "m2.jsonl").exists()
+
+    def test_invalid_messages_written_as_errors(self, scorer, service, tmp_path):
+        """Test qu'un message invalide produit une erreur sans être renvoyé"""
+        response = scorer.handle(_sqs_event('"a"', "not json", '{"id": 3}', ""))
+
+        assert response == {"batchItemFailures": []}
+        service.predict_batch.assert_called_once_with(["a"])
+        first = _read_jsonl(tmp_path / "results" / "sqs" / "m0.jsonl")
+        second = _read_jsonl(tmp_path / "results" / "sqs" / "m2.jsonl")
+        assert first[0]["sentiment"] == "4"
+        assert first[1]["line"] == 2 and "JSON invalide" in first[1]["error"]
+        assert first[1]["message_id"] == "m1"
+        assert [r["error"] for r in second] == [
+            "Champ 'text' (chaîne) manquant",
+            "Message vide",
+        ]
+        # Paquet sans texte valide : pas d'appel du modèle
+        assert service.predict_batch.call_count == 1
+
+    def test_sink_failure_reported(self, scorer, monkeypatch):
+        """Test qu'une écriture qui échoue encore seule renvoie son message"""
+        write = Mock(
+            side_effect=[OSError("throttled"), OSError("throttled"), "ok", "ok"]
+        )
+        monkeypatch.setattr(scorer.sink, "write", write)
+
+        response = scorer.handle(_sqs_event('"a"', "not json", '"c"'))
+
+        assert response["batchItemFailures"] == [{"itemIdentifier": "m0"}]
+        assert [call.args[0] for call in write.call_args_list] == [
+            "sqs/m0",
+            "sqs/m0",
+            "sqs/m1",
+            "sqs/m2",
+        ]
+
+    def test_failed_chunk_retried_per_message(self, scorer, service, tmp_path):
+        """Test que seuls les messages qui échouent encore seuls sont renvoyés"""
+        service.predict_batch.side_effect = [
+            RuntimeError("OOM"),
+            RuntimeError("OOM"),
+            [("4", 0.9)],
+            [("0", 0.2)],
+        ]
+
+        response = scorer.handle(_sqs_event('"a"', '"b"', '"c"'))
+
+        assert response["batchItemFailures"] == [{"itemIdentifier": "m0"}]
+        assert [call.args[0] for call in service.predict_batch.call_args_list] == [
+            ["a", "b"],
+            ["a"],
+            ["b"],
+            ["c"],
+        ]
+        records = _read_jsonl(tmp_path / "results" / "sqs" / "m1.jsonl")
+        assert records == [
+            {"text": "b", "sentiment": "4", "confidence": 0.9, "message_id": "m1"}
+        ]
+
+    def test_transient_chunk_failure_recovered(self, scorer, service):
+        """Test qu'un paquet dont tous les messages passent seuls n'est pas renvoyé"""
+        service.predict_batch.side_effect = [
+            RuntimeError("OOM"),
+            [("4", 0.9)],
+            [("4", 0.9)],
+        ]
+
+        response = scorer.handle(_sqs_event('"a"', '"b"'))
+
+        assert response == {"batchItemFailures": []}
+
+    def test_lambda_handler_routes_sqs(self, scorer, monkeypatch):
+        """Test que le handler Lambda transmet les événements SQS"""
+        monkeypatch.setattr(main_lambda, "get_bulk_scorer", lambda: scorer)
+
+        response = main_lambda.lambda_handler(_sqs_event('"a"'), None)
+
+        assert response == {"batchItemFailures": []}
+
+
+class TestS3:
+    """Tests des objets JSONL déposés sur S3"""
+
+    def _put(self, tmp_path, bucket, key, lines):
+        path = tmp_path / "buckets" / bucket / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("\n".join(lines) + "\n")
+
+    def test_object_scored_in_parts(self, scorer, tmp_path):
+        """Test du découpage d'un objet en parts de résultats"""
+        lines = ['{"text": "a"}', '"b"', "", "oops", '"d"']
+        self._put(tmp_path, "tweets", "in/day 1.jsonl", lines)
+
+        response = scorer.handle(_s3_event("tweets", "in/day+1.jsonl"))
+
+        summary = response["objects"][0]
+        assert summary == {
+            "bucket": "tweets",
+            "key": "in/day 1.jsonl",
+            "rows": 4,
+            "errors": 1,
+            "parts": 2,
+        }
+        output = tmp_path / "results" / "s3" / "tweets" / "in" / "day 1.jsonl"
+        assert [r["text"] for r in _read_jsonl(output / "part-00000.jsonl")] == [
+            "a",
+            "b",
+        ]
+        second = _read_jsonl(output / "part-00001.jsonl")
+        assert second[0]["line"] == 4
+        assert second[1]["text"] == "d"
+
+    def test_failed_object_raises_after_others(self, scorer, tmp_path):
+        """Test qu'un objet absent n'empêche pas le scoring des autres"""
+        self._put(tmp_path, "tweets", "ok.jsonl", ['"a"'])
+
+        with pytest.raises(RuntimeError, match="missing.jsonl"):
+            scorer.handle(_s3_event("tweets", "missing.jsonl", "ok.jsonl"))
+
+        assert (tmp_path / "results" / "s3" / "tweets" / "ok.jsonl").is_dir()
+
+    def test_objects_under_result_sink_skipped(self, service, tmp_path):
+        """Test qu'un objet de résultats ne relance pas le scoring"""
+        client = Mock()
+        self._put(tmp_path, "tweets", "in/a.jsonl", ['"a"'])
+        self._put(tmp_path, "tweets", "results/s3/tweets/in/a.jsonl", ['"a"'])
+        scorer = BulkScorer(
+            service,
+            S3Sink("tweets", "results", client=client),
+            lambda bucket, key: open(tmp_path / "buckets" / bucket / key, "rb"),
+        )
+
+        response = scorer.handle(
+            _s3_event("tweets", "results/s3/tweets/in/a.jsonl", "in/a.jsonl")
+        )
+
+        assert [summary["key"] for summary in response["objects"]] == ["in/a.jsonl"]
+        assert client.put_object.call_count == 1
+        assert (
+            client.put_object.call_args.kwargs["Key"]
+            == "results/s3/tweets/in/a.jsonl/part-00000.jsonl"
+        )
+
+
+class TestSinks:
+    """Tests des destinations de résultats"""
+
+    def test_sink_from_url(self, tmp_path):
+        """Test de la configuration RESULT_SINK"""
+        local = sink_from_url(f"file://{tmp_path}")
+        s3 = sink_from_url("s3://results-bucket/sentiment/")
+
+        assert isinstance(local, LocalSink) and local.directory == tmp_path
+        assert (s3.bucket, s3.prefix) == ("results-bucket", "sentiment")
+        with pytest.raises(ValueError):
+            sink_from_url("ftp://host/path")
+
+    def test_s3_sink_contains(self):
+        """Test de la reconnaissance des objets sous la destination"""
+        sink = S3Sink("results-bucket", "sentiment/")
+
+        assert sink.contains("results-bucket", "sentiment/s3/a.jsonl")
+        assert not sink.contains("results-bucket", "sentiment-in/a.jsonl")
+        assert not sink.contains("tweets", "sentiment/a.jsonl")
+        assert S3Sink("results-bucket").contains("results-bucket", "any.jsonl")
+        assert not LocalSink("/tmp").contains("results-bucket", "any.jsonl")
+
+    def test_s3_sink_put_object(self):
+        """Test de l'écriture S3 avec un client injecté"""
+        client = Mock()
+        sink = S3Sink("results-bucket", "sentiment", client=client)
+
+        location = sink.write("sqs/m0", [{"text": "é"}])
+
+        assert location == "s3://results-bucket/sentiment/sqs/m0.jsonl"
+        kwargs = client.put_object.call_args.kwargs
+        assert kwargs["Key"] == "sentiment/sqs/m0.jsonl"
+        assert kwargs["Body"] == '{"text": "é"}\n'.encode("utf-8")
@@ -0,0 +1,123 @@
+"""
+Tests unitaires pour le cycle de vie Lambda
+"""
+
+import json
+import time
+from unittest.mock import Mock
+
+import pytest
+
+import main_lambda
+from app.lambda_runtime import LambdaRuntime, is_warmer_event
+from app.services.sentiment_service import SentimentService
+
+
+def _logs(capsys):
+    return [
+        json.loads(line)
+        for line in capsys.readouterr().out.splitlines()
+        if line.startswith("{")
+    ]
+
+
+@pytest.fixture
+def service():
+    service = Mock(spec=SentimentService)
+    service.is_model_loaded.return_value = True
+    service.warmup_duration_s = 0.25
+    service.load_timings = {"model_s": 1.5, "tokenizer_source": "bundled"}
+    return service
+
+
+class TestWarmerEvents:
+    """Tests de la reconnaissance des événements de préchauffage"""
+
+    @pytest.mark.parametrize(
+        "event,expected",
+        [
+            ({"source": "aws.events", "detail-type": "Scheduled Event"}, True),
+            ({"source": "serverless-plugin-warmup"}, True),
+            ({"warmer": True}, True),
+            ({"keep_alive": True}, True),
+            ({"httpMethod": "GET", "path": "/health"}, False),
+            ({"warmer": "yes"}, False),
+            ("ping", False),
+        ],
+    )
+    def test_is_warmer_event(self, event, expected):
+        """Test des formats d'événements reconnus"""
+        assert is_warmer_event(event) is expected
+
+    def test_warmer_short_circuit(self, service, monkeypatch, capsys):
+        """Test que le handler répond sans FastAPI ni inférence"""
+        mangum = Mock()
+        monkeypatch.setattr(main_lambda, "handler", mangum)
+        monkeypatch.setattr(main_lambda, "runtime", LambdaRuntime(lambda: service))
+
+        response = main_lambda.lambda_handler({"source": "aws.events"}, None)
+
+        assert response["statusCode"] == 200
+        assert json.loads(response["body"]) == {"warm": True}
+        mangum.assert_not_called()
+        service.predict_sentiment.assert_not_called()
+        assert _logs(capsys)[-1] == {"event": "warmer", "model_loaded": True}
+
+    def test_warmer_loads_after_failed_init(self, service):
+        """Test que le préchauffage recharge un modèle absent"""
+        service.is_model_loaded.return_value = False
+
+        LambdaRuntime(lambda: service).warm()
+
+        service.load.assert_called_once()
+        service.predict_batch.assert_not_called()
+
+
+class TestInitPhase:
+    """Tests du chargement en phase init"""
+
+    def test_initialize_logs_durations(self, service, capsys):
+        """Test du chargement et du log structuré de la phase init"""
+        fields = LambdaRuntime(lambda: service).initialize("eager")
+
+        service.warmup.assert_called_once()
+        log = _logs(capsys)[-1]
+        assert log["event"] == "lambda_init"
+        assert log["model_loaded"] is True
+        assert log["model_ms"] == 1500.0
+        assert log["warmup_ms"] == 250.0
+        assert log["tokenizer_source"] == "bundled"
+        assert fields["init_duration_ms"] >= 0
+
+    def test_initialize_failure_does_not_raise(self, service, capsys):
+        """Test qu'un échec de chargement ne bloque pas le démarrage"""
+        service.warmup.side_effect = OSError("SavedModel absent")
+        service.is_model_loaded.return_value = False
+
+        runtime = LambdaRuntime(lambda: service)
+        runtime.initialize("eager")
+
+        log = _logs(capsys)[-1]
+        assert log["error"] == "SavedModel absent"
+        assert log["model_loaded"] is False
+        assert runtime.init_error == "SavedModel absent"
+
+    def test_initialize_lazy(self, service):
+        """Test que le mode lazy ne charge rien en phase init"""
+        LambdaRuntime(lambda: service).initialize("lazy")
+
+        service.warmup.assert_not_called()
+
+    def test_first_invocation_logged_once(self, service, capsys):
+        """Test du log de latence de la première invocation"""
+        runtime = LambdaRuntime(lambda: service)
+        runtime.initialize("eager")
+
+        runtime.record_invocation(time.perf_counter(), "single")
+        runtime.record_invocation(time.perf_counter(), "single")
+
+        logs = [log for log in _logs(capsys) if log["event"] == "first_invocation"]
+        assert len(logs) == 1
+        assert logs[0]["route"] == "single"
+        assert logs[0]["model_loaded_at_init"] is True
+        assert logs[0]["latency_ms"] >= 0
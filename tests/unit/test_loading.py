@@ -0,0 +1,191 @@
+"""
+Tests unitaires pour le chargement unique du modèle
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from app.config import Settings
+from app.services.loading import LoadState, ModelLoadError, SingleFlightLoader
+from app.services.sentiment_service import SentimentService
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestSingleFlightLoader:
+    """Tests de la machine à états du chargement"""
+
+    def test_concurrent_callers_share_one_load(self):
+        """Test que les appels concurrents attendent le chargement en cours"""
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def load():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+
+        loader = SingleFlightLoader(load)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            futures = [pool.submit(loader.ensure_loaded) for _ in range(8)]
+            assert started.wait(5)
+            assert loader.state is LoadState.LOADING
+            time.sleep(0.05)
+            release.set()
+            for future in futures:
+                future.result(timeout=5)
+
+        assert len(calls) == 1
+        assert loader.state is LoadState.READY
+        assert loader.snapshot()["attempts"] == 1
+
+    def test_failure_backs_off(self):
+        """Test qu'un échec n'est pas retenté avant la fin du backoff"""
+        clock = FakeClock()
+        attempts = []
+
+        def load():
+            attempts.append(1)
+            raise FileNotFoundError("Model not found")
+
+        loader = SingleFlightLoader(load, backoff_s=2.0, clock=clock)
+
+        with pytest.raises(FileNotFoundError):
+            loader.ensure_loaded()
+        assert loader.state is LoadState.FAILED
+
+        with pytest.raises(ModelLoadError) as error:
+            loader.ensure_loaded()
+        assert error.value.retry_in_s == pytest.approx(2.0)
+        assert "Model not found" in str(error.value)
+        assert len(attempts) == 1
+
+        clock.now += 2.0
+        with pytest.raises(FileNotFoundError):
+            loader.ensure_loaded()
+        assert len(attempts) == 2
+        # Délai doublé après le second échec consécutif
+        assert loader.snapshot()["retry_in_s"] == pytest.approx(4.0)
+
+    def test_backoff_is_bounded(self):
+        """Test du plafond du délai de backoff"""
+        clock = FakeClock()
+
+        def load():
+            raise RuntimeError("boom")
+
+        loader = SingleFlightLoader(load, backoff_s=1.0, backoff_max_s=3.0, clock=clock)
+        for _ in range(5):
+            with pytest.raises(RuntimeError):
+                loader.ensure_loaded()
+            clock.now += 10
+
+        with pytest.raises(RuntimeError):
+            loader.ensure_loaded()
+        snapshot = loader.snapshot()
+        assert snapshot["consecutive_failures"] == 6
+        assert snapshot["retry_in_s"] == pytest.approx(3.0)
+
+    def test_recovery_after_failure(self):
+        """Test du passage à ready après une nouvelle tentative réussie"""
+        clock = FakeClock()
+        outcomes = [RuntimeError("boom"), None]
+
+        def load():
+            outcome = outcomes.pop(0)
+            if outcome is not None:
+                raise outcome
+
+        loader = SingleFlightLoader(load, backoff_s=1.0, clock=clock)
+        with pytest.raises(RuntimeError):
+            loader.ensure_loaded()
+        clock.now += 1.0
+
+        loader.ensure_loaded()
+
+        snapshot = loader.snapshot()
+        assert snapshot["state"] == "ready"
+        assert snapshot["consecutive_failures"] == 0
+        assert snapshot["last_error"] is None
+        assert snapshot["retry_in_s"] is None
+
+    def test_waiters_share_failure(self):
+        """Test que les appels en attente reçoivent l'échec sans recharger"""
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def load():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            raise RuntimeError("boom")
+
+        loader = SingleFlightLoader(load, backoff_s=60.0)
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = [pool.submit(loader.ensure_loaded) for _ in range(4)]
+            assert started.wait(5)
+            time.sleep(0.05)
+            release.set()
+            errors = [future.exception(timeout=5) for future in futures]
+
+        assert len(calls) == 1
+        assert sum(isinstance(e, ModelLoadError) for e in errors) == 3
+        assert sum(type(e) is RuntimeError for e in errors) == 1
+
+
+class TestServiceLoading:
+    """Tests du chargement unique dans le service"""
+
+    def test_concurrent_predictions_load_once(self):
+        """Test qu'une rafale sur une instance froide charge une seule fois"""
+        service = SentimentService(Settings(prediction_cache_enabled=False))
+        calls = []
+
+        def slow_load():
+            calls.append(1)
+            time.sleep(0.1)
+
+        with patch.object(service, "_load_model", side_effect=slow_load):
+            with ThreadPoolExecutor(max_workers=6) as pool:
+                list(pool.map(lambda _: service.load(), range(6)))
+
+        assert len(calls) == 1
+        assert service.load_state is LoadState.READY
+        assert service.is_model_loaded() is True
+
+    def test_failed_load_state(self):
+        """Test de l'état failed et du backoff configuré"""
+        service = SentimentService(Settings(model_load_backoff_s=30.0))
+
+        with patch.object(service, "_load_model", side_effect=OSError("disk")):
+            with pytest.raises(OSError):
+                service.load()
+            with pytest.raises(ModelLoadError):
+                service.predict_sentiment("test")
+
+        snapshot = service.load_snapshot()
+        assert snapshot["state"] == "failed"
+        assert snapshot["attempts"] == 1
+        assert snapshot["last_error"] == "disk"
+        assert service.is_model_loaded() is False
+
+    def test_is_loaded_setter(self):
+        """Test que l'affectation de _is_loaded force l'état"""
+        service = SentimentService()
+        assert service.load_state is LoadState.NOT_LOADED
+
+        service._is_loaded = True
+        assert service.load_state is LoadState.READY
+
+        service._is_loaded = False
+        assert service.load_state is LoadState.NOT_LOADED
@@ -0,0 +1,281 @@
+"""
+Tests unitaires pour les métriques Prometheus
+"""
+
+import math
+import pickle
+import re
+
+import pytest
+from sklearn.preprocessing import LabelEncoder
+
+from app.config import Settings
+from app.services.metrics import MODEL_BATCH_SIZE, STAGES, MetricsRegistry
+from app.services.sentiment_service import SentimentService
+
+METRIC_NAME = r"[a-zA-Z_:][a-zA-Z0-9_:]*"
+LABEL_NAME = r"[a-zA-Z_][a-zA-Z0-9_]*"
+LABEL_VALUE = r'"(?:[^"\\\n]|\\[\\"n])*"'
+LABEL_PAIR = rf"{LABEL_NAME}={LABEL_VALUE}"
+SAMPLE = re.compile(
+    rf"(?P<name>{METRIC_NAME})"
+    rf"(?:\{{(?P<labels>{LABEL_PAIR}(?:,{LABEL_PAIR})*)?\}})?"
+    r" (?P<value>\S+)(?: (?P<timestamp>-?\d+))?"
+)
+LABEL = re.compile(rf"({LABEL_NAME})=({LABEL_VALUE})")
+HELP = re.compile(rf"# HELP ({METRIC_NAME}) (.*)")
+TYPE = re.compile(rf"# TYPE ({METRIC_NAME}) (counter|gauge|histogram|summary|untyped)")
+FLOAT = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?")
+SUFFIXES = {"histogram": ("_bucket", "_sum", "_count"), "summary": ("_sum", "_count")}
+
+
+def _unescape(value, quotes=True):
+    escapes = {"\\": "\\", "n": "\n", '"': '"'} if quotes else {"\\": "\\", "n": "\n"}
+
+    def replace(match):
+        char = match.group(1)
+        if char not in escapes:
+            raise AssertionError(f"Échappement invalide: \\{char}")
+        return escapes[char]
+
+    return re.sub(r"\\(.|$)", replace, value)
+
+
+def _parse_value(text):
+    special = {"+Inf": math.inf, "-Inf": -math.inf, "NaN": math.nan}
+    if text in special:
+        return special[text]
+    assert FLOAT.fullmatch(text), f"Valeur invalide: {text!r}"
+    return float(text)
+
+
+def parse_exposition(text):
+    """
+    Analyse stricte du format texte 0.0.4 de Prometheus
+
+    Retourne ``{famille: {"type", "help", "samples": [(nom, étiquettes,
+    valeur)]}}`` ; lève AssertionError au premier écart.
+    """
+    assert text.endswith("\n"), "Le corps doit se terminer par un saut de ligne"
+    families, seen = {}, set()
+    current = None
+    for number, line in enumerate(text[:-1].split("\n"), start=1):
+        assert line, f"Ligne {number} vide"
+        if line.startswith("# HELP "):
+            match = HELP.fullmatch(line)
+            assert match, f"HELP invalide ligne {number}: {line!r}"
+            name = match.group(1)
+            family = families.setdefault(name, {"type": None, "samples": []})
+            assert "help" not in family, f"HELP en double pour {name}"
+            assert not family["samples"], f"HELP après les échantillons de {name}"
+            family["help"] = _unescape(match.group(2), quotes=False)
+            current = name
+            continue
+        if line.startswith("# TYPE "):
+            match = TYPE.fullmatch(line)
+            assert match, f"TYPE invalide ligne {number}: {line!r}"
+            name = match.group(1)
+            family = families.setdefault(name, {"type": None, "samples": []})
+            assert family["type"] is None, f"TYPE en double pour {name}"
+            assert not family["samples"], f"TYPE après les échantillons de {name}"
+            family["type"] = match.group(2)
+            current = name
+            continue
+        assert not line.startswith("#"), f"Commentaire inattendu ligne {number}"
+
+        match = SAMPLE.fullmatch(line)
+        assert match, f"Échantillon invalide ligne {number}: {line!r}"
+        name = match.group("name")
+        family = families.get(current)
+        assert family is not None, f"Échantillon hors famille ligne {number}"
+        allowed = {current} | {
+            current + suffix for suffix in SUFFIXES.get(family["type"], ())
+        }
+        assert name in allowed, f"{name} n'appartient pas à la famille {current}"
+        labels = {}
+        for label, value in LABEL.findall(match.group("labels") or ""):
+            assert label not in labels, f"Étiquette {label} en double ligne {number}"
+            labels[label] = _unescape(value[1:-1])
+        key = (name, tuple(sorted(labels.items())))
+        assert key not in seen, f"Échantillon en double ligne {number}: {line!r}"
+        seen.add(key)
+        family["samples"].append((name, labels, _parse_value(match.group("value"))))
+
+    for name, family in families.items():
+        assert family["type"] is not None, f"TYPE absent pour {name}"
+        if family["type"] == "histogram":
+            _check_histogram(name, family["samples"])
+    return families
+
+
+def _check_histogram(name, samples):
+    series = {}
+    for sample_name, labels, value in samples:
+        rest = tuple(sorted((k, v) for k, v in labels.items() if k != "le"))
+        entry = series.setdefault(rest, {"buckets": []})
+        if sample_name == f"{name}_bucket":
+            assert "le" in labels, f"{name}_bucket sans étiquette le"
+            entry["buckets"].append((_parse_value(labels["le"]), value))
+        else:
+            assert "le" not in labels, f"{sample_name} avec une étiquette le"
+            entry[sample_name[len(name) :]] = value
+    for labels, entry in series.items():
+        bounds = [bound for bound, _ in entry["buckets"]]
+        counts = [count for _, count in entry["buckets"]]
+        assert bounds and bounds[-1] == math.inf, f"{name}{labels}: borne +Inf absente"
+        assert bounds == sorted(set(bounds)), f"{name}{labels}: bornes non croissantes"
+        assert counts == sorted(counts), f"{name}{labels}: comptes non cumulés"
+        assert entry.get("_count") == counts[-1], f"{name}{labels}: _count incohérent"
+        assert "_sum" in entry, f"{name}{labels}: _sum absent"
+
+
+def _count(histogram_value):
+    return sum(histogram_value.counts)
+
+
+class TestRegistry:
+    """Tests du registre et du format d'exposition"""
+
+    def test_counter_and_gauge(self):
+        """Test des compteurs à étiquettes et des jauges"""
+        registry = MetricsRegistry()
+        requests = registry.counter("requests_total", "Requêtes", ["path"])
+        in_flight = registry.gauge("in_flight", "En cours")
+
+        requests.labels(path="/a").inc()
+        requests.labels(path="/a").inc()
+        requests.labels(path='/"b"').inc()
+        in_flight.inc()
+        in_flight.inc()
+        in_flight.dec()
+
+        text = registry.render()
+        assert "# TYPE requests_total counter" in text
+        assert 'requests_total{path="/a"} 2' in text
+        assert 'requests_total{path="/\\"b\\""} 1' in text
+        assert "in_flight 1" in text
+        assert text.endswith("\n")
+
+    def test_histogram_buckets(self):
+        """Test des bornes cumulées, de la somme et du compte"""
+        registry = MetricsRegistry()
+        latency = registry.histogram("latency_seconds", "Latence", buckets=(0.1, 1))
+
+        latency.observe(0.05)
+        latency.observe(0.1)
+        latency.observe(0.5)
+        latency.observe(3)
+
+        lines = registry.render().splitlines()
+        assert 'latency_seconds_bucket{le="0.1"} 2' in lines
+        assert 'latency_seconds_bucket{le="1"} 3' in lines
+        assert 'latency_seconds_bucket{le="+Inf"} 4' in lines
+        assert "latency_seconds_sum 3.65" in lines
+        assert "latency_seconds_count 4" in lines
+
+    def test_timer(self):
+        """Test de la mesure d'un bloc"""
+        registry = MetricsRegistry()
+        latency = registry.histogram("latency_seconds", "Latence")
+
+        with latency.time():
+            pass
+
+        assert "latency_seconds_count 1" in registry.render()
+
+
+class TestExpositionFormat:
+    """Tests de conformité du format d'exposition texte"""
+
+    def _registry(self):
+        registry = MetricsRegistry()
+        requests = registry.counter(
+            "requests_total", "Requêtes \\ par chemin\nsur deux lignes", ["path"]
+        )
+        requests.labels(path='/a\\b"c"\nd').inc(2)
+        gauge = registry.gauge("temperature", "Valeurs spéciales", ["kind"])
+        gauge.labels(kind="nan").set(math.nan)
+        gauge.labels(kind="low").set(-math.inf)
+        gauge.labels(kind="high").set(math.inf)
+        gauge.labels(kind="big").set(1e300)
+        gauge.labels(kind="small").set(-2.5e-7)
+        latency = registry.histogram(
+            "latency_seconds", "Latence", ["route"], buckets=(0.1, 1)
+        )
+        latency.labels(route="a").observe(0.05)
+        latency.labels(route="a").observe(2)
+        latency.labels(route="b").observe(0.5)
+        registry.counter("unused_total", "Sans échantillon", ["reason"])
+        return registry
+
+    def test_registry_strict_parse(self):
+        """Test d'un rendu aux valeurs et étiquettes piégeuses"""
+        families = parse_exposition(self._registry().render())
+
+        assert families["requests_total"]["help"] == (
+            "Requêtes \\ par chemin\nsur deux lignes"
+        )
+        ((_, labels, value),) = families["requests_total"]["samples"]
+        assert labels == {"path": '/a\\b"c"\nd'} and value == 2
+        values = {
+            labels["kind"]: value
+            for _, labels, value in families["temperature"]["samples"]
+        }
+        assert math.isnan(values["nan"])
+        assert values["low"] == -math.inf and values["high"] == math.inf
+        assert values["big"] == 1e300 and values["small"] == -2.5e-7
+        assert families["latency_seconds"]["type"] == "histogram"
+        assert families["unused_total"]["samples"] == []
+
+    def test_metrics_endpoint_strict_parse(self, client, override_sentiment_service):
+        """Test de la conformité de /metrics après du trafic"""
+        client.post("/predict-sentiment/", json={"text": "Great!"})
+        client.post("/predict-sentiment/batch", json={"texts": ["a", "b"]})
+        client.get("/does-not-exist")
+
+        families = parse_exposition(client.get("/metrics").text)
+
+        assert families["http_requests_total"]["type"] == "counter"
+        assert families["sentiment_stage_duration_seconds"]["type"] == "histogram"
+
+    def test_prometheus_client_parser(self, client, override_sentiment_service):
+        """Test avec l'analyseur de référence (prometheus_client facultatif)"""
+        parser = pytest.importorskip("prometheus_client.parser")
+        client.post("/predict-sentiment/", json={"text": "Great!"})
+        text = client.get("/metrics").text + self._registry().render()
+
+        families = {
+            family.name: family
+            for family in parser.text_string_to_metric_families(text)
+        }
+
+        assert families["http_requests"].type == "counter"
+        assert families["requests"].samples[0].labels == {"path": '/a\\b"c"\nd'}
+        assert families["latency_seconds"].type == "histogram"
+
+
+class TestServiceStages:
+    """Tests de l'instrumentation des étapes de la prédiction"""
+
+    def test_stages_observed(self, tiny_saved_model, tokenizer_file):
+        """Test que chaque étape et la taille de lot sont mesurées"""
+        model_dir = tiny_saved_model()
+        with open(model_dir.parent / "label_encoder.pkl", "wb") as f:
+            pickle.dump(LabelEncoder().fit(["0", "4"]), f)
+        service = SentimentService(
+            Settings(tokenizer_source="bundled", prediction_cache_enabled=False)
+        )
+        service.model_path = model_dir.parent
+        service.load()
+        before = {stage: _count(value) for stage, value in STAGES.items()}
+        batches_before = _count(MODEL_BATCH_SIZE.labels())
+
+        service.predict_batch(["i love this movie !", "i"])
+
+        # Étapes "linear" et "persistent_cache" : cascade et cache persistant
+        # désactivés
+        for stage in ("tokenize", "model", "transfer", "decode"):
+            assert _count(STAGES[stage]) == before[stage] + 1, stage
+        for stage in ("linear", "persistent_cache"):
+            assert _count(STAGES[stage]) == before[stage], stage
+        assert _count(MODEL_BATCH_SIZE.labels()) == batches_before + 1
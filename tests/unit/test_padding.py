@@ -0,0 +1,40 @@
+"""
+Tests unitaires pour le padding dynamique
+"""
+
+import numpy as np
+
+from app.services.padding import bucket_length, pad_sequences, plan_batches
+
+BUCKETS = (16, 32, 64, 128)
+
+
+class TestPadding:
+    """Tests pour les fonctions de padding par bucket"""
+
+    def test_bucket_length(self):
+        """Test du choix du bucket"""
+        assert bucket_length(3, BUCKETS) == 16
+        assert bucket_length(16, BUCKETS) == 16
+        assert bucket_length(17, BUCKETS) == 32
+        assert bucket_length(500, BUCKETS) == 128
+
+    def test_plan_groups_by_bucket(self):
+        """Test du regroupement des séquences par bucket"""
+        plan = plan_batches([5, 40, 10, 100], BUCKETS, max_tokens=8192)
+
+        assert plan == [(16, [0, 2]), (64, [1]), (128, [3])]
+
+    def test_plan_respects_token_budget(self):
+        """Test du découpage selon le budget de tokens"""
+        plan = plan_batches([10] * 5, BUCKETS, max_tokens=32)
+
+        assert plan == [(16, [0, 1]), (16, [2, 3]), (16, [4])]
+
+    def test_pad_sequences(self):
+        """Test de construction des tenseurs paddés"""
+        input_ids, attention_mask = pad_sequences([[101, 7, 102], [101, 102]], 4)
+
+        np.testing.assert_array_equal(input_ids, [[101, 7, 102, 0], [101, 102, 0, 0]])
+        np.testing.assert_array_equal(attention_mask, [[1, 1, 1, 0], [1, 1, 0, 0]])
+        assert input_ids.dtype == np.int32
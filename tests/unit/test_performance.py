@@ -1,136 +1,207 @@
 """
-Tests de performance pour le service de sentiment
+Tests de performance : suite de benchmarks sur un modèle DistilBERT
+aléatoire réduit (inférence réelle, sans mocks)
 """
 
-import time
-from unittest.mock import Mock, patch
-
 import pytest
-import tensorflow as tf
 
+from app.api.dependencies import get_batcher, get_sentiment_service
+from app.config import Settings
 from app.services.sentiment_service import SentimentService
+from benchmarks.random_model import (
+    CONFIG_FILENAME,
+    MODEL_DIRNAME,
+    ModelConfig,
+    build_random_model,
+)
+from benchmarks.suite import (
+    AppTarget,
+    LambdaTarget,
+    ServiceTarget,
+    compare,
+    make_texts,
+    run_suite,
+    summarize,
+)
+
+TINY_CONFIG = ModelConfig(vocab_size=512, dim=32, layers=1, heads=2, hidden_dim=64)
+
+
+@pytest.fixture(scope="module")
+def tiny_model_dir(tmp_path_factory):
+    return build_random_model(tmp_path_factory.mktemp("bench") / "model", TINY_CONFIG)
+
+
+def _service(model_dir, **settings):
+    service = SentimentService(
+        Settings(tokenizer_source="bundled", prediction_cache_enabled=False, **settings)
+    )
+    service.model_path = model_dir
+    service.load()
+    return service
+
+
+class TestRandomModel:
+    """Tests du modèle DistilBERT aléatoire"""
+
+    def test_layout_and_reuse(self, tiny_model_dir):
+        """Test de la disposition du répertoire et de sa réutilisation"""
+        assert (tiny_model_dir / MODEL_DIRNAME / "saved_model.pb").exists()
+        assert (tiny_model_dir / "label_encoder.pkl").exists()
+        assert (tiny_model_dir / "tokenizer.json").exists()
+        mtime = (tiny_model_dir / CONFIG_FILENAME).stat().st_mtime
+
+        assert build_random_model(tiny_model_dir, TINY_CONFIG) == tiny_model_dir
+        assert (tiny_model_dir / CONFIG_FILENAME).stat().st_mtime == mtime
+
+    @pytest.mark.parametrize("padding_strategy", ["max_length", "dynamic"])
+    def test_real_inference(self, tiny_model_dir, padding_strategy):
+        """Test d'une inférence réelle par le service"""
+        service = _service(tiny_model_dir, padding_strategy=padding_strategy)
+        texts = make_texts(8, 3) + make_texts(128, 2)
+
+        results = service.predict_batch(texts)
 
-
-class TestPerformance:
-    """Tests de performance"""
-
-    @patch("app.services.sentiment_service.tf.saved_model.load")
-    @patch("app.services.sentiment_service.AutoTokenizer.from_pretrained")
-    @patch("builtins.open")
-    @patch("app.services.sentiment_service.pickle.load")
-    def test_prediction_speed(
-        self, mock_pickle_load, mock_open, mock_tokenizer, mock_load_model
-    ):
-        """Test de la vitesse de prédiction"""
-        # Mock des composants
-        mock_model = Mock()
-        mock_tokenizer_instance = Mock()
-        mock_label_encoder = Mock()
-
-        # Mock des tokens
-        mock_tokens = {
-            "input_ids": tf.constant([[1, 2, 3, 4, 5]]),
-            "attention_mask": tf.constant([[1, 1, 1, 1, 1]]),
+        assert len(results) == 5
+        for label, confidence in results:
+            assert label in ("0", "4")
+            assert 0.0 <= confidence <= 1.0
+        assert service.predict_sentiment(texts[0]) == pytest.approx(results[0])
+
+    def test_direct_call_matches_signature(self, tiny_model_dir):
+        """Test de l'appel direct du modèle (sans InferenceEngine)"""
+        import numpy as np
+
+        from app.services.backends.tensorflow_backend import TensorFlowBackend
+
+        model_dir = tiny_model_dir / MODEL_DIRNAME
+        direct = TensorFlowBackend.load(model_dir, compiled=False)
+        compiled = TensorFlowBackend.load(model_dir, sequence_lengths=(4,))
+        ids = np.array([[2, 10, 11, 3], [2, 12, 3, 0]], dtype=np.int32)
+        mask = (ids > 0).astype(np.int32)
+
+        assert direct.engine is None
+        np.testing.assert_allclose(
+            direct.predict(ids, mask), compiled.predict(ids, mask), atol=1e-6
+        )
+
+    def test_text_lengths(self, tiny_model_dir):
+        """Test que les textes générés ont la longueur demandée en tokens"""
+        service = _service(tiny_model_dir)
+
+        for tokens in (8, 32):
+            encoded = service.tokenizer(make_texts(tokens, 4))["input_ids"]
+            assert {len(ids) for ids in encoded} == {tokens}
+
+
+class TestSuite:
+    """Tests de l'exécution de la suite"""
+
+    def test_summarize(self):
+        """Test des percentiles et du débit"""
+        summary = summarize([0.01, 0.02, 0.03, 0.04], texts=8, wall_s=0.1)
+
+        assert summary["requests"] == 4
+        assert summary["p50_ms"] == pytest.approx(25.0)
+        assert summary["p99_ms"] <= 40.0
+        assert summary["throughput_texts_s"] == pytest.approx(80.0)
+
+    def test_run_suite(self, tiny_model_dir):
+        """Test des scénarios sur le service, l'application et Mangum"""
+        from main import app
+        from main_lambda import handler
+
+        service = _service(tiny_model_dir)
+        app.dependency_overrides[get_sentiment_service] = lambda: service
+        app.dependency_overrides[get_batcher] = lambda: None
+        try:
+            results = run_suite(
+                [
+                    ServiceTarget(service),
+                    AppTarget(app),
+                    LambdaTarget("mangum", handler),
+                ],
+                lengths=["short"],
+                requests=3,
+                batch_size=2,
+                concurrency=2,
+                warmup=1,
+            )
+        finally:
+            app.dependency_overrides.clear()
+
+        measured = {(r["target"], r["scenario"]) for r in results}
+        assert measured == {
+            ("service", "single"),
+            ("service", "batch"),
+            ("service", "concurrent"),
+            ("app", "single"),
+            ("app", "batch"),
+            ("app", "concurrent"),
+            ("mangum", "single"),
+            ("mangum", "batch"),
         }
-        mock_tokenizer_instance.return_value = mock_tokens
-
-        # Mock de la prédiction
-        mock_prediction = tf.constant([[0.8]])
-        mock_model.return_value = mock_prediction
-
-        # Mock du label encoder
-        mock_label_encoder.inverse_transform.return_value = ["4"]
-
-        # Configuration des mocks
-        mock_load_model.return_value = mock_model
-        mock_tokenizer.return_value = mock_tokenizer_instance
-        mock_pickle_load.return_value = mock_label_encoder
-
-        # Test
-        service = SentimentService()
-
-        # Mesurer le temps de prédiction
-        start_time = time.time()
-        label, confidence = service.predict_sentiment("I love this movie!")
-        end_time = time.time()
-
-        prediction_time = end_time - start_time
-
-        # Vérifier que la prédiction est rapide (< 1 seconde)
-        assert prediction_time < 1.0
-        assert label == "4"
-        assert confidence == pytest.approx(0.8, rel=1e-6)
-
-    @patch("app.services.sentiment_service.tf.saved_model.load")
-    @patch("app.services.sentiment_service.AutoTokenizer.from_pretrained")
-    @patch("builtins.open")
-    @patch("app.services.sentiment_service.pickle.load")
-    def test_multiple_predictions(
-        self, mock_pickle_load, mock_open, mock_tokenizer, mock_load_model
-    ):
-        """Test de prédictions multiples"""
-        # Mock des composants
-        mock_model = Mock()
-        mock_tokenizer_instance = Mock()
-        mock_label_encoder = Mock()
-
-        # Mock des tokens
-        mock_tokens = {
-            "input_ids": tf.constant([[1, 2, 3, 4, 5]]),
-            "attention_mask": tf.constant([[1, 1, 1, 1, 1]]),
+        for result in results:
+            assert result["requests"] == 3
+            assert result["texts"] == 3 * result["batch_size"]
+            assert result["throughput_texts_s"] > 0
+            assert result["p50_ms"] <= result["p99_ms"]
+
+
+class TestCompare:
+    """Tests de la comparaison avec une exécution de référence"""
+
+    @staticmethod
+    def _report(p50, throughput, model="random"):
+        return {
+            "metadata": {"model": {"kind": model}, "machine": {"cpus": 4}},
+            "results": [
+                {
+                    "target": "service",
+                    "scenario": "single",
+                    "length": "short",
+                    "p50_ms": p50,
+                    "p99_ms": 20.0,
+                    "throughput_texts_s": throughput,
+                }
+            ],
         }
-        mock_tokenizer_instance.return_value = mock_tokens
-
-        # Mock de la prédiction
-        mock_prediction = tf.constant([[0.8]])
-        mock_model.return_value = mock_prediction
 
-        # Mock du label encoder
-        mock_label_encoder.inverse_transform.return_value = ["4"]
+    def test_regression_detected(self):
+        """Test d'une hausse de latence au-delà du seuil"""
+        comparison = compare(self._report(13.0, 100.0), self._report(10.0, 100.0))
 
-        # Configuration des mocks
-        mock_load_model.return_value = mock_model
-        mock_tokenizer.return_value = mock_tokenizer_instance
-        mock_pickle_load.return_value = mock_label_encoder
+        assert [r["metric"] for r in comparison["regressions"]] == ["p50_ms"]
+        assert comparison["regressions"][0]["change"] == pytest.approx(0.3)
+        assert comparison["warnings"] == []
 
-        # Test
-        service = SentimentService()
+    def test_within_threshold_and_improvement(self):
+        """Test d'une variation tolérée et d'une amélioration du débit"""
+        comparison = compare(self._report(11.0, 150.0), self._report(10.0, 100.0))
 
-        texts = [
-            "I love this movie!",
-            "This is amazing!",
-            "Great film!",
-            "Excellent work!",
-            "Fantastic!",
+        assert comparison["regressions"] == []
+        assert [r["metric"] for r in comparison["improvements"]] == [
+            "throughput_texts_s"
         ]
 
-        start_time = time.time()
-        results = []
-        for text in texts:
-            label, confidence = service.predict_sentiment(text)
-            results.append((label, confidence))
-        end_time = time.time()
+    def test_throughput_drop_and_model_mismatch(self):
+        """Test d'une baisse de débit et d'un modèle différent"""
+        comparison = compare(
+            self._report(10.0, 50.0, model="real"),
+            self._report(10.0, 100.0),
+            threshold=0.1,
+        )
 
-        total_time = end_time - start_time
-
-        # Vérifier que toutes les prédictions sont correctes
-        assert len(results) == 5
-        for label, confidence in results:
-            assert label == "4"
-            assert confidence == pytest.approx(0.8, rel=1e-6)
-
-        # Vérifier que le temps total est raisonnable (< 5 secondes)
-        assert total_time < 5.0
+        assert [r["metric"] for r in comparison["regressions"]] == [
+            "throughput_texts_s"
+        ]
+        assert comparison["warnings"] == ["model différent de la référence"]
 
-    def test_memory_usage(self):
-        """Test d'utilisation mémoire (simulation)"""
-        # Ce test simule une vérification d'utilisation mémoire
-        # En pratique, on utiliserait psutil ou memory_profiler
+    def test_unknown_measure_ignored(self):
+        """Test qu'une mesure absente de la référence est ignorée"""
+        baseline = self._report(10.0, 100.0)
+        baseline["results"][0]["length"] = "long"
 
-        service = SentimentService()
+        comparison = compare(self._report(50.0, 1.0), baseline)
 
-        # Vérifier que l'objet est créé sans erreur
-        assert service is not None
-        assert hasattr(service, "model")
-        assert hasattr(service, "tokenizer")
-        assert hasattr(service, "label_encoder")
+        assert comparison["regressions"] == []
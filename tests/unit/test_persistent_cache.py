@@ -0,0 +1,178 @@
+"""
+Tests unitaires pour le cache persistant des prédictions (SQLite)
+"""
+
+import subprocess
+import sys
+import textwrap
+from unittest.mock import patch
+
+import pytest
+
+from app.config import Settings
+from app.services.cache import cache_key
+from app.services.metrics import STAGES
+from app.services.persistent_cache import PersistentCache
+from app.services.sentiment_service import SentimentService
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _predict(calls):
+    def predict(texts):
+        calls.append(list(texts))
+        return [("4", 0.9)] * len(texts), ["transformer"] * len(texts)
+
+    return predict
+
+
+class TestPersistentCache:
+    """Tests du stockage SQLite"""
+
+    def test_put_and_get(self, tmp_path):
+        """Test d'écriture et de lecture, y compris des clés absentes"""
+        cache = PersistentCache(tmp_path / "cache" / "predictions.sqlite3")
+
+        cache.put_many({"a": ("4", 0.9), "b": ("0", 0.1)})
+
+        assert cache.get_many(["a", "b", "c", "a"]) == {
+            "a": ("4", 0.9),
+            "b": ("0", 0.1),
+        }
+        assert cache.get("c") is None
+        snapshot = cache.snapshot()
+        assert snapshot["size"] == 2
+        assert snapshot["hits"] == 2
+        assert snapshot["misses"] == 2
+        assert snapshot["avg_lookup_ms"] > 0
+
+    def test_shared_between_processes(self, tmp_path):
+        """Test qu'une entrée écrite par un autre processus est lue"""
+        path = tmp_path / "predictions.sqlite3"
+        reader = PersistentCache(path)
+        assert reader.get("shared") is None
+
+        script = textwrap.dedent(
+            f"""
+            from app.services.persistent_cache import PersistentCache
+            PersistentCache({str(path)!r}).put("shared", ("0", 0.25))
+            """
+        )
+        subprocess.run([sys.executable, "-c", script], check=True)
+
+        assert reader.get("shared") == ("0", 0.25)
+
+    def test_ttl(self, tmp_path):
+        """Test de l'expiration des entrées"""
+        clock = FakeClock()
+        cache = PersistentCache(tmp_path / "c.sqlite3", ttl_seconds=10, clock=clock)
+        cache.put("a", ("4", 0.9))
+
+        clock.now += 11
+
+        assert cache.get("a") is None
+
+    def test_size_bounded_eviction(self, tmp_path):
+        """Test de la suppression des entrées les plus anciennes"""
+        clock = FakeClock()
+        cache = PersistentCache(tmp_path / "c.sqlite3", max_entries=10, clock=clock)
+
+        for i in range(25):
+            clock.now += 1
+            cache.put(f"k{i}", ("4", 0.5))
+
+        assert len(cache) <= 10
+        assert cache.get("k24") == ("4", 0.5)
+        assert cache.get("k0") is None
+        assert cache.snapshot()["evictions"] >= 15
+
+    def test_errors_do_not_raise(self, tmp_path):
+        """Test qu'un fichier invalide désactive le cache sans erreur"""
+        path = tmp_path / "corrupt.sqlite3"
+        path.write_bytes(b"not a sqlite database" * 100)
+        cache = PersistentCache(path)
+
+        cache.put("a", ("4", 0.9))
+
+        assert cache.get("a") is None
+        snapshot = cache.snapshot()
+        assert snapshot["errors"] >= 2
+        assert snapshot["last_error"]
+
+    def test_invalid_max_entries(self, tmp_path):
+        """Test d'une borne invalide"""
+        with pytest.raises(ValueError):
+            PersistentCache(tmp_path / "c.sqlite3", max_entries=0)
+
+
+class TestServicePersistentCache:
+    """Tests du cache persistant dans le service"""
+
+    def _service(self, path, **settings):
+        return SentimentService(
+            Settings(
+                persistent_cache_enabled=True,
+                persistent_cache_path=str(path),
+                **settings,
+            )
+        )
+
+    def test_shared_between_services(self, tmp_path):
+        """Test qu'un autre worker réutilise les prédictions calculées"""
+        path = tmp_path / "predictions.sqlite3"
+        first, second = self._service(path), self._service(path)
+        first_calls, second_calls = [], []
+        lookups_before = sum(STAGES["persistent_cache"].counts)
+
+        with patch.object(
+            first, "_predict_uncached", side_effect=_predict(first_calls)
+        ):
+            first.predict_batch(["Great movie", "bad movie"])
+        with patch.object(
+            second, "_predict_uncached", side_effect=_predict(second_calls)
+        ):
+            results = second.predict_batch_with_tiers(["great   MOVIE", "new text"])
+            again = second.predict_batch_with_tiers(["great movie"])
+
+        assert second_calls == [["new text"]]
+        assert [tier for _, _, tier in results] == ["persistent_cache", "transformer"]
+        # Remis dans le cache mémoire du second worker : pas de recherche
+        assert again[0][2] == "cache"
+        assert sum(STAGES["persistent_cache"].counts) - lookups_before == 2
+
+    def test_checked_after_memory_cache(self, tmp_path):
+        """Test que le cache persistant n'est consulté qu'en cas d'absence"""
+        service = self._service(tmp_path / "p.sqlite3")
+        key = cache_key("hello", service.model_version)
+        service.cache.put(key, ("4", 0.9))
+
+        with patch.object(service.persistent_cache, "get_many") as get_many:
+            assert service.predict_sentiment("hello") == ("4", 0.9)
+
+        get_many.assert_not_called()
+
+    def test_no_cache_refreshes(self, tmp_path):
+        """Test que use_cache=False ignore puis rafraîchit le cache persistant"""
+        service = self._service(tmp_path / "p.sqlite3", prediction_cache_enabled=False)
+        key = cache_key("hello", service.model_version)
+        service.persistent_cache.put(key, ("0", 0.1))
+        calls = []
+
+        with patch.object(service, "_predict_uncached", side_effect=_predict(calls)):
+            assert service.predict_sentiment("hello", use_cache=False) == ("4", 0.9)
+
+        assert calls == [["hello"]]
+        assert service.persistent_cache.get(key) == ("4", 0.9)
+
+    def test_disabled_by_default(self):
+        """Test que le cache persistant est désactivé par défaut"""
+        service = SentimentService()
+
+        assert service.persistent_cache is None
+        assert service.persistent_cache_snapshot() is None
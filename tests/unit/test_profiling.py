@@ -0,0 +1,161 @@
+"""
+Tests unitaires pour le profilage à la demande
+"""
+
+import json
+import pstats
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.config import Settings
+from app.services.profiling import Profiler, ProfilingBusyError
+from app.services.sentiment_service import SentimentService
+
+
+def _work(n):
+    return sum(i * i for i in range(n))
+
+
+class TestProfiler:
+    """Tests des sessions de profilage"""
+
+    def test_inactive_by_default(self, tmp_path):
+        """Test que le profileur est inactif et ne crée aucun fichier"""
+        profiler = Profiler(tmp_path / "profiles")
+
+        assert profiler.active is False
+        assert profiler.run(_work, 10) == _work(10)
+        assert profiler.status() == {"active": False, "session": None, "sessions": []}
+
+    def test_next_n_predictions(self, tmp_path):
+        """Test de la capture des N prochaines prédictions puis de l'arrêt"""
+        profiler = Profiler(tmp_path)
+        session = profiler.start("cprofile", predictions=2)
+
+        assert profiler.active is True
+        for _ in range(3):
+            assert profiler.run(_work, 1000) == _work(1000)
+
+        assert profiler.active is False
+        assert session.status == "completed"
+        assert session.predictions == 2
+        directory = tmp_path / session.id
+        stats = pstats.Stats(str(directory / "profile.pstats"))
+        assert any(name == "_work" for _, _, name in stats.stats)
+        assert "_work" in (directory / "profile.txt").read_text()
+        metadata = json.loads((directory / "session.json").read_text())
+        assert metadata["predictions"] == 2
+        assert profiler.session_directory(session.id) == directory
+
+    def test_time_window(self, tmp_path):
+        """Test de l'arrêt automatique à la fin de la fenêtre de temps"""
+        profiler = Profiler(tmp_path)
+        session = profiler.start("cprofile", duration_s=0.05)
+        profiler.run(_work, 100)
+
+        deadline = time.monotonic() + 5
+        while profiler.active and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert profiler.active is False
+        assert session.predictions == 1
+        assert (tmp_path / session.id / "profile.pstats").exists()
+
+    def test_single_session(self, tmp_path):
+        """Test du refus d'une seconde session et de l'arrêt manuel"""
+        profiler = Profiler(tmp_path)
+        session = profiler.start("cprofile", predictions=10)
+
+        with pytest.raises(ProfilingBusyError):
+            profiler.start("cprofile", predictions=1)
+        assert profiler.session_directory(session.id) is None
+
+        assert profiler.stop() is session
+        assert profiler.stop() is None
+        assert session.predictions == 0
+        assert session.status == "completed"
+        assert not (tmp_path / session.id / "profile.pstats").exists()
+
+    def test_invalid_arguments(self, tmp_path):
+        """Test des paramètres de session invalides"""
+        profiler = Profiler(tmp_path)
+
+        with pytest.raises(ValueError):
+            profiler.start("perf", predictions=1)
+        with pytest.raises(ValueError):
+            profiler.start("cprofile")
+        assert profiler.active is False
+
+    def test_tensorflow_trace(self, tmp_path):
+        """Test que le mode TensorFlow démarre et arrête le profileur TF"""
+        profiler = Profiler(tmp_path)
+        with (
+            patch("tensorflow.profiler.experimental.start") as start,
+            patch("tensorflow.profiler.experimental.stop") as stop,
+        ):
+            session = profiler.start("tensorflow", predictions=1)
+            profiler.run(_work, 10)
+
+        start.assert_called_once_with(str(tmp_path / session.id))
+        stop.assert_called_once_with()
+        assert session.status == "completed"
+
+    def test_concurrent_predictions(self, tmp_path):
+        """Test de deux prédictions simultanées : une seule est profilée"""
+        profiler = Profiler(tmp_path)
+        session = profiler.start("cprofile", predictions=2)
+        started, release = threading.Event(), threading.Event()
+        results = []
+
+        def blocked():
+            started.set()
+            release.wait(5)
+            return _work(100)
+
+        first = threading.Thread(target=lambda: results.append(profiler.run(blocked)))
+        first.start()
+        assert started.wait(5)
+        # Pendant la prédiction profilée : exécutée sans profilage ni erreur
+        assert profiler.run(_work, 100) == _work(100)
+        assert session.predictions == 1
+        release.set()
+        first.join(5)
+        assert profiler.run(_work, 1000) == _work(1000)
+
+        assert results == [_work(100)]
+        assert profiler.active is False
+        assert session.status == "completed"
+        assert session.predictions == 2
+
+    def test_failed_prediction_is_counted(self, tmp_path):
+        """Test qu'une prédiction en erreur est profilée et propage l'erreur"""
+        profiler = Profiler(tmp_path)
+        session = profiler.start("cprofile", predictions=1)
+
+        with pytest.raises(ZeroDivisionError):
+            profiler.run(lambda: 1 / 0)
+
+        assert profiler.active is False
+        assert session.predictions == 1
+
+
+class TestServiceProfiling:
+    """Tests du branchement du profileur sur le service"""
+
+    def test_predict_batch_profiled(self, tmp_path):
+        """Test que predict_batch passe par le profileur actif"""
+        service = SentimentService(Settings(prediction_cache_enabled=False))
+        service.profiler = Profiler(tmp_path)
+        with patch.object(
+            service, "_predict_uncached", return_value=([("4", 0.9)], ["transformer"])
+        ) as predict:
+            session = service.profiler.start("cprofile", predictions=1)
+            assert service.predict_sentiment("great") == ("4", 0.9)
+            assert service.predict_sentiment("great") == ("4", 0.9)
+
+        assert predict.call_count == 2
+        assert session.predictions == 1
+        assert (tmp_path / session.id / "profile.pstats").exists()
@@ -0,0 +1,156 @@
+"""
+Tests unitaires pour la quantification INT8 et son rapport
+"""
+
+import json
+import pickle
+
+import numpy as np
+import pytest
+from sklearn.preprocessing import LabelEncoder
+
+from app.config import Settings
+from app.services.backends import OnnxBackend, TensorFlowBackend, TFLiteBackend
+from app.services.backends.quantize import compare, main, quantize
+from app.services.sentiment_service import SentimentService
+
+
+@pytest.fixture
+def model_dir(tiny_saved_model, tokenizer_file):
+    model_dir = tiny_saved_model()
+    with open(model_dir.parent / "label_encoder.pkl", "wb") as f:
+        pickle.dump(LabelEncoder().fit(["0", "4"]), f)
+    return model_dir
+
+
+@pytest.fixture
+def sentiment140_file(tmp_path):
+    texts = ["i love this movie !", "i", "this movie", "love love love"]
+    lines = [
+        f'"{4 if i % 2 else 0}","{i}","Mon Apr 06 22:19:45 PDT 2009","NO_QUERY",'
+        f'"user","{texts[i % len(texts)]}"'
+        for i in range(12)
+    ]
+    path = tmp_path / "sample.csv"
+    path.write_text("\n".join(lines), encoding="ISO-8859-1")
+    return path
+
+
+class TestPrecision:
+    """Tests de la sélection de précision"""
+
+    def test_int8_artifact_path(self, tmp_path):
+        """Test du nommage des artefacts quantifiés"""
+        model_dir = tmp_path / "distilbert_HF_100000k"
+
+        assert TFLiteBackend.artifact_path(model_dir, "int8").name == (
+            "distilbert_HF_100000k.int8.tflite"
+        )
+        assert OnnxBackend.artifact_path(model_dir, "int8").name == (
+            "distilbert_HF_100000k.int8.onnx"
+        )
+
+    def test_tensorflow_rejects_int8(self):
+        """Test que le SavedModel n'a pas de variante INT8"""
+        with pytest.raises(ValueError, match="non supportée"):
+            TensorFlowBackend.check_precision("int8")
+        with pytest.raises(ValueError):
+            SentimentService(Settings(model_precision="int8"))
+
+    def test_int8_cache_keys_distinct(self):
+        """Test que les prédictions INT8 ont leurs propres clés de cache"""
+        service = SentimentService(
+            Settings(inference_backend="onnx", model_precision="int8")
+        )
+
+        assert service.model_version.endswith("-int8")
+
+    def test_compare(self):
+        """Test des indicateurs de comparaison avec la référence FP32"""
+        reference = {
+            "probabilities": [0.9, 0.2, 0.6],
+            "single": {"p50_ms": 10.0},
+            "batch": {"p50_ms": 40.0},
+            "peak_rss_mb": 1000.0,
+        }
+        variant = {
+            "probabilities": [0.8, 0.3, 0.4],
+            "single": {"p50_ms": 4.0},
+            "batch": {"p50_ms": 10.0},
+            "peak_rss_mb": 500.0,
+        }
+
+        result = compare(reference, variant, ["4", "0", "4"])
+
+        assert result["label_agreement"] == pytest.approx(2 / 3, abs=1e-4)
+        assert result["accuracy"] == pytest.approx(2 / 3, abs=1e-4)
+        assert result["reference_accuracy"] == 1.0
+        assert result["single_speedup"] == 2.5
+        assert result["batch_speedup"] == 4.0
+        assert result["peak_rss_ratio"] == 0.5
+
+
+class TestQuantization:
+    """Tests de la quantification d'un SavedModel minuscule"""
+
+    def test_quantize_tflite_and_serve(self, model_dir):
+        """Test de l'artefact TFLite INT8 servi par le service"""
+        outputs = quantize(model_dir, ["tflite"])
+
+        assert outputs["tflite"].exists()
+        service = SentimentService(
+            Settings(
+                tokenizer_source="bundled",
+                inference_backend="tflite",
+                model_precision="int8",
+            )
+        )
+        service.model_path = model_dir.parent
+
+        results = service.predict_batch(["i love this movie !", "i"])
+
+        assert service.backend.precision == "int8"
+        assert len(results) == 2
+
+    def test_quantize_onnx(self, model_dir):
+        """Test de la quantification dynamique ONNX"""
+        pytest.importorskip("tf2onnx")
+        pytest.importorskip("onnxruntime")
+
+        outputs = quantize(model_dir, ["onnx"])
+
+        backend = OnnxBackend.load(model_dir, precision="int8")
+        ids = np.array([[2, 4, 5, 3, 0]], dtype=np.int32)
+        assert outputs["onnx"].exists()
+        assert backend.predict(ids, (ids != 0).astype(np.int32)).shape == (1,)
+
+    def test_report(self, model_dir, sentiment140_file, tmp_path):
+        """Test du rapport latence / RSS / accord sur un échantillon"""
+        output = tmp_path / "report.json"
+
+        exit_code = main(
+            [
+                "run",
+                "--model-dir",
+                str(model_dir),
+                "--data",
+                str(sentiment140_file),
+                "--samples",
+                "8",
+                "--batch-size",
+                "4",
+                "--formats",
+                "tflite",
+                "--output",
+                str(output),
+            ]
+        )
+
+        report = json.loads(output.read_text())
+        variant = report["variants"]["tflite-int8"]
+        assert exit_code == 0
+        assert report["samples"] == 8
+        assert report["reference"]["backend"] == "tensorflow"
+        assert 0 <= variant["label_agreement"] <= 1
+        assert variant["peak_rss_mb"] > 0
+        assert "p95_ms" in variant["batch"]
@@ -0,0 +1,84 @@
+"""
+Tests unitaires pour le registre des services
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from app.config import Settings
+from app.services.registry import ServiceRegistry
+
+
+class TestServiceRegistry:
+    """Tests pour ServiceRegistry"""
+
+    def test_components_are_shared(self):
+        """Test que chaque composant est une instance unique"""
+        registry = ServiceRegistry(Settings(micro_batching_enabled=True))
+
+        assert registry.sentiment_service is registry.sentiment_service
+        assert registry.executor is registry.executor
+        assert registry.batcher is registry.batcher
+
+        asyncio.run(registry.shutdown())
+
+    def test_batcher_disabled(self):
+        """Test que le batcher est absent si le micro-batching est désactivé"""
+        registry = ServiceRegistry(Settings(micro_batching_enabled=False))
+
+        assert registry.batcher is None
+
+    def test_eager_startup_runs_warmup(self):
+        """Test que le démarrage eager charge et préchauffe le modèle"""
+        registry = ServiceRegistry(Settings(model_loading="eager"))
+
+        with patch.object(registry.sentiment_service, "warmup") as mock_warmup:
+            asyncio.run(registry.startup())
+
+        mock_warmup.assert_called_once()
+        asyncio.run(registry.shutdown())
+
+    def test_lazy_startup_skips_loading(self):
+        """Test que le démarrage lazy ne charge pas le modèle"""
+        registry = ServiceRegistry(Settings(model_loading="lazy"))
+
+        with patch.object(registry.sentiment_service, "warmup") as mock_warmup:
+            asyncio.run(registry.startup())
+
+        mock_warmup.assert_not_called()
+
+    def test_startup_failure_keeps_api_available(self):
+        """Test qu'un échec de chargement au démarrage n'interrompt pas l'API"""
+        registry = ServiceRegistry(Settings(model_loading="eager"))
+
+        with patch.object(
+            registry.sentiment_service,
+            "warmup",
+            side_effect=FileNotFoundError("Model not found"),
+        ):
+            asyncio.run(registry.startup())
+
+        assert registry.sentiment_service.is_model_loaded() is False
+        asyncio.run(registry.shutdown())
+
+    def test_invalid_loading_mode(self):
+        """Test avec un mode de chargement inconnu"""
+        with pytest.raises(ValueError):
+            ServiceRegistry(Settings(model_loading="sometimes"))
+
+    def test_admission_capacity(self):
+        """Test de la capacité du contrôle d'admission selon le micro-batching"""
+        registry = ServiceRegistry(
+            Settings(inference_workers=2, batch_max_size=8, request_deadline_ms=500)
+        )
+        assert registry.admission is registry.admission
+        assert registry.admission.max_concurrency == 2
+        assert registry.admission.default_deadline_s == 0.5
+
+        batching = ServiceRegistry(
+            Settings(inference_workers=2, batch_max_size=8, micro_batching_enabled=True)
+        )
+        assert batching.admission.max_concurrency == 16
+        assert ServiceRegistry(Settings(admission_enabled=False)).admission is None
@@ -5,7 +5,13 @@ Tests unitaires pour les schémas Pydantic
 import pytest
 from pydantic import ValidationError
 
-from app.schemas.sentiment import SentimentRequest, SentimentResponse
+from app.schemas.sentiment import (
+    MAX_BATCH_SIZE,
+    BatchSentimentRequest,
+    BatchSentimentResponse,
+    SentimentRequest,
+    SentimentResponse,
+)
 
 
 class TestSentimentRequest:
@@ -73,3 +79,30 @@ class TestSentimentResponse:
         """Test avec type de confiance invalide"""
         with pytest.raises(ValidationError):
             SentimentResponse(text="test", sentiment="4", confidence="high")
+
+
+class TestBatchSentimentSchemas:
+    """Tests pour BatchSentimentRequest et BatchSentimentResponse"""
+
+    def test_valid_batch_request(self):
+        """Test avec une liste de textes valide"""
+        request = BatchSentimentRequest(texts=["I love it", "I hate it"])
+        assert request.texts == ["I love it", "I hate it"]
+
+    def test_empty_batch_rejected(self):
+        """Test avec une liste vide"""
+        with pytest.raises(ValidationError):
+            BatchSentimentRequest(texts=[])
+
+    def test_batch_too_large_rejected(self):
+        """Test avec une liste dépassant la taille maximale"""
+        with pytest.raises(ValidationError):
+            BatchSentimentRequest(texts=["text"] * (MAX_BATCH_SIZE + 1))
+
+    def test_valid_batch_response(self):
+        """Test avec une réponse par lot valide"""
+        response = BatchSentimentResponse(
+            results=[{"text": "I love it", "sentiment": "4", "confidence": 0.9}]
+        )
+        assert len(response.results) == 1
+        assert response.results[0].sentiment == "4"
@@ -4,9 +4,11 @@ Tests unitaires pour le service de sentiment
 
 from unittest.mock import Mock, patch
 
+import numpy as np
 import pytest
 import tensorflow as tf
 
+from app.config import Settings
 from app.services.sentiment_service import SentimentService
 
 
@@ -117,6 +119,142 @@ class TestSentimentService:
         assert label == "0"
         assert confidence == pytest.approx(0.3, rel=1e-6)
 
+    def test_predict_batch_single_model_call(self):
+        """Test qu'un lot est traité en un seul appel tokenizer/modèle"""
+        service = SentimentService()
+        service._is_loaded = True
+        service.tokenizer = Mock(
+            return_value={
+                "input_ids": tf.constant([[1, 2], [1, 3], [1, 4]]),
+                "attention_mask": tf.constant([[1, 1], [1, 1], [1, 1]]),
+            }
+        )
+        service.model = Mock(return_value=tf.constant([[0.9], [0.2], [0.5]]))
+        service.label_encoder = Mock()
+        service.label_encoder.inverse_transform.side_effect = lambda idx: np.where(
+            np.asarray(idx) == 1, "4", "0"
+        )
+
+        results = service.predict_batch(["great", "awful", "meh"])
+
+        assert service.tokenizer.call_count == 1
+        assert service.model.call_count == 1
+        assert service.label_encoder.inverse_transform.call_count == 1
+        assert [label for label, _ in results] == ["4", "0", "4"]
+        assert results[1][1] == pytest.approx(0.2, rel=1e-6)
+
+    def test_predict_batch_dynamic_padding(self):
+        """Test du padding dynamique par bucket de longueur"""
+        service = SentimentService(Settings(padding_strategy="dynamic"))
+        service._is_loaded = True
+        service.tokenizer = Mock(
+            return_value={"input_ids": [[101, 5, 102], [101] + [7] * 40 + [102]]},
+            pad_token_id=0,
+        )
+        shapes = []
+
+        def model(inputs, training=False):
+            shapes.append(tuple(inputs[0].shape))
+            return tf.fill([inputs[0].shape[0], 1], 0.9)
+
+        service.model = model
+        service.label_encoder = Mock()
+        service.label_encoder.inverse_transform.return_value = ["4", "4"]
+
+        results = service.predict_batch(["short", "a much longer text"])
+
+        assert sorted(shapes) == [(1, 16), (1, 64)]
+        assert len(results) == 2
+        assert service.tokenizer.call_args.kwargs["padding"] is False
+
+    def _service_with_fake_model(self, settings=None):
+        service = SentimentService(settings)
+        service._is_loaded = True
+        service.tokenizer = Mock(
+            side_effect=lambda texts, **kwargs: {
+                "input_ids": tf.ones([len(texts), 4], dtype=tf.int32),
+                "attention_mask": tf.ones([len(texts), 4], dtype=tf.int32),
+            }
+        )
+        service.model = Mock(
+            side_effect=lambda inputs, training=False: tf.fill(
+                [inputs[0].shape[0], 1], 0.8
+            )
+        )
+        service.label_encoder = Mock()
+        service.label_encoder.inverse_transform.side_effect = lambda idx: np.where(
+            np.asarray(idx) == 1, "4", "0"
+        )
+        return service
+
+    def test_cache_hit_skips_tokenizer_and_model(self):
+        """Test qu'un texte en cache ne passe pas par le modèle"""
+        service = self._service_with_fake_model()
+
+        first = service.predict_sentiment("I love this movie!")
+        second = service.predict_sentiment("  i LOVE this   movie! ")
+
+        assert first == second
+        assert service.tokenizer.call_count == 1
+        assert service.model.call_count == 1
+        assert service.cache_snapshot()["hits"] == 1
+
+    def test_cache_bypass(self):
+        """Test que use_cache=False force l'appel au modèle"""
+        service = self._service_with_fake_model()
+
+        service.predict_sentiment("I love this movie!")
+        service.predict_sentiment("I love this movie!", use_cache=False)
+
+        assert service.model.call_count == 2
+
+    def test_batch_duplicates_computed_once(self):
+        """Test que les doublons d'un lot ne sont calculés qu'une fois"""
+        service = self._service_with_fake_model()
+
+        results = service.predict_batch(["great", "Great", "bad"])
+
+        assert len(results) == 3
+        assert service.tokenizer.call_args.args[0] == ["great", "bad"]
+
+    def test_cache_disabled(self):
+        """Test avec le cache désactivé"""
+        service = self._service_with_fake_model(
+            Settings(prediction_cache_enabled=False)
+        )
+
+        service.predict_sentiment("great")
+        service.predict_sentiment("great")
+
+        assert service.model.call_count == 2
+        assert service.cache_snapshot() is None
+
+    def test_warmup_loads_and_skips_cache(self):
+        """Test que le warm-up charge le modèle sans alimenter le cache"""
+        service = self._service_with_fake_model()
+        service._is_loaded = False
+
+        with patch.object(service, "_load_model") as mock_load:
+            service.warmup()
+
+        mock_load.assert_called_once()
+        assert service.is_model_loaded() is True
+        assert service.model.call_count > 0
+        assert service.cache_snapshot()["size"] == 0
+        assert service.warmup_duration_s is not None
+
+    def test_invalid_padding_strategy(self):
+        """Test avec une stratégie de padding inconnue"""
+        with pytest.raises(ValueError):
+            SentimentService(Settings(padding_strategy="unknown"))
+
+    def test_predict_batch_empty(self):
+        """Test qu'un lot vide ne charge pas le modèle"""
+        service = SentimentService()
+
+        assert service.predict_batch([]) == []
+        assert service._is_loaded is False
+
     def test_predict_sentiment_model_not_loaded(self):
         """Test avec modèle non chargé"""
         service = SentimentService()
@@ -0,0 +1,152 @@
+"""
+Tests unitaires pour le serveur multi-processus
+"""
+
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+import pytest
+
+from app.config import Settings
+from app.serving import (
+    effective_workers,
+    model_artifact,
+    preload_weights,
+    threads_per_worker,
+    worker_environment,
+)
+
+
+class TestThreadBudget:
+    """Tests de la répartition des threads entre workers"""
+
+    @pytest.mark.parametrize(
+        "workers,cpus,expected", [(1, 8, 8), (4, 8, 2), (8, 8, 1), (16, 8, 1)]
+    )
+    def test_threads_per_worker(self, workers, cpus, expected):
+        """Test que workers × threads ne dépasse pas le nombre de cœurs"""
+        assert threads_per_worker(workers, cpus) == expected
+
+    def test_worker_environment(self):
+        """Test des variables de dimensionnement des pools de threads"""
+        environment = worker_environment(2)
+
+        assert environment["INFERENCE_THREADS"] == "2"
+        assert environment["OMP_NUM_THREADS"] == "2"
+        assert environment["TF_NUM_INTRAOP_THREADS"] == "2"
+        assert environment["TF_NUM_INTEROP_THREADS"] == "1"
+
+
+class TestEffectiveWorkers:
+    """Tests du nombre de workers selon le moteur"""
+
+    def test_tensorflow_single_worker(self, capsys):
+        """Test du repli sur un worker : SavedModel non partagé"""
+        assert effective_workers(Settings(), 4) == 1
+        assert "INFERENCE_BACKEND=tflite" in capsys.readouterr().out
+
+    @pytest.mark.parametrize("backend", ["tflite", "onnx"])
+    def test_shared_backends_keep_workers(self, backend):
+        """Test que les moteurs à poids projetés gardent les workers demandés"""
+        assert effective_workers(Settings(inference_backend=backend), 4) == 4
+
+    def test_single_worker_no_warning(self, capsys):
+        """Test d'un seul worker demandé avec tensorflow"""
+        assert effective_workers(Settings(), 1) == 1
+        assert capsys.readouterr().out == ""
+
+
+class TestPreloadWeights:
+    """Tests de la projection des poids avant le fork"""
+
+    def test_preload_tflite(self, tmp_path):
+        """Test de la projection en lecture seule de l'artefact"""
+        settings = Settings(inference_backend="tflite", model_precision="int8")
+        artifact = model_artifact(settings, tmp_path)
+        artifact.write_bytes(os.urandom(3 * 4096 + 10))
+
+        mapping = preload_weights(settings, tmp_path)
+
+        assert artifact.name == "distilbert_HF_100000k.int8.tflite"
+        assert len(mapping) == 3 * 4096 + 10
+        assert mapping[:16] == artifact.read_bytes()[:16]
+        with pytest.raises(TypeError):
+            mapping[0] = 0
+        mapping.close()
+
+    def test_preload_tensorflow_not_shared(self, tmp_path):
+        """Test que le SavedModel n'est pas projeté (non fork-safe)"""
+        assert preload_weights(Settings(), tmp_path) is None
+
+    def test_preload_missing_artifact(self, tmp_path):
+        """Test d'un artefact absent"""
+        assert preload_weights(Settings(inference_backend="onnx"), tmp_path) is None
+
+
+class TestServerProcess:
+    """Tests du serveur multi-processus réel"""
+
+    def _free_port(self):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            return sock.getsockname()[1]
+
+    def _serve(self, backend):
+        """Démarre deux workers demandés, attend /health puis arrête"""
+        port = self._free_port()
+        process = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "app.serving",
+                "--workers",
+                "2",
+                "--host",
+                "127.0.0.1",
+                "--port",
+                str(port),
+                "--log-level",
+                "warning",
+            ],
+            env={**os.environ, "MODEL_LOADING": "lazy", "INFERENCE_BACKEND": backend},
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+        )
+        try:
+            body = None
+            deadline = time.monotonic() + 30
+            while time.monotonic() < deadline and body is None:
+                try:
+                    url = f"http://127.0.0.1:{port}/health"
+                    with urllib.request.urlopen(url, timeout=1) as response:
+                        body = json.loads(response.read())
+                except OSError:
+                    time.sleep(0.2)
+        finally:
+            process.send_signal(signal.SIGTERM)
+            output, _ = process.communicate(timeout=30)
+        return body, process.returncode, output
+
+    def test_workers_share_socket_and_stop(self):
+        """Test du démarrage de deux workers et de l'arrêt sur SIGTERM"""
+        body, returncode, output = self._serve("tflite")
+
+        assert body is not None and body["status"] == "healthy"
+        assert returncode == 0, output
+        assert "2 workers démarrés" in output
+        assert "Artefact du modèle absent" in output
+
+    def test_tensorflow_starts_single_worker(self):
+        """Test du repli sur un worker avec le moteur tensorflow"""
+        body, returncode, output = self._serve("tensorflow")
+
+        assert body is not None and body["status"] == "healthy"
+        assert returncode == 0, output
+        assert "1 workers démarrés" in output
@@ -0,0 +1,129 @@
+"""
+Tests unitaires pour le scoring en flux NDJSON
+"""
+
+import asyncio
+import json
+
+from app.services.streaming import iter_lines, parse_line, score_ndjson
+
+
+async def _chunks(*parts):
+    for part in parts:
+        yield part
+
+
+def _collect(generator):
+    async def scenario():
+        return [item async for item in generator]
+
+    return asyncio.run(scenario())
+
+
+class TestLineSplitting:
+    """Tests du découpage incrémental en lignes"""
+
+    def test_lines_split_across_chunks(self):
+        """Test d'une ligne coupée entre deux morceaux"""
+        lines = _collect(iter_lines(_chunks(b'"a"\n"b', b'c"\n"d"'), 100))
+
+        assert lines == [b'"a"', b'"bc"', b'"d"']
+
+    def test_parse_line_formats(self):
+        """Test des formats de ligne acceptés"""
+        assert parse_line(b'"Great"', 1).text == "Great"
+        item = parse_line(b'{"text": "Great", "id": 7}', 2)
+        assert (item.text, item.id) == ("Great", 7)
+        assert parse_line(b"  ", 3) is None
+        assert "JSON invalide" in parse_line(b"{oops", 4).error
+        assert "text" in parse_line(b'{"id": 1}', 5).error
+
+
+class TestScoreNDJSON:
+    """Tests du scoring par lots"""
+
+    def _run(self, body, batch_size=2, max_line_bytes=100):
+        batches = []
+
+        async def predict(texts):
+            batches.append(list(texts))
+            return [("4", 0.9) for _ in texts]
+
+        chunks = _collect(
+            score_ndjson(_chunks(body), predict, batch_size, max_line_bytes)
+        )
+        lines = b"".join(chunks).decode().splitlines()
+        return [json.loads(line) for line in lines], batches
+
+    def test_batches_and_order(self):
+        """Test des lots de taille bornée et de l'ordre des résultats"""
+        body = b'"a"\n{"text": "b", "id": "x"}\nnot json\n"c"\n\n"d"\n"e"'
+
+        records, batches = self._run(body)
+
+        assert batches == [["a", "b"], ["c", "d"], ["e"]]
+        assert [r.get("text") for r in records] == ["a", "b", None, "c", "d", "e"]
+        assert records[1]["id"] == "x"
+        assert records[2]["line"] == 3
+        assert "id" not in records[0]
+
+    def test_line_too_long_stops_stream(self):
+        """Test qu'une ligne trop longue termine le flux par une erreur"""
+        records, batches = self._run(b'"a"\n"' + b"x" * 200, max_line_bytes=50)
+
+        assert batches == [["a"]]
+        assert records[0]["sentiment"] == "4"
+        assert records[-1] == {"line": 2, "error": "Ligne de plus de 50 octets"}
+
+    def test_complete_line_too_long_in_one_chunk(self):
+        """Test d'une ligne trop longue mais complète dans un seul morceau"""
+        body = b'"a"\n"' + b"x" * 200 + b'"\n"b"\n'
+
+        records, batches = self._run(body, max_line_bytes=50)
+
+        assert batches == [["a"]]
+        assert records[-1] == {"line": 2, "error": "Ligne de plus de 50 octets"}
+
+    def test_prediction_error_reported_per_line(self):
+        """Test qu'une erreur du modèle est signalée sans couper le flux"""
+
+        async def predict(texts):
+            raise RuntimeError("Model error")
+
+        chunks = _collect(score_ndjson(_chunks(b'"a"\n"b"'), predict))
+        records = [json.loads(line) for line in b"".join(chunks).splitlines()]
+
+        assert [r["line"] for r in records] == [1, 2]
+        assert "Model error" in records[0]["error"]
+
+    def test_invalid_lines_streamed_incrementally(self):
+        """Test que des lignes invalides en série sont renvoyées au fil de l'eau"""
+        consumed = []
+
+        async def body():
+            yield b'"a"\n'
+            for number in range(1000):
+                consumed.append(number)
+                yield b"not json\n"
+
+        async def predict(texts):
+            return [("4", 0.9) for _ in texts]
+
+        async def scenario():
+            outputs = []
+            async for chunk in score_ndjson(body(), predict, batch_size=4):
+                outputs.append((len(consumed), chunk))
+            return outputs
+
+        outputs = asyncio.run(scenario())
+
+        # Le premier lot (texte en attente + 3 erreurs) part dès 4 lignes
+        assert outputs[0][0] == 3
+        # Ensuite chaque ligne invalide est renvoyée dès sa lecture
+        assert [seen for seen, _ in outputs[1:]] == list(range(4, 1001))
+        records = [
+            json.loads(line) for _, chunk in outputs for line in chunk.splitlines()
+        ]
+        assert len(records) == 1001
+        assert records[0]["sentiment"] == "4"
+        assert all("JSON invalide" in r["error"] for r in records[1:])
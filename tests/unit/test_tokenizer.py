@@ -0,0 +1,101 @@
+"""
+Tests unitaires pour le tokenizer embarqué
+"""
+
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+import tensorflow as tf
+
+from app.config import Settings
+from app.services.sentiment_service import SentimentService
+from app.services.tokenizer import FastTokenizer
+
+
+class TestFastTokenizer:
+    """Tests pour FastTokenizer"""
+
+    def test_encode_without_padding(self, tokenizer_file):
+        """Test de la tokenisation sans padding"""
+        tokenizer = FastTokenizer.from_file(tokenizer_file, max_length=16)
+
+        encoded = tokenizer(["I LOVE this movie!", "love"])
+
+        assert encoded["input_ids"] == [[2, 4, 5, 6, 7, 8, 3], [2, 5, 3]]
+        assert encoded["attention_mask"][1] == [1, 1, 1]
+
+    def test_max_length_padding(self, tokenizer_file):
+        """Test du padding à longueur fixe"""
+        tokenizer = FastTokenizer.from_file(tokenizer_file, max_length=8)
+
+        encoded = tokenizer(
+            "love movie", padding="max_length", max_length=8, return_tensors="np"
+        )
+
+        np.testing.assert_array_equal(encoded["input_ids"], [[2, 5, 7, 3, 0, 0, 0, 0]])
+        np.testing.assert_array_equal(
+            encoded["attention_mask"], [[1, 1, 1, 1, 0, 0, 0, 0]]
+        )
+
+    def test_truncation_and_tf_tensors(self, tokenizer_file):
+        """Test de la troncature et du retour en tenseurs TensorFlow"""
+        tokenizer = FastTokenizer.from_file(tokenizer_file, max_length=4)
+
+        encoded = tokenizer(
+            ["i love this movie !", "i"], padding="longest", return_tensors="tf"
+        )
+
+        assert isinstance(encoded["input_ids"], tf.Tensor)
+        assert encoded["input_ids"].shape == (2, 4)
+        assert encoded["input_ids"].numpy()[0, -1] == 3  # [SEP] conservé
+
+    def test_other_max_length_rejected(self, tokenizer_file):
+        """Test qu'une longueur différente de la configuration est refusée"""
+        tokenizer = FastTokenizer.from_file(tokenizer_file, max_length=8)
+
+        with pytest.raises(ValueError):
+            tokenizer("love", padding="max_length", max_length=128)
+
+
+class TestTokenizerSource:
+    """Tests du choix de la source du tokenizer dans le service"""
+
+    def test_bundled_tokenizer_used_without_hub(self, tokenizer_file):
+        """Test que le tokenizer embarqué est chargé sans accès au Hub"""
+        service = SentimentService(Settings(tokenizer_source="auto"))
+        service.model_path = tokenizer_file.parent
+
+        with patch(
+            "app.services.sentiment_service.AutoTokenizer.from_pretrained"
+        ) as mock_hub:
+            tokenizer = service._create_tokenizer()
+
+        mock_hub.assert_not_called()
+        assert isinstance(tokenizer, FastTokenizer)
+        assert service.load_timings["tokenizer_source"] == "bundled"
+
+    def test_auto_falls_back_to_hub(self, tmp_path):
+        """Test du repli sur le Hub sans tokenizer embarqué"""
+        service = SentimentService(Settings(tokenizer_source="auto"))
+        service.model_path = tmp_path
+
+        with patch(
+            "app.services.sentiment_service.AutoTokenizer.from_pretrained"
+        ) as mock_hub:
+            service._create_tokenizer()
+
+        mock_hub.assert_called_once()
+
+    def test_bundled_missing_raises(self, tmp_path):
+        """Test qu'un tokenizer embarqué obligatoire mais absent lève une erreur"""
+        service = SentimentService(Settings(tokenizer_source="bundled"))
+        service.model_path = tmp_path
+
+        with pytest.raises(FileNotFoundError):
+            service._create_tokenizer()
+
+    def test_invalid_source(self):
+        """Test avec une source inconnue"""
+        with pytest.raises(ValueError):
+            SentimentService(Settings(tokenizer_source="ftp"))